@@ -172,11 +172,12 @@ def _get_kb_for_orchestrator():
     """Get KnowledgeBase instance for orchestrator nodes (thread-safe)."""
     global _orchestrator_kb
     if _orchestrator_kb is None:
+        vector_store = _get_vs_for_orchestrator()  # Takes _kb_lock itself
         with _kb_lock:
             if _orchestrator_kb is None:
                 try:
                     from knowledge_base import KnowledgeBase
-                    _orchestrator_kb = KnowledgeBase()
+                    _orchestrator_kb = KnowledgeBase(vector_store=vector_store)
                     logger.info("KnowledgeBase initialized for orchestrator")
                 except Exception as e:
                     logger.warning(f"Could not initialize KnowledgeBase: {e}")
@@ -190,9 +191,9 @@ def _get_vs_for_orchestrator():
         with _kb_lock:
             if _orchestrator_vs is None:
                 try:
-                    from vector_store import VectorStore
-                    _orchestrator_vs = VectorStore()
-                    logger.info("VectorStore initialized for orchestrator")
+                    from vector_store import get_vector_store
+                    _orchestrator_vs = get_vector_store()
+                    logger.info(f"{type(_orchestrator_vs).__name__} initialized for orchestrator")
                 except Exception as e:
                     logger.warning(f"Could not initialize VectorStore: {e}")
     return _orchestrator_vs
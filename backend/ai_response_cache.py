@@ -0,0 +1,167 @@
+"""
+Certify Intel - Persistent AI Response Cache
+============================================
+
+Opt-in cache of AIRouter.generate / generate_json results. Many prompts are
+sent verbatim again and again (news classification batches, extraction of
+unchanged pages, summaries of unchanged data); with this cache a repeat is
+answered from disk instead of paying the provider's latency and cost.
+
+Entries are keyed by sha256 of (model, system prompt, prompt, temperature,
+max_tokens). Only deterministic-enough calls are cached: the temperature
+must be at most AI_RESPONSE_CACHE_MAX_TEMPERATURE and the task type must
+have a TTL. Interactive task types (chat, RAG, strategy, reasoning) have
+none by default, so their answers are always generated fresh.
+
+The file is bounded by size: once the stored responses exceed
+AI_RESPONSE_CACHE_MAX_MB, the least recently used rows are evicted
+(sqlite_cache.SQLiteCache), through an index on last_used_at.
+
+Config:
+    AI_RESPONSE_CACHE_ENABLED=false              (opt-in)
+    AI_RESPONSE_CACHE_PATH=./ai_response_cache.db
+    AI_RESPONSE_CACHE_MAX_MB=100
+    AI_RESPONSE_CACHE_MAX_TEMPERATURE=0.3
+    AI_RESPONSE_CACHE_TTL_HOURS=classification=168,summarization=24
+        (overrides DEFAULT_TTL_HOURS per task type; 0 disables a task type)
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+from typing import Any, Dict, Optional
+
+from sqlite_cache import SharedCache, SQLiteCache, default_cache_path
+
+logger = logging.getLogger(__name__)
+
+# Hours a cached response stays valid, per TaskType value. Task types not
+# listed are never cached.
+DEFAULT_TTL_HOURS: Dict[str, float] = {
+    "classification": 168,
+    "bulk_extraction": 168,
+    "summarization": 24,
+    "discovery": 24,
+    "battlecard": 24,
+    "analysis": 6,
+}
+
+
+def ttl_hours() -> Dict[str, float]:
+    """Per-task TTLs: DEFAULT_TTL_HOURS with AI_RESPONSE_CACHE_TTL_HOURS applied."""
+    ttls = dict(DEFAULT_TTL_HOURS)
+    for item in os.getenv("AI_RESPONSE_CACHE_TTL_HOURS", "").split(","):
+        task, _, hours = item.partition("=")
+        if not task.strip():
+            continue
+        try:
+            ttls[task.strip().lower()] = float(hours)
+        except ValueError:
+            logger.warning(f"Ignoring invalid AI_RESPONSE_CACHE_TTL_HOURS entry: {item!r}")
+    return ttls
+
+
+def cache_ttl_seconds(task_type: str, temperature: float) -> Optional[float]:
+    """TTL for a call, or None if it must not be cached."""
+    max_temperature = float(os.getenv("AI_RESPONSE_CACHE_MAX_TEMPERATURE", "0.3"))
+    if temperature > max_temperature:
+        return None
+    hours = ttl_hours().get(task_type, 0)
+    return hours * 3600 if hours > 0 else None
+
+
+def response_key(
+    model: str,
+    system_prompt: Optional[str],
+    prompt: str,
+    temperature: float,
+    max_tokens: int,
+) -> str:
+    """sha256 hex digest of everything that determines the response."""
+    fingerprint = json.dumps([model, system_prompt, prompt, temperature, max_tokens])
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+
+class AIResponseCache(SQLiteCache):
+    """SQLite-backed key -> generate() result cache with a total size limit."""
+
+    TABLE = "responses"
+    COLUMNS = (
+        "key TEXT PRIMARY KEY,"
+        " task_type TEXT NOT NULL,"
+        " payload TEXT NOT NULL,"
+        " size INTEGER NOT NULL,"
+        " expires_at REAL NOT NULL,"
+        " last_used_at REAL NOT NULL"
+    )
+    KEY = ("key",)
+    SIZE_COLUMN = "size"
+
+    def __init__(self, path: Optional[str] = None, max_bytes: Optional[int] = None):
+        super().__init__(
+            path or default_cache_path("AI_RESPONSE_CACHE_PATH", "ai_response_cache.db"),
+            max_bytes=max_bytes or int(float(os.getenv("AI_RESPONSE_CACHE_MAX_MB", "100")) * 1024 * 1024),
+        )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for ``key``, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, size, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[2] <= now:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._removed(1, row[1])
+                self._conn.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE responses SET last_used_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, task_type: str, result: Dict[str, Any], ttl_seconds: float) -> None:
+        """Store a result, evicting least recently used rows past max_bytes."""
+        payload = json.dumps(result)
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, task_type, payload, size, expires_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, task_type, payload, size, now + ttl_seconds, now),
+            )
+            self._stored(0 if old else 1, size - (old[0] if old else 0))
+            self._conn.commit()
+
+
+_shared: SharedCache[AIResponseCache] = SharedCache(
+    AIResponseCache, "AI response cache unavailable, generating every time"
+)
+
+
+def is_enabled() -> bool:
+    return os.getenv("AI_RESPONSE_CACHE_ENABLED", "false").lower() == "true"
+
+
+def get_ai_response_cache() -> Optional[AIResponseCache]:
+    """Shared cache instance, or None when disabled or the file can't be opened."""
+    return _shared.get(is_enabled())
+
+
+def reset_ai_response_cache() -> None:
+    """Close and forget the shared instance (tests, config changes)."""
+    _shared.reset()
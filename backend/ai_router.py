@@ -9,6 +9,9 @@ Features:
 - Daily budget enforcement ($50 default limit)
 - Cost tracking per request
 - Automatic fallback on errors
+- Coalescing of identical concurrent requests
+- Opt-in persisted response cache for low-temperature tasks (ai_response_cache)
+- Token streaming (AIRouter.stream) with time-to-first-token metrics
 - Langfuse integration for observability
 
 Model Strategy (2026 Pricing):
@@ -26,9 +29,13 @@ Expected Savings:
 
 import os
 import json
+import hashlib
 import logging
 import asyncio
-from typing import Optional, Dict, Any, List
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, Dict, Any, List, AsyncIterator, Callable
 from dataclasses import dataclass, field
 from datetime import datetime, date
 from enum import Enum
@@ -260,6 +267,9 @@ class CostTracker:
         self.daily_budget_usd = daily_budget_usd
         self._usage_records: List[UsageRecord] = []
         self._daily_totals: Dict[date, float] = {}
+        # Responses served from the response cache: (when, model, cost avoided)
+        self._cache_hits: List[tuple] = []
+        self._daily_savings: Dict[date, float] = {}
 
     def record_usage(
         self,
@@ -306,6 +316,18 @@ class CostTracker:
 
         return record
 
+    def record_cache_hit(self, model: str, saved_usd: float) -> None:
+        """Record a response served from cache; its original cost counts as saved spend."""
+        self._cache_hits.append((datetime.utcnow(), model, saved_usd))
+        if len(self._cache_hits) > 10_000:
+            self._cache_hits = self._cache_hits[-5_000:]
+        today = date.today()
+        self._daily_savings[today] = self._daily_savings.get(today, 0.0) + saved_usd
+
+    def get_today_savings(self) -> float:
+        """Get spend avoided by cache hits today."""
+        return self._daily_savings.get(date.today(), 0.0)
+
     def get_today_spend(self) -> float:
         """Get total spend for today."""
         return self._daily_totals.get(date.today(), 0.0)
@@ -321,8 +343,14 @@ class CostTracker:
     def get_usage_summary(self, since: Optional[datetime] = None) -> Dict[str, Any]:
         """Get usage summary."""
         records = self._usage_records
+        cache_hits = self._cache_hits
         if since:
             records = [r for r in records if r.timestamp >= since]
+            cache_hits = [h for h in cache_hits if h[0] >= since]
+        cache_summary = {
+            "cache_hits": len(cache_hits),
+            "saved_usd": sum(h[2] for h in cache_hits),
+        }
 
         if not records:
             return {
@@ -331,7 +359,8 @@ class CostTracker:
                 "total_tokens_input": 0,
                 "total_tokens_output": 0,
                 "by_model": {},
-                "by_task": {}
+                "by_task": {},
+                **cache_summary
             }
 
         by_model: Dict[str, Dict] = {}
@@ -358,7 +387,8 @@ class CostTracker:
             "total_tokens_input": sum(r.tokens_input for r in records),
             "total_tokens_output": sum(r.tokens_output for r in records),
             "by_model": by_model,
-            "by_task": by_task
+            "by_task": by_task,
+            **cache_summary
         }
 
 
@@ -366,6 +396,26 @@ class CostTracker:
 # AI ROUTER
 # =============================================================================
 
+# Receives streamed text from AIRouter.generate calls made inside forward_tokens()
+_token_sink: ContextVar[Optional[Callable[[str], None]]] = ContextVar("ai_token_sink", default=None)
+
+
+@contextmanager
+def forward_tokens(sink: Callable[[str], None]):
+    """
+    Stream the text of AIRouter.generate calls made in this block to ``sink``.
+
+    Lets callers that only see the final result (e.g. the agent orchestrator)
+    still push tokens to a client as they arrive. Tasks created inside the
+    block inherit the sink. generate_json output is never forwarded.
+    """
+    token = _token_sink.set(sink)
+    try:
+        yield
+    finally:
+        _token_sink.reset(token)
+
+
 class AIRouter:
     """
     Route AI requests to optimal model based on task type and cost constraints.
@@ -394,6 +444,8 @@ class AIRouter:
     ):
         self.cost_tracker = CostTracker(daily_budget_usd)
         self.fallback_enabled = fallback_enabled
+        # Share one in-flight provider call between identical concurrent requests
+        self.coalesce_requests = True
 
         # Client cache
         self._clients: Dict[str, Any] = {}
@@ -593,6 +645,20 @@ class AIRouter:
         """
         Generate response with automatic model selection.
 
+        Concurrent calls with the same prompt, system prompt, model and
+        parameters from the same user and agent share one provider call (see
+        performance.SingleFlight); cost is recorded once, against that user
+        and agent. Each caller gets its own copy of the result.
+
+        Inside a forward_tokens() block the response is streamed instead and
+        each piece of text is passed to the sink as it arrives.
+
+        With AI_RESPONSE_CACHE_ENABLED, low-temperature calls of cacheable
+        task types are answered from the persisted response cache when the
+        same model, prompts and parameters were seen before (see
+        ai_response_cache). Hits cost nothing, are marked ``"cached": True``
+        and count as saved spend in the cost tracker.
+
         Args:
             prompt: User prompt
             task_type: Task type for routing
@@ -606,18 +672,114 @@ class AIRouter:
         Returns:
             Dict with response, model, cost, usage
         """
-        import tiktoken
-        import time
+        from performance import get_single_flight
 
-        # Estimate tokens
+        kwargs = dict(
+            prompt=prompt, task_type=task_type, system_prompt=system_prompt,
+            max_tokens=max_tokens, temperature=temperature,
+            model_override=model_override, user_id=user_id, agent_type=agent_type
+        )
+        sink = _token_sink.get()
+        if sink is not None:
+            result: Dict[str, Any] = {}
+            async for event in self.stream(**kwargs):
+                if event["type"] == "token":
+                    sink(event["text"])
+                else:
+                    result = {k: v for k, v in event.items() if k != "type"}
+            return result
+
+        if not self.coalesce_requests:
+            return await self._generate(**kwargs)
+
+        fingerprint = json.dumps([
+            id(self), getattr(task_type, "value", task_type), model_override, system_prompt, prompt,
+            max_tokens, temperature, user_id, agent_type
+        ])
+        flight_key = "ai:" + hashlib.sha256(fingerprint.encode()).hexdigest()
+        result = await get_single_flight().do(flight_key, lambda: self._generate(**kwargs))
+        return dict(result)
+
+    def _count_prompt_tokens(self, prompt: str, system_prompt: Optional[str]) -> int:
+        """Estimate input tokens with tiktoken (word count fallback)."""
         try:
+            import tiktoken
             enc = tiktoken.get_encoding("cl100k_base")
             prompt_tokens = len(enc.encode(prompt))
             if system_prompt:
                 prompt_tokens += len(enc.encode(system_prompt))
+            return prompt_tokens
+        except Exception:
+            return len(prompt.split()) * 2
+
+    def _fallback_model(self, model: str, config: ModelConfig) -> Optional[str]:
+        """Next model in the 3-tier fallback chain (Claude Opus → GPT-4o → Gemini), then Ollama."""
+        if not self.fallback_enabled:
+            return None
+        if config.provider == "anthropic" and model != "gpt-4o":
+            return "gpt-4o"
+        if model != "gemini-3-flash-preview":
+            return "gemini-3-flash-preview"
+        # Try Ollama as last resort if available
+        if os.getenv("OLLAMA_ENABLED", "false").lower() == "true":
+            _ollama_default = os.getenv("OLLAMA_DEFAULT_MODEL", "llama3.1:8b")
+            ollama_model = f"ollama-{_ollama_default}"
+            if model != ollama_model and ollama_model in MODELS:
+                return ollama_model
+        return None
+
+    def _record(
+        self,
+        model: str,
+        task_type: TaskType,
+        prompt_tokens: int,
+        output_tokens: int,
+        latency_ms: int,
+        user_id: Optional[str],
+        agent_type: Optional[str]
+    ) -> UsageRecord:
+        """Record usage in the cost tracker and Langfuse."""
+        record = self.cost_tracker.record_usage(
+            model=model,
+            task_type=task_type,
+            tokens_input=prompt_tokens,
+            tokens_output=output_tokens,
+            latency_ms=latency_ms,
+            user_id=user_id,
+            agent_type=agent_type
+        )
+
+        # Log to Langfuse if enabled (zero overhead if disabled)
+        try:
+            from observability import log_ai_cost
+            log_ai_cost(
+                model=model,
+                agent_type=agent_type or "unknown",
+                task_type=task_type.value,
+                tokens_input=prompt_tokens,
+                tokens_output=output_tokens,
+                cost_usd=record.cost_usd,
+                latency_ms=latency_ms,
+                user_id=user_id
+            )
         except Exception:
-            # Fallback estimation
-            prompt_tokens = len(prompt.split()) * 2
+            pass  # Langfuse logging must never break generation
+
+        return record
+
+    async def _generate(
+        self,
+        prompt: str,
+        task_type: TaskType,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        model_override: Optional[str] = None,
+        user_id: Optional[str] = None,
+        agent_type: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Generate a response without request coalescing (fallbacks recurse here)."""
+        prompt_tokens = self._count_prompt_tokens(prompt, system_prompt)
 
         # Select model
         if model_override:
@@ -633,6 +795,18 @@ class AIRouter:
         if not config:
             raise ModelUnavailableException(f"Unknown model: {model}")
 
+        # Serve repeats of deterministic prompts from the response cache (SQLite, off the loop)
+        from ai_response_cache import cache_ttl_seconds, get_ai_response_cache, response_key
+        cache = get_ai_response_cache()
+        cache_ttl = cache_ttl_seconds(getattr(task_type, "value", task_type), temperature) if cache else None
+        if cache_ttl:
+            cache_key = response_key(model, system_prompt, prompt, temperature, max_tokens)
+            cached = await asyncio.to_thread(cache.get, cache_key)
+            if cached is not None:
+                self.cost_tracker.record_cache_hit(model, cached["cost_usd"])
+                return {**cached, "cost_usd": 0.0, "latency_ms": 0, "cached": True,
+                        "saved_usd": cached["cost_usd"]}
+
         # Generate response
         start_time = time.time()
         response_text = ""
@@ -678,75 +852,24 @@ class AIRouter:
 
         except Exception as e:
             logger.error(f"Generation failed with {model}: {e}")
-
-            # 3-tier fallback: Claude Opus → GPT-4o → Gemini
-            if self.fallback_enabled:
-                if config.provider == "anthropic" and model != "gpt-4o":
-                    logger.info("Anthropic failed, falling back to gpt-4o")
-                    return await self.generate(
-                        prompt=prompt, task_type=task_type,
-                        system_prompt=system_prompt, max_tokens=max_tokens,
-                        temperature=temperature, model_override="gpt-4o",
-                        user_id=user_id, agent_type=agent_type
-                    )
-                if model != "gemini-3-flash-preview":
-                    logger.info("Falling back to gemini-3-flash-preview")
-                    return await self.generate(
-                        prompt=prompt, task_type=task_type,
-                        system_prompt=system_prompt, max_tokens=max_tokens,
-                        temperature=temperature, model_override="gemini-3-flash-preview",
-                        user_id=user_id, agent_type=agent_type
-                    )
-                # Try Ollama as last resort if available
-                if os.getenv("OLLAMA_ENABLED", "false").lower() == "true":
-                    _ollama_default = os.getenv(
-                        "OLLAMA_DEFAULT_MODEL", "llama3.1:8b"
-                    )
-                    ollama_model = f"ollama-{_ollama_default}"
-                    if model != ollama_model and ollama_model in MODELS:
-                        logger.info(
-                            f"Falling back to local Ollama: {ollama_model}"
-                        )
-                        return await self.generate(
-                            prompt=prompt, task_type=task_type,
-                            system_prompt=system_prompt,
-                            max_tokens=max_tokens,
-                            temperature=temperature,
-                            model_override=ollama_model,
-                            user_id=user_id, agent_type=agent_type
-                        )
+            fallback = self._fallback_model(model, config)
+            if fallback:
+                logger.info(f"Falling back to {fallback}")
+                return await self._generate(
+                    prompt=prompt, task_type=task_type,
+                    system_prompt=system_prompt, max_tokens=max_tokens,
+                    temperature=temperature, model_override=fallback,
+                    user_id=user_id, agent_type=agent_type
+                )
             raise
 
         latency_ms = int((time.time() - start_time) * 1000)
 
-        # Record usage
-        record = self.cost_tracker.record_usage(
-            model=model,
-            task_type=task_type,
-            tokens_input=prompt_tokens,
-            tokens_output=output_tokens,
-            latency_ms=latency_ms,
-            user_id=user_id,
-            agent_type=agent_type
+        record = self._record(
+            model, task_type, prompt_tokens, output_tokens, latency_ms, user_id, agent_type
         )
 
-        # Log to Langfuse if enabled (zero overhead if disabled)
-        try:
-            from observability import log_ai_cost
-            log_ai_cost(
-                model=model,
-                agent_type=agent_type or "unknown",
-                task_type=task_type.value,
-                tokens_input=prompt_tokens,
-                tokens_output=output_tokens,
-                cost_usd=record.cost_usd,
-                latency_ms=latency_ms,
-                user_id=user_id
-            )
-        except Exception:
-            pass  # Langfuse logging must never break generation
-
-        return {
+        result = {
             "response": response_text,
             "model": model,
             "provider": config.provider,
@@ -755,6 +878,131 @@ class AIRouter:
             "cost_usd": record.cost_usd,
             "latency_ms": latency_ms
         }
+        if cache_ttl and response_text:
+            try:
+                await asyncio.to_thread(
+                    cache.put, cache_key, getattr(task_type, "value", task_type), result, cache_ttl
+                )
+            except Exception as e:
+                logger.warning(f"Failed to cache AI response: {e}")
+        return result
+
+    async def stream(
+        self,
+        prompt: str,
+        task_type: TaskType,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        model_override: Optional[str] = None,
+        user_id: Optional[str] = None,
+        agent_type: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a response as the model generates it.
+
+        Yields ``{"type": "token", "text": ...}`` events, then one
+        ``{"type": "done", ...}`` event with the same fields generate()
+        returns plus ``ttft_ms`` (time to first token).
+
+        Routing, budget checks, the fallback chain and cost accounting are
+        the same as generate(). A fallback only happens before the first
+        token, since text already sent can't be taken back; a failure after
+        that is raised. Usage is recorded once tokens have been produced,
+        also when the consumer stops reading early.
+        """
+        from metrics import track_ai_first_token
+
+        prompt_tokens = self._count_prompt_tokens(prompt, system_prompt)
+        if model_override:
+            model = model_override
+        else:
+            model = await self.route_request(
+                task_type=task_type,
+                prompt_tokens=prompt_tokens,
+                expected_output_tokens=max_tokens
+            )
+
+        while True:
+            config = MODELS.get(model)
+            if not config:
+                raise ModelUnavailableException(f"Unknown model: {model}")
+
+            usage: Dict[str, int] = {}
+            parts: List[str] = []
+            start_time = time.time()
+            ttft: Optional[float] = None
+            completed = False
+            record: Optional[UsageRecord] = None
+            try:
+                async for text in self._stream_provider(
+                    config, prompt, system_prompt, max_tokens, temperature, usage
+                ):
+                    if not text:
+                        continue
+                    if ttft is None:
+                        ttft = time.time() - start_time
+                        track_ai_first_token(config.provider, model, ttft)
+                    parts.append(text)
+                    yield {"type": "token", "text": text}
+                completed = True
+            except Exception as e:
+                logger.error(f"Streaming failed with {model}: {e}")
+                fallback = self._fallback_model(model, config) if ttft is None else None
+                if fallback:
+                    logger.info(f"Falling back to {fallback}")
+                    model = fallback
+                    continue
+                raise
+            finally:
+                if completed or ttft is not None:
+                    response_text = "".join(parts)
+                    output_tokens = usage.get("tokens_output") or len(response_text.split())
+                    latency_ms = int((time.time() - start_time) * 1000)
+                    record = self._record(
+                        model, task_type, prompt_tokens, output_tokens, latency_ms,
+                        user_id, agent_type
+                    )
+
+            yield {
+                "type": "done",
+                "response": response_text,
+                "model": model,
+                "provider": config.provider,
+                "tokens_input": prompt_tokens,
+                "tokens_output": output_tokens,
+                "cost_usd": record.cost_usd,
+                "latency_ms": latency_ms,
+                "ttft_ms": int(ttft * 1000) if ttft is not None else None
+            }
+            return
+
+    def _stream_provider(
+        self,
+        config: ModelConfig,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        usage: Dict[str, int]
+    ) -> AsyncIterator[str]:
+        """Text chunks from the model's provider; output token count goes to ``usage``."""
+        args = (config, prompt, system_prompt, max_tokens, temperature, usage)
+        if config.provider == "openai" or config.provider == "deepseek":
+            return self._stream_openai(*args)
+        if config.provider == "anthropic":
+            return self._stream_anthropic(*args)
+        if config.provider == "google":
+            return self._stream_google(*args)
+        if config.provider == "vertex_ai":
+            return self._stream_vertex_ai(*args)
+        if config.provider in ("ollama", "litellm"):
+            return self._get_client(config.provider).stream(
+                prompt=prompt, model=config.api_model_id,
+                system_prompt=system_prompt, max_tokens=max_tokens,
+                temperature=temperature, usage=usage
+            )
+        raise ModelUnavailableException(f"Unsupported provider: {config.provider}")
 
     async def generate_json(
         self,
@@ -775,12 +1023,17 @@ class AIRouter:
         else:
             enhanced_system = json_instruction
 
-        result = await self.generate(
-            prompt=prompt, task_type=task_type,
-            system_prompt=enhanced_system, max_tokens=max_tokens,
-            temperature=temperature, model_override=model_override,
-            user_id=user_id, agent_type=agent_type
-        )
+        # JSON is parsed here, never shown to a user as it streams
+        sink_token = _token_sink.set(None)
+        try:
+            result = await self.generate(
+                prompt=prompt, task_type=task_type,
+                system_prompt=enhanced_system, max_tokens=max_tokens,
+                temperature=temperature, model_override=model_override,
+                user_id=user_id, agent_type=agent_type
+            )
+        finally:
+            _token_sink.reset(sink_token)
 
         # Parse the response as JSON, stripping any markdown fencing
         raw = result["response"].strip()
@@ -917,6 +1170,128 @@ class AIRouter:
         tokens = len(response.content.split()) * 2  # Approximate
         return response.content, tokens
 
+    async def _stream_openai(
+        self,
+        config: ModelConfig,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        usage: Dict[str, int]
+    ) -> AsyncIterator[str]:
+        """Stream with OpenAI-compatible API."""
+        client = self._get_client(config.provider)
+
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        stream = await client.chat.completions.create(
+            model=config.api_model_id or config.name,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+
+        async for chunk in stream:
+            if chunk.usage:
+                usage["tokens_output"] = chunk.usage.completion_tokens
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def _stream_anthropic(
+        self,
+        config: ModelConfig,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        usage: Dict[str, int]
+    ) -> AsyncIterator[str]:
+        """Stream with Anthropic API."""
+        client = self._get_client(config.provider)
+
+        kwargs = {
+            "model": config.api_model_id or config.name,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "messages": [{"role": "user", "content": prompt}]
+        }
+
+        if system_prompt:
+            kwargs["system"] = system_prompt
+
+        async with client.messages.stream(**kwargs) as stream:
+            async for text in stream.text_stream:
+                yield text
+            final = await stream.get_final_message()
+            if final.usage:
+                usage["tokens_output"] = final.usage.output_tokens
+
+    async def _stream_google(
+        self,
+        config: ModelConfig,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        usage: Dict[str, int]
+    ) -> AsyncIterator[str]:
+        """Stream with Google Gemini API (native async client of google-genai)."""
+        from google.genai import types as genai_types
+
+        client = self._get_client(config.provider)
+        model_name = config.api_model_id or config.name
+
+        full_prompt = prompt
+        if system_prompt:
+            full_prompt = f"{system_prompt}\n\n{prompt}"
+
+        stream = await client.aio.models.generate_content_stream(
+            model=model_name,
+            contents=full_prompt,
+            config=genai_types.GenerateContentConfig(
+                max_output_tokens=max_tokens,
+                temperature=temperature,
+            ),
+        )
+
+        words = 0
+        async for chunk in stream:
+            text = chunk.text if hasattr(chunk, 'text') else None
+            if text:
+                words += len(text.split())
+                yield text
+        usage["tokens_output"] = words * 2  # Approximate, as in _generate_google
+
+    async def _stream_vertex_ai(
+        self,
+        config: ModelConfig,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        usage: Dict[str, int]
+    ) -> AsyncIterator[str]:
+        """Stream with Google Cloud Vertex AI provider."""
+        client = self._get_client(config.provider)
+        model_name = config.api_model_id or config.name
+
+        words = 0
+        async for text in client.stream(
+            prompt=prompt,
+            model=model_name,
+            system_instruction=system_prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+        ):
+            words += len(text.split())
+            yield text
+        usage["tokens_output"] = words * 2  # Approximate, as in _generate_vertex_ai
+
 
 # =============================================================================
 # SINGLETON INSTANCE
@@ -0,0 +1,34 @@
+"""Add full-text search index for global search
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-03-01
+
+Creates the index used by /api/search and /api/search/suggestions:
+- SQLite: FTS5 external-content tables (fts_competitors, fts_competitor_products,
+  fts_knowledge_base) with sync triggers
+- PostgreSQL: search_tsv generated tsvector columns with GIN indexes
+
+The DDL lives in search_index.py, which also applies it idempotently at startup.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create full-text search index objects."""
+    from search_index import create_search_index
+    create_search_index(op.get_bind())
+
+
+def downgrade() -> None:
+    """Drop full-text search index objects."""
+    from search_index import drop_search_index
+    drop_search_index(op.get_bind())
@@ -0,0 +1,29 @@
+"""Add per-stage progress to refresh_sessions
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-03-10
+
+The competitor refresh job runs as a scrape -> extract -> persist pipeline;
+stage_progress holds its JSON-encoded per-stage counts and timing.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add refresh_sessions.stage_progress."""
+    op.add_column('refresh_sessions', sa.Column('stage_progress', sa.Text, nullable=True))
+
+
+def downgrade() -> None:
+    """Drop refresh_sessions.stage_progress."""
+    op.drop_column('refresh_sessions', 'stage_progress')
@@ -0,0 +1,47 @@
+"""Add page_fingerprints for scrape change detection
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-03-12
+
+Stores a normalized-text hash plus ETag / Last-Modified per competitor page
+so refreshes can send conditional requests and skip re-extracting pages
+whose content has not changed.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create page_fingerprints."""
+    op.create_table(
+        'page_fingerprints',
+        sa.Column('id', sa.Integer, primary_key=True, index=True),
+        sa.Column('competitor_id', sa.Integer, sa.ForeignKey('competitors.id'), nullable=False, index=True),
+        sa.Column('url', sa.String, nullable=False),
+        sa.Column('page_type', sa.String, nullable=True),
+        sa.Column('content_hash', sa.String(64), nullable=False),
+        sa.Column('etag', sa.String, nullable=True),
+        sa.Column('last_modified', sa.String, nullable=True),
+        sa.Column('extraction_json', sa.Text, nullable=True),
+        sa.Column('last_checked_at', sa.DateTime),
+        sa.Column('last_changed_at', sa.DateTime),
+    )
+    op.create_index(
+        'ux_page_fingerprint_competitor_url', 'page_fingerprints',
+        ['competitor_id', 'url'], unique=True
+    )
+
+
+def downgrade() -> None:
+    """Drop page_fingerprints."""
+    op.drop_index('ux_page_fingerprint_competitor_url', table_name='page_fingerprints')
+    op.drop_table('page_fingerprints')
@@ -0,0 +1,35 @@
+"""Add data_versions change counters for conditional GET
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-03-20
+
+One row per tracked table, bumped after each commit that writes to it.
+Read-heavy list endpoints derive their ETags from these counters and can
+answer If-None-Match with 304 before querying.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create data_versions."""
+    op.create_table(
+        'data_versions',
+        sa.Column('table_name', sa.String, primary_key=True),
+        sa.Column('version', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime),
+    )
+
+
+def downgrade() -> None:
+    """Drop data_versions."""
+    op.drop_table('data_versions')
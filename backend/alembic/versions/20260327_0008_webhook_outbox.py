@@ -0,0 +1,47 @@
+"""Add webhook_outbox for durable webhook delivery
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-03-27
+
+Triggered webhook events are written here before delivery and deleted once
+the endpoint accepts them, so undelivered events survive a restart. A row
+being delivered is leased to one worker (claimed_by, lease_until).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create webhook_outbox."""
+    op.create_table(
+        'webhook_outbox',
+        sa.Column('id', sa.Integer, primary_key=True),
+        sa.Column('webhook_id', sa.String, nullable=False),
+        sa.Column('event_type', sa.String, nullable=False),
+        sa.Column('event', sa.Text, nullable=False),
+        sa.Column('status', sa.String, server_default='pending'),
+        sa.Column('attempts', sa.Integer, server_default='0'),
+        sa.Column('last_error', sa.String),
+        sa.Column('claimed_by', sa.String),
+        sa.Column('lease_until', sa.DateTime),
+        sa.Column('created_at', sa.DateTime),
+        sa.Column('updated_at', sa.DateTime),
+    )
+    op.create_index('ix_webhook_outbox_id', 'webhook_outbox', ['id'])
+    op.create_index('ix_webhook_outbox_status', 'webhook_outbox', ['status'])
+
+
+def downgrade() -> None:
+    """Drop webhook_outbox."""
+    op.drop_index('ix_webhook_outbox_status', table_name='webhook_outbox')
+    op.drop_index('ix_webhook_outbox_id', table_name='webhook_outbox')
+    op.drop_table('webhook_outbox')
@@ -0,0 +1,34 @@
+"""Add a unique normalized-URL key to news_article_cache
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-04-03
+
+news_ingest upserts articles with INSERT ... ON CONFLICT (url_hash). This
+adds url_hash, backfills it, archives existing duplicate articles (keeping
+the oldest) and creates the unique index ux_news_url_hash.
+
+The DDL lives in news_ingest.py, which also applies it idempotently at startup.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add, backfill and uniquely index news_article_cache.url_hash."""
+    from news_ingest import create_url_hash_index
+    create_url_hash_index(op.get_bind())
+
+
+def downgrade() -> None:
+    """Drop the unique index and news_article_cache.url_hash."""
+    from news_ingest import drop_url_hash_index
+    drop_url_hash_index(op.get_bind())
+    op.drop_column('news_article_cache', 'url_hash')
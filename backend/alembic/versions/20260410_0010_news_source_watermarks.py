@@ -0,0 +1,42 @@
+"""Add news_source_watermarks for the incremental daily news refresh
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-04-10
+
+Keeps the newest article date seen per (competitor, news source) so the
+daily refresh only requests newer articles, and when each pair was last
+checked so an interrupted refresh can resume.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create news_source_watermarks."""
+    op.create_table(
+        'news_source_watermarks',
+        sa.Column('id', sa.Integer, primary_key=True, index=True),
+        sa.Column('competitor_id', sa.Integer, sa.ForeignKey('competitors.id'), nullable=False, index=True),
+        sa.Column('source', sa.String, nullable=False),
+        sa.Column('last_published_at', sa.DateTime, nullable=True),
+        sa.Column('last_checked_at', sa.DateTime, nullable=False),
+    )
+    op.create_index(
+        'ux_news_watermark_competitor_source', 'news_source_watermarks',
+        ['competitor_id', 'source'], unique=True
+    )
+
+
+def downgrade() -> None:
+    """Drop news_source_watermarks."""
+    op.drop_index('ux_news_watermark_competitor_source', table_name='news_source_watermarks')
+    op.drop_table('news_source_watermarks')
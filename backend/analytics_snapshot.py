@@ -0,0 +1,309 @@
+"""
+Certify Intel - Analytics Dashboard Snapshot
+============================================
+
+Precomputed data for GET /api/analytics/dashboard.
+
+The dashboard is split into sections, each computed with aggregate SQL
+(COUNT/SUM/AVG with GROUP BY) instead of loading ORM objects:
+
+- competitors: status/threat breakdowns, freshness, data quality,
+  dimension-score averages and the market-positioning sample
+- news: sentiment counts over the last 30 days of cached articles
+- changes: data changes in the last 7 days
+
+Sections are stored in the shared cache (namespace "query"), so every
+worker serves the same snapshot. When a commit touches a section's model
+(Competitor, NewsArticleCache, DataChangeHistory), through the ORM or a
+Core insert/update/delete run on the session (news_ingest), only that
+section's tag is invalidated and recomputed on the next request.
+SNAPSHOT_MAX_AGE bounds staleness for writes made outside a Session and
+for the rolling time windows.
+
+Usage:
+    from analytics_snapshot import get_dashboard_snapshot
+    data = get_dashboard_snapshot(db)
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Set
+
+from sqlalchemy import case, event, func
+from sqlalchemy.orm import Session
+
+from cache import get_cache
+from database import Competitor, DataChangeHistory, NewsArticleCache
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_NAMESPACE = "query"
+SNAPSHOT_MAX_AGE = 300  # seconds
+
+THREAT_LEVELS = ("High", "Medium", "Low")
+SENTIMENTS = ("positive", "negative", "neutral")
+
+# Column -> dashboard label
+DIMENSION_FIELDS = {
+    "dim_product_packaging_score": "Product Packaging",
+    "dim_integration_depth_score": "Integration Depth",
+    "dim_support_service_score": "Support Service",
+    "dim_retention_stickiness_score": "Retention Stickiness",
+    "dim_user_adoption_score": "User Adoption",
+    "dim_implementation_ttv_score": "Implementation Ttv",
+    "dim_reliability_enterprise_score": "Reliability Enterprise",
+    "dim_pricing_flexibility_score": "Pricing Flexibility",
+    "dim_reporting_analytics_score": "Reporting Analytics",
+}
+
+MARKET_POSITIONING_LIMIT = 30
+
+
+# =============================================================================
+# SECTION QUERIES
+# =============================================================================
+
+def _not_deleted():
+    return Competitor.is_deleted == False  # noqa: E712
+
+
+def _parse_customer_count(value) -> int:
+    if not value:
+        return 0
+    try:
+        return int(''.join(filter(str.isdigit, str(value)[:10])))
+    except (ValueError, TypeError):
+        return 100
+
+
+def compute_competitor_section(db: Session) -> Dict[str, Any]:
+    """Competitor breakdowns, freshness, quality and dimension averages."""
+    now = datetime.utcnow()
+
+    status_counts: Dict[str, int] = {}
+    status_rows = db.query(Competitor.status, func.count(Competitor.id)).filter(
+        _not_deleted()
+    ).group_by(Competitor.status).all()
+    for status, count in status_rows:
+        key = status or "Unknown"
+        status_counts[key] = status_counts.get(key, 0) + count
+
+    threat_counts = {level: 0 for level in THREAT_LEVELS}
+    threat_rows = db.query(Competitor.threat_level, func.count(Competitor.id)).filter(
+        _not_deleted()
+    ).group_by(Competitor.threat_level).all()
+    for level, count in threat_rows:
+        key = level or "Low"
+        if key in threat_counts:
+            threat_counts[key] += count
+
+    # Age in whole days: <= 7 is fresh, > 30 is stale
+    fresh_cutoff = now - timedelta(days=8)
+    stale_cutoff = now - timedelta(days=31)
+    dim_columns = [getattr(Competitor, field) for field in DIMENSION_FIELDS]
+    totals = db.query(
+        func.count(Competitor.id),
+        func.coalesce(func.sum(Competitor.data_quality_score), 0),
+        func.sum(case((Competitor.last_updated > fresh_cutoff, 1), else_=0)),
+        func.sum(case((Competitor.last_updated <= stale_cutoff, 1), else_=0)),
+        *[func.avg(col) for col in dim_columns],
+    ).filter(_not_deleted()).one()
+    total, quality_sum, fresh_count, stale_count = totals[:4]
+
+    dimension_averages = {
+        label: float(avg)
+        for label, avg in zip(DIMENSION_FIELDS.values(), totals[4:])
+        if avg is not None
+    }
+
+    market_rows = db.query(
+        Competitor.name, Competitor.data_quality_score, Competitor.customer_count,
+        Competitor.threat_level, Competitor.website
+    ).filter(_not_deleted()).order_by(Competitor.id).limit(MARKET_POSITIONING_LIMIT).all()
+    market_data = [
+        {
+            "name": name,
+            "x": quality or 50,  # Data quality as proxy for market presence
+            "y": _parse_customer_count(customers),
+            "threat": threat or "Low",
+            "size": {"High": 30, "Medium": 20, "Low": 10}.get(threat, 15),
+            "website": website,
+        }
+        for name, quality, customers, threat, website in market_rows
+    ]
+
+    return {
+        "total": total or 0,
+        "status_counts": status_counts,
+        "threat_counts": threat_counts,
+        "avg_quality": (quality_sum or 0) / total if total else 0,
+        "fresh_count": int(fresh_count or 0),
+        "stale_count": int(stale_count or 0),
+        "dimension_averages": dimension_averages,
+        "market_positioning": market_data,
+    }
+
+
+def compute_news_section(db: Session) -> Dict[str, Any]:
+    """Sentiment counts for non-archived articles from the last 30 days."""
+    cutoff = datetime.utcnow() - timedelta(days=30)
+    counts = {s: 0 for s in SENTIMENTS}
+    total = 0
+    rows = db.query(NewsArticleCache.sentiment, func.count(NewsArticleCache.id)).filter(
+        NewsArticleCache.published_at >= cutoff,
+        NewsArticleCache.is_archived != True  # noqa: E712
+    ).group_by(NewsArticleCache.sentiment).all()
+    for sentiment, count in rows:
+        total += count
+        key = sentiment or "neutral"
+        if key in counts:
+            counts[key] += count
+    return {"counts": counts, "total": total}
+
+
+def compute_changes_section(db: Session) -> Dict[str, Any]:
+    """Number of recorded data changes in the last 7 days."""
+    cutoff = datetime.utcnow() - timedelta(days=7)
+    count = db.query(func.count(DataChangeHistory.id)).filter(
+        DataChangeHistory.changed_at >= cutoff
+    ).scalar()
+    return {"recent_changes": count or 0}
+
+
+SECTIONS: Dict[str, Callable[[Session], Dict[str, Any]]] = {
+    "competitors": compute_competitor_section,
+    "news": compute_news_section,
+    "changes": compute_changes_section,
+}
+
+# Models whose committed changes invalidate a section
+SECTION_MODELS = {
+    Competitor: "competitors",
+    NewsArticleCache: "news",
+    DataChangeHistory: "changes",
+}
+SECTION_TABLES = {model.__table__: name for model, name in SECTION_MODELS.items()}
+
+
+def _section_key(name: str) -> str:
+    return f"analytics:dashboard:{name}"
+
+
+def _section_tag(name: str) -> str:
+    return f"analytics:{name}"
+
+
+# =============================================================================
+# SNAPSHOT
+# =============================================================================
+
+def get_section(db: Session, name: str) -> Dict[str, Any]:
+    """Return a cached section, computing it (once across threads) on a miss."""
+    cache = get_cache()
+    key = _section_key(name)
+    entry = cache.get(key, namespace=SNAPSHOT_NAMESPACE)
+    if entry is not None:
+        return entry
+
+    from performance import get_sync_single_flight
+
+    def _compute():
+        data = SECTIONS[name](db)
+        entry = {"data": data, "computed_at": datetime.utcnow().isoformat()}
+        cache.set(key, entry, ttl=SNAPSHOT_MAX_AGE, namespace=SNAPSHOT_NAMESPACE,
+                  tags=[_section_tag(name)])
+        return entry
+
+    return get_sync_single_flight().do(key, _compute)
+
+
+def get_dashboard_snapshot(db: Session) -> Dict[str, Any]:
+    """Assemble the /api/analytics/dashboard response from the cached sections."""
+    entries = {name: get_section(db, name) for name in SECTIONS}
+    comp = entries["competitors"]["data"]
+    news = entries["news"]["data"]
+    changes = entries["changes"]["data"]
+    status_counts = comp["status_counts"]
+
+    return {
+        "summary": {
+            "total_competitors": comp["total"],
+            "active_count": status_counts.get("Active", 0),
+            "discovered_count": status_counts.get("Discovered", 0),
+            "avg_data_quality": round(comp["avg_quality"], 1),
+            "fresh_data_count": comp["fresh_count"],
+            "stale_data_count": comp["stale_count"],
+            "recent_changes": changes["recent_changes"]
+        },
+        "threat_distribution": comp["threat_counts"],
+        "status_distribution": status_counts,
+        "news_sentiment": {
+            "counts": news["counts"],
+            "total": news["total"]
+        },
+        "dimension_averages": comp["dimension_averages"],
+        "market_positioning": comp["market_positioning"],
+        "generated_at": max(e["computed_at"] for e in entries.values())
+    }
+
+
+def invalidate_sections(*names: str) -> None:
+    """Drop sections so the next request recomputes them (on every worker)."""
+    cache = get_cache()
+    for name in names:
+        cache.invalidate_tag(_section_tag(name))
+
+
+# =============================================================================
+# CHANGE TRACKING
+# =============================================================================
+
+_SESSION_KEY = "analytics_dirty_sections"
+
+
+def _on_after_flush(session: Session, flush_context) -> None:
+    dirty: Set[str] = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        name = SECTION_MODELS.get(type(obj))
+        if name:
+            dirty.add(name)
+    if dirty:
+        session.info.setdefault(_SESSION_KEY, set()).update(dirty)
+
+
+def _on_do_orm_execute(orm_execute_state) -> None:
+    """Track Core DML statements run through Session.execute (bulk upserts)."""
+    state = orm_execute_state
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return
+    name = SECTION_TABLES.get(getattr(state.statement, "table", None))
+    if name:
+        state.session.info.setdefault(_SESSION_KEY, set()).add(name)
+
+
+def _on_after_commit(session: Session) -> None:
+    dirty = session.info.pop(_SESSION_KEY, None)
+    if dirty:
+        try:
+            invalidate_sections(*dirty)
+        except Exception as e:
+            logger.warning(f"Could not invalidate analytics snapshot: {e}")
+
+
+def _on_after_rollback(session: Session) -> None:
+    session.info.pop(_SESSION_KEY, None)
+
+
+_listeners_installed = False
+
+
+def install_change_listeners() -> None:
+    """Invalidate affected sections whenever a session commits model changes (idempotent)."""
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    event.listen(Session, "after_flush", _on_after_flush)
+    event.listen(Session, "do_orm_execute", _on_do_orm_execute)
+    event.listen(Session, "after_commit", _on_after_commit)
+    event.listen(Session, "after_rollback", _on_after_rollback)
+    _listeners_installed = True
@@ -1,68 +1,517 @@
-
 """
 Backup Manager Module
-Handles automated database backups and retention policies.
+Online, incremental, compressed database backups and verified restores.
+
+A backup is a manifest (``certify_intel_backup_<timestamp>.manifest``)
+listing content-addressed chunks stored under ``backups/chunks/``. Chunks
+are compressed with zstd (zlib when the ``zstandard`` package is missing)
+and named by the SHA-256 of their uncompressed bytes, so chunks that did
+not change since an earlier backup are stored only once.
+
+- SQLite: the live database is copied with SQLite's online backup API, a
+  few hundred pages per step, so writers are never blocked for the whole
+  copy and the snapshot is transactionally consistent (WAL included).
+  The snapshot is checked with ``PRAGMA quick_check`` before it is stored.
+- PostgreSQL: ``pg_dump`` (custom format, uncompressed) is streamed
+  straight into the chunk store.
+
+Restores stream the chunks back, verifying every chunk hash and the
+whole-database hash. SQLite restores are written into the live database
+with the backup API; PostgreSQL restores are piped into ``pg_restore``
+in a single transaction, so a corrupt backup changes nothing.
 """
 import os
-import shutil
-import glob
+import json
+import zlib
+import sqlite3
+import hashlib
+import logging
+import tempfile
+import threading
+import subprocess
 from datetime import datetime
 from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy.engine import make_url
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
 
 # Configuration
-BACKUP_DIR = "backups"
-DB_FILE = "certify_intel.db"
-MAX_BACKUPS = 7  # Keep last 7 days
+BACKUP_DIR = Path(os.getenv("BACKUP_DIR", "backups"))
+BACKUP_RETENTION_DAYS = int(os.getenv("BACKUP_RETENTION_DAYS", "7"))
+CHUNK_SIZE = int(os.getenv("BACKUP_CHUNK_SIZE", str(1024 * 1024)))
+STEP_PAGES = int(os.getenv("BACKUP_STEP_PAGES", "256"))
+ZSTD_LEVEL = 10
+
+BACKUP_PREFIX = "certify_intel_backup_"
+MANIFEST_SUFFIX = ".manifest"
+MANIFEST_VERSION = 1
+
+# One backup or restore at a time (they share the chunk store)
+_lock = threading.Lock()
+
+
+class BackupError(Exception):
+    """A backup could not be written, or a stored backup failed verification."""
+
+
+# =============================================================================
+# CHUNK STORE
+# =============================================================================
+
+def _compress(data: bytes) -> Tuple[bytes, str]:
+    if ZSTD_AVAILABLE:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data), ".zst"
+    return zlib.compress(data, 6), ".zz"
+
+
+def _decompress(data: bytes, suffix: str) -> bytes:
+    if suffix == ".zst":
+        if not ZSTD_AVAILABLE:
+            raise BackupError("This backup is zstd-compressed; install the zstandard package")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+class ChunkStore:
+    """Compressed chunks named by the SHA-256 of their content."""
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def _find(self, digest: str) -> Optional[Path]:
+        folder = self.root / digest[:2]
+        for suffix in (".zst", ".zz"):
+            path = folder / f"{digest}{suffix}"
+            if path.exists():
+                return path
+        return None
+
+    def put(self, data: bytes) -> Tuple[str, int]:
+        """Store a chunk; returns its digest and the bytes written (0 if already stored)."""
+        digest = hashlib.sha256(data).hexdigest()
+        if self._find(digest) is not None:
+            return digest, 0
+        compressed, suffix = _compress(data)
+        folder = self.root / digest[:2]
+        folder.mkdir(parents=True, exist_ok=True)
+        tmp = folder / f".{digest}.tmp"
+        tmp.write_bytes(compressed)
+        os.replace(tmp, folder / f"{digest}{suffix}")
+        return digest, len(compressed)
+
+    def get(self, digest: str) -> bytes:
+        """Read a chunk back, verifying its hash."""
+        path = self._find(digest)
+        if path is None:
+            raise BackupError(f"Missing backup chunk {digest[:12]}")
+        data = _decompress(path.read_bytes(), path.suffix)
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise BackupError(f"Backup chunk {digest[:12]} is corrupt")
+        return data
+
+    def sweep(self, keep: Set[str]) -> int:
+        """Delete chunks no manifest refers to; returns how many were removed."""
+        removed = 0
+        if not self.root.exists():
+            return 0
+        for path in self.root.glob("*/*"):
+            if path.name.split(".")[0] not in keep:
+                path.unlink()
+                removed += 1
+        return removed
+
+
+def _chunk_store() -> ChunkStore:
+    return ChunkStore(BACKUP_DIR / "chunks")
+
+
+def _store_stream(stream: BinaryIO, store: ChunkStore) -> Dict[str, Any]:
+    """Split a stream into fixed-size chunks and store them."""
+    whole = hashlib.sha256()
+    chunks: List[List[Any]] = []
+    size = stored = new_chunks = 0
+    while True:
+        data = stream.read(CHUNK_SIZE)
+        if not data:
+            break
+        whole.update(data)
+        digest, written = store.put(data)
+        chunks.append([digest, len(data)])
+        size += len(data)
+        stored += written
+        new_chunks += 1 if written else 0
+    return {
+        "chunks": chunks, "size": size, "sha256": whole.hexdigest(),
+        "stored_bytes": stored, "new_chunks": new_chunks,
+    }
+
+
+# =============================================================================
+# DATABASE SOURCES
+# =============================================================================
+
+def database_url() -> str:
+    from database import DATABASE_URL
+    return DATABASE_URL
+
+
+def _sqlite_path(url: str) -> Optional[Path]:
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite":
+        return None
+    return Path(parsed.database or "certify_intel.db")
+
+
+def _pg_command(url: str) -> Tuple[str, Dict[str, str]]:
+    """libpq connection string without the password, plus an env carrying it."""
+    parsed = make_url(url).set(drivername="postgresql")
+    env = dict(os.environ)
+    if parsed.password:
+        env["PGPASSWORD"] = str(parsed.password)
+    return parsed.set(password=None).render_as_string(hide_password=False), env
+
+
+def _sqlite_copy(src_path: Path, dest_path: Path) -> None:
+    """Online copy with the backup API in STEP_PAGES-page steps."""
+    src = sqlite3.connect(str(src_path))
+    dst = sqlite3.connect(str(dest_path))
+    try:
+        src.backup(dst, pages=STEP_PAGES, sleep=0.005)
+    finally:
+        dst.close()
+        src.close()
+
+
+def _sqlite_check(path: Path) -> None:
+    conn = sqlite3.connect(str(path))
+    try:
+        result = conn.execute("PRAGMA quick_check").fetchone()[0]
+    finally:
+        conn.close()
+    if result != "ok":
+        raise BackupError(f"Integrity check failed: {result}")
+
+
+def _snapshot_sqlite(db_path: Path, store: ChunkStore) -> Dict[str, Any]:
+    fd, tmp = tempfile.mkstemp(prefix=".snapshot_", suffix=".db", dir=str(BACKUP_DIR))
+    os.close(fd)
+    try:
+        _sqlite_copy(db_path, Path(tmp))
+        _sqlite_check(Path(tmp))
+        with open(tmp, "rb") as f:
+            return _store_stream(f, store)
+    finally:
+        os.remove(tmp)
+
+
+def _snapshot_postgres(url: str, store: ChunkStore) -> Dict[str, Any]:
+    dsn, env = _pg_command(url)
+    with tempfile.TemporaryFile() as stderr:
+        proc = subprocess.Popen(
+            ["pg_dump", "--format=custom", "--compress=0", "--no-owner", f"--dbname={dsn}"],
+            stdout=subprocess.PIPE, stderr=stderr, env=env,
+        )
+        try:
+            stored = _store_stream(proc.stdout, store)
+        finally:
+            proc.stdout.close()
+            returncode = proc.wait()
+        if returncode != 0:
+            stderr.seek(0)
+            raise BackupError(f"pg_dump failed: {stderr.read().decode(errors='replace')[:500]}")
+    return stored
+
+
+# =============================================================================
+# BACKUPS
+# =============================================================================
 
 def ensure_backup_dir():
     """Ensure backup directory exists."""
-    if not os.path.exists(BACKUP_DIR):
-        os.makedirs(BACKUP_DIR)
-        print(f"Created backup directory: {BACKUP_DIR}")
+    BACKUP_DIR.mkdir(parents=True, exist_ok=True)
+
+
+def _manifests() -> List[Path]:
+    return sorted(BACKUP_DIR.glob(f"{BACKUP_PREFIX}*{MANIFEST_SUFFIX}"), reverse=True)
+
+
+def _read_manifest(path: Path) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _create_backup() -> Dict[str, Any]:
+    ensure_backup_dir()
+    url = database_url()
+    db_path = _sqlite_path(url)
+    store = _chunk_store()
+    started = datetime.now()
+    timestamp = started.strftime("%Y%m%d_%H%M%S")
+
+    if db_path is not None:
+        if not db_path.exists():
+            raise FileNotFoundError("Database file not found")
+        source = "sqlite"
+        stored = _snapshot_sqlite(db_path, store)
+    else:
+        source = make_url(url).get_backend_name()
+        if source != "postgresql":
+            raise BackupError(f"Backups are not supported for {source}")
+        stored = _snapshot_postgres(url, store)
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "source": source,
+        "created_at": started.isoformat(),
+        "chunk_size": CHUNK_SIZE,
+        "compression": "zstd" if ZSTD_AVAILABLE else "zlib",
+        **stored,
+    }
+    name = f"{BACKUP_PREFIX}{timestamp}{MANIFEST_SUFFIX}"
+    n = 1
+    while (BACKUP_DIR / name).exists():
+        # Several backups within one second (e.g. the one taken before a restore)
+        name = f"{BACKUP_PREFIX}{timestamp}_{n}{MANIFEST_SUFFIX}"
+        n += 1
+    tmp = BACKUP_DIR / f".{name}.tmp"
+    tmp.write_text(json.dumps(manifest), encoding="utf-8")
+    os.replace(tmp, BACKUP_DIR / name)
 
-def create_backup():
-    """Create a backup of the current database."""
+    prune_old_backups()
+
+    duration = (datetime.now() - started).total_seconds()
+    logger.info(
+        f"[Backup] {name}: {stored['size'] / 1048576:.1f} MB in {len(stored['chunks'])} chunks, "
+        f"{stored['new_chunks']} new ({stored['stored_bytes'] / 1048576:.2f} MB written) in {duration:.1f}s"
+    )
+    return {
+        "success": True,
+        "backup_file": name,
+        "backup_path": str(BACKUP_DIR / name),
+        "size_bytes": stored["size"],
+        "size_mb": round(stored["size"] / (1024 * 1024), 2),
+        "stored_bytes": stored["stored_bytes"],
+        "chunks": len(stored["chunks"]),
+        "new_chunks": stored["new_chunks"],
+        "duration_seconds": round(duration, 2),
+        "timestamp": timestamp,
+    }
+
+
+def create_backup() -> Dict[str, Any]:
+    """Create an incremental backup of the current database."""
     try:
-        ensure_backup_dir()
-        
-        if not os.path.exists(DB_FILE):
-            print(f"Warning: Database file {DB_FILE} not found. Skipping backup.")
-            return False
-
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_filename = f"{BACKUP_DIR}/certify_intel_backup_{timestamp}.db"
-        
-        # Copy the file
-        shutil.copy2(DB_FILE, backup_filename)
-        print(f"Database backup created: {backup_filename}")
-        
-        # Prune old backups
-        prune_old_backups()
-        
-        return True
+        with _lock:
+            return _create_backup()
+    except FileNotFoundError as e:
+        return {"success": False, "error": str(e)}
     except Exception as e:
-        print(f"Error creating backup: {e}")
-        return False
+        logger.error(f"[Backup] Backup failed: {e}")
+        return {"success": False, "error": "An unexpected error occurred"}
+
 
 def prune_old_backups():
-    """Remove backups older than MAX_BACKUPS."""
+    """Remove backups older than BACKUP_RETENTION_DAYS (never the newest) and unreferenced chunks."""
     try:
-        # Get list of backup files
-        backups = glob.glob(f"{BACKUP_DIR}/certify_intel_backup_*.db")
-        
-        # Sort by creation time (newest first)
-        backups.sort(key=os.path.getctime, reverse=True)
-        
-        # Identify files to remove
-        to_remove = backups[MAX_BACKUPS:]
-        
-        for file_path in to_remove:
-            os.remove(file_path)
-            print(f"Removed old backup: {file_path}")
-            
+        cutoff = datetime.now().timestamp() - (BACKUP_RETENTION_DAYS * 86400)
+        manifests = _manifests()
+        for path in manifests[1:]:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                logger.info(f"[Backup] Removed old backup: {path.name}")
+        for path in BACKUP_DIR.glob(f"{BACKUP_PREFIX}*.db"):
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                logger.info(f"[Backup] Removed old backup: {path.name}")
+
+        keep: Set[str] = set()
+        for path in _manifests():
+            keep.update(digest for digest, _ in _read_manifest(path)["chunks"])
+        removed = _chunk_store().sweep(keep)
+        if removed:
+            logger.info(f"[Backup] Removed {removed} unreferenced chunks")
     except Exception as e:
-        print(f"Error pruning backups: {e}")
+        logger.error(f"[Backup] Error pruning backups: {e}")
+
+
+def list_backups() -> List[Dict[str, Any]]:
+    """List all available backups, newest first."""
+    if not BACKUP_DIR.exists():
+        return []
+
+    backups = []
+    for path in _manifests():
+        try:
+            manifest = _read_manifest(path)
+        except (OSError, ValueError):
+            continue
+        backups.append({
+            "filename": path.name,
+            "path": str(path),
+            "format": "chunked",
+            "source": manifest["source"],
+            "size_bytes": manifest["size"],
+            "size_mb": round(manifest["size"] / (1024 * 1024), 2),
+            "stored_bytes": manifest.get("stored_bytes"),
+            "created_at": manifest["created_at"],
+        })
+    # Plain copies made before chunked backups
+    for path in sorted(BACKUP_DIR.glob(f"{BACKUP_PREFIX}*.db"), reverse=True):
+        stat = path.stat()
+        backups.append({
+            "filename": path.name,
+            "path": str(path),
+            "format": "file",
+            "source": "sqlite",
+            "size_bytes": stat.st_size,
+            "size_mb": round(stat.st_size / (1024 * 1024), 2),
+            "created_at": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+        })
+    backups.sort(key=lambda b: b["created_at"], reverse=True)
+    return backups
+
+
+def resolve_backup(filename: str) -> Path:
+    """
+    Path of a backup in BACKUP_DIR.
+
+    Raises ValueError for names outside the backup directory and
+    FileNotFoundError for unknown backups.
+    """
+    root = BACKUP_DIR.resolve()
+    path = (BACKUP_DIR / filename).resolve()
+    if path.parent != root:
+        raise ValueError("Invalid filename")
+    if not path.is_file() or not path.name.startswith(BACKUP_PREFIX):
+        raise FileNotFoundError("Backup not found")
+    return path
+
+
+def backup_source(path: Path) -> str:
+    """'sqlite' or 'postgresql'."""
+    if path.name.endswith(MANIFEST_SUFFIX):
+        return _read_manifest(path)["source"]
+    return "sqlite"
+
+
+def iter_backup(path: Path) -> Iterator[bytes]:
+    """
+    Stream a backup's database bytes, verifying as it goes.
+
+    Raises BackupError (possibly after some chunks were yielded) when a
+    chunk or the whole-database hash does not match the manifest.
+    """
+    if not path.name.endswith(MANIFEST_SUFFIX):
+        with open(path, "rb") as f:
+            while True:
+                data = f.read(CHUNK_SIZE)
+                if not data:
+                    return
+                yield data
+
+    manifest = _read_manifest(path)
+    store = _chunk_store()
+    whole = hashlib.sha256()
+    size = 0
+    for digest, length in manifest["chunks"]:
+        data = store.get(digest)
+        if len(data) != length:
+            raise BackupError(f"Backup chunk {digest[:12]} has the wrong length")
+        whole.update(data)
+        size += len(data)
+        yield data
+    if size != manifest["size"] or whole.hexdigest() != manifest["sha256"]:
+        raise BackupError("Backup does not match its manifest")
+
+
+def verify_backup(filename: str) -> Dict[str, Any]:
+    """Read a whole backup back and check every hash."""
+    path = resolve_backup(filename)
+    size = sum(len(data) for data in iter_backup(path))
+    return {"filename": path.name, "verified": True, "size_bytes": size}
+
+
+# =============================================================================
+# RESTORE
+# =============================================================================
+
+def _restore_sqlite(path: Path, db_path: Path) -> None:
+    fd, tmp = tempfile.mkstemp(prefix=".restore_", suffix=".db", dir=str(db_path.parent.resolve()))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for data in iter_backup(path):
+                f.write(data)
+        _sqlite_check(Path(tmp))
+        # Write through SQLite (locks and WAL respected) instead of replacing the file
+        _sqlite_copy(Path(tmp), db_path)
+    finally:
+        os.remove(tmp)
+
+
+def _restore_postgres(path: Path, url: str) -> None:
+    dsn, env = _pg_command(url)
+    with tempfile.TemporaryFile() as stderr:
+        proc = subprocess.Popen(
+            ["pg_restore", "--clean", "--if-exists", "--no-owner", "--single-transaction",
+             "--exit-on-error", f"--dbname={dsn}"],
+            stdin=subprocess.PIPE, stderr=stderr, env=env,
+        )
+        try:
+            for data in iter_backup(path):
+                proc.stdin.write(data)
+            proc.stdin.close()
+        except BaseException:
+            # Abort the single transaction: nothing is restored
+            proc.kill()
+            proc.wait()
+            raise
+        if proc.wait() != 0:
+            stderr.seek(0)
+            raise BackupError(f"pg_restore failed: {stderr.read().decode(errors='replace')[:500]}")
+
+
+def restore_backup(filename: str) -> Dict[str, Any]:
+    """
+    Restore the database from a backup after taking a fresh backup of the current state.
+
+    Raises ValueError / FileNotFoundError for bad names and BackupError when
+    the backup fails verification (the database is left unchanged).
+    """
+    path = resolve_backup(filename)
+    url = database_url()
+    db_path = _sqlite_path(url)
+    target = "sqlite" if db_path is not None else make_url(url).get_backend_name()
+    if backup_source(path) != target:
+        raise BackupError(f"Backup is from {backup_source(path)}, the database is {target}")
+
+    with _lock:
+        pre_restore = _create_backup()
+        if db_path is not None:
+            _restore_sqlite(path, db_path)
+        else:
+            _restore_postgres(path, url)
+
+    # Drop pooled connections that may have cached the old schema
+    from database import engine
+    engine.dispose()
+
+    logger.info(f"[Backup] Restored database from {path.name}")
+    return {
+        "success": True,
+        "restored_from": path.name,
+        "pre_restore_backup": pre_restore.get("backup_file"),
+        "message": "Database restored.",
+    }
+
 
 if __name__ == "__main__":
     # Manual test
-    create_backup()
+    print(create_backup())
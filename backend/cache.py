@@ -1,149 +1,644 @@
 """
 Certify Intel - Cache Layer
 
-Provides a unified caching interface with two backends:
-- InMemoryCache: Process-local dict with TTL (default, zero dependencies)
-- RedisCache: Redis-backed cache for multi-process/distributed deployments
+Provides a unified, tiered caching interface:
+- InMemoryCache: Process-local LRU cache with TTL (L1, zero dependencies)
+- RedisCache: Redis-backed cache shared by all uvicorn workers (L2)
+- TieredCache: L1 in front of L2, with cross-worker invalidation over
+  Redis pub/sub so that tag/key invalidation reaches every process
+
+Entries live in namespaces ("api", "query", "agent", ...). Each namespace
+has its own byte budget and entry limit; eviction is O(1) least-recently-used
+and expired entries are dropped lazily on access or when they reach the LRU end.
 
 Usage:
     from cache import get_cache
     cache = get_cache()
     cache.set("key", {"data": "value"}, ttl=300)
     result = cache.get("key")
+
+    cache.set("comp:1", payload, ttl=300, namespace="api", tags=["competitors"])
+    cache.invalidate_tag("competitors")
 """
 import json
 import time
 import os
+import sys
+import uuid
 import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_NAMESPACE = "default"
+
+# Per-namespace limits: max_bytes is the memory budget for the L1 tier,
+# max_entries caps the entry count regardless of size.
+_NAMESPACE_CONFIG: Dict[str, Dict[str, int]] = {
+    DEFAULT_NAMESPACE: {"max_bytes": 16 * 1024 * 1024, "max_entries": 1000},
+    "api": {"max_bytes": 32 * 1024 * 1024, "max_entries": 500},
+    "query": {"max_bytes": 16 * 1024 * 1024, "max_entries": 200},
+    "agent": {"max_bytes": 8 * 1024 * 1024, "max_entries": 100},
+    "news": {"max_bytes": 4 * 1024 * 1024, "max_entries": 20000},
+}
+
+
+def _estimate_size(value) -> int:
+    """Approximate the memory footprint of a cached value in bytes."""
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8", errors="ignore"))
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return sys.getsizeof(value)
+
+
+class _Namespace:
+    """LRU-ordered entries and counters for one cache namespace."""
+
+    __slots__ = (
+        "name", "entries", "max_bytes", "max_entries", "bytes",
+        "hits", "misses", "evictions", "expirations",
+    )
+
+    def __init__(self, name: str, max_bytes: int, max_entries: int):
+        self.name = name
+        # key -> (value, expiry_timestamp or None, size_bytes, tags)
+        self.entries: "OrderedDict[str, Tuple[Any, Optional[float], int, Tuple[str, ...]]]" = OrderedDict()
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate_pct": round(self.hits / total * 100, 2) if total else 0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
 
 class InMemoryCache:
-    """Fallback cache when Redis is not available."""
+    """Process-local LRU cache with TTL, per-namespace byte budgets and tags."""
+
+    def __init__(self, max_entries: int = 1000, max_bytes: Optional[int] = None):
+        self._namespaces: Dict[str, _Namespace] = {}
+        self._tag_index: Dict[str, Set[Tuple[str, str]]] = {}  # tag -> {(ns, key)}
+        self._lock = threading.RLock()
+        # Overrides for the default namespace (kept for backward compatibility)
+        self._default_limits = {"max_entries": max_entries}
+        if max_bytes is not None:
+            self._default_limits["max_bytes"] = max_bytes
+
+    # -- namespace management -------------------------------------------------
+
+    def _ns(self, namespace: str) -> _Namespace:
+        ns = self._namespaces.get(namespace)
+        if ns is None:
+            config = dict(_NAMESPACE_CONFIG.get(namespace, _NAMESPACE_CONFIG[DEFAULT_NAMESPACE]))
+            if namespace == DEFAULT_NAMESPACE:
+                config.update(self._default_limits)
+            ns = _Namespace(namespace, config["max_bytes"], config["max_entries"])
+            self._namespaces[namespace] = ns
+        return ns
 
-    def __init__(self, max_entries: int = 1000):
-        self._cache = {}  # key -> (value, expiry_timestamp)
-        self._max_entries = max_entries
+    def configure_namespace(self, namespace: str, max_bytes: int = None, max_entries: int = None):
+        """Change the limits of a namespace, evicting immediately if now over budget."""
+        with self._lock:
+            ns = self._ns(namespace)
+            if max_bytes is not None:
+                ns.max_bytes = max_bytes
+            if max_entries is not None:
+                ns.max_entries = max_entries
+            self._enforce_budget(ns)
 
-    def get(self, key: str):
+    # -- core operations --------------------------------------------------------
+
+    def get(self, key: str, namespace: str = DEFAULT_NAMESPACE):
         """Get a value by key. Returns None if not found or expired."""
-        if key in self._cache:
-            value, expiry = self._cache[key]
+        with self._lock:
+            ns = self._ns(namespace)
+            entry = ns.entries.get(key)
+            if entry is None:
+                ns.misses += 1
+                return None
+            value, expiry, _, _ = entry
             if expiry and time.time() > expiry:
-                del self._cache[key]
+                self._remove(ns, key)
+                ns.expirations += 1
+                ns.misses += 1
                 return None
+            ns.entries.move_to_end(key)
+            ns.hits += 1
             return value
-        return None
 
-    def set(self, key: str, value, ttl: int = 300):
-        """Set a key-value pair with optional TTL in seconds."""
-        if len(self._cache) >= self._max_entries:
-            self._cleanup()
+    def set(self, key: str, value, ttl: int = 300, namespace: str = DEFAULT_NAMESPACE,
+            tags: Optional[List[str]] = None):
+        """Set a key-value pair with optional TTL in seconds and invalidation tags."""
+        size = _estimate_size(value)
         expiry = time.time() + ttl if ttl else None
-        self._cache[key] = (value, expiry)
+        tag_tuple = tuple(tags) if tags else ()
+        with self._lock:
+            ns = self._ns(namespace)
+            if key in ns.entries:
+                self._remove(ns, key)
+            if size > ns.max_bytes:
+                # Larger than the whole namespace budget: never cacheable
+                return
+            ns.entries[key] = (value, expiry, size, tag_tuple)
+            ns.bytes += size
+            for tag in tag_tuple:
+                self._tag_index.setdefault(tag, set()).add((namespace, key))
+            self._enforce_budget(ns)
 
-    def delete(self, key: str):
+    def delete(self, key: str, namespace: str = DEFAULT_NAMESPACE):
         """Delete a key."""
-        self._cache.pop(key, None)
+        with self._lock:
+            self._remove(self._ns(namespace), key)
 
-    def clear(self):
-        """Clear all cached entries."""
-        self._cache.clear()
+    def clear(self, namespace: Optional[str] = None):
+        """Clear all cached entries, or only those of one namespace."""
+        with self._lock:
+            targets = [namespace] if namespace else list(self._namespaces)
+            for name in targets:
+                ns = self._namespaces.get(name)
+                if ns is None:
+                    continue
+                for key in list(ns.entries):
+                    self._remove(ns, key)
 
-    def keys(self, pattern: str = None) -> list:
+    def keys(self, pattern: str = None, namespace: str = DEFAULT_NAMESPACE) -> list:
         """List keys, optionally filtered by prefix pattern."""
-        self._cleanup()
-        if pattern and pattern.endswith("*"):
-            prefix = pattern[:-1]
-            return [k for k in self._cache if k.startswith(prefix)]
-        return list(self._cache.keys())
-
-    def _cleanup(self):
-        """Remove expired entries and evict oldest if over capacity."""
+        self.purge_expired(namespace)
+        with self._lock:
+            ns = self._ns(namespace)
+            if pattern and pattern.endswith("*"):
+                prefix = pattern[:-1]
+                return [k for k in ns.entries if k.startswith(prefix)]
+            return list(ns.entries.keys())
+
+    # -- invalidation -----------------------------------------------------------
+
+    def invalidate_tag(self, tag: str) -> int:
+        """Remove every entry carrying the tag, in any namespace."""
+        with self._lock:
+            members = self._tag_index.pop(tag, set())
+            count = 0
+            for namespace, key in members:
+                ns = self._namespaces.get(namespace)
+                if ns is not None and key in ns.entries:
+                    self._remove(ns, key)
+                    count += 1
+            return count
+
+    def invalidate_pattern(self, pattern: str, namespace: Optional[str] = None) -> int:
+        """Remove entries whose key contains the substring. O(n); use tags on hot paths."""
+        with self._lock:
+            count = 0
+            targets = [namespace] if namespace else list(self._namespaces)
+            for name in targets:
+                ns = self._namespaces.get(name)
+                if ns is None:
+                    continue
+                for key in [k for k in ns.entries if pattern in k]:
+                    self._remove(ns, key)
+                    count += 1
+            return count
+
+    def purge_expired(self, namespace: Optional[str] = None) -> int:
+        """Drop expired entries eagerly. Returns the number removed."""
         now = time.time()
-        expired = [k for k, (v, exp) in self._cache.items() if exp and now > exp]
-        for k in expired:
-            del self._cache[k]
-        if len(self._cache) >= self._max_entries:
-            # Remove oldest 25%
-            items = sorted(
-                self._cache.items(),
-                key=lambda x: x[1][1] or float('inf')
-            )
-            for k, _ in items[:len(items) // 4]:
-                del self._cache[k]
+        with self._lock:
+            count = 0
+            targets = [namespace] if namespace else list(self._namespaces)
+            for name in targets:
+                ns = self._namespaces.get(name)
+                if ns is None:
+                    continue
+                expired = [k for k, (_, exp, _, _) in ns.entries.items() if exp and now > exp]
+                for key in expired:
+                    self._remove(ns, key)
+                ns.expirations += len(expired)
+                count += len(expired)
+            return count
+
+    # -- internals --------------------------------------------------------------
+
+    def _remove(self, ns: _Namespace, key: str):
+        entry = ns.entries.pop(key, None)
+        if entry is None:
+            return
+        ns.bytes -= entry[2]
+        for tag in entry[3]:
+            members = self._tag_index.get(tag)
+            if members is not None:
+                members.discard((ns.name, key))
+                if not members:
+                    del self._tag_index[tag]
+
+    def _enforce_budget(self, ns: _Namespace):
+        """Pop least-recently-used entries until the namespace fits its budget."""
+        now = time.time()
+        while ns.entries and (ns.bytes > ns.max_bytes or len(ns.entries) > ns.max_entries):
+            key, (_, expiry, _, _) = next(iter(ns.entries.items()))
+            self._remove(ns, key)
+            if expiry and now > expiry:
+                ns.expirations += 1
+            else:
+                ns.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-namespace counters plus totals."""
+        with self._lock:
+            namespaces = {name: ns.stats() for name, ns in self._namespaces.items()}
+            hits = sum(s["hits"] for s in namespaces.values())
+            misses = sum(s["misses"] for s in namespaces.values())
+            return {
+                "backend": "memory",
+                "entries": sum(s["entries"] for s in namespaces.values()),
+                "bytes": sum(s["bytes"] for s in namespaces.values()),
+                "hits": hits,
+                "misses": misses,
+                "hit_rate_pct": round(hits / (hits + misses) * 100, 2) if hits + misses else 0,
+                "tags": len(self._tag_index),
+                "namespaces": namespaces,
+            }
 
 
 class RedisCache:
-    """Redis-backed cache."""
+    """Redis-backed cache shared across worker processes."""
+
+    KEY_PREFIX = "ci:cache"
+    TAG_PREFIX = "ci:tag"
+    INVALIDATION_CHANNEL = "ci:cache:invalidate"
 
     def __init__(self, redis_url: str = "redis://localhost:6379/0"):
         import redis as redis_lib
-        self._client = redis_lib.from_url(redis_url, decode_responses=True)
+        self._client = redis_lib.from_url(
+            redis_url, decode_responses=True,
+            socket_connect_timeout=2, socket_timeout=2,
+        )
         # Test the connection
         self._client.ping()
+        self._pubsub_thread = None
+        self._hits = 0
+        self._misses = 0
+        self._errors = 0
 
-    def get(self, key: str):
+    def _key(self, key: str, namespace: str) -> str:
+        return f"{self.KEY_PREFIX}:{namespace}:{key}"
+
+    def get(self, key: str, namespace: str = DEFAULT_NAMESPACE):
         """Get a value by key. Returns None if not found."""
-        val = self._client.get(key)
-        if val:
-            try:
-                return json.loads(val)
-            except (json.JSONDecodeError, TypeError):
-                return val
-        return None
-
-    def set(self, key: str, value, ttl: int = 300):
-        """Set a key-value pair with optional TTL in seconds."""
-        serialized = json.dumps(value) if not isinstance(value, str) else value
-        if ttl:
-            self._client.setex(key, ttl, serialized)
-        else:
-            self._client.set(key, serialized)
-
-    def delete(self, key: str):
+        value, _ = self.get_with_ttl(key, namespace)
+        return value
+
+    def get_with_ttl(self, key: str, namespace: str = DEFAULT_NAMESPACE):
+        """Return (value, remaining_ttl_seconds) in one round trip."""
+        full_key = self._key(key, namespace)
+        try:
+            pipe = self._client.pipeline()
+            pipe.get(full_key)
+            pipe.ttl(full_key)
+            val, ttl = pipe.execute()
+        except Exception as e:
+            self._errors += 1
+            logger.debug("Redis get failed for %s: %s", full_key, e)
+            return None, None
+        if val is None:
+            self._misses += 1
+            return None, None
+        self._hits += 1
+        try:
+            value = json.loads(val)
+        except (json.JSONDecodeError, TypeError):
+            value = val
+        return value, (ttl if ttl and ttl > 0 else None)
+
+    def set(self, key: str, value, ttl: int = 300, namespace: str = DEFAULT_NAMESPACE,
+            tags: Optional[List[str]] = None) -> bool:
+        """Set a key-value pair with optional TTL in seconds. Returns False if not stored."""
+        try:
+            serialized = json.dumps(value) if not isinstance(value, str) else value
+        except (TypeError, ValueError):
+            return False
+        full_key = self._key(key, namespace)
+        try:
+            pipe = self._client.pipeline()
+            if ttl:
+                pipe.setex(full_key, ttl, serialized)
+            else:
+                pipe.set(full_key, serialized)
+            for tag in tags or ():
+                tag_key = f"{self.TAG_PREFIX}:{tag}"
+                pipe.sadd(tag_key, full_key)
+                if ttl:
+                    # Tag sets only need to outlive their longest member
+                    # (NX/GT flags need Redis >= 7, as shipped in docker-compose.prod.yml)
+                    pipe.expire(tag_key, ttl, nx=True)
+                    pipe.expire(tag_key, ttl, gt=True)
+            pipe.execute()
+            return True
+        except Exception as e:
+            self._errors += 1
+            logger.debug("Redis set failed for %s: %s", full_key, e)
+            return False
+
+    def delete(self, key: str, namespace: str = DEFAULT_NAMESPACE):
         """Delete a key."""
-        self._client.delete(key)
+        try:
+            self._client.delete(self._key(key, namespace))
+        except Exception as e:
+            self._errors += 1
+            logger.debug("Redis delete failed: %s", e)
 
-    def clear(self):
-        """Flush the current database."""
-        self._client.flushdb()
+    def clear(self, namespace: Optional[str] = None):
+        """Delete all cache keys (or one namespace) without touching other Redis users."""
+        match = f"{self.KEY_PREFIX}:{namespace}:*" if namespace else f"{self.KEY_PREFIX}:*"
+        self._delete_matching(match)
+        if not namespace:
+            self._delete_matching(f"{self.TAG_PREFIX}:*")
 
-    def keys(self, pattern: str = None) -> list:
+    def keys(self, pattern: str = None, namespace: str = DEFAULT_NAMESPACE) -> list:
         """List keys matching a pattern (supports Redis glob patterns)."""
-        if pattern:
-            return self._client.keys(pattern)
-        return self._client.keys("*")
+        prefix = f"{self.KEY_PREFIX}:{namespace}:"
+        match = prefix + (pattern or "*")
+        return [k[len(prefix):] for k in self._client.scan_iter(match=match, count=500)]
+
+    def invalidate_tag(self, tag: str) -> int:
+        """Delete every key registered under the tag."""
+        return len(self.pop_tag(tag))
+
+    def pop_tag(self, tag: str) -> List[Tuple[str, str]]:
+        """Delete every key registered under the tag and return them as (namespace, key)."""
+        tag_key = f"{self.TAG_PREFIX}:{tag}"
+        try:
+            members = self._client.smembers(tag_key)
+            pipe = self._client.pipeline()
+            if members:
+                pipe.delete(*members)
+            pipe.delete(tag_key)
+            pipe.execute()
+        except Exception as e:
+            self._errors += 1
+            logger.debug("Redis tag invalidation failed for %s: %s", tag, e)
+            return []
+        popped = []
+        for full_key in members:
+            parts = full_key.split(":", 3)
+            if len(parts) == 4:
+                popped.append((parts[2], parts[3]))
+        return popped
+
+    def invalidate_pattern(self, pattern: str, namespace: Optional[str] = None) -> int:
+        """Delete keys containing the substring."""
+        ns_part = namespace or "*"
+        return self._delete_matching(f"{self.KEY_PREFIX}:{ns_part}:*{pattern}*")
+
+    def _delete_matching(self, match: str) -> int:
+        count = 0
+        try:
+            batch = []
+            for key in self._client.scan_iter(match=match, count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    count += self._client.delete(*batch)
+                    batch = []
+            if batch:
+                count += self._client.delete(*batch)
+        except Exception as e:
+            self._errors += 1
+            logger.debug("Redis delete by pattern failed for %s: %s", match, e)
+        return count
+
+    # -- cross-worker invalidation --------------------------------------------
+
+    def publish(self, message: Dict[str, Any]):
+        """Broadcast an invalidation message to every worker."""
+        try:
+            self._client.publish(self.INVALIDATION_CHANNEL, json.dumps(message))
+        except Exception as e:
+            self._errors += 1
+            logger.debug("Redis publish failed: %s", e)
+
+    def subscribe(self, callback):
+        """Run callback(message_dict) for each invalidation message, on a daemon thread."""
+        def _handler(raw):
+            try:
+                callback(json.loads(raw["data"]))
+            except Exception as e:
+                logger.debug("Ignoring malformed cache invalidation message: %s", e)
+
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{self.INVALIDATION_CHANNEL: _handler})
+        self._pubsub_thread = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def close(self):
+        """Stop the subscriber thread, if any."""
+        if self._pubsub_thread is not None:
+            self._pubsub_thread.stop()
+            self._pubsub_thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        total = self._hits + self._misses
+        stats = {
+            "backend": "redis",
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate_pct": round(self._hits / total * 100, 2) if total else 0,
+            "errors": self._errors,
+        }
+        try:
+            info = self._client.info("memory")
+            stats["used_memory_bytes"] = info.get("used_memory")
+        except Exception:
+            pass
+        return stats
+
+
+class TieredCache:
+    """
+    L1 in-process LRU in front of an L2 shared by all workers.
+
+    Reads check L1 first and promote L2 hits into L1. Writes go to both
+    tiers. Deletes and tag/pattern invalidations are applied to both tiers
+    and broadcast so that every other worker drops its L1 copy as well.
+    L1 entries are additionally capped at ``l1_max_ttl`` seconds so a
+    missed broadcast can only serve stale data for a bounded time.
+    """
+
+    def __init__(self, l1: InMemoryCache, l2, l1_max_ttl: int = 60):
+        self.l1 = l1
+        self.l2 = l2
+        self._l1_max_ttl = l1_max_ttl
+        self._origin = uuid.uuid4().hex
+        self._invalidations_received = 0
+        self.l2.subscribe(self._on_invalidation)
+
+    def _l1_ttl(self, ttl: Optional[int]) -> int:
+        return min(ttl, self._l1_max_ttl) if ttl else self._l1_max_ttl
+
+    def get(self, key: str, namespace: str = DEFAULT_NAMESPACE):
+        """Get from L1, falling back to L2 (and promoting the hit)."""
+        value = self.l1.get(key, namespace)
+        if value is not None:
+            return value
+        value, remaining = self.l2.get_with_ttl(key, namespace)
+        if value is not None:
+            self.l1.set(key, value, ttl=self._l1_ttl(remaining), namespace=namespace)
+        return value
+
+    def set(self, key: str, value, ttl: int = 300, namespace: str = DEFAULT_NAMESPACE,
+            tags: Optional[List[str]] = None):
+        """Write through both tiers; other workers drop any stale L1 copy."""
+        self.l1.set(key, value, ttl=self._l1_ttl(ttl), namespace=namespace, tags=tags)
+        if self.l2.set(key, value, ttl=ttl, namespace=namespace, tags=tags):
+            self._broadcast("key", namespace, key)
+
+    def delete(self, key: str, namespace: str = DEFAULT_NAMESPACE):
+        """Delete from both tiers on every worker."""
+        self.l1.delete(key, namespace)
+        self.l2.delete(key, namespace)
+        self._broadcast("key", namespace, key)
+
+    def clear(self, namespace: Optional[str] = None):
+        """Clear both tiers on every worker."""
+        self.l1.clear(namespace)
+        self.l2.clear(namespace)
+        self._broadcast("clear", namespace, None)
+
+    def keys(self, pattern: str = None, namespace: str = DEFAULT_NAMESPACE) -> list:
+        """List keys from the shared tier."""
+        return self.l2.keys(pattern, namespace)
+
+    def invalidate_tag(self, tag: str) -> int:
+        """Invalidate a tag in both tiers on every worker."""
+        local = self.l1.invalidate_tag(tag)
+        members = self.l2.pop_tag(tag)
+        # Entries promoted from L2 carry no tags in L1, so other workers
+        # need the concrete keys as well as the tag name.
+        self._broadcast("tag", None, tag, keys=members)
+        return max(local, len(members))
+
+    def invalidate_pattern(self, pattern: str, namespace: Optional[str] = None) -> int:
+        """Invalidate keys containing the substring in both tiers on every worker."""
+        count = max(
+            self.l1.invalidate_pattern(pattern, namespace),
+            self.l2.invalidate_pattern(pattern, namespace),
+        )
+        self._broadcast("pattern", namespace, pattern)
+        return count
+
+    def purge_expired(self, namespace: Optional[str] = None) -> int:
+        """Expire L1 entries eagerly (L2 expiry is handled by Redis)."""
+        return self.l1.purge_expired(namespace)
+
+    def configure_namespace(self, namespace: str, max_bytes: int = None, max_entries: int = None):
+        self.l1.configure_namespace(namespace, max_bytes=max_bytes, max_entries=max_entries)
+
+    def _broadcast(self, op: str, namespace: Optional[str], value: Optional[str], keys=None):
+        message = {"origin": self._origin, "op": op, "ns": namespace, "value": value}
+        if keys:
+            message["keys"] = [list(k) for k in keys]
+        self.l2.publish(message)
+
+    def _on_invalidation(self, message: Dict[str, Any]):
+        """Apply an invalidation published by another worker to the local L1."""
+        if message.get("origin") == self._origin:
+            return
+        self._invalidations_received += 1
+        op, namespace, value = message.get("op"), message.get("ns"), message.get("value")
+        if op == "key":
+            self.l1.delete(value, namespace or DEFAULT_NAMESPACE)
+        elif op == "tag":
+            self.l1.invalidate_tag(value)
+            for ns_name, key in message.get("keys", ()):
+                self.l1.delete(key, ns_name)
+        elif op == "pattern":
+            self.l1.invalidate_pattern(value, namespace)
+        elif op == "clear":
+            self.l1.clear(namespace)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "tiered",
+            "l1": self.l1.stats(),
+            "l2": self.l2.stats(),
+            "l1_max_ttl": self._l1_max_ttl,
+            "invalidations_received": self._invalidations_received,
+        }
+
+
+def configure_namespace(namespace: str, max_bytes: int = None, max_entries: int = None):
+    """
+    Register limits for a namespace.
+
+    Applies to the live cache instance and to any instance created later
+    (e.g. after reset_cache()).
+    """
+    config = _NAMESPACE_CONFIG.setdefault(namespace, dict(_NAMESPACE_CONFIG[DEFAULT_NAMESPACE]))
+    if max_bytes is not None:
+        config["max_bytes"] = max_bytes
+    if max_entries is not None:
+        config["max_entries"] = max_entries
+    if _cache_instance is not None:
+        _cache_instance.configure_namespace(namespace, max_bytes=max_bytes, max_entries=max_entries)
 
 
 # Singleton
 _cache_instance = None
+_cache_lock = threading.Lock()
 
 
 def get_cache():
-    """Get the singleton cache instance (Redis if enabled, else in-memory)."""
+    """Get the singleton cache instance (tiered L1+Redis if enabled, else in-memory)."""
     global _cache_instance
     if _cache_instance is None:
-        if os.environ.get("REDIS_ENABLED", "false").lower() == "true":
-            redis_url = os.environ.get(
-                "REDIS_URL", "redis://localhost:6379/0"
-            )
-            try:
-                _cache_instance = RedisCache(redis_url)
-                logger.info("Redis cache initialized: %s", redis_url)
-            except Exception as e:
-                logger.warning(
-                    "Redis unavailable, falling back to in-memory: %s", e
-                )
-                _cache_instance = InMemoryCache()
-        else:
-            _cache_instance = InMemoryCache()
-            logger.info("Using in-memory cache (REDIS_ENABLED=false)")
+        with _cache_lock:
+            if _cache_instance is None:
+                _cache_instance = _create_cache()
     return _cache_instance
 
 
+def _create_cache():
+    if os.environ.get("REDIS_ENABLED", "false").lower() == "true":
+        redis_url = os.environ.get(
+            "REDIS_URL", "redis://localhost:6379/0"
+        )
+        try:
+            cache = TieredCache(
+                InMemoryCache(),
+                RedisCache(redis_url),
+                l1_max_ttl=int(os.environ.get("CACHE_L1_MAX_TTL", "60")),
+            )
+            logger.info("Tiered cache initialized (L1 memory + L2 Redis): %s", redis_url)
+            return cache
+        except Exception as e:
+            logger.warning(
+                "Redis unavailable, falling back to in-memory: %s", e
+            )
+            return InMemoryCache()
+    logger.info("Using in-memory cache (REDIS_ENABLED=false)")
+    return InMemoryCache()
+
+
 def reset_cache():
     """Reset the singleton (used in tests)."""
     global _cache_instance
+    if isinstance(_cache_instance, TieredCache):
+        _cache_instance.l2.close()
     _cache_instance = None
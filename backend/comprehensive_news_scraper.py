@@ -335,6 +335,7 @@ class NewsFeedService:
             NewsFeedResult with summary
         """
         from database import SessionLocal, Competitor, NewsArticleCache
+        from news_ingest import ingest_articles
 
         if self.db is None:
             self.db = SessionLocal()
@@ -392,34 +393,29 @@ class NewsFeedService:
                     if articles:
                         result.competitors_with_news += 1
 
-                        # Cache articles
-                        for article in articles:
-                            # Check if already cached
-                            existing = self.db.query(NewsArticleCache).filter(
-                                NewsArticleCache.url == article.get("url")
-                            ).first()
-
-                            if not existing:
-                                cache_entry = NewsArticleCache(
-                                    competitor_id=comp.id,
-                                    competitor_name=comp.name,
-                                    title=article.get("title", "")[:500],
-                                    url=article.get("url", ""),
-                                    source=article.get("source", "Unknown"),
-                                    source_type=article.get("source_type", "unknown"),
-                                    published_at=self._parse_date(article.get("published_at")),
-                                    snippet=article.get("snippet", "")[:1000] if article.get("snippet") else None,
-                                    sentiment=article.get("sentiment", "neutral"),
-                                    event_type=article.get("event_type"),
-                                    is_major_event=article.get("is_major_event", False),
-                                    fetched_at=datetime.utcnow(),
-                                    cache_expires_at=datetime.utcnow() + timedelta(hours=24),
-                                    created_at=datetime.utcnow()
-                                )
-                                self.db.add(cache_entry)
-                                result.new_articles_found += 1
-
-                            result.total_articles_cached += 1
+                        # Cache articles; ones already stored get their analysis refreshed
+                        rows = [
+                            dict(
+                                competitor_id=comp.id,
+                                competitor_name=comp.name,
+                                title=article.get("title", "")[:500],
+                                url=article.get("url", ""),
+                                source=article.get("source", "Unknown"),
+                                source_type=article.get("source_type", "unknown"),
+                                published_at=self._parse_date(article.get("published_at")),
+                                snippet=article.get("snippet", "")[:1000] if article.get("snippet") else None,
+                                sentiment=article.get("sentiment", "neutral"),
+                                event_type=article.get("event_type"),
+                                is_major_event=article.get("is_major_event", False),
+                                fetched_at=datetime.utcnow(),
+                                cache_expires_at=datetime.utcnow() + timedelta(hours=24),
+                                created_at=datetime.utcnow()
+                            )
+                            for article in articles
+                        ]
+                        ingested = ingest_articles(self.db, rows, update_existing=True)
+                        result.new_articles_found += ingested.inserted
+                        result.total_articles_cached += len(articles)
 
                         # Track sources
                         for article in articles:
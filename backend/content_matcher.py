@@ -14,19 +14,38 @@ Matching strategies (tried in order):
   4. Word boundary expansion (partial match -> full phrase)
   5. Fuzzy substring (for values 4+ chars)
 
+Pages are fetched through one pooled client per event loop (HTTP/2 when h2
+is installed, at most PAGE_FETCH_PER_HOST requests per host) and cached in
+memory and on disk (page_cache.py).  fetch_source_pages() fetches every
+source page of a competitor concurrently.
+
 Author: Certify Health
 Date: February 14, 2026
 """
 
+import asyncio
 import logging
+import os
 import re
+import time
+import weakref
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from html.parser import HTMLParser
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
 
 import httpx
 
+from page_cache import get_page_cache
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -133,74 +152,143 @@ def extract_text_from_html(html: str) -> str:
 # Page content cache
 # ─────────────────────────────────────────────────────────────────────────────
 
-# url -> (fetched_at, page_text)
-_page_cache: Dict[str, Tuple[datetime, str]] = {}
+# url -> (fetched_at, page_text), least recently used first. Expired entries
+# are dropped when looked up; inserts evict from the front in O(1).
+_page_cache: "OrderedDict[str, Tuple[datetime, str]]" = OrderedDict()
 
 
-def _prune_cache() -> None:
-    """Remove expired entries and enforce max size."""
-    now = datetime.utcnow()
-    cutoff = now - timedelta(hours=CACHE_TTL_HOURS)
+def _remember(url: str, page_text: str, fetched_at: Optional[datetime] = None) -> None:
+    _page_cache[url] = (fetched_at or datetime.utcnow(), page_text)
+    _page_cache.move_to_end(url)
+    while len(_page_cache) > MAX_CACHE_ENTRIES:
+        _page_cache.popitem(last=False)
 
-    expired = [url for url, (ts, _) in _page_cache.items() if ts < cutoff]
-    for url in expired:
-        del _page_cache[url]
 
-    # Enforce max entries by removing oldest
-    if len(_page_cache) > MAX_CACHE_ENTRIES:
-        sorted_entries = sorted(_page_cache.items(), key=lambda x: x[1][0])
-        excess = len(_page_cache) - MAX_CACHE_ENTRIES
-        for url, _ in sorted_entries[:excess]:
-            del _page_cache[url]
+def _cached_text(url: str) -> Optional[str]:
+    entry = _page_cache.get(url)
+    if entry is None:
+        return None
+    ts, text = entry
+    if datetime.utcnow() - ts >= timedelta(hours=CACHE_TTL_HOURS):
+        del _page_cache[url]
+        return None
+    _page_cache.move_to_end(url)
+    return text
 
 
 def clear_cache() -> None:
-    """Clear the entire page cache."""
+    """Clear the page cache (in-memory and on-disk)."""
     _page_cache.clear()
+    disk = get_page_cache()
+    if disk is not None:
+        disk.clear()
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Page fetching
 # ─────────────────────────────────────────────────────────────────────────────
 
+# One pooled client per event loop; clients can't be shared across loops
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+_host_limits: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Process-wide pooled client for the running loop (HTTP/2 when h2 is installed)."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        max_connections = int(os.getenv("PAGE_FETCH_MAX_CONNECTIONS", "50"))
+        client = httpx.AsyncClient(
+            timeout=FETCH_TIMEOUT,
+            follow_redirects=True,
+            http2=HTTP2_AVAILABLE,
+            headers={"User-Agent": USER_AGENT},
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+        _clients[loop] = client
+    return client
+
+
+def _host_semaphore(url: str) -> asyncio.Semaphore:
+    """Bound concurrent requests to any one host."""
+    per_loop = _host_limits.setdefault(asyncio.get_running_loop(), {})
+    host = urlsplit(url).netloc.lower()
+    sem = per_loop.get(host)
+    if sem is None:
+        sem = per_loop[host] = asyncio.Semaphore(int(os.getenv("PAGE_FETCH_PER_HOST", "4")))
+    return sem
+
+
+async def close_shared_client() -> None:
+    """Close the pooled client opened on the running event loop."""
+    loop = asyncio.get_running_loop()
+    _host_limits.pop(loop, None)
+    client = _clients.pop(loop, None)
+    if client is not None:
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.debug(f"Content matcher client close note: {e}")
+
 
 async def fetch_page_text(url: str) -> Optional[str]:
     """Fetch a web page and return its visible text content.
 
-    Uses an in-memory cache with 1-hour TTL.  Returns None on any error
-    (network, timeout, non-200 status, etc.).
+    Pages are cached in memory and on disk (see page_cache.py) for
+    CACHE_TTL_HOURS; after that the on-disk copy is revalidated with its
+    ETag / Last-Modified.  Disk cache reads and writes run in a worker
+    thread.  Returns None on any error (network, timeout,
+    non-200 status, etc.).
     """
-    _prune_cache()
+    text = _cached_text(url)
+    if text is not None:
+        return text
 
-    # Check cache
-    if url in _page_cache:
-        ts, text = _page_cache[url]
-        if datetime.utcnow() - ts < timedelta(hours=CACHE_TTL_HOURS):
-            return text
-        else:
-            del _page_cache[url]
+    disk = get_page_cache()
+    cached = await asyncio.to_thread(disk.get, url) if disk is not None else None
+    if cached is not None and time.time() - cached.fetched_at < CACHE_TTL_HOURS * 3600:
+        _remember(url, cached.text, datetime.utcfromtimestamp(cached.fetched_at))
+        return cached.text
 
     try:
-        async with httpx.AsyncClient(
-            timeout=FETCH_TIMEOUT,
-            follow_redirects=True,
-            headers={"User-Agent": USER_AGENT},
-        ) as client:
-            resp = await client.get(url)
-            if resp.status_code != 200:
-                logger.debug("fetch_page_text %s returned %d", url, resp.status_code)
-                return None
+        client = _get_client()
+        async with _host_semaphore(url):
+            resp = await client.get(
+                url, headers=cached.conditional_headers() if cached is not None else None
+            )
 
-            # Enforce max page size
-            content = resp.text
-            if len(content) > MAX_PAGE_SIZE:
-                content = content[:MAX_PAGE_SIZE]
+        if resp.status_code == 304 and cached is not None:
+            await asyncio.to_thread(disk.touch, url)
+            _remember(url, cached.text)
+            return cached.text
+        if resp.status_code != 200:
+            logger.debug("fetch_page_text %s returned %d", url, resp.status_code)
+            return None
 
-            page_text = extract_text_from_html(content)
+        # Enforce max page size
+        content = resp.text
+        if len(content) > MAX_PAGE_SIZE:
+            content = content[:MAX_PAGE_SIZE]
 
-            # Cache the result
-            _page_cache[url] = (datetime.utcnow(), page_text)
-            return page_text
+        page_text = extract_text_from_html(content)
+
+        # Cache the result
+        _remember(url, page_text)
+        if disk is not None:
+            await asyncio.to_thread(
+                disk.put, url, page_text,
+                etag=resp.headers.get("ETag"),
+                last_modified=resp.headers.get("Last-Modified"),
+            )
+        return page_text
 
     except httpx.TimeoutException:
         logger.debug("fetch_page_text timeout for %s", url)
@@ -210,6 +298,30 @@ async def fetch_page_text(url: str) -> Optional[str]:
         return None
 
 
+async def fetch_pages(urls: Iterable[str]) -> Dict[str, Optional[str]]:
+    """Fetch several pages concurrently; returns {url: page text or None}.
+
+    Duplicate URLs are fetched once.  Concurrency is bounded by the pooled
+    client and the per-host limit.
+    """
+    unique = list(dict.fromkeys(u for u in urls if u))
+    texts = await asyncio.gather(*(fetch_page_text(u) for u in unique))
+    return dict(zip(unique, texts))
+
+
+async def fetch_source_pages(sources: Iterable) -> Dict[str, Optional[str]]:
+    """Fetch the pages behind a competitor's DataSource rows in one batch.
+
+    Uses each source's ``source_page_url`` (falling back to ``source_url``)
+    and returns {url: page text or None}.
+    """
+    urls = [
+        getattr(src, "source_page_url", None) or getattr(src, "source_url", None)
+        for src in sources
+    ]
+    return await fetch_pages(urls)
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Number normalization
 # ─────────────────────────────────────────────────────────────────────────────
@@ -21,6 +21,7 @@ Usage:
 from typing import List, Optional
 
 from .base_provider import BaseDataProvider, ProviderResult  # noqa: F401
+from .enrichment import EnrichmentEngine  # noqa: F401
 
 # Import all provider adapter classes
 from .pitchbook import PitchBookProvider  # noqa: F401
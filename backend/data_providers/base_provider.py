@@ -8,21 +8,38 @@ and field mapping to Competitor model columns.
 
 All providers:
 - Check configuration via environment variables
-- Use httpx.AsyncClient for HTTP calls
+- Share one pooled httpx.AsyncClient per provider (HTTP/2 when h2 is installed)
 - Map external data to Competitor ORM field names
 - Generate deep-linkable source URLs
-- Rate limit themselves per provider specs
+- Rate limit themselves per provider specs with a process-wide token bucket
+- Cache company name -> provider ID resolutions on disk (see id_cache.py)
+
+Config:
+    PROVIDER_MAX_CONNECTIONS=10   (connection pool size per provider)
 """
 
 import os
+import asyncio
 import logging
+import threading
 import time
+import weakref
 from abc import ABC, abstractmethod
 from typing import Optional, Dict, Any
 from dataclasses import dataclass, field
 
+import httpx
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+REQUEST_TIMEOUT = 15.0
+
 
 @dataclass
 class ProviderResult:
@@ -36,6 +53,79 @@ class ProviderResult:
     latency_ms: float = 0.0
 
 
+class TokenBucket:
+    """
+    Token bucket shared by every instance of a provider in this process.
+
+    Refills at rate_per_minute / 60 tokens per second up to ``burst``.
+    Callers that find the bucket empty reserve a future token (the balance
+    goes negative) and sleep until it is theirs, so concurrent requests are
+    spaced out evenly instead of all waking at the next window boundary.
+    """
+
+    def __init__(self, rate_per_minute: int, burst: Optional[int] = None):
+        self.rate = max(rate_per_minute, 1) / 60.0
+        self.capacity = float(burst or max(1, rate_per_minute // 6))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    async def acquire(self) -> float:
+        """Wait for a token; returns the time spent waiting."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+# One client per (event loop, provider); clients can't be shared across loops
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_token_bucket(provider_name: str, rate_per_minute: int) -> TokenBucket:
+    """Return the process-wide bucket for a provider, creating it on first use."""
+    bucket = _buckets.get(provider_name)
+    if bucket is None:
+        with _buckets_lock:
+            bucket = _buckets.get(provider_name)
+            if bucket is None:
+                bucket = TokenBucket(rate_per_minute)
+                _buckets[provider_name] = bucket
+    return bucket
+
+
+def reset_token_buckets() -> None:
+    """Forget all buckets (tests, rate limit changes)."""
+    with _buckets_lock:
+        _buckets.clear()
+
+
+async def close_shared_clients() -> None:
+    """Close the pooled clients opened on the running event loop."""
+    per_loop = _clients.pop(asyncio.get_running_loop(), {})
+    for client in per_loop.values():
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.debug(f"Provider client close note: {e}")
+
+
 class BaseDataProvider(ABC):
     """
     Abstract base class for enterprise data provider integrations.
@@ -63,9 +153,6 @@ class BaseDataProvider(ABC):
     def __init__(self):
         """Initialize provider with API key from environment."""
         self.api_key = os.getenv(self.env_key_name, "")
-        self._last_request_time = 0.0
-        self._request_count = 0
-        self._minute_start = 0.0
 
     @classmethod
     def is_configured(cls) -> bool:
@@ -157,21 +244,19 @@ class BaseDataProvider(ABC):
                 "latency_ms": 0,
             }
 
-        import httpx
-
         start = time.time()
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                resp = await client.get(
-                    self.base_url,
-                    headers=self._get_auth_headers(),
-                )
-                latency = (time.time() - start) * 1000
-                return {
-                    "success": resp.status_code < 500,
-                    "message": f"HTTP {resp.status_code}",
-                    "latency_ms": round(latency, 1),
-                }
+            resp = await self._get_client().get(
+                self.base_url,
+                headers=self._get_auth_headers(),
+                timeout=10.0,
+            )
+            latency = (time.time() - start) * 1000
+            return {
+                "success": resp.status_code < 500,
+                "message": f"HTTP {resp.status_code}",
+                "latency_ms": round(latency, 1),
+            }
         except Exception as e:
             latency = (time.time() - start) * 1000
             return {
@@ -189,32 +274,65 @@ class BaseDataProvider(ABC):
         """
         return {"Authorization": f"Bearer {self.api_key}"}
 
-    async def _rate_limit(self):
+    def _get_client(self) -> httpx.AsyncClient:
         """
-        Enforce rate limiting. Call before each API request.
+        Pooled client shared by all instances of this provider on the running loop.
 
-        Uses a simple sliding window: tracks request count per minute.
+        Keeps connections (and TLS sessions) alive across requests instead of
+        opening a new client per call. Uses HTTP/2 when the h2 package is installed.
         """
-        import asyncio
+        per_loop = _clients.setdefault(asyncio.get_running_loop(), {})
+        client = per_loop.get(self.provider_name)
+        if client is None or client.is_closed:
+            max_connections = int(os.getenv("PROVIDER_MAX_CONNECTIONS", "10"))
+            client = httpx.AsyncClient(
+                timeout=REQUEST_TIMEOUT,
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                ),
+            )
+            per_loop[self.provider_name] = client
+        return client
 
-        now = time.time()
+    async def _rate_limit(self):
+        """
+        Enforce rate limiting. Call before each API request.
 
-        # Reset counter each minute
-        if now - self._minute_start > 60:
-            self._minute_start = now
-            self._request_count = 0
+        Draws from the provider's process-wide token bucket, so the limit
+        holds across instances and concurrent enrichment tasks.
+        """
+        bucket = get_token_bucket(self.provider_name, self.rate_limit_per_minute)
+        waited = await bucket.acquire()
+        if waited > 1:
+            logger.info(f"{self.provider_name}: Rate limit reached, waited {waited:.1f}s")
 
-        self._request_count += 1
+    async def resolve_company(self, company_name: str, refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        search_company() with the on-disk name -> provider ID cache in front.
 
-        if self._request_count > self.rate_limit_per_minute:
-            wait_time = 60 - (now - self._minute_start)
-            if wait_time > 0:
-                logger.info(
-                    f"{self.provider_name}: Rate limit reached, waiting {wait_time:.1f}s"
+        Results served from the cache carry ``"cached": True``. ``refresh``
+        skips the cache and replaces the stored entry.
+        """
+        from .id_cache import get_provider_id_cache
+
+        cache = get_provider_id_cache()
+        if cache is not None and not refresh:
+            cached = cache.get(self.provider_name, company_name)
+            if cached:
+                return {**cached, "cached": True}
+
+        search_result = await self.search_company(company_name)
+        if cache is not None:
+            if search_result and search_result.get("provider_id"):
+                cache.put(
+                    self.provider_name, company_name,
+                    search_result["provider_id"], search_result.get("name") or company_name,
                 )
-                await asyncio.sleep(wait_time)
-                self._minute_start = time.time()
-                self._request_count = 1
+            elif refresh:
+                cache.forget(self.provider_name, company_name)
+        return search_result
 
     async def query_for_competitor(self, company_name: str) -> ProviderResult:
         """
@@ -239,8 +357,8 @@ class BaseDataProvider(ABC):
             return result
 
         try:
-            # Step 1: Search for the company
-            search_result = await self.search_company(company_name)
+            # Step 1: Resolve the company (cached across runs)
+            search_result = await self.resolve_company(company_name)
             if not search_result:
                 result.error = f"Company '{company_name}' not found on {self.provider_name}"
                 result.latency_ms = (time.time() - start) * 1000
@@ -250,6 +368,12 @@ class BaseDataProvider(ABC):
 
             # Step 2: Get full profile
             raw_data = await self.get_company_profile(provider_id)
+            if not raw_data and search_result.get("cached"):
+                # The cached ID may be stale (merged or renamed company); search again
+                search_result = await self.resolve_company(company_name, refresh=True)
+                if search_result:
+                    provider_id = search_result.get("provider_id", "")
+                    raw_data = await self.get_company_profile(provider_id)
             if not raw_data:
                 result.error = f"Could not retrieve profile from {self.provider_name}"
                 result.latency_ms = (time.time() - start) * 1000
@@ -12,8 +12,6 @@ Rate Limit: 30 requests/minute (standard terminal license)
 import logging
 from typing import Optional, Dict, Any
 
-import httpx
-
 from .base_provider import BaseDataProvider
 
 logger = logging.getLogger(__name__)
@@ -38,23 +36,23 @@ class BloombergProvider(BaseDataProvider):
         """Search Bloomberg for a company by name."""
         await self._rate_limit()
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.get(
-                    f"{self.base_url}/search",
-                    params={"query": company_name, "type": "EQUITY", "limit": 5},
-                    headers=self._get_auth_headers(),
-                )
-                resp.raise_for_status()
-                data = resp.json()
-                results = data.get("results", [])
-                if not results:
-                    return None
-                top = results[0]
-                return {
-                    "provider_id": top.get("figi", top.get("id", "")),
-                    "name": top.get("name", company_name),
-                    "ticker": top.get("ticker", ""),
-                }
+            client = self._get_client()
+            resp = await client.get(
+                f"{self.base_url}/search",
+                params={"query": company_name, "type": "EQUITY", "limit": 5},
+                headers=self._get_auth_headers(),
+            )
+            resp.raise_for_status()
+            data = resp.json()
+            results = data.get("results", [])
+            if not results:
+                return None
+            top = results[0]
+            return {
+                "provider_id": top.get("figi", top.get("id", "")),
+                "name": top.get("name", company_name),
+                "ticker": top.get("ticker", ""),
+            }
         except Exception as e:
             logger.error(f"Bloomberg search error: {e}")
             return None
@@ -70,14 +68,14 @@ class BloombergProvider(BaseDataProvider):
                 "TRAIL_12M_GROSS_MARGIN", "EPS_GROWTH",
                 "BEST_EST_SALES", "ESG_DISCLOSURE_SCORE",
             ]
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.post(
-                    f"{self.base_url}/fields",
-                    json={"securities": [provider_id], "fields": fields},
-                    headers=self._get_auth_headers(),
-                )
-                resp.raise_for_status()
-                return resp.json()
+            client = self._get_client()
+            resp = await client.post(
+                f"{self.base_url}/fields",
+                json={"securities": [provider_id], "fields": fields},
+                headers=self._get_auth_headers(),
+            )
+            resp.raise_for_status()
+            return resp.json()
         except Exception as e:
             logger.error(f"Bloomberg profile error: {e}")
             return None
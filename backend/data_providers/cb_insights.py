@@ -13,8 +13,6 @@ Rate Limit: 60 requests/minute
 import logging
 from typing import Optional, Dict, Any
 
-import httpx
-
 from .base_provider import BaseDataProvider
 
 logger = logging.getLogger(__name__)
@@ -39,22 +37,22 @@ class CBInsightsProvider(BaseDataProvider):
         """Search CB Insights for a company by name."""
         await self._rate_limit()
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.get(
-                    f"{self.base_url}/companies/search",
-                    params={"q": company_name, "limit": 5},
-                    headers=self._get_auth_headers(),
-                )
-                resp.raise_for_status()
-                data = resp.json()
-                companies = data.get("companies", [])
-                if not companies:
-                    return None
-                top = companies[0]
-                return {
-                    "provider_id": top.get("companyId", ""),
-                    "name": top.get("name", company_name),
-                }
+            client = self._get_client()
+            resp = await client.get(
+                f"{self.base_url}/companies/search",
+                params={"q": company_name, "limit": 5},
+                headers=self._get_auth_headers(),
+            )
+            resp.raise_for_status()
+            data = resp.json()
+            companies = data.get("companies", [])
+            if not companies:
+                return None
+            top = companies[0]
+            return {
+                "provider_id": top.get("companyId", ""),
+                "name": top.get("name", company_name),
+            }
         except Exception as e:
             logger.error(f"CB Insights search error: {e}")
             return None
@@ -63,14 +61,14 @@ class CBInsightsProvider(BaseDataProvider):
         """Get company profile from CB Insights."""
         await self._rate_limit()
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.get(
-                    f"{self.base_url}/companies/{provider_id}",
-                    params={"include": "funding,mosaic,market,competitors"},
-                    headers=self._get_auth_headers(),
-                )
-                resp.raise_for_status()
-                return resp.json()
+            client = self._get_client()
+            resp = await client.get(
+                f"{self.base_url}/companies/{provider_id}",
+                params={"include": "funding,mosaic,market,competitors"},
+                headers=self._get_auth_headers(),
+            )
+            resp.raise_for_status()
+            return resp.json()
         except Exception as e:
             logger.error(f"CB Insights profile error: {e}")
             return None
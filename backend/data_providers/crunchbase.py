@@ -12,8 +12,6 @@ Rate Limit: 200 requests/minute (enterprise tier)
 import logging
 from typing import Optional, Dict, Any
 
-import httpx
-
 from .base_provider import BaseDataProvider
 
 logger = logging.getLogger(__name__)
@@ -38,27 +36,27 @@ class CrunchbaseProvider(BaseDataProvider):
         """Search Crunchbase for a company by name."""
         await self._rate_limit()
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.get(
-                    f"{self.base_url}/autocompletes",
-                    params={
-                        "query": company_name,
-                        "collection_ids": "organizations",
-                        "limit": 5,
-                    },
-                    headers=self._get_auth_headers(),
-                )
-                resp.raise_for_status()
-                data = resp.json()
-                entities = data.get("entities", [])
-                if not entities:
-                    return None
-                top = entities[0]
-                identifier = top.get("identifier", {})
-                return {
-                    "provider_id": identifier.get("permalink", ""),
-                    "name": identifier.get("value", company_name),
-                }
+            client = self._get_client()
+            resp = await client.get(
+                f"{self.base_url}/autocompletes",
+                params={
+                    "query": company_name,
+                    "collection_ids": "organizations",
+                    "limit": 5,
+                },
+                headers=self._get_auth_headers(),
+            )
+            resp.raise_for_status()
+            data = resp.json()
+            entities = data.get("entities", [])
+            if not entities:
+                return None
+            top = entities[0]
+            identifier = top.get("identifier", {})
+            return {
+                "provider_id": identifier.get("permalink", ""),
+                "name": identifier.get("value", company_name),
+            }
         except Exception as e:
             logger.error(f"Crunchbase search error: {e}")
             return None
@@ -73,14 +71,14 @@ class CrunchbaseProvider(BaseDataProvider):
                 "categories,investor_identifiers,revenue_range,contact_email,"
                 "website,linkedin,twitter"
             )
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.get(
-                    f"{self.base_url}/entities/organizations/{provider_id}",
-                    params={"field_ids": field_ids},
-                    headers=self._get_auth_headers(),
-                )
-                resp.raise_for_status()
-                return resp.json().get("properties", resp.json())
+            client = self._get_client()
+            resp = await client.get(
+                f"{self.base_url}/entities/organizations/{provider_id}",
+                params={"field_ids": field_ids},
+                headers=self._get_auth_headers(),
+            )
+            resp.raise_for_status()
+            return resp.json().get("properties", resp.json())
         except Exception as e:
             logger.error(f"Crunchbase profile error: {e}")
             return None
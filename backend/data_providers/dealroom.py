@@ -13,8 +13,6 @@ Rate Limit: 120 requests/minute
 import logging
 from typing import Optional, Dict, Any
 
-import httpx
-
 from .base_provider import BaseDataProvider
 
 logger = logging.getLogger(__name__)
@@ -52,23 +50,23 @@ class DealroomProvider(BaseDataProvider):
                 """,
                 "variables": {"name": company_name},
             }
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.post(
-                    f"{self.base_url}/graphql",
-                    json=query,
-                    headers=self._get_auth_headers(),
-                )
-                resp.raise_for_status()
-                data = resp.json()
-                companies = data.get("data", {}).get("companies", [])
-                if not companies:
-                    return None
-                top = companies[0]
-                return {
-                    "provider_id": str(top.get("id", "")),
-                    "name": top.get("name", company_name),
-                    "slug": top.get("slug", ""),
-                }
+            client = self._get_client()
+            resp = await client.post(
+                f"{self.base_url}/graphql",
+                json=query,
+                headers=self._get_auth_headers(),
+            )
+            resp.raise_for_status()
+            data = resp.json()
+            companies = data.get("data", {}).get("companies", [])
+            if not companies:
+                return None
+            top = companies[0]
+            return {
+                "provider_id": str(top.get("id", "")),
+                "name": top.get("name", company_name),
+                "slug": top.get("slug", ""),
+            }
         except Exception as e:
             logger.error(f"Dealroom search error: {e}")
             return None
@@ -102,14 +100,14 @@ class DealroomProvider(BaseDataProvider):
                 """,
                 "variables": {"id": provider_id},
             }
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.post(
-                    f"{self.base_url}/graphql",
-                    json=query,
-                    headers=self._get_auth_headers(),
-                )
-                resp.raise_for_status()
-                return resp.json().get("data", {}).get("company", {})
+            client = self._get_client()
+            resp = await client.post(
+                f"{self.base_url}/graphql",
+                json=query,
+                headers=self._get_auth_headers(),
+            )
+            resp.raise_for_status()
+            return resp.json().get("data", {}).get("company", {})
         except Exception as e:
             logger.error(f"Dealroom profile error: {e}")
             return None
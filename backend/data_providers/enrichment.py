@@ -0,0 +1,91 @@
+"""
+Certify Intel - Concurrent Provider Enrichment
+
+Fans competitor lookups out across every active provider at once. Each
+provider runs up to PROVIDER_CONCURRENCY queries in flight (its token
+bucket still paces the actual requests), and results are yielded as soon
+as each (competitor, provider) query finishes, so callers can apply and
+report partial results instead of waiting for the whole batch.
+
+Config:
+    PROVIDER_CONCURRENCY=4   (in-flight queries per provider)
+
+Usage:
+    from data_providers.enrichment import EnrichmentEngine
+
+    engine = EnrichmentEngine(get_active_providers())
+    async for competitor_id, result in engine.stream([(c.id, c.name) for c in competitors]):
+        ...
+"""
+
+import os
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, Hashable, List, Sequence, Tuple
+
+from .base_provider import BaseDataProvider, ProviderResult
+
+logger = logging.getLogger(__name__)
+
+
+class EnrichmentEngine:
+    """Runs query_for_competitor() for many companies across many providers concurrently."""
+
+    def __init__(self, providers: Sequence[BaseDataProvider], concurrency_per_provider: int = 0):
+        self.providers: List[BaseDataProvider] = list(providers)
+        self.concurrency = concurrency_per_provider or int(os.getenv("PROVIDER_CONCURRENCY", "4"))
+        self.stats: Dict[str, Dict[str, Any]] = {
+            p.provider_name: {"queried": 0, "succeeded": 0, "failed": 0, "total_latency_ms": 0.0}
+            for p in self.providers
+        }
+
+    async def _query(
+        self,
+        provider: BaseDataProvider,
+        semaphore: asyncio.Semaphore,
+        key: Hashable,
+        company_name: str,
+    ) -> Tuple[Hashable, ProviderResult]:
+        async with semaphore:
+            try:
+                result = await provider.query_for_competitor(company_name)
+            except Exception as e:
+                logger.warning(f"{provider.provider_name} failed for {company_name}: {e}")
+                result = ProviderResult(
+                    provider_name=provider.provider_name,
+                    company_name=company_name,
+                    error=f"{provider.provider_name} error: {e}",
+                )
+
+        stats = self.stats[provider.provider_name]
+        stats["queried"] += 1
+        stats["failed" if result.error else "succeeded"] += 1
+        stats["total_latency_ms"] += result.latency_ms
+        return key, result
+
+    async def stream(
+        self, companies: Sequence[Tuple[Hashable, str]]
+    ) -> AsyncIterator[Tuple[Hashable, ProviderResult]]:
+        """
+        Yield (key, ProviderResult) for every company x provider pair, in completion order.
+
+        ``companies`` is a sequence of (key, company name); the key is passed
+        through untouched (e.g. the competitor ID). Queries are started in
+        company order, so each company's results tend to finish together.
+        Closing the generator early cancels the queries still pending.
+        """
+        semaphores = {p.provider_name: asyncio.Semaphore(self.concurrency) for p in self.providers}
+        tasks = [
+            asyncio.ensure_future(self._query(provider, semaphores[provider.provider_name], key, name))
+            for key, name in companies
+            for provider in self.providers
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            pending = [t for t in tasks if not t.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
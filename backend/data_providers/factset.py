@@ -13,8 +13,6 @@ Rate Limit: 60 requests/minute
 import logging
 from typing import Optional, Dict, Any
 
-import httpx
-
 from .base_provider import BaseDataProvider
 
 logger = logging.getLogger(__name__)
@@ -42,26 +40,26 @@ class FactSetProvider(BaseDataProvider):
         """Search FactSet for a company by name."""
         await self._rate_limit()
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.post(
-                    f"{self.base_url}/idsearch/v1/idsearch",
-                    json={
-                        "input": {"query": company_name},
-                        "settings": {"result_count": 5},
-                    },
-                    headers=self._get_auth_headers(),
-                )
-                resp.raise_for_status()
-                data = resp.json()
-                results = data.get("typeahead", {}).get("results", [])
-                if not results:
-                    return None
-                top = results[0]
-                return {
-                    "provider_id": top.get("fsymId", top.get("entityId", "")),
-                    "name": top.get("name", company_name),
-                    "ticker": top.get("ticker", ""),
-                }
+            client = self._get_client()
+            resp = await client.post(
+                f"{self.base_url}/idsearch/v1/idsearch",
+                json={
+                    "input": {"query": company_name},
+                    "settings": {"result_count": 5},
+                },
+                headers=self._get_auth_headers(),
+            )
+            resp.raise_for_status()
+            data = resp.json()
+            results = data.get("typeahead", {}).get("results", [])
+            if not results:
+                return None
+            top = results[0]
+            return {
+                "provider_id": top.get("fsymId", top.get("entityId", "")),
+                "name": top.get("name", company_name),
+                "ticker": top.get("ticker", ""),
+            }
         except Exception as e:
             logger.error(f"FactSet search error: {e}")
             return None
@@ -70,25 +68,25 @@ class FactSetProvider(BaseDataProvider):
         """Get company fundamentals and estimates from FactSet."""
         await self._rate_limit()
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.post(
-                    f"{self.base_url}/factset-fundamentals/v2/fundamentals",
-                    json={
-                        "ids": [provider_id],
-                        "metrics": [
-                            "FF_SALES", "FF_NET_INC", "FF_MKT_VAL",
-                            "FF_EMP", "FF_CITY", "FF_STATE_PROV",
-                            "FF_FOUND_DT", "FF_GROSS_MGN",
-                            "FF_SALES_GR", "FF_EPS_EST",
-                            "FF_PE_RATIO", "FF_DIV_YLD",
-                        ],
-                        "periodicity": "ANN",
-                        "currency": "USD",
-                    },
-                    headers=self._get_auth_headers(),
-                )
-                resp.raise_for_status()
-                return resp.json()
+            client = self._get_client()
+            resp = await client.post(
+                f"{self.base_url}/factset-fundamentals/v2/fundamentals",
+                json={
+                    "ids": [provider_id],
+                    "metrics": [
+                        "FF_SALES", "FF_NET_INC", "FF_MKT_VAL",
+                        "FF_EMP", "FF_CITY", "FF_STATE_PROV",
+                        "FF_FOUND_DT", "FF_GROSS_MGN",
+                        "FF_SALES_GR", "FF_EPS_EST",
+                        "FF_PE_RATIO", "FF_DIV_YLD",
+                    ],
+                    "periodicity": "ANN",
+                    "currency": "USD",
+                },
+                headers=self._get_auth_headers(),
+            )
+            resp.raise_for_status()
+            return resp.json()
         except Exception as e:
             logger.error(f"FactSet profile error: {e}")
             return None
@@ -0,0 +1,110 @@
+"""
+Certify Intel - Provider ID Cache
+
+On-disk cache of search_company() resolutions: (provider, company name)
+-> provider ID. Resolving a name costs a rate-limited search call on every
+provider, but the answer rarely changes, so repeat enrichment runs go
+straight to get_company_profile().
+
+Only successful resolutions are stored. Names are matched case- and
+whitespace-insensitively. Entries expire after PROVIDER_ID_CACHE_TTL_DAYS,
+and BaseDataProvider re-searches (and replaces the entry) when a cached ID
+no longer returns a profile.
+
+Config:
+    PROVIDER_ID_CACHE_ENABLED=true
+    PROVIDER_ID_CACHE_PATH=./provider_id_cache.db
+    PROVIDER_ID_CACHE_TTL_DAYS=30
+"""
+
+import os
+import time
+import logging
+from typing import Dict, Optional
+
+from sqlite_cache import SharedCache, SQLiteCache, default_cache_path
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_name(company_name: str) -> str:
+    """Case-fold and collapse whitespace."""
+    return " ".join((company_name or "").casefold().split())
+
+
+class ProviderIdCache(SQLiteCache):
+    """SQLite-backed (provider, normalized name) -> provider ID map."""
+
+    TABLE = "provider_ids"
+    COLUMNS = (
+        "provider TEXT NOT NULL,"
+        " name_key TEXT NOT NULL,"
+        " provider_id TEXT NOT NULL,"
+        " name TEXT,"
+        " resolved_at REAL NOT NULL,"
+        " PRIMARY KEY (provider, name_key)"
+    )
+    KEY = ("provider", "name_key")
+    LRU_COLUMN = None  # Bounded by the TTL, not by size
+
+    def __init__(self, path: Optional[str] = None, ttl_days: Optional[float] = None):
+        super().__init__(path or default_cache_path("PROVIDER_ID_CACHE_PATH", "provider_id_cache.db"))
+        if ttl_days is None:
+            ttl_days = float(os.getenv("PROVIDER_ID_CACHE_TTL_DAYS", "30"))
+        self.ttl_seconds = ttl_days * 86400
+
+    def get(self, provider: str, company_name: str) -> Optional[Dict[str, str]]:
+        """Return {"provider_id", "name"} if resolved within the TTL, else None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT provider_id, name, resolved_at FROM provider_ids "
+                "WHERE provider = ? AND name_key = ?",
+                (provider, normalize_name(company_name)),
+            ).fetchone()
+        if row is None or time.time() - row[2] > self.ttl_seconds:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return {"provider_id": row[0], "name": row[1] or company_name}
+
+    def put(self, provider: str, company_name: str, provider_id: str, name: str) -> None:
+        key = (provider, normalize_name(company_name))
+        with self._lock:
+            exists = self._conn.execute(
+                "SELECT 1 FROM provider_ids WHERE provider = ? AND name_key = ?", key
+            ).fetchone() is not None
+            self._conn.execute(
+                "INSERT OR REPLACE INTO provider_ids "
+                "(provider, name_key, provider_id, name, resolved_at) VALUES (?, ?, ?, ?, ?)",
+                (*key, str(provider_id), name, time.time()),
+            )
+            self._stored(0 if exists else 1)
+            self._conn.commit()
+
+    def forget(self, provider: str, company_name: str) -> None:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM provider_ids WHERE provider = ? AND name_key = ?",
+                (provider, normalize_name(company_name)),
+            )
+            self._removed(cursor.rowcount)
+            self._conn.commit()
+
+
+_shared: SharedCache[ProviderIdCache] = SharedCache(
+    ProviderIdCache, "Provider ID cache unavailable, searching every time"
+)
+
+
+def is_enabled() -> bool:
+    return os.getenv("PROVIDER_ID_CACHE_ENABLED", "true").lower() == "true"
+
+
+def get_provider_id_cache() -> Optional[ProviderIdCache]:
+    """Shared cache instance, or None when disabled or the file can't be opened."""
+    return _shared.get(is_enabled())
+
+
+def reset_provider_id_cache() -> None:
+    """Close and forget the shared instance (tests, config changes)."""
+    _shared.reset()
@@ -12,8 +12,6 @@ Rate Limit: 60 requests/minute
 import logging
 from typing import Optional, Dict, Any
 
-import httpx
-
 from .base_provider import BaseDataProvider
 
 logger = logging.getLogger(__name__)
@@ -38,22 +36,22 @@ class LSEGProvider(BaseDataProvider):
         """Search LSEG for a company by name."""
         await self._rate_limit()
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.get(
-                    f"{self.base_url}/search",
-                    params={"query": company_name, "entityType": "company", "top": 5},
-                    headers=self._get_auth_headers(),
-                )
-                resp.raise_for_status()
-                data = resp.json()
-                hits = data.get("hits", [])
-                if not hits:
-                    return None
-                top = hits[0]
-                return {
-                    "provider_id": top.get("PermID", top.get("RIC", "")),
-                    "name": top.get("DTSubjectName", company_name),
-                }
+            client = self._get_client()
+            resp = await client.get(
+                f"{self.base_url}/search",
+                params={"query": company_name, "entityType": "company", "top": 5},
+                headers=self._get_auth_headers(),
+            )
+            resp.raise_for_status()
+            data = resp.json()
+            hits = data.get("hits", [])
+            if not hits:
+                return None
+            top = hits[0]
+            return {
+                "provider_id": top.get("PermID", top.get("RIC", "")),
+                "name": top.get("DTSubjectName", company_name),
+            }
         except Exception as e:
             logger.error(f"LSEG search error: {e}")
             return None
@@ -69,14 +67,14 @@ class LSEGProvider(BaseDataProvider):
                 "TR.ESGScore", "TR.ESGEnvironmentPillarScore",
                 "TR.GrossMargin", "TR.RevenueGrowth",
             ]
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.get(
-                    f"{self.base_url}/fundamentals/{provider_id}",
-                    params={"fields": ",".join(fields)},
-                    headers=self._get_auth_headers(),
-                )
-                resp.raise_for_status()
-                return resp.json()
+            client = self._get_client()
+            resp = await client.get(
+                f"{self.base_url}/fundamentals/{provider_id}",
+                params={"fields": ",".join(fields)},
+                headers=self._get_auth_headers(),
+            )
+            resp.raise_for_status()
+            return resp.json()
         except Exception as e:
             logger.error(f"LSEG profile error: {e}")
             return None
@@ -13,8 +13,6 @@ Rate Limit: 30 requests/minute
 import logging
 from typing import Optional, Dict, Any
 
-import httpx
-
 from .base_provider import BaseDataProvider
 
 logger = logging.getLogger(__name__)
@@ -41,27 +39,27 @@ class OrbisProvider(BaseDataProvider):
         """Search Orbis for a company by name."""
         await self._rate_limit()
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.post(
-                    f"{self.base_url}/Companies/Search",
-                    json={
-                        "WHERE": [
-                            {"Name": company_name, "MatchType": "Contains"}
-                        ],
-                        "LIMIT": 5,
-                    },
-                    headers=self._get_auth_headers(),
-                )
-                resp.raise_for_status()
-                data = resp.json()
-                companies = data.get("Data", [])
-                if not companies:
-                    return None
-                top = companies[0]
-                return {
-                    "provider_id": top.get("BvDID", ""),
-                    "name": top.get("Name", company_name),
-                }
+            client = self._get_client()
+            resp = await client.post(
+                f"{self.base_url}/Companies/Search",
+                json={
+                    "WHERE": [
+                        {"Name": company_name, "MatchType": "Contains"}
+                    ],
+                    "LIMIT": 5,
+                },
+                headers=self._get_auth_headers(),
+            )
+            resp.raise_for_status()
+            data = resp.json()
+            companies = data.get("Data", [])
+            if not companies:
+                return None
+            top = companies[0]
+            return {
+                "provider_id": top.get("BvDID", ""),
+                "name": top.get("Name", company_name),
+            }
         except Exception as e:
             logger.error(f"Orbis search error: {e}")
             return None
@@ -70,23 +68,23 @@ class OrbisProvider(BaseDataProvider):
         """Get full company profile from Orbis."""
         await self._rate_limit()
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.post(
-                    f"{self.base_url}/Companies/Data",
-                    json={
-                        "BvDID": provider_id,
-                        "SelectionCriteria": [
-                            "Name", "Country", "City", "Postcode",
-                            "OperatingRevenue", "NetIncome", "TotalAssets",
-                            "NumberOfEmployees", "DateOfIncorporation",
-                            "NationalId", "BvDSector", "ConsolidationCode",
-                            "GlobalUltimateOwner", "Shareholders",
-                        ],
-                    },
-                    headers=self._get_auth_headers(),
-                )
-                resp.raise_for_status()
-                return resp.json()
+            client = self._get_client()
+            resp = await client.post(
+                f"{self.base_url}/Companies/Data",
+                json={
+                    "BvDID": provider_id,
+                    "SelectionCriteria": [
+                        "Name", "Country", "City", "Postcode",
+                        "OperatingRevenue", "NetIncome", "TotalAssets",
+                        "NumberOfEmployees", "DateOfIncorporation",
+                        "NationalId", "BvDSector", "ConsolidationCode",
+                        "GlobalUltimateOwner", "Shareholders",
+                    ],
+                },
+                headers=self._get_auth_headers(),
+            )
+            resp.raise_for_status()
+            return resp.json()
         except Exception as e:
             logger.error(f"Orbis profile error: {e}")
             return None
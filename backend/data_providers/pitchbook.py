@@ -12,8 +12,6 @@ Rate Limit: 100 requests/minute (enterprise tier)
 import logging
 from typing import Optional, Dict, Any
 
-import httpx
-
 from .base_provider import BaseDataProvider
 
 logger = logging.getLogger(__name__)
@@ -38,22 +36,22 @@ class PitchBookProvider(BaseDataProvider):
         """Search PitchBook for a company by name."""
         await self._rate_limit()
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.get(
-                    f"{self.base_url}/companies/search",
-                    params={"q": company_name, "limit": 5},
-                    headers=self._get_auth_headers(),
-                )
-                resp.raise_for_status()
-                data = resp.json()
-                companies = data.get("companies", [])
-                if not companies:
-                    return None
-                top = companies[0]
-                return {
-                    "provider_id": top.get("companyId", ""),
-                    "name": top.get("companyName", company_name),
-                }
+            client = self._get_client()
+            resp = await client.get(
+                f"{self.base_url}/companies/search",
+                params={"q": company_name, "limit": 5},
+                headers=self._get_auth_headers(),
+            )
+            resp.raise_for_status()
+            data = resp.json()
+            companies = data.get("companies", [])
+            if not companies:
+                return None
+            top = companies[0]
+            return {
+                "provider_id": top.get("companyId", ""),
+                "name": top.get("companyName", company_name),
+            }
         except Exception as e:
             logger.error(f"PitchBook search error: {e}")
             return None
@@ -62,13 +60,13 @@ class PitchBookProvider(BaseDataProvider):
         """Get full company profile from PitchBook."""
         await self._rate_limit()
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.get(
-                    f"{self.base_url}/companies/{provider_id}",
-                    headers=self._get_auth_headers(),
-                )
-                resp.raise_for_status()
-                return resp.json()
+            client = self._get_client()
+            resp = await client.get(
+                f"{self.base_url}/companies/{provider_id}",
+                headers=self._get_auth_headers(),
+            )
+            resp.raise_for_status()
+            return resp.json()
         except Exception as e:
             logger.error(f"PitchBook profile error: {e}")
             return None
@@ -13,8 +13,6 @@ Rate Limit: 40 requests/minute
 import logging
 from typing import Optional, Dict, Any
 
-import httpx
-
 from .base_provider import BaseDataProvider
 
 logger = logging.getLogger(__name__)
@@ -39,22 +37,22 @@ class PreqinProvider(BaseDataProvider):
         """Search Preqin for a company (as a portfolio company or fund manager)."""
         await self._rate_limit()
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.get(
-                    f"{self.base_url}/portfolio-companies/search",
-                    params={"name": company_name, "limit": 5},
-                    headers=self._get_auth_headers(),
-                )
-                resp.raise_for_status()
-                data = resp.json()
-                companies = data.get("portfolioCompanies", [])
-                if not companies:
-                    return None
-                top = companies[0]
-                return {
-                    "provider_id": str(top.get("portfolioCompanyId", "")),
-                    "name": top.get("name", company_name),
-                }
+            client = self._get_client()
+            resp = await client.get(
+                f"{self.base_url}/portfolio-companies/search",
+                params={"name": company_name, "limit": 5},
+                headers=self._get_auth_headers(),
+            )
+            resp.raise_for_status()
+            data = resp.json()
+            companies = data.get("portfolioCompanies", [])
+            if not companies:
+                return None
+            top = companies[0]
+            return {
+                "provider_id": str(top.get("portfolioCompanyId", "")),
+                "name": top.get("name", company_name),
+            }
         except Exception as e:
             logger.error(f"Preqin search error: {e}")
             return None
@@ -63,14 +61,14 @@ class PreqinProvider(BaseDataProvider):
         """Get portfolio company profile from Preqin."""
         await self._rate_limit()
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.get(
-                    f"{self.base_url}/portfolio-companies/{provider_id}",
-                    params={"include": "deals,investors,financials"},
-                    headers=self._get_auth_headers(),
-                )
-                resp.raise_for_status()
-                return resp.json()
+            client = self._get_client()
+            resp = await client.get(
+                f"{self.base_url}/portfolio-companies/{provider_id}",
+                params={"include": "deals,investors,financials"},
+                headers=self._get_auth_headers(),
+            )
+            resp.raise_for_status()
+            return resp.json()
         except Exception as e:
             logger.error(f"Preqin profile error: {e}")
             return None
@@ -13,8 +13,6 @@ Rate Limit: 50 requests/minute (standard tier)
 import logging
 from typing import Optional, Dict, Any
 
-import httpx
-
 from .base_provider import BaseDataProvider
 
 logger = logging.getLogger(__name__)
@@ -41,22 +39,22 @@ class SPCapitalIQProvider(BaseDataProvider):
         """Search Capital IQ for a company by name."""
         await self._rate_limit()
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.post(
-                    f"{self.base_url}/companies/search",
-                    json={"searchTerm": company_name, "maxResults": 5},
-                    headers=self._get_auth_headers(),
-                )
-                resp.raise_for_status()
-                data = resp.json()
-                results = data.get("results", [])
-                if not results:
-                    return None
-                top = results[0]
-                return {
-                    "provider_id": str(top.get("companyId", "")),
-                    "name": top.get("companyName", company_name),
-                }
+            client = self._get_client()
+            resp = await client.post(
+                f"{self.base_url}/companies/search",
+                json={"searchTerm": company_name, "maxResults": 5},
+                headers=self._get_auth_headers(),
+            )
+            resp.raise_for_status()
+            data = resp.json()
+            results = data.get("results", [])
+            if not results:
+                return None
+            top = results[0]
+            return {
+                "provider_id": str(top.get("companyId", "")),
+                "name": top.get("companyName", company_name),
+            }
         except Exception as e:
             logger.error(f"Capital IQ search error: {e}")
             return None
@@ -71,17 +69,17 @@ class SPCapitalIQProvider(BaseDataProvider):
                 "IQ_COMPANY_HQ_STATE", "IQ_COMPANY_FOUNDED_YEAR",
                 "IQ_EBITDA", "IQ_GROSS_MARGIN", "IQ_REVENUE_EST",
             ]
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.post(
-                    f"{self.base_url}/datapoints",
-                    json={
-                        "companyId": provider_id,
-                        "mnemonics": mnemonics,
-                    },
-                    headers=self._get_auth_headers(),
-                )
-                resp.raise_for_status()
-                return resp.json()
+            client = self._get_client()
+            resp = await client.post(
+                f"{self.base_url}/datapoints",
+                json={
+                    "companyId": provider_id,
+                    "mnemonics": mnemonics,
+                },
+                headers=self._get_auth_headers(),
+            )
+            resp.raise_for_status()
+            return resp.json()
         except Exception as e:
             logger.error(f"Capital IQ profile error: {e}")
             return None
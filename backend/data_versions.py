@@ -0,0 +1,233 @@
+"""
+Certify Intel - Data Versions and Conditional Responses
+=======================================================
+
+Per-table change counters (the data_versions table) and an endpoint
+decorator that turns them into ETags.
+
+A polled list endpoint declares the tables its response is built from:
+
+    @router.get("", response_model=List[CompetitorResponse])
+    @conditional_response(tables=["competitors"])
+    async def list_competitors(..., db: Session = Depends(get_db)):
+        ...
+
+The ETag is a hash of the request path and query, the tables' versions and
+a coarse time bucket. When If-None-Match matches, a 304 is returned before
+the endpoint runs, so nothing is queried or serialized.
+
+Versions are bumped after every commit that inserts, updates or deletes
+rows of a tracked table through the ORM (unit-of-work flushes and bulk
+query().update()/delete()). Writes made with raw SQL are not seen; the
+time bucket (ETAG_VERSION_MAX_AGE seconds, default 300) bounds how long
+such a change can be answered with 304.
+
+Other GET /api JSON responses get body-hash ETags from
+middleware.conditional.ConditionalGetMiddleware.
+"""
+
+import os
+import time
+import asyncio
+import hashlib
+import inspect
+import logging
+from datetime import datetime
+from functools import wraps
+from typing import Callable, Dict, Iterable, Sequence, Set
+
+from fastapi import Request, Response
+from sqlalchemy import event, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from database import DataVersion
+from middleware.conditional import CACHE_CONTROL, etag_matches
+
+logger = logging.getLogger(__name__)
+
+# Tables some endpoint builds an ETag from; only these are counted
+_tracked: Set[str] = set()
+
+_SESSION_KEY = "data_versions_dirty"
+
+
+def version_max_age() -> int:
+    return int(os.getenv("ETAG_VERSION_MAX_AGE", "300"))
+
+
+# =============================================================================
+# VERSIONS
+# =============================================================================
+
+def get_versions(db: Session, tables: Sequence[str]) -> Dict[str, int]:
+    """Current version per table (0 for tables never written)."""
+    rows = db.query(DataVersion.table_name, DataVersion.version).filter(
+        DataVersion.table_name.in_(list(tables))
+    ).all()
+    versions = {name: 0 for name in tables}
+    versions.update({name: version for name, version in rows})
+    return versions
+
+
+def bump_versions(bind: Engine, tables: Iterable[str]) -> None:
+    """Increment the counters for tables in their own short transaction (upsert)."""
+    tables = sorted(set(tables))
+    if not tables:
+        return
+    now = datetime.utcnow()
+    with bind.begin() as conn:
+        dialect = conn.dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            if dialect == "sqlite":
+                from sqlalchemy.dialects.sqlite import insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert
+            stmt = insert(DataVersion).values(
+                [{"table_name": t, "version": 1, "updated_at": now} for t in tables]
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[DataVersion.table_name],
+                set_={"version": DataVersion.version + 1, "updated_at": now},
+            )
+            conn.execute(stmt)
+            return
+        for table in tables:
+            result = conn.execute(
+                update(DataVersion).where(DataVersion.table_name == table).values(
+                    version=DataVersion.version + 1, updated_at=now
+                )
+            )
+            if result.rowcount == 0:
+                conn.execute(DataVersion.__table__.insert().values(
+                    table_name=table, version=1, updated_at=now
+                ))
+
+
+def track_tables(*tables: str) -> None:
+    """Start counting writes to these tables."""
+    _tracked.update(tables)
+
+
+# =============================================================================
+# CHANGE TRACKING
+# =============================================================================
+
+def _mark(session: Session, table_name) -> None:
+    if table_name in _tracked:
+        session.info.setdefault(_SESSION_KEY, set()).add(table_name)
+
+
+def _on_after_flush(session: Session, flush_context) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        _mark(session, getattr(type(obj), "__tablename__", None))
+
+
+def _on_do_orm_execute(orm_execute_state) -> None:
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None:
+            _mark(orm_execute_state.session, mapper.local_table.name)
+
+
+def _on_after_commit(session: Session) -> None:
+    dirty = session.info.pop(_SESSION_KEY, None)
+    if not dirty:
+        return
+    try:
+        bind = session.get_bind()
+        bump_versions(getattr(bind, "engine", bind), dirty)
+    except Exception as e:
+        logger.warning(f"Could not bump data versions for {sorted(dirty)}: {e}")
+
+
+def _on_after_rollback(session: Session) -> None:
+    session.info.pop(_SESSION_KEY, None)
+
+
+_listeners_installed = False
+
+
+def install_version_listeners() -> None:
+    """Bump tracked tables' versions whenever a session commits writes to them (idempotent)."""
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    event.listen(Session, "after_flush", _on_after_flush)
+    event.listen(Session, "do_orm_execute", _on_do_orm_execute)
+    event.listen(Session, "after_commit", _on_after_commit)
+    event.listen(Session, "after_rollback", _on_after_rollback)
+    _listeners_installed = True
+
+
+# =============================================================================
+# ENDPOINT DECORATOR
+# =============================================================================
+
+def version_etag(request: Request, versions: Dict[str, int]) -> str:
+    """Strong ETag for this URL at these table versions (within the current time bucket)."""
+    max_age = version_max_age()
+    bucket = int(time.time() // max_age) if max_age > 0 else 0
+    parts = [request.url.path, str(request.url.query), str(bucket)]
+    parts.extend(f"{name}={versions[name]}" for name in sorted(versions))
+    digest = hashlib.blake2b("\n".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+    return f'"v{digest}"'
+
+
+def conditional_response(tables: Sequence[str], db_param: str = "db"):
+    """
+    Answer If-None-Match with 304 from table versions, before the endpoint runs.
+
+    The endpoint's output must depend only on the request URL and the rows
+    of ``tables`` (not on the current user or the clock). The decorated
+    function needs the DB session as ``db_param``; the Request and Response
+    are injected. Works for ``async def`` and plain ``def`` endpoints.
+    """
+    tables = list(tables)
+    track_tables(*tables)
+
+    def decorator(func: Callable):
+        signature = inspect.signature(func)
+        injected = [
+            inspect.Parameter("_etag_request", inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+            inspect.Parameter("_etag_response", inspect.Parameter.KEYWORD_ONLY, annotation=Response),
+        ]
+
+        def check(kwargs):
+            request = kwargs.pop("_etag_request")
+            response = kwargs.pop("_etag_response")
+            etag = version_etag(request, get_versions(kwargs[db_param], tables))
+            if etag_matches(request.headers.get("if-none-match"), etag):
+                return etag, response, Response(
+                    status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+                )
+            return etag, response, None
+
+        def finish(etag, response):
+            response.headers["ETag"] = etag
+            response.headers["Cache-Control"] = CACHE_CONTROL
+
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                etag, response, not_modified = check(kwargs)
+                if not_modified is not None:
+                    return not_modified
+                result = await func(*args, **kwargs)
+                finish(etag, response)
+                return result
+        else:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                etag, response, not_modified = check(kwargs)
+                if not_modified is not None:
+                    return not_modified
+                result = func(*args, **kwargs)
+                finish(etag, response)
+                return result
+
+        wrapper.__signature__ = signature.replace(
+            parameters=[*signature.parameters.values(), *injected]
+        )
+        return wrapper
+    return decorator
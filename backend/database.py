@@ -17,8 +17,11 @@ INFRASTRUCTURE: ✅ COMPLETE
 ENDPOINT MIGRATION: ⏳ HYBRID APPROACH
 - main.py endpoints: SYNC (237 db.query() calls)
 - Agent modules: Can use async helpers directly
+- Auth dependencies, dashboard threats, chat sessions, team reads: ASYNC
+  (query helpers in repositories/)
 - Reason: Full migration is high-risk with 237 queries
-- Strategy: Gradually migrate high-impact endpoints as needed
+- Strategy: Gradually migrate high-impact endpoints as needed;
+  DB_LOOP_GUARD=warn logs async endpoints still querying with a sync Session
 
 USAGE:
 ------
@@ -43,12 +46,16 @@ Helper functions (async):
 from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey, Index, event, select
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, relationship, declarative_base
-from contextlib import asynccontextmanager
+from collections import Counter
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
 from datetime import datetime
-from typing import AsyncGenerator, Optional
+from typing import AsyncGenerator, Dict, Optional
 import os
 import sys
+import asyncio
 import logging
+import traceback
 
 logger = logging.getLogger(__name__)
 
@@ -229,6 +236,72 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
         finally:
             await session.close()
 
+
+# =============================================================================
+# EVENT LOOP GUARD - flags blocking sync queries inside async code
+# =============================================================================
+# A sync Session query issued from an ``async def`` endpoint runs on the
+# event loop and stalls every other request on the worker. With
+# DB_LOOP_GUARD=warn each offending call site is logged once (and counted
+# in sync_query_sites()); DB_LOOP_GUARD=raise turns them into errors, e.g.
+# in CI. ``def`` endpoints run in the threadpool and are never flagged.
+# Move flagged code to AsyncSession and the helpers in repositories/.
+
+class SyncQueryOnEventLoop(RuntimeError):
+    """A sync database query was issued from the event loop thread."""
+
+
+_sync_db_allowed: ContextVar[bool] = ContextVar("sync_db_allowed", default=False)
+_sync_query_sites: Counter = Counter()
+
+
+@contextmanager
+def allow_sync_db():
+    """Exempt deliberate blocking queries (startup migrations) from the guard."""
+    token = _sync_db_allowed.set(True)
+    try:
+        yield
+    finally:
+        _sync_db_allowed.reset(token)
+
+
+def _loop_guard_mode() -> str:
+    return os.getenv("DB_LOOP_GUARD", "off").lower()
+
+
+def _caller_site() -> str:
+    """First stack frame outside SQLAlchemy and this module."""
+    for frame in reversed(traceback.extract_stack()[:-2]):
+        filename = frame.filename.replace("\\", "/")
+        if "/sqlalchemy/" in filename or filename.endswith("/database.py"):
+            continue
+        return f"{os.path.basename(filename)}:{frame.lineno} in {frame.name}"
+    return "unknown"
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _guard_sync_query_on_loop(conn, cursor, statement, parameters, context, executemany):
+    mode = _loop_guard_mode()
+    if mode not in ("warn", "raise") or _sync_db_allowed.get():
+        return
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return  # worker thread, not the event loop
+
+    site = _caller_site()
+    _sync_query_sites[site] += 1
+    if mode == "raise":
+        raise SyncQueryOnEventLoop(f"Blocking sync query on the event loop at {site}: {statement[:80]}")
+    if _sync_query_sites[site] == 1:
+        logger.warning(f"[!] Blocking sync query on the event loop at {site} (use AsyncSession)")
+
+
+def sync_query_sites() -> Dict[str, int]:
+    """Call sites flagged by the event loop guard, with query counts."""
+    return dict(_sync_query_sites)
+
+
 # ============== Database Models ==============
 
 class Competitor(Base):
@@ -910,6 +983,23 @@ class WebhookConfig(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
+class WebhookOutboxEntry(Base):
+    """An outbound webhook event awaiting delivery (durable across restarts)."""
+    __tablename__ = "webhook_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    webhook_id = Column(String, nullable=False)
+    event_type = Column(String, nullable=False)
+    event = Column(Text, nullable=False)  # JSON-encoded WebhookEvent
+    status = Column(String, default="pending", index=True)  # pending, sending, failed
+    attempts = Column(Integer, default=0)
+    last_error = Column(String, nullable=True)
+    claimed_by = Column(String, nullable=True)  # Delivery worker holding the row while sending
+    lease_until = Column(DateTime, nullable=True)  # Claim expiry; other workers take it over after
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class UserSettings(Base):
     """Personal settings for each user (notification preferences, schedules, etc.)."""
     __tablename__ = "user_settings"
@@ -1003,9 +1093,45 @@ class RefreshSession(Base):
     errors_count = Column(Integer, default=0)
     ai_summary = Column(Text, nullable=True)  # Store the AI-generated summary
     change_details = Column(Text, nullable=True)  # JSON-encoded change details
+    stage_progress = Column(Text, nullable=True)  # JSON: per-stage done/failed/timing (scrape, extract, persist)
     status = Column(String, default="in_progress")  # in_progress, completed, failed
 
 
+class PageFingerprint(Base):
+    """
+    Last-seen fingerprint of a scraped competitor page.
+
+    Lets the refresh job send conditional requests (ETag / Last-Modified)
+    and skip AI extraction when a page's normalized text is unchanged.
+    """
+    __tablename__ = "page_fingerprints"
+
+    id = Column(Integer, primary_key=True, index=True)
+    competitor_id = Column(Integer, ForeignKey("competitors.id"), nullable=False, index=True)
+    url = Column(String, nullable=False)
+    page_type = Column(String, nullable=True)
+    content_hash = Column(String(64), nullable=False)  # sha256 of normalized page text
+    etag = Column(String, nullable=True)
+    last_modified = Column(String, nullable=True)  # Raw Last-Modified header value
+    extraction_json = Column(Text, nullable=True)  # JSON ExtractedData from the last extraction
+    last_checked_at = Column(DateTime, default=datetime.utcnow)
+    last_changed_at = Column(DateTime, default=datetime.utcnow)
+
+
+class DataVersion(Base):
+    """
+    Change counter per table, bumped after each commit that writes to it.
+
+    Lets read-heavy endpoints build ETags (and answer If-None-Match with 304)
+    without running their queries. See data_versions.py.
+    """
+    __tablename__ = "data_versions"
+
+    table_name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
 # ===========================================
 # SALES & MARKETING MODULE TABLES (v5.0.7)
 # ===========================================
@@ -1214,7 +1340,8 @@ class NewsArticleCache(Base):
 
     # Article data
     title = Column(String)
-    url = Column(String, index=True)  # Dedupe key
+    url = Column(String, index=True)
+    url_hash = Column(String(64), nullable=True)  # sha256 of the normalized URL; dedupe key (news_ingest)
     source = Column(String)  # e.g., "TechCrunch", "Reuters"
     source_type = Column(String)  # google_news, sec_edgar, gnews, mediastack, newsdata
     published_at = Column(DateTime, index=True)
@@ -1236,6 +1363,23 @@ class NewsArticleCache(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
+class NewsSourceWatermark(Base):
+    """
+    Newest article seen per (competitor, news source).
+
+    The daily news refresh asks each source only for articles newer than
+    last_published_at, and skips competitors already checked when it
+    resumes an interrupted run.
+    """
+    __tablename__ = "news_source_watermarks"
+
+    id = Column(Integer, primary_key=True, index=True)
+    competitor_id = Column(Integer, ForeignKey("competitors.id"), nullable=False, index=True)
+    source = Column(String, nullable=False)  # google_news, newsapi, gnews, sec_edgar, ...
+    last_published_at = Column(DateTime, nullable=True)
+    last_checked_at = Column(DateTime, nullable=False)
+
+
 class PersistentCache(Base):
     """
     Generic key-value cache persisted to SQLite (v8.0.8).
@@ -1355,6 +1499,8 @@ Index('ix_dimnews_competitor_dim', DimensionNewsTag.competitor_id, DimensionNews
 Index('ix_dimnews_tagged_at', DimensionNewsTag.tagged_at.desc())
 Index('ix_news_competitor_published', NewsArticleCache.competitor_id, NewsArticleCache.published_at.desc())
 Index('ix_news_source_sentiment', NewsArticleCache.source_type, NewsArticleCache.sentiment)
+Index('ux_news_url_hash', NewsArticleCache.url_hash, unique=True)
+Index('ux_news_watermark_competitor_source', NewsSourceWatermark.competitor_id, NewsSourceWatermark.source, unique=True)
 Index('ix_subscription_user_competitor', CompetitorSubscription.user_id, CompetitorSubscription.competitor_id)
 Index('ix_team_membership_user', TeamMembership.team_id, TeamMembership.user_id)
 Index('ix_annotation_competitor_team', CompetitorAnnotation.competitor_id, CompetitorAnnotation.team_id)
@@ -1362,6 +1508,7 @@ Index('ix_team_activity_team_type', TeamActivity.team_id, TeamActivity.activity_
 Index('ix_chat_session_user_context', ChatSession.user_id, ChatSession.page_context)
 Index('ix_chat_session_user_active', ChatSession.user_id, ChatSession.is_active, ChatSession.updated_at.desc())
 Index('ix_chat_message_session_created', ChatMessage.session_id, ChatMessage.created_at)
+Index('ux_page_fingerprint_competitor_url', PageFingerprint.competitor_id, PageFingerprint.url, unique=True)
 
 # =============================================================================
 # TABLE CREATION & DATABASE INITIALIZATION
@@ -1370,6 +1517,14 @@ Index('ix_chat_message_session_created', ChatMessage.session_id, ChatMessage.cre
 # Create tables using sync engine
 Base.metadata.create_all(bind=engine)
 
+# Full-text search index for /api/search (FTS5 on SQLite, tsvector on PostgreSQL)
+from search_index import ensure_search_index  # noqa: E402
+ensure_search_index(engine)
+
+# Unique normalized-URL key for news ingestion (backfills databases created before it)
+from news_ingest import ensure_url_hash_index  # noqa: E402
+ensure_url_hash_index(engine)
+
 # PERF-005: Enable WAL mode for better concurrent access and performance (SQLite only)
 if DATABASE_URL.startswith("sqlite"):
     @event.listens_for(engine, "connect")
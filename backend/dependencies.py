@@ -6,11 +6,12 @@ used across multiple routers and main.py.
 """
 
 import logging
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Request
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from database import get_db, User, ActivityLog
+from database import get_async_db, get_user_by_email, ActivityLog
 
 logger = logging.getLogger(__name__)
 
@@ -18,16 +19,18 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
 
 
 async def get_current_user(
+    request: Request,
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Verify JWT token and return current user with ID. Raises 401 if invalid/missing."""
     if not token:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
-    from extended_features import auth_manager
+    # Decoded at most once per request (the rate limiter may already have)
+    from middleware.pipeline import get_token_payload
 
-    payload = auth_manager.verify_token(token)
+    payload = get_token_payload(request.scope, token)
     if not payload:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
@@ -35,27 +38,28 @@ async def get_current_user(
     if payload.get("mfa_pending"):
         raise HTTPException(status_code=401, detail="MFA verification required")
 
-    user = db.query(User).filter(User.email == payload.get("sub")).first()
+    user = await get_user_by_email(db, payload.get("sub"))
     user_id = user.id if user else None
 
     return {"id": user_id, "email": payload.get("sub"), "role": payload.get("role")}
 
 
 async def get_current_user_optional(
+    request: Request,
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Verify JWT token and return current user, or None if not authenticated. Does not raise errors."""
     if not token:
         return None
 
-    from extended_features import auth_manager
+    from middleware.pipeline import get_token_payload
 
-    payload = auth_manager.verify_token(token)
+    payload = get_token_payload(request.scope, token)
     if not payload:
         return None
 
-    user = db.query(User).filter(User.email == payload.get("sub")).first()
+    user = await get_user_by_email(db, payload.get("sub"))
     user_id = user.id if user else None
 
     return {"id": user_id, "email": payload.get("sub"), "role": payload.get("role")}
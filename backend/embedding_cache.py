@@ -0,0 +1,253 @@
+"""
+Certify Intel - Persistent Embedding Cache
+==========================================
+
+Content-addressed cache for embedding vectors, shared by every embedding
+path (VectorStore.embed_text / batch_embed, KnowledgeBase._batch_embed and
+local_embeddings.embed_text / embed_batch).
+
+Entries are keyed by (model, sha256 of the normalized text) and stored as
+little-endian float32 blobs in a small SQLite file, with an in-process LRU
+in front of it for hot query embeddings. Re-ingesting a document or
+re-running the same agent query only pays for texts that were never
+embedded with that model before; everything else is served from disk.
+
+Config:
+    EMBEDDING_CACHE_ENABLED=true        (set false to always call the provider)
+    EMBEDDING_CACHE_PATH=./embedding_cache.db
+    EMBEDDING_CACHE_MAX_ENTRIES=50000   (least recently used rows are pruned)
+
+Usage:
+    from embedding_cache import cached_embed
+
+    vectors = await cached_embed("text-embedding-3-small", texts, embed_misses)
+
+``embed_misses`` receives only the distinct texts that were not cached and
+must return one vector per text, in order.
+"""
+
+import os
+import time
+import asyncio
+import hashlib
+import logging
+import unicodedata
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from sqlite_cache import SharedCache, SQLiteCache, default_cache_path
+
+logger = logging.getLogger(__name__)
+
+# SQLite's default limit on bound parameters is 999 on older builds
+_LOOKUP_CHUNK = 500
+
+
+def normalize_text(text: str) -> str:
+    """Unicode-normalize and collapse whitespace; case is kept (it changes embeddings)."""
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+def text_key(text: str) -> str:
+    """sha256 hex digest of the normalized text."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache(SQLiteCache):
+    """Disk-backed (model, text hash) -> float32 vector cache."""
+
+    TABLE = "embeddings"
+    COLUMNS = (
+        "model TEXT NOT NULL,"
+        " text_hash TEXT NOT NULL,"
+        " dim INTEGER NOT NULL,"
+        " vector BLOB NOT NULL,"
+        " last_used_at REAL NOT NULL,"
+        " PRIMARY KEY (model, text_hash)"
+    )
+    KEY = ("model", "text_hash")
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        memory_entries: int = 2048,
+    ):
+        super().__init__(
+            path or default_cache_path("EMBEDDING_CACHE_PATH", "embedding_cache.db"),
+            max_entries=max_entries or int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "50000")),
+        )
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+
+    # -------------------------------------------------------------------------
+    # Lookups
+    # -------------------------------------------------------------------------
+
+    def _remember(self, key: Tuple[str, str], vector: np.ndarray) -> None:
+        vector.setflags(write=False)  # Shared by every hit; callers get copies
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get_many(self, model: str, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Return {text_hash: vector} for the keys that are cached."""
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            pending = []
+            for key in keys:
+                vector = self._memory.get((model, key))
+                if vector is not None:
+                    self._memory.move_to_end((model, key))
+                    found[key] = vector
+                else:
+                    pending.append(key)
+
+            for i in range(0, len(pending), _LOOKUP_CHUNK):
+                chunk = pending[i:i + _LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings "
+                    f"WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *chunk],
+                ).fetchall()
+                for text_hash, blob in rows:
+                    vector = np.frombuffer(blob, dtype="<f4").copy()
+                    found[text_hash] = vector
+                    self._remember((model, text_hash), vector)
+
+            if pending and found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used_at = ? WHERE model = ? AND text_hash = ?",
+                    [(now, model, k) for k in pending if k in found],
+                )
+                self._conn.commit()
+        return found
+
+    def put_many(self, model: str, items: Sequence[Tuple[str, np.ndarray]]) -> None:
+        """Store (text_hash, vector) pairs, pruning least recently used rows past max_entries."""
+        if not items:
+            return
+        now = time.time()
+        rows = []
+        with self._lock:
+            for key, vector in items:
+                vector = np.array(vector, dtype="<f4")
+                self._remember((model, key), vector)
+                rows.append((model, key, int(vector.shape[0]), vector.tobytes(), now))
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (model, text_hash, dim, vector, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._stored(self._conn.total_changes - before)
+            self._conn.commit()
+
+    # -------------------------------------------------------------------------
+    # Maintenance
+    # -------------------------------------------------------------------------
+
+    def record(self, model: str, hits: int, misses: int) -> None:
+        """Count a lookup and export it to the metrics module."""
+        self.hits += hits
+        self.misses += misses
+        try:
+            from metrics import track_embedding_cache
+            track_embedding_cache(model, hits=hits, misses=misses)
+        except Exception:
+            pass
+
+    def stats(self) -> Dict[str, object]:
+        return {**super().stats(), "memory_entries": len(self._memory)}
+
+    def clear(self) -> None:
+        super().clear()
+        with self._lock:
+            self._memory.clear()
+
+
+# =============================================================================
+# SHARED INSTANCE + HELPERS
+# =============================================================================
+
+_shared: SharedCache[EmbeddingCache] = SharedCache(
+    EmbeddingCache, "Embedding cache unavailable, embedding without it"
+)
+
+
+def is_enabled() -> bool:
+    return os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """Shared cache instance, or None when disabled or the file can't be opened."""
+    return _shared.get(is_enabled())
+
+
+def reset_embedding_cache() -> None:
+    """Close and forget the shared instance (tests, config changes)."""
+    _shared.reset()
+
+
+def _plan(cache: EmbeddingCache, model: str, texts: Sequence[str]):
+    """Split texts into cached vectors and the distinct texts still to embed."""
+    keys = [text_key(t) for t in texts]
+    found = cache.get_many(model, list(dict.fromkeys(keys)))
+    misses: Dict[str, str] = {}
+    for key, text in zip(keys, texts):
+        if key not in found and key not in misses:
+            misses[key] = text
+    cache.record(model, hits=sum(1 for k in keys if k in found), misses=len(misses))
+    return keys, found, misses
+
+
+def _assemble(cache, model, keys, found, misses, vectors) -> List[np.ndarray]:
+    if len(vectors) != len(misses):
+        raise ValueError(f"Embedding provider returned {len(vectors)} vectors for {len(misses)} texts")
+    fresh = [(key, np.asarray(vec, dtype=np.float32)) for key, vec in zip(misses, vectors)]
+    cache.put_many(model, fresh)
+    found.update(fresh)
+    # Copies, so a caller editing its vectors can't change the cached ones
+    return [found[key].copy() for key in keys]
+
+
+async def cached_embed(
+    model: str,
+    texts: Sequence[str],
+    embed_misses: Callable[[List[str]], Awaitable[Sequence]],
+) -> List[np.ndarray]:
+    """Embed texts, sending only cache misses (deduplicated) to ``embed_misses``.
+
+    Cache reads and writes (SQLite) run in a worker thread.
+    """
+    texts = list(texts)
+    cache = get_embedding_cache()
+    if cache is None:
+        return [np.asarray(v, dtype=np.float32) for v in await embed_misses(texts)] if texts else []
+    if not texts:
+        return []
+    keys, found, misses = await asyncio.to_thread(_plan, cache, model, texts)
+    vectors = await embed_misses(list(misses.values())) if misses else []
+    return await asyncio.to_thread(_assemble, cache, model, keys, found, misses, vectors)
+
+
+def cached_embed_sync(
+    model: str,
+    texts: Sequence[str],
+    embed_misses: Callable[[List[str]], Sequence],
+) -> List[np.ndarray]:
+    """Synchronous cached_embed for blocking providers (local sentence-transformers)."""
+    texts = list(texts)
+    cache = get_embedding_cache()
+    if cache is None:
+        return [np.asarray(v, dtype=np.float32) for v in embed_misses(texts)] if texts else []
+    if not texts:
+        return []
+    keys, found, misses = _plan(cache, model, texts)
+    vectors = embed_misses(list(misses.values())) if misses else []
+    return _assemble(cache, model, keys, found, misses, vectors)
@@ -516,7 +516,7 @@ class KnowledgeBase:
         return [s.strip() for s in sentences if s.strip()]
 
     async def _batch_embed(self, texts: List[str]) -> List[List[float]]:
-        """Batch embed texts using local model or OpenAI."""
+        """Batch embed texts using local model or OpenAI; cached texts are not re-embedded."""
         if USE_LOCAL_EMBEDDINGS:
             try:
                 from local_embeddings import embed_batch
@@ -530,6 +530,12 @@ class KnowledgeBase:
                     "falling back to OpenAI"
                 )
 
+        from embedding_cache import cached_embed
+        vectors = await cached_embed(self.embedding_model, texts, self._embed_openai)
+        return [v.tolist() for v in vectors]
+
+    async def _embed_openai(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts with OpenAI (cache misses only, see _batch_embed)."""
         client = await self._get_openai_client()
 
         all_embeddings = []
@@ -11,7 +11,7 @@ Config:
 
 import os
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator
 
 logger = logging.getLogger(__name__)
 
@@ -82,6 +82,41 @@ class LiteLLMProvider:
             "tokens_output": tokens,
         }
 
+    async def stream(
+        self,
+        prompt: str,
+        model: str = "gpt-4o",
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        usage: Optional[Dict[str, int]] = None,
+    ) -> AsyncIterator[str]:
+        """Stream text chunks via LiteLLM proxy; token counts go to ``usage``."""
+        client = self._get_client()
+        if not client:
+            raise RuntimeError("LiteLLM client not available")
+
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        stream = await client.chat.completions.create(
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+
+        async for chunk in stream:
+            if chunk.usage and usage is not None:
+                usage["tokens_input"] = chunk.usage.prompt_tokens
+                usage["tokens_output"] = chunk.usage.completion_tokens
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
     async def health_check(self) -> bool:
         """Check if LiteLLM proxy is reachable."""
         try:
@@ -6,6 +6,9 @@ Free embeddings using sentence-transformers all-MiniLM-L6-v2.
 
 Config:
     USE_LOCAL_EMBEDDINGS=false (default OFF, uses OpenAI)
+
+Vectors are cached on disk by text hash (embedding_cache.py), so only
+texts this model has not seen before are encoded.
 """
 
 import os
@@ -38,20 +41,32 @@ def _get_model():
     return _model
 
 
+def _cache_model_key() -> str:
+    return f"sentence-transformers/{_model_name}"
+
+
 def embed_text(text: str) -> List[float]:
     """Embed a single text string. Returns 384-dim vector."""
-    model = _get_model()
-    embedding = model.encode(text, convert_to_numpy=True)
-    return embedding.tolist()
+    from embedding_cache import cached_embed_sync
+
+    def _encode(misses):
+        model = _get_model()
+        return [model.encode(misses[0], convert_to_numpy=True)]
+
+    return cached_embed_sync(_cache_model_key(), [text], _encode)[0].tolist()
 
 
 def embed_batch(texts: List[str]) -> List[List[float]]:
     """Embed a batch of texts. Returns list of 384-dim vectors."""
     if not texts:
         return []
-    model = _get_model()
-    embeddings = model.encode(texts, convert_to_numpy=True, batch_size=32)
-    return embeddings.tolist()
+    from embedding_cache import cached_embed_sync
+
+    def _encode(misses):
+        model = _get_model()
+        return model.encode(misses, convert_to_numpy=True, batch_size=32)
+
+    return [v.tolist() for v in cached_embed_sync(_cache_model_key(), texts, _encode)]
 
 
 def get_embedding_dimension() -> int:
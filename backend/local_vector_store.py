@@ -0,0 +1,743 @@
+"""
+Certify Intel - Embedded Vector Index
+=====================================
+
+In-process fallback for VectorStore when PostgreSQL + pgvector is not
+available (desktop/SQLite deployments, field laptops, CI).
+
+Storage (under LOCAL_VECTOR_INDEX_DIR, default ./vector_index):
+- vectors.f32: row-major float32 matrix of L2-normalized embeddings,
+  memory-mapped for search
+- index.db: SQLite catalog of documents and chunk rows (content,
+  metadata, tombstones); a chunk's row_id is its row in vectors.f32
+- ivf.npz: optional IVF partitioning (k-means centroids + row lists)
+
+Search is cosine similarity computed as a dot product against the
+normalized rows in NumPy blocks. Metadata filters (same containment
+semantics as the JSONB @> filter in VectorStore) are applied before
+scoring. Once the corpus passes LOCAL_VECTOR_IVF_MIN_ROWS rows an IVF
+index is built and only the nprobe nearest partitions are scored.
+
+Usage:
+    from vector_store import get_vector_store
+
+    store = get_vector_store()  # LocalVectorStore when pgvector is absent
+    results = await store.search("pricing strategy", limit=10)
+"""
+
+import os
+import sys
+import json
+import asyncio
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from vector_store import VectorStore, SearchResult, DocumentChunk, _embedding_cache_stats
+
+logger = logging.getLogger(__name__)
+
+
+def _default_index_dir() -> str:
+    """Index directory, next to the exe for PyInstaller builds (like the SQLite DB)."""
+    configured = os.getenv("LOCAL_VECTOR_INDEX_DIR")
+    if configured:
+        return configured
+    if getattr(sys, 'frozen', False):
+        return os.path.join(os.path.dirname(sys.executable), "vector_index")
+    return "./vector_index"
+
+
+def _metadata_contains(metadata: Dict[str, Any], flt: Dict[str, Any]) -> bool:
+    """JSONB-style containment: every key/value in flt is present in metadata."""
+    for key, expected in flt.items():
+        if key not in metadata:
+            return False
+        actual = metadata[key]
+        if isinstance(expected, dict):
+            if not isinstance(actual, dict) or not _metadata_contains(actual, expected):
+                return False
+        elif isinstance(actual, list):
+            wanted = expected if isinstance(expected, list) else [expected]
+            if not all(item in actual for item in wanted):
+                return False
+        elif actual != expected:
+            return False
+    return True
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize rows; all-zero rows stay zero."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class LocalVectorStore(VectorStore):
+    """
+    Embedded vector store with the VectorStore interface.
+
+    Embedding (embed_text / batch_embed) is inherited; when
+    USE_LOCAL_EMBEDDINGS=true the local sentence-transformers model is used
+    instead so query vectors match what KnowledgeBase ingested.
+    """
+
+    BACKEND = "local"
+    INDEX_TYPE_FLAT = "flat"
+    INDEX_TYPE_IVF = "ivf"
+
+    # Rows scored per NumPy block; bounds peak memory on large corpora
+    BLOCK_ROWS = 65536
+
+    def __init__(
+        self,
+        index_dir: Optional[str] = None,
+        ivf_min_rows: Optional[int] = None,
+        nprobe: Optional[int] = None
+    ):
+        super().__init__(connection_string="local", pool_size=0)
+        self.connection_string = None
+        self.index_dir = index_dir or _default_index_dir()
+        self.ivf_min_rows = ivf_min_rows or int(os.getenv("LOCAL_VECTOR_IVF_MIN_ROWS", "20000"))
+        self.nprobe = nprobe or int(os.getenv("LOCAL_VECTOR_NPROBE", "8"))
+        self.use_local_embeddings = os.getenv("USE_LOCAL_EMBEDDINGS", "false").lower() == "true"
+
+        os.makedirs(self.index_dir, exist_ok=True)
+        self._vectors_path = os.path.join(self.index_dir, "vectors.f32")
+        self._ivf_path = os.path.join(self.index_dir, "ivf.npz")
+
+        self._lock = threading.RLock()
+        self._catalog = sqlite3.connect(
+            os.path.join(self.index_dir, "index.db"), check_same_thread=False
+        )
+        self._init_catalog()
+
+        # In-memory view of the catalog, loaded on first use
+        self._loaded = False
+        self._dim: Optional[int] = None
+        self._row_meta: List[Optional[Dict[str, Any]]] = []  # None = deleted row
+        self._alive = np.zeros(0, dtype=bool)
+        self._matrix: Optional[np.memmap] = None
+        self._centroids: Optional[np.ndarray] = None
+        self._assign: Optional[np.ndarray] = None  # row -> IVF list (-1 = deleted)
+
+    # =========================================================================
+    # CATALOG / STATE
+    # =========================================================================
+
+    def _init_catalog(self):
+        with self._lock:
+            self._catalog.executescript("""
+                PRAGMA journal_mode=WAL;
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+                CREATE TABLE IF NOT EXISTS documents (
+                    id TEXT PRIMARY KEY,
+                    filename TEXT,
+                    file_type TEXT,
+                    content_hash TEXT UNIQUE,
+                    uploaded_by TEXT,
+                    file_size_bytes INTEGER DEFAULT 0,
+                    metadata TEXT,
+                    chunk_count INTEGER DEFAULT 0,
+                    created_at TEXT,
+                    updated_at TEXT
+                );
+                CREATE TABLE IF NOT EXISTS chunks (
+                    row_id INTEGER PRIMARY KEY,
+                    document_id TEXT NOT NULL,
+                    chunk_index INTEGER NOT NULL,
+                    content TEXT,
+                    token_count INTEGER DEFAULT 0,
+                    metadata TEXT,
+                    deleted INTEGER DEFAULT 0
+                );
+                CREATE INDEX IF NOT EXISTS ix_chunks_document
+                    ON chunks (document_id, chunk_index);
+            """)
+            self._catalog.commit()
+
+    def _ensure_loaded(self):
+        """Load row metadata, liveness and IVF state from disk (once)."""
+        with self._lock:
+            if self._loaded:
+                return
+            row = self._catalog.execute("SELECT value FROM meta WHERE key = 'dim'").fetchone()
+            self._dim = int(row[0]) if row else None
+
+            count = self._catalog.execute("SELECT COALESCE(MAX(row_id) + 1, 0) FROM chunks").fetchone()[0]
+            self._row_meta = [None] * count
+            self._alive = np.zeros(count, dtype=bool)
+            for row_id, metadata in self._catalog.execute(
+                "SELECT row_id, metadata FROM chunks WHERE deleted = 0"
+            ):
+                self._row_meta[row_id] = json.loads(metadata) if metadata else {}
+                self._alive[row_id] = True
+
+            if os.path.exists(self._ivf_path):
+                try:
+                    data = np.load(self._ivf_path)
+                    if len(data["assign"]) == count:
+                        self._centroids = data["centroids"]
+                        self._assign = data["assign"]
+                    else:
+                        logger.warning("IVF index out of date; falling back to flat search")
+                except Exception as e:
+                    logger.warning(f"Could not load IVF index: {e}")
+            self._matrix = None
+            self._loaded = True
+
+    def _rows(self) -> int:
+        return len(self._row_meta)
+
+    def _matrix_view(self) -> Optional[np.ndarray]:
+        """Memory-mapped (rows x dim) matrix of normalized embeddings."""
+        n = self._rows()
+        if n == 0 or self._dim is None:
+            return None
+        if self._matrix is None or self._matrix.shape[0] != n:
+            self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(n, self._dim))
+        return self._matrix
+
+    def _save_ivf(self):
+        if self._centroids is None or self._assign is None:
+            return
+        tmp = self._ivf_path + ".tmp.npz"
+        np.savez(tmp, centroids=self._centroids, assign=self._assign)
+        os.replace(tmp, self._ivf_path)
+
+    # =========================================================================
+    # EMBEDDING
+    # =========================================================================
+
+    async def embed_text(self, text: str) -> np.ndarray:
+        if self.use_local_embeddings:
+            from local_embeddings import embed_text as local_embed_text
+            return np.array(await asyncio.to_thread(local_embed_text, text), dtype=np.float32)
+        return await super().embed_text(text)
+
+    async def batch_embed(self, texts: List[str]) -> List[np.ndarray]:
+        if self.use_local_embeddings:
+            from local_embeddings import embed_batch as local_embed_batch
+            vectors = await asyncio.to_thread(local_embed_batch, texts)
+            return [np.array(v, dtype=np.float32) for v in vectors]
+        return await super().batch_embed(texts)
+
+    # =========================================================================
+    # SEARCH
+    # =========================================================================
+
+    async def search(
+        self,
+        query: str,
+        limit: int = 10,
+        min_similarity: float = 0.7,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        timeout_seconds: float = 15.0
+    ) -> List[SearchResult]:
+        """Semantic search; skips embedding the query when the index is empty."""
+        self._ensure_loaded()
+        if not self._alive.any():
+            return []
+        return await super().search(
+            query, limit=limit, min_similarity=min_similarity,
+            filter_metadata=filter_metadata, timeout_seconds=timeout_seconds
+        )
+
+    async def search_by_embedding(
+        self,
+        embedding: np.ndarray,
+        limit: int = 10,
+        min_similarity: float = 0.7,
+        filter_metadata: Optional[Dict[str, Any]] = None
+    ) -> List[SearchResult]:
+        """
+        Search by pre-computed embedding vector.
+
+        Args:
+            embedding: Query embedding vector
+            limit: Maximum results to return
+            min_similarity: Minimum cosine similarity (0-1)
+            filter_metadata: Metadata containment filter, applied before scoring
+
+        Returns:
+            List of SearchResult objects ordered by similarity
+        """
+        return await asyncio.to_thread(
+            self._search_sync, embedding, limit, min_similarity, filter_metadata
+        )
+
+    def _candidate_rows(self, query: np.ndarray, filter_metadata: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """Row ids to score, or None for every row (the contiguous fast path)."""
+        mask = None
+        if self._centroids is not None and self._assign is not None:
+            nprobe = min(self.nprobe, len(self._centroids))
+            probes = np.argpartition(-(self._centroids @ query), nprobe - 1)[:nprobe]
+            mask = np.isin(self._assign, probes)
+        if filter_metadata:
+            meta_mask = np.fromiter(
+                (m is not None and _metadata_contains(m, filter_metadata) for m in self._row_meta),
+                dtype=bool, count=self._rows()
+            )
+            mask = meta_mask if mask is None else mask & meta_mask
+        if mask is None:
+            return None if self._alive.all() else np.flatnonzero(self._alive)
+        return np.flatnonzero(mask & self._alive)
+
+    def _search_sync(
+        self,
+        embedding,
+        limit: int,
+        min_similarity: float,
+        filter_metadata: Optional[Dict[str, Any]]
+    ) -> List[SearchResult]:
+        self._ensure_loaded()
+        with self._lock:
+            matrix = self._matrix_view()
+            if matrix is None or limit <= 0:
+                return []
+            query = np.asarray(embedding, dtype=np.float32).reshape(-1)
+            if query.shape[0] != self._dim:
+                raise ValueError(
+                    f"Query embedding has {query.shape[0]} dimensions; index has {self._dim}"
+                )
+            norm = np.linalg.norm(query)
+            if norm == 0:
+                return []
+            query = query / norm
+            candidates = self._candidate_rows(query, filter_metadata)
+
+        total = matrix.shape[0] if candidates is None else len(candidates)
+        best_rows = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+
+        for start in range(0, total, self.BLOCK_ROWS):
+            if candidates is None:
+                rows = np.arange(start, min(start + self.BLOCK_ROWS, total))
+                block = matrix[start:start + self.BLOCK_ROWS]
+            else:
+                rows = candidates[start:start + self.BLOCK_ROWS]
+                block = matrix[rows]
+            scores = block @ query
+            keep = scores >= min_similarity
+            if not keep.any():
+                continue
+            best_rows = np.concatenate([best_rows, rows[keep]])
+            best_scores = np.concatenate([best_scores, scores[keep]])
+            if len(best_scores) > limit:
+                top = np.argpartition(-best_scores, limit - 1)[:limit]
+                best_rows, best_scores = best_rows[top], best_scores[top]
+
+        if len(best_rows) == 0:
+            return []
+        order = np.argsort(-best_scores)
+        best_rows, best_scores = best_rows[order], best_scores[order]
+
+        row_ids = [int(r) for r in best_rows]
+        placeholders = ",".join("?" * len(row_ids))
+        with self._lock:
+            found = {
+                row[0]: row for row in self._catalog.execute(
+                    f"SELECT row_id, document_id, content, metadata FROM chunks "
+                    f"WHERE row_id IN ({placeholders})",
+                    row_ids
+                )
+            }
+
+        results = []
+        for row_id, score in zip(row_ids, best_scores):
+            row = found.get(row_id)
+            if row is None:
+                continue
+            results.append(SearchResult(
+                chunk_id=row_id,
+                document_id=row[1],
+                content=row[2],
+                metadata=json.loads(row[3]) if row[3] else {},
+                similarity=float(score)
+            ))
+        return results
+
+    # =========================================================================
+    # WRITES
+    # =========================================================================
+
+    async def insert_document(
+        self,
+        document_id: str,
+        filename: str,
+        file_type: str,
+        content_hash: str,
+        uploaded_by: str,
+        file_size_bytes: int = 0,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Insert a knowledge document record, or return existing document ID if duplicate.
+
+        Returns:
+            document_id if inserted, or existing document ID if duplicate content_hash
+        """
+        def _insert() -> str:
+            with self._lock:
+                existing = self._catalog.execute(
+                    "SELECT id FROM documents WHERE content_hash = ?", (content_hash,)
+                ).fetchone()
+                if existing:
+                    return existing[0]
+                now = datetime.utcnow().isoformat()
+                self._catalog.execute(
+                    "INSERT INTO documents (id, filename, file_type, content_hash, uploaded_by, "
+                    "file_size_bytes, metadata, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (document_id, filename, file_type, content_hash, uploaded_by,
+                     file_size_bytes, json.dumps(metadata or {}), now, now)
+                )
+                self._catalog.commit()
+                return document_id
+
+        return await asyncio.to_thread(_insert)
+
+    async def batch_insert_chunks(
+        self,
+        document_id: str,
+        chunks: List[DocumentChunk]
+    ) -> int:
+        """
+        Batch insert document chunks with embeddings.
+
+        Re-inserting an existing (document_id, chunk_index) replaces it, like
+        the ON CONFLICT upsert in the pgvector store.
+
+        Returns:
+            Number of chunks inserted
+        """
+        if not chunks:
+            return 0
+        return await asyncio.to_thread(self._insert_chunks_sync, document_id, chunks)
+
+    async def bulk_insert_chunks(
+        self,
+        chunks_by_document: Dict[str, List[DocumentChunk]],
+        batch_rows: Optional[int] = None,
+        rebuild_index: Optional[str] = None
+    ) -> int:
+        """
+        Load chunks for many documents in a single worker thread.
+
+        Any ``rebuild_index`` value builds the IVF index once after the
+        load; there is no HNSW/DiskANN here. ``batch_rows`` is unused.
+        """
+        def _load():
+            return sum(
+                self._insert_chunks_sync(document_id, chunks)
+                for document_id, chunks in chunks_by_document.items() if chunks
+            )
+
+        total = await asyncio.to_thread(_load)
+        if rebuild_index:
+            await self.build_ivf_index()
+        return total
+
+    def _insert_chunks_sync(self, document_id: str, chunks: List[DocumentChunk]) -> int:
+        embeddings = np.asarray(
+            [np.asarray(c.embedding, dtype=np.float32).reshape(-1) for c in chunks],
+            dtype=np.float32
+        )
+        embeddings = _normalize_rows(embeddings)
+
+        self._ensure_loaded()
+        with self._lock:
+            if self._dim is None:
+                self._dim = embeddings.shape[1]
+                self._catalog.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('dim', ?)", (str(self._dim),)
+                )
+            elif embeddings.shape[1] != self._dim:
+                raise ValueError(
+                    f"Embedding has {embeddings.shape[1]} dimensions; index has {self._dim}"
+                )
+
+            # Tombstone rows being replaced
+            indices = [c.chunk_index for c in chunks]
+            replaced = []
+            for i in range(0, len(indices), 500):
+                part = indices[i:i + 500]
+                replaced.extend(r[0] for r in self._catalog.execute(
+                    f"SELECT row_id FROM chunks WHERE document_id = ? AND deleted = 0 "
+                    f"AND chunk_index IN ({','.join('?' * len(part))})",
+                    [document_id, *part]
+                ))
+            self._tombstone(replaced)
+
+            # Append vectors first; the catalog commit below is what makes them
+            # visible, and any orphaned tail from a crash is truncated here
+            start = self._rows()
+            row_bytes = self._dim * 4
+            mode = "r+b" if os.path.exists(self._vectors_path) else "wb"
+            with open(self._vectors_path, mode) as f:
+                f.truncate(start * row_bytes)
+                f.seek(start * row_bytes)
+                f.write(embeddings.tobytes())
+
+            self._catalog.executemany(
+                "INSERT INTO chunks (row_id, document_id, chunk_index, content, token_count, metadata) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (start + i, document_id, c.chunk_index, c.content, c.token_count or 0,
+                     json.dumps(c.metadata or {}))
+                    for i, c in enumerate(chunks)
+                ]
+            )
+            self._catalog.execute(
+                "UPDATE documents SET chunk_count = (SELECT COUNT(*) FROM chunks "
+                "WHERE document_id = ? AND deleted = 0), updated_at = ? WHERE id = ?",
+                (document_id, datetime.utcnow().isoformat(), document_id)
+            )
+            self._catalog.commit()
+
+            self._row_meta.extend(c.metadata or {} for c in chunks)
+            self._alive = np.concatenate([self._alive, np.ones(len(chunks), dtype=bool)])
+            self._matrix = None
+
+            if self._centroids is not None:
+                assign = np.argmax(embeddings @ self._centroids.T, axis=1).astype(np.int32)
+                self._assign = np.concatenate([self._assign, assign])
+                self._save_ivf()
+            elif int(self._alive.sum()) >= self.ivf_min_rows:
+                self._build_ivf_sync()
+
+        return len(chunks)
+
+    def _tombstone(self, row_ids: List[int]):
+        """Mark rows deleted in the catalog and in memory. Caller commits."""
+        if not row_ids:
+            return
+        for i in range(0, len(row_ids), 500):
+            part = row_ids[i:i + 500]
+            self._catalog.execute(
+                f"UPDATE chunks SET deleted = 1 WHERE row_id IN ({','.join('?' * len(part))})", part
+            )
+        for row_id in row_ids:
+            self._row_meta[row_id] = None
+            self._alive[row_id] = False
+            if self._assign is not None:
+                self._assign[row_id] = -1
+        if self._assign is not None:
+            self._save_ivf()
+
+    async def delete_document(self, document_id: str) -> bool:
+        """
+        Delete a document and all its chunks.
+
+        Returns:
+            True if deleted, False if not found
+        """
+        def _delete() -> bool:
+            self._ensure_loaded()
+            with self._lock:
+                rows = [r[0] for r in self._catalog.execute(
+                    "SELECT row_id FROM chunks WHERE document_id = ? AND deleted = 0", (document_id,)
+                )]
+                self._tombstone(rows)
+                deleted = self._catalog.execute(
+                    "DELETE FROM documents WHERE id = ?", (document_id,)
+                ).rowcount
+                self._catalog.commit()
+                return deleted > 0
+
+        return await asyncio.to_thread(_delete)
+
+    async def get_document_chunks(
+        self,
+        document_id: str
+    ) -> List[Dict[str, Any]]:
+        """Get all chunks for a document (without embeddings)."""
+        with self._lock:
+            rows = self._catalog.execute(
+                "SELECT chunk_index, content, token_count, metadata FROM chunks "
+                "WHERE document_id = ? AND deleted = 0 ORDER BY chunk_index",
+                (document_id,)
+            ).fetchall()
+        return [
+            {
+                "chunk_index": row[0],
+                "content": row[1],
+                "token_count": row[2],
+                "metadata": json.loads(row[3]) if row[3] else {}
+            }
+            for row in rows
+        ]
+
+    async def compact(self) -> Dict[str, int]:
+        """Rewrite vectors.f32 without tombstoned rows and renumber the catalog."""
+        return await asyncio.to_thread(self._compact_sync)
+
+    def _compact_sync(self) -> Dict[str, int]:
+        self._ensure_loaded()
+        with self._lock:
+            before = self._rows()
+            live = np.flatnonzero(self._alive)
+            matrix = self._matrix_view()
+            tmp = self._vectors_path + ".tmp"
+            with open(tmp, "wb") as f:
+                for start in range(0, len(live), self.BLOCK_ROWS):
+                    f.write(np.ascontiguousarray(matrix[live[start:start + self.BLOCK_ROWS]]).tobytes())
+
+            self._catalog.execute("DELETE FROM chunks WHERE deleted = 1")
+            # live is ascending and new_id <= old_id, so renumbering in order never collides
+            self._catalog.executemany(
+                "UPDATE chunks SET row_id = ? WHERE row_id = ?",
+                [(new_id, int(old_id)) for new_id, old_id in enumerate(live) if new_id != old_id]
+            )
+            self._matrix = None
+            os.replace(tmp, self._vectors_path)
+            self._catalog.commit()
+
+            had_ivf = self._centroids is not None
+            self._row_meta = [self._row_meta[i] for i in live]
+            self._alive = np.ones(len(live), dtype=bool)
+            self._centroids = self._assign = None
+            if os.path.exists(self._ivf_path):
+                os.remove(self._ivf_path)
+            if had_ivf:
+                self._build_ivf_sync()
+            return {"rows_before": before, "rows_after": len(live)}
+
+    # =========================================================================
+    # IVF INDEX
+    # =========================================================================
+
+    async def build_ivf_index(self, nlist: Optional[int] = None, iterations: int = 10) -> bool:
+        """
+        Partition the corpus with spherical k-means for faster search.
+
+        Args:
+            nlist: Number of partitions (default: ~sqrt(rows))
+            iterations: k-means iterations
+
+        Returns:
+            True if an index was built
+        """
+        return await asyncio.to_thread(self._build_ivf_sync, nlist, iterations)
+
+    def _build_ivf_sync(self, nlist: Optional[int] = None, iterations: int = 10) -> bool:
+        self._ensure_loaded()
+        with self._lock:
+            matrix = self._matrix_view()
+            live = np.flatnonzero(self._alive)
+            if matrix is None or len(live) < 2:
+                return False
+            nlist = int(nlist or max(1, np.sqrt(len(live))))
+            nlist = max(1, min(nlist, len(live)))
+
+            # Train on a sample; assignment of the full corpus happens after
+            rng = np.random.default_rng(0)
+            sample_ids = live if len(live) <= nlist * 256 else rng.choice(live, nlist * 256, replace=False)
+            sample = np.asarray(matrix[np.sort(sample_ids)])
+            centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+            for _ in range(iterations):
+                labels = np.argmax(sample @ centroids.T, axis=1)
+                for k in range(nlist):
+                    members = sample[labels == k]
+                    if len(members):
+                        centroids[k] = members.sum(axis=0)
+                centroids = _normalize_rows(centroids).astype(np.float32)
+
+            assign = np.full(self._rows(), -1, dtype=np.int32)
+            for start in range(0, len(live), self.BLOCK_ROWS):
+                rows = live[start:start + self.BLOCK_ROWS]
+                assign[rows] = np.argmax(matrix[rows] @ centroids.T, axis=1)
+
+            self._centroids, self._assign = centroids, assign
+            self._save_ivf()
+            logger.info(f"Built IVF index: {nlist} lists over {len(live)} vectors")
+            return True
+
+    async def drop_ivf_index(self) -> None:
+        """Remove the IVF index and return to exact (flat) search."""
+        with self._lock:
+            self._centroids = self._assign = None
+            if os.path.exists(self._ivf_path):
+                os.remove(self._ivf_path)
+
+    # =========================================================================
+    # STATS / INDEX INFO
+    # =========================================================================
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Vector store statistics (same keys as VectorStore.get_stats, plus backend info)."""
+        self._ensure_loaded()
+        with self._lock:
+            doc_count = self._catalog.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+            chunk_count, avg_tokens = self._catalog.execute(
+                "SELECT COUNT(*), AVG(token_count) FROM chunks WHERE deleted = 0"
+            ).fetchone()
+            return {
+                "document_count": doc_count or 0,
+                "chunk_count": chunk_count or 0,
+                "avg_tokens_per_chunk": round(avg_tokens or 0, 1),
+                "embedding_model": "all-MiniLM-L6-v2" if self.use_local_embeddings else self.EMBEDDING_MODEL,
+                "embedding_dimensions": self._dim or self.EMBEDDING_DIMENSIONS,
+                "embedding_cache": _embedding_cache_stats(),
+                "backend": self.BACKEND,
+                "index_type": self.INDEX_TYPE_IVF if self._centroids is not None else self.INDEX_TYPE_FLAT,
+                "tombstoned_rows": self._rows() - int(self._alive.sum()),
+                "index_dir": os.path.abspath(self.index_dir),
+            }
+
+    async def get_index_info(self) -> Dict[str, Any]:
+        """Information about the local index (flat or IVF)."""
+        self._ensure_loaded()
+        with self._lock:
+            live = int(self._alive.sum())
+            if self._centroids is None:
+                return {
+                    "index_type": self.INDEX_TYPE_FLAT,
+                    "chunk_count": live,
+                    "recommendation": (
+                        f"Exact search. An IVF index is built automatically at "
+                        f"{self.ivf_min_rows} vectors, or call build_ivf_index()."
+                    )
+                }
+            return {
+                "index_type": self.INDEX_TYPE_IVF,
+                "nlist": int(len(self._centroids)),
+                "nprobe": self.nprobe,
+                "chunk_count": live,
+            }
+
+    async def drop_vector_indexes(self) -> None:
+        await self.drop_ivf_index()
+
+    async def check_pgvectorscale_extension(self) -> bool:
+        return False
+
+    async def install_pgvectorscale_extension(self) -> bool:
+        logger.warning("pgvectorscale is not available for the local vector store")
+        return False
+
+    async def create_streamingdiskann_index(self, *args, **kwargs) -> bool:
+        logger.warning("StreamingDiskANN needs PostgreSQL; use build_ivf_index() for the local store")
+        return False
+
+    async def create_hnsw_index(self, *args, **kwargs) -> bool:
+        logger.warning("HNSW needs pgvector; use build_ivf_index() for the local store")
+        return False
+
+    async def _get_pool(self):
+        raise RuntimeError("LocalVectorStore has no database pool")
+
+    async def close(self):
+        """Close the catalog connection."""
+        with self._lock:
+            self._matrix = None
+            try:
+                self._catalog.close()
+            except Exception:
+                pass
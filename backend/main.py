@@ -10,6 +10,7 @@ import os
 import sys
 import logging
 
+from startup import startup_state  # noqa: E402  (first, so import timing covers main)
 from constants import __version__, NO_HALLUCINATION_INSTRUCTION  # noqa: E402
 
 # Configure logging early for CI/CD and production
@@ -73,9 +74,8 @@ try:
     from slowapi import Limiter, _rate_limit_exceeded_handler
     from slowapi.util import get_remote_address
     from slowapi.errors import RateLimitExceeded
-    from slowapi.middleware import SlowAPIMiddleware
 
-    _rate_limit_enabled = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    _rate_limit_enabled = os.getenv("RATE_LIMIT_ENABLED", "false").lower() == "true"
 
     if _rate_limit_enabled:
         limiter = Limiter(key_func=get_remote_address)
@@ -103,15 +103,20 @@ if os.getenv("JSON_LOGGING", "false").lower() == "true":
     except ImportError:
         logger.info("python-json-logger not installed - using default logging")
 
-try:
-    import yfinance as yf
-except ImportError:
-    class MockYF:
-        @staticmethod
-        def Ticker(t):
-            return type('MockTicker', (), {'info': {}, 'history': lambda *a, **k: None})()
-    yf = MockYF()
-    logger.warning("yfinance not found, using mock")
+class MockYF:
+    @staticmethod
+    def Ticker(t):
+        return type('MockTicker', (), {'info': {}, 'history': lambda *a, **k: None})()
+
+
+def _yfinance():
+    """yfinance, imported on first use (it pulls in pandas); a stub if not installed."""
+    try:
+        import yfinance
+        return yfinance
+    except ImportError:
+        logger.warning("yfinance not found, using mock")
+        return MockYF
 
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
@@ -128,34 +133,23 @@ from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime,
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.ext.asyncio import AsyncSession
-from openpyxl import Workbook
-from openpyxl.styles import PatternFill, Font, Alignment
-from openpyxl.utils import get_column_letter
 
-# Enterprise Automation Import
-try:
-    from scheduler import start_scheduler, stop_scheduler
-    SCHEDULER_AVAILABLE = True
-except ImportError:
-    SCHEDULER_AVAILABLE = False
+# Enterprise automation. The scheduler (and the scraping/extraction stack it
+# pulls in) is imported by the background startup task, not at import time.
+import importlib
+import importlib.util
+SCHEDULER_AVAILABLE = importlib.util.find_spec("scheduler") is not None
+if not SCHEDULER_AVAILABLE:
     logger.warning("Scheduler module not found. Automation disabled.")
 
-# New Data Source Imports
-import glassdoor_scraper
-import indeed_scraper
-import sec_edgar_scraper
-import uspto_scraper
-import klas_scraper
-import appstore_scraper
-
-import himss_scraper
-import social_media_monitor
+# Data source scrapers (glassdoor_scraper, indeed_scraper, ...) are imported
+# by the endpoints that use them, so they do not slow down startup.
 
 # Database setup - SQLite for simplicity
 # Database setup
 
 from database import (
-    engine, SessionLocal, Base, get_db, Competitor, ChangeLog, DataSource,
+    engine, SessionLocal, Base, get_db, allow_sync_db, Competitor, ChangeLog, DataSource,
     DataChangeHistory, PendingDataChange, User, SystemPrompt, KnowledgeBaseItem, UserSettings, ActivityLog,
     CompetitorProduct, ProductPricingTier, ProductFeatureMatrix, CustomerCountEstimate,
     RefreshSession,  # Phase 4: Task 5.0.1-031
@@ -183,6 +177,19 @@ from dependencies import (
     oauth2_scheme, get_current_user, get_current_user_optional, log_activity
 )
 from utils.prompt_utils import resolve_system_prompt as _resolve_system_prompt
+from performance import cached_response
+from analytics_snapshot import install_change_listeners
+from data_versions import install_version_listeners
+from streaming_export import (
+    arrow_schema, check_format, csv_chunks, iter_rows, json_document_chunks,
+    model_fields, ndjson_chunks, parquet_chunks, streaming_download, xlsx_chunks,
+)
+from sse import event_stream_response, wants_event_stream
+
+# Recompute analytics dashboard sections when their models change
+install_change_listeners()
+# Bump per-table data versions (ETags for polled list endpoints) on commit
+install_version_listeners()
 
 
 # Global progress tracker for scrape operations (thread-safe via Lock)
@@ -208,10 +215,6 @@ scrape_progress = {
 }
 
 
-# White fill for Excel cells
-WHITE_FILL = PatternFill(start_color="FFFFFF", end_color="FFFFFF", fill_type="solid")
-
-
 def get_openai_client():
     """Get OpenAI client if API key is configured, otherwise return None."""
     try:
@@ -408,8 +411,92 @@ from schemas.common import (  # noqa: E402
 
 # ============== FastAPI App ==============
 
+def _log_data_provider_status():
+    """Enterprise data provider diagnostic (v8.3.0)."""
+    try:
+        from data_providers import get_all_provider_status
+        all_status = get_all_provider_status()
+        active = [s for s in all_status if s["configured"]]
+        logger.info(f"Enterprise data providers: {len(active)}/{len(all_status)} active")
+        for s in all_status:
+            tag = "[OK]" if s["configured"] else "[!]"
+            logger.info(f"  {tag} {s['name']} ({s['env_key']})")
+    except ImportError:
+        logger.debug("Enterprise data providers module not available")
+    except Exception as dp_err:
+        logger.warning(f"Data provider diagnostic failed: {dp_err}")
+
+
+def _seed_startup_data():
+    """Preinstall the knowledge base and seed demo deals and AI prompts."""
+    db = SessionLocal()
+    try:
+        # Preinstall Knowledge Base (client-provided data)
+        # This only runs on first startup - subsequent startups skip
+        logger.info("Checking knowledge base preinstall...")
+        try:
+            from knowledge_base_importer import preinstall_knowledge_base
+            result = preinstall_knowledge_base(db)
+            if result and result.get("success"):
+                logger.info(f"[OK] Preinstalled {result.get('competitors_imported', 0)} competitors")
+                logger.info(f"[OK] Updated {result.get('competitors_updated', 0)} existing competitors")
+                logger.info(f"[OK] Data labeled as 'Certify Health (Preinstalled)'")
+            elif result and result.get("skipped"):
+                logger.info(f"[OK] No competitors found in knowledge base folder")
+            else:
+                logger.info(f"[OK] Already preinstalled, skipping")
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"[!] Knowledge base preinstall warning: {e}")
+
+        # Seed Win/Loss Deals (v7.1.5)
+        logger.info("Checking win/loss deal data...")
+        try:
+            seed_win_loss_data(db)
+        except Exception as e:
+            logger.warning(f"[!] Win/loss seed warning: {e}")
+
+        # Seed all AI prompts into database
+        try:
+            from prompt_seeder import seed_system_prompts
+            result = seed_system_prompts(db)
+            logger.info(f"[OK] Prompt seeder: {result['inserted']} new, {result['updated']} updated, {result['skipped']} existing")
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"[!] Prompt seeder warning: {e}")
+    finally:
+        db.close()
+
+
+async def _start_scheduler_with_retry():
+    """Start the Enterprise Automation Engine, retrying with backoff."""
+    logger.info("Initializing Enterprise Automation Engine...")
+    # Importing the scheduler loads the scraping/extraction stack; do it off the loop
+    scheduler_module = await asyncio.to_thread(importlib.import_module, "scheduler")
+    for attempt in range(3):
+        try:
+            scheduler_module.start_scheduler()
+            return
+        except Exception as e:
+            wait = 2 ** attempt
+            logger.warning(f"Scheduler start failed (attempt {attempt + 1}/3): {e}, retrying in {wait}s...")
+            await asyncio.sleep(wait)
+    logger.error("Scheduler failed to start after 3 attempts")
+
+
+def _resume_webhook_outbox():
+    """Resume webhook deliveries left in the outbox by the previous run."""
+    try:
+        from webhooks import get_webhook_manager
+        pending = get_webhook_manager().resume_pending()
+        if pending:
+            logger.info(f"[OK] Resuming {pending} undelivered webhook event(s)")
+    except Exception as e:
+        logger.debug(f"Webhook outbox note: {e}")
+
+
 @asynccontextmanager
-async def lifespan(app: FastAPI):
+async def _lifespan(app: FastAPI):
     # Startup
     logger.info("Certify Intel Backend starting...")
     logger.info("=" * 60)
@@ -459,43 +546,13 @@ async def lifespan(app: FastAPI):
     else:
         logger.info("[!] Langfuse Observability - DISABLED (set ENABLE_LANGFUSE=true)")
 
-    # Enterprise data provider diagnostic (v8.3.0)
-    try:
-        from data_providers import get_all_provider_status
-        all_status = get_all_provider_status()
-        active = [s for s in all_status if s["configured"]]
-        logger.info(f"Enterprise data providers: {len(active)}/{len(all_status)} active")
-        for s in all_status:
-            tag = "[OK]" if s["configured"] else "[!]"
-            logger.info(f"  {tag} {s['name']} ({s['env_key']})")
-    except ImportError:
-        logger.debug("Enterprise data providers module not available")
-    except Exception as dp_err:
-        logger.warning(f"Data provider diagnostic failed: {dp_err}")
-
     logger.info("=" * 60)
 
     # Skip heavy startup tasks during testing
     is_testing = os.getenv("TESTING") == "true"
 
-    # Start Enterprise Scheduler with retry
-    if SCHEDULER_AVAILABLE and not is_testing:
-        logger.info("Initializing Enterprise Automation Engine...")
-        import time as _time
-        for _attempt in range(3):
-            try:
-                start_scheduler()
-                break
-            except Exception as e:
-                wait = 2 ** _attempt
-                logger.warning(f"Scheduler start failed (attempt {_attempt + 1}/3): {e}, retrying in {wait}s...")
-                _time.sleep(wait)
-        else:
-            logger.error("Scheduler failed to start after 3 attempts")
-    elif is_testing:
-        logger.info("[TEST] Skipping scheduler startup")
-
-    # Run Startup Tasks
+    # Run Startup Tasks (quick schema fixes only; seeding and the scheduler
+    # run in the background after the server starts, see below)
     try:
         from extended_features import ClassificationWorkflow, auth_manager
 
@@ -506,35 +563,7 @@ async def lifespan(app: FastAPI):
         logger.info("Ensuring default admin user exists...")
         auth_manager.ensure_default_admin(db)
 
-        # 2. Preinstall Knowledge Base (client-provided data)
-        # This only runs on first startup - subsequent startups skip
-        if not is_testing:
-            logger.info("Checking knowledge base preinstall...")
-            try:
-                from knowledge_base_importer import preinstall_knowledge_base
-                result = preinstall_knowledge_base(db)
-                if result and result.get("success"):
-                    logger.info(f"[OK] Preinstalled {result.get('competitors_imported', 0)} competitors")
-                    logger.info(f"[OK] Updated {result.get('competitors_updated', 0)} existing competitors")
-                    logger.info(f"[OK] Data labeled as 'Certify Health (Preinstalled)'")
-                elif result and result.get("skipped"):
-                    logger.info(f"[OK] No competitors found in knowledge base folder")
-                else:
-                    logger.info(f"[OK] Already preinstalled, skipping")
-            except Exception as e:
-                logger.warning(f"[!] Knowledge base preinstall warning: {e}")
-        else:
-            logger.info("[TEST] Skipping knowledge base preinstall")
-
-        # 3. Seed Win/Loss Deals (v7.1.5)
-        if not is_testing:
-            logger.info("Checking win/loss deal data...")
-            try:
-                seed_win_loss_data(db)
-            except Exception as e:
-                logger.warning(f"[!] Win/loss seed warning: {e}")
-        else:
-            logger.info("[TEST] Skipping win/loss seed")
+        # 2-3. Knowledge base preinstall and win/loss seed: see _seed_startup_data
 
         # 4. Run Classification Workflow - DISABLED (costs money, use button instead)
         # workflow = ClassificationWorkflow(db)
@@ -620,14 +649,7 @@ async def lifespan(app: FastAPI):
             db.rollback()
             logger.warning(f"[!] Chat tables migration warning: {e}")
 
-        # 6. Seed all AI prompts into database
-        if not is_testing:
-            try:
-                from prompt_seeder import seed_system_prompts
-                result = seed_system_prompts(db)
-                logger.info(f"[OK] Prompt seeder: {result['inserted']} new, {result['updated']} updated, {result['skipped']} existing")
-            except Exception as e:
-                logger.warning(f"[!] Prompt seeder warning: {e}")
+        # 6. Prompt seeding: see _seed_startup_data
 
         # 7. Performance indexes (PERF-012)
         _perf_indexes = [
@@ -681,6 +703,14 @@ async def lifespan(app: FastAPI):
             db.rollback()
             logger.debug(f"[!] RefreshToken table note: {e}")
 
+        # 10. Per-stage refresh pipeline progress on refresh_sessions
+        try:
+            db.execute(text("ALTER TABLE refresh_sessions ADD COLUMN stage_progress TEXT"))
+            db.commit()
+            logger.info("[Migration] Added stage_progress to refresh_sessions")
+        except Exception:
+            db.rollback()
+
         db.close()
     except Exception as e:
         logger.warning(f"Startup task warning: {e}")
@@ -691,16 +721,52 @@ async def lifespan(app: FastAPI):
         except Exception:
             pass
 
+    # Background startup work. /readiness reports "starting" until the
+    # required tasks finish; the others never hold readiness back.
+    startup_state.start_task("data_provider_diagnostic", _log_data_provider_status)
+    startup_state.start_task("webhook_outbox", _resume_webhook_outbox)
+    if is_testing:
+        logger.info("[TEST] Skipping scheduler startup, knowledge base preinstall and seeding")
+    else:
+        startup_state.start_task("seed_data", _seed_startup_data, required=True)
+        if SCHEDULER_AVAILABLE:
+            startup_state.start_task("scheduler", _start_scheduler_with_retry)
+    startup_state.mark_serving()
+
     yield
     
     # Shutdown: Clean up resources
     logger.info("Certify Intel Backend shutting down...")
-    if SCHEDULER_AVAILABLE:
+    await startup_state.cancel()
+    if "scheduler" in sys.modules:
         try:
+            from scheduler import stop_scheduler
             stop_scheduler()
         except Exception as e:
             logger.debug(f"Scheduler shutdown note: {e}")
 
+    # Close pooled enterprise data provider clients
+    try:
+        from data_providers.base_provider import close_shared_clients
+        await close_shared_clients()
+    except Exception:
+        pass
+
+    # Close the pooled content matcher client
+    if "content_matcher" in sys.modules:
+        try:
+            from content_matcher import close_shared_client
+            await close_shared_client()
+        except Exception:
+            pass
+
+    # Deliver buffered webhook events and stop the delivery worker
+    try:
+        from webhooks import get_webhook_manager
+        get_webhook_manager().close()
+    except Exception:
+        pass
+
     # Flush Langfuse traces on shutdown
     try:
         from observability import shutdown_langfuse
@@ -708,6 +774,16 @@ async def lifespan(app: FastAPI):
     except Exception:
         pass
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup migrations and shutdown block on purpose; exempt them from
+    # DB_LOOP_GUARD. Requests run in other tasks and are still checked.
+    with allow_sync_db():
+        async with _lifespan(app):
+            yield
+
+
 app = FastAPI(
     title="Certify Health Intel API",
     description="Backend for Competitive Intelligence Dashboard",
@@ -715,24 +791,21 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-# GZip compression for API responses (PERF-011)
+# ETag / If-None-Match for GET /api JSON responses. Registered before GZip so
+# it runs inside it and hashes the uncompressed body.
+from middleware.conditional import ConditionalGetMiddleware  # noqa: E402
+app.add_middleware(ConditionalGetMiddleware)
+
+# GZip compression for API responses (PERF-011). Starlette >= 0.46 skips
+# text/event-stream, so streamed AI tokens are not buffered.
 from starlette.middleware.gzip import GZipMiddleware  # noqa: E402
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
-# Attach slowapi limiter if available
+# Attach slowapi limiter if available (for per-endpoint @limiter.limit decorators;
+# global API limits and correlation IDs are handled by RequestPipelineMiddleware)
 if limiter is not None:
     app.state.limiter = limiter
     app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-    app.add_middleware(SlowAPIMiddleware)
-
-
-@app.middleware("http")
-async def correlation_id_middleware(request, call_next):
-    """Add correlation ID to all requests for distributed tracing."""
-    correlation_id = request.headers.get("X-Correlation-ID", str(uuid.uuid4()))
-    response = await call_next(request)
-    response.headers["X-Correlation-ID"] = correlation_id
-    return response
 
 
 # Health/version/readiness endpoints moved to routers/health.py
@@ -1367,8 +1440,13 @@ async def get_analytics_summary_progress(
 
 
 @app.post("/api/analytics/chat")
-async def chat_with_summary(request: dict, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
-    """Chat with AI about the competitive intelligence data. Supports conversation history."""
+async def chat_with_summary(request: dict, http_request: Request, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    """
+    Chat with AI about the competitive intelligence data. Supports conversation history.
+
+    Streams the reply as Server-Sent Events when the client sends
+    ``Accept: text/event-stream`` or ``"stream": true`` (see sse.py).
+    """
     try:
         import os
 
@@ -1499,12 +1577,18 @@ LIVE DATA CONTEXT:
 
         from ai_router import get_ai_router, TaskType
         router = get_ai_router()
-        result = await router.generate(
+        gen_kwargs = dict(
             prompt=history_prefix,
             task_type=TaskType.ANALYSIS,
             system_prompt=full_system_content + NO_HALLUCINATION_INSTRUCTION,
             max_tokens=4000,
         )
+        if wants_event_stream(http_request, request.get("stream")):
+            return event_stream_response(
+                _stream_analytics_chat(router, gen_kwargs, session_id, user_message)
+            )
+
+        result = await router.generate(**gen_kwargs)
         if result and result.get("response"):
             ai_response = result["response"]
 
@@ -1526,6 +1610,50 @@ LIVE DATA CONTEXT:
         return {"response": "An error occurred processing your request. Please try again.", "success": False}
 
 
+async def _stream_analytics_chat(router, gen_kwargs: dict, session_id, user_message: str):
+    """SSE events for /api/analytics/chat: tokens as they arrive, then the saved reply."""
+    result = {}
+    async for event in router.stream(**gen_kwargs):
+        if event["type"] == "token":
+            yield event
+        else:
+            result = event
+
+    ai_response = result.get("response")
+    if not ai_response:
+        yield {"type": "done", "response": "AI chat is unavailable. Check API key configuration.", "success": False}
+        return
+
+    # Persist to chat session if session_id provided (own session: the
+    # request's session may be gone by the time the stream ends)
+    if session_id:
+        def _save():
+            save_db = SessionLocal()
+            try:
+                _save_chat_messages(save_db, session_id, user_message, ai_response, {
+                    "provider": result.get("provider"),
+                    "model": result.get("model"),
+                    "endpoint": "analytics_chat",
+                })
+            finally:
+                save_db.close()
+
+        try:
+            await asyncio.to_thread(_save)
+        except Exception as save_err:
+            logger.warning(f"Failed to save chat messages: {save_err}")
+
+    yield {
+        "type": "done",
+        "response": ai_response,
+        "success": True,
+        "session_id": session_id,
+        "model": result.get("model"),
+        "provider": result.get("provider"),
+        "ttft_ms": result.get("ttft_ms"),
+    }
+
+
 # /api/health moved to routers/health.py
 
 # Chat session endpoints moved to routers/chat.py
@@ -1611,8 +1739,12 @@ def get_ai_status():
             "today_spend_usd": round(router.cost_tracker.get_today_spend(), 4),
             "remaining_budget_usd": round(router.cost_tracker.get_remaining_budget(), 4),
             "budget_used_percent": round((router.cost_tracker.get_today_spend() / router.cost_tracker.daily_budget_usd) * 100, 1) if router.cost_tracker.daily_budget_usd > 0 else 0,
-            "budget_warning": router.cost_tracker.get_today_spend() >= (router.cost_tracker.daily_budget_usd * 0.8)
+            "budget_warning": router.cost_tracker.get_today_spend() >= (router.cost_tracker.daily_budget_usd * 0.8),
+            "today_saved_usd": round(router.cost_tracker.get_today_savings(), 4),
         }
+        from ai_response_cache import get_ai_response_cache
+        response_cache = get_ai_response_cache()
+        budget_info["response_cache"] = response_cache.stats() if response_cache else None
     except Exception as e:
         logger.warning(f"Failed to get budget info: {e}")
         budget_info = {"error": "Budget tracking unavailable"}
@@ -2891,7 +3023,7 @@ async def ai_news_agent(
         News articles with sentiment, event types, and sources
     """
     from datetime import datetime, timedelta
-    from database import NewsArticleCache
+    from news_ingest import ingest_articles
 
     try:
         body = await request.json() if request.headers.get('content-type') == 'application/json' else {}
@@ -2979,6 +3111,7 @@ async def ai_news_agent(
                     comp_articles = await fetch_google_news_rss(comp.name, limit_per_competitor)
 
                 # Analyze sentiment and detect event types
+                rows = []
                 for article in comp_articles:
                     # Sentiment analysis
                     sentiment = analyze_article_sentiment(article.get("title", ""), article.get("snippet", ""))
@@ -2988,38 +3121,34 @@ async def ai_news_agent(
                     event_type = detect_event_type(article.get("title", ""))
                     article["event_type"] = event_type
 
-                    # Store in database
-                    try:
-                        existing = db.query(NewsArticleCache).filter(
-                            NewsArticleCache.url == article.get("url")
-                        ).first()
-
-                        if not existing:
-                            pub_date = datetime.utcnow() - timedelta(days=1)  # Default to yesterday
-
-                            cache_entry = NewsArticleCache(
-                                competitor_id=comp.id,
-                                competitor_name=comp.name,
-                                title=article.get("title", ""),
-                                url=article.get("url", ""),
-                                source=article.get("source", "Google News"),
-                                source_type="google_news",
-                                published_at=pub_date,
-                                snippet=article.get("snippet", ""),
-                                sentiment=sentiment,
-                                event_type=event_type,
-                                is_major_event=event_type in ["funding", "acquisition", "leadership"],
-                                fetched_at=datetime.utcnow(),
-                            )
-                            db.add(cache_entry)
-                            results["total_articles"] += 1
-                            results["by_sentiment"][sentiment] += 1
-
-                    except Exception as db_err:
-                        logger.warning(f"DB save error: {db_err}")
-
+                    rows.append(dict(
+                        competitor_id=comp.id,
+                        competitor_name=comp.name,
+                        title=article.get("title", ""),
+                        url=article.get("url", ""),
+                        source=article.get("source", "Google News"),
+                        source_type="google_news",
+                        published_at=datetime.utcnow() - timedelta(days=1),  # Default to yesterday
+                        snippet=article.get("snippet", ""),
+                        sentiment=sentiment,
+                        event_type=event_type,
+                        is_major_event=event_type in ["funding", "acquisition", "leadership"],
+                        fetched_at=datetime.utcnow(),
+                    ))
                     results["articles"].append(article)
 
+                # Store in database
+                try:
+                    stored = ingest_articles(db, rows)
+                    results["total_articles"] += stored.inserted
+                    new_urls = set(stored.inserted_urls)
+                    for row in rows:
+                        if row["url"] in new_urls:
+                            results["by_sentiment"][row["sentiment"]] += 1
+                except Exception as db_err:
+                    logger.warning(f"DB save error: {db_err}")
+                    db.rollback()
+
                 results["by_competitor"][comp.name] = len(comp_articles)
                 db.commit()
 
@@ -3549,122 +3678,12 @@ def get_analytics_dashboard(db: Session = Depends(get_db)):
     - News sentiment trends
     - Dimension score averages
     - Market positioning data
-    """
-    from datetime import timedelta
-    from sqlalchemy import func
-
-    competitors = db.query(Competitor).filter(Competitor.is_deleted == False).all()
-    total = len(competitors)
-
-    # Status breakdown
-    status_counts = {}
-    for c in competitors:
-        status = c.status or "Unknown"
-        status_counts[status] = status_counts.get(status, 0) + 1
 
-    # Threat level breakdown
-    threat_counts = {"High": 0, "Medium": 0, "Low": 0}
-    for c in competitors:
-        level = c.threat_level or "Low"
-        if level in threat_counts:
-            threat_counts[level] += 1
-
-    # Data freshness
-    now = datetime.utcnow()
-    fresh_count = 0  # Updated within 7 days
-    stale_count = 0  # Not updated in 30+ days
-    for c in competitors:
-        if c.last_updated:
-            age = (now - c.last_updated).days
-            if age <= 7:
-                fresh_count += 1
-            elif age > 30:
-                stale_count += 1
-
-    # Data quality average
-    quality_sum = sum(c.data_quality_score or 0 for c in competitors)
-    avg_quality = quality_sum / total if total > 0 else 0
-
-    # News sentiment from cache
-    try:
-        from database import NewsArticleCache
-        recent_cutoff = now - timedelta(days=30)
-        news_query = db.query(NewsArticleCache).filter(
-            NewsArticleCache.published_at >= recent_cutoff,
-            NewsArticleCache.is_archived != True
-        ).all()
-
-        sentiment_counts = {"positive": 0, "negative": 0, "neutral": 0}
-        for article in news_query:
-            sent = article.sentiment or "neutral"
-            if sent in sentiment_counts:
-                sentiment_counts[sent] += 1
-
-        news_total = len(news_query)
-    except Exception as e:
-        logger.debug(f"News sentiment query failed: {e}")
-        sentiment_counts = {"positive": 0, "negative": 0, "neutral": 0}
-        news_total = 0
-
-    # Dimension score averages (if available)
-    dimension_averages = {}
-    dimension_fields = [
-        "product_packaging_score", "integration_depth_score", "support_service_score",
-        "retention_stickiness_score", "user_adoption_score", "implementation_ttv_score",
-        "reliability_enterprise_score", "pricing_flexibility_score", "reporting_analytics_score"
-    ]
-
-    for field in dimension_fields:
-        scores = [getattr(c, field, None) for c in competitors if hasattr(c, field)]
-        valid_scores = [s for s in scores if s is not None]
-        if valid_scores:
-            dimension_name = field.replace("_score", "").replace("_", " ").title()
-            dimension_averages[dimension_name] = sum(valid_scores) / len(valid_scores)
-
-    # Market positioning (customer count vs threat level)
-    market_data = []
-    for c in competitors[:50]:  # Limit for performance
-        customer_count = 0
-        if c.customer_count:
-            try:
-                customer_count = int(''.join(filter(str.isdigit, str(c.customer_count)[:10])))
-            except (ValueError, TypeError):
-                customer_count = 100
-
-        market_data.append({
-            "name": c.name,
-            "x": c.data_quality_score or 50,  # Data quality as proxy for market presence
-            "y": customer_count,
-            "threat": c.threat_level or "Low",
-            "size": {"High": 30, "Medium": 20, "Low": 10}.get(c.threat_level, 15),
-            "website": c.website
-        })
-
-    # Recent changes count
-    changes_count = db.query(DataChangeHistory).filter(
-        DataChangeHistory.changed_at >= now - timedelta(days=7)
-    ).count()
-
-    return {
-        "summary": {
-            "total_competitors": total,
-            "active_count": status_counts.get("Active", 0),
-            "discovered_count": status_counts.get("Discovered", 0),
-            "avg_data_quality": round(avg_quality, 1),
-            "fresh_data_count": fresh_count,
-            "stale_data_count": stale_count,
-            "recent_changes": changes_count
-        },
-        "threat_distribution": threat_counts,
-        "status_distribution": status_counts,
-        "news_sentiment": {
-            "counts": sentiment_counts,
-            "total": news_total
-        },
-        "dimension_averages": dimension_averages,
-        "market_positioning": market_data[:30],
-        "generated_at": now.isoformat()
-    }
+    Served from the precomputed snapshot in analytics_snapshot.py; sections
+    are recomputed with aggregate queries when their data changes.
+    """
+    from analytics_snapshot import get_dashboard_snapshot
+    return get_dashboard_snapshot(db)
 
 
 @app.get("/api/analytics/market-map")
@@ -3984,6 +4003,39 @@ def get_changes(
     }
 
 
+# Raw DataChangeHistory fields for JSON, NDJSON and Parquet change exports
+_CHANGE_EXPORT_FIELDS = (
+    "id", "competitor_id", "competitor_name", "field_name", "old_value", "new_value",
+    "changed_by", "change_reason", "source_url", "changed_at",
+)
+
+
+def _change_history_query(days: int, competitor_ids: Optional[List[int]] = None):
+    """Query builder for change exports, newest first."""
+    cutoff = datetime.utcnow() - timedelta(days=days)
+
+    def build(db: Session):
+        query = db.query(DataChangeHistory).filter(DataChangeHistory.changed_at >= cutoff)
+        if competitor_ids is not None:
+            query = query.filter(DataChangeHistory.competitor_id.in_(competitor_ids))
+        return query.order_by(DataChangeHistory.changed_at.desc())
+    return build
+
+
+def _stream_change_records(db: Session, build, format: str, filename: str, tail=None):
+    """Full change records as a JSON document, NDJSON or Parquet."""
+    records = iter_rows(db, build, lambda c: model_fields(c, _CHANGE_EXPORT_FIELDS))
+    if format == "ndjson":
+        return streaming_download(ndjson_chunks(records), f"{filename}.ndjson", format)
+    if format == "parquet":
+        schema = arrow_schema(DataChangeHistory, _CHANGE_EXPORT_FIELDS)
+        return streaming_download(parquet_chunks(schema, records), f"{filename}.parquet", format)
+    return streaming_download(
+        json_document_chunks("changes", records, tail or (lambda count: {"total": count})),
+        f"{filename}.json", format
+    )
+
+
 @app.get("/api/changes/export")
 def export_changes(
     competitor_id: Optional[int] = None,
@@ -3992,94 +4044,45 @@ def export_changes(
     db: Session = Depends(get_db)
 ):
     """
-    Export change logs to CSV or Excel.
+    Export change logs to CSV, Excel, JSON, NDJSON or Parquet.
 
-    v5.2.0: Phase 4 - Change log export.
+    v5.2.0: Phase 4 - Change log export. Rows are streamed (see streaming_export).
 
     Args:
         competitor_id: Filter by specific competitor
         days: Number of days to look back
-        format: "csv" or "excel"
+        format: "csv", "excel", "json", "ndjson" or "parquet"
     """
-    from datetime import timedelta
-    import io
-    import csv
-
-    cutoff = datetime.utcnow() - timedelta(days=days)
-    query = db.query(DataChangeHistory).filter(DataChangeHistory.changed_at >= cutoff)
-
-    if competitor_id:
-        query = query.filter(DataChangeHistory.competitor_id == competitor_id)
-
-    changes = query.order_by(DataChangeHistory.changed_at.desc()).all()
+    format = check_format(format, ("csv", "xlsx", "json", "ndjson", "parquet"))
+    build = _change_history_query(days, [competitor_id] if competitor_id else None)
+    filename = f"changelog_export_{datetime.now().strftime('%Y%m%d')}"
+    header = ["Date", "Competitor", "Field", "Old Value", "New Value", "Changed By", "Reason"]
 
     if format == "csv":
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow([
-            "Date", "Competitor", "Field", "Old Value", "New Value",
-            "Changed By", "Reason"
+        rows = iter_rows(db, build, lambda c: [
+            c.changed_at.isoformat() if c.changed_at else "",
+            c.competitor_name,
+            c.field_name,
+            c.old_value[:200] if c.old_value else "",
+            c.new_value[:200] if c.new_value else "",
+            c.changed_by or "system",
+            c.change_reason or ""
         ])
+        return streaming_download(csv_chunks(header, rows), f"{filename}.csv", format)
+
+    if format == "xlsx":
+        rows = iter_rows(db, build, lambda c: [
+            c.changed_at.strftime("%Y-%m-%d %H:%M") if c.changed_at else "",
+            c.competitor_name,
+            c.field_name,
+            (c.old_value[:200] if c.old_value else ""),
+            (c.new_value[:200] if c.new_value else ""),
+            c.changed_by or "system",
+            c.change_reason or ""
+        ])
+        return streaming_download(xlsx_chunks([("Change Log", header, rows)]), f"{filename}.xlsx", format)
 
-        for c in changes:
-            writer.writerow([
-                c.changed_at.isoformat() if c.changed_at else "",
-                c.competitor_name,
-                c.field_name,
-                c.old_value[:200] if c.old_value else "",
-                c.new_value[:200] if c.new_value else "",
-                c.changed_by or "system",
-                c.change_reason or ""
-            ])
-
-        output.seek(0)
-        return StreamingResponse(
-            iter([output.getvalue()]),
-            media_type="text/csv",
-            headers={
-                "Content-Disposition": f"attachment; filename=changelog_export_{datetime.now().strftime('%Y%m%d')}.csv"
-            }
-        )
-
-    elif format == "excel":
-        try:
-            from openpyxl import Workbook
-            from fastapi.responses import FileResponse
-
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Change Log"
-
-            # Header
-            ws.append([
-                "Date", "Competitor", "Field", "Old Value", "New Value",
-                "Changed By", "Reason"
-            ])
-
-            for c in changes:
-                ws.append([
-                    c.changed_at.strftime("%Y-%m-%d %H:%M") if c.changed_at else "",
-                    c.competitor_name,
-                    c.field_name,
-                    (c.old_value[:200] if c.old_value else ""),
-                    (c.new_value[:200] if c.new_value else ""),
-                    c.changed_by or "system",
-                    c.change_reason or ""
-                ])
-
-            os.makedirs("./exports", exist_ok=True)
-            filepath = f"./exports/changelog_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-            wb.save(filepath)
-
-            return FileResponse(
-                filepath,
-                media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                filename=f"changelog_export_{datetime.now().strftime('%Y%m%d')}.xlsx"
-            )
-        except ImportError:
-            return {"error": "openpyxl not installed for Excel export"}
-
-    return {"error": f"Unknown format: {format}"}
+    return _stream_change_records(db, build, format, filename)
 
 
 @app.get("/api/changes/history/{competitor_id}")
@@ -4369,62 +4372,35 @@ def bulk_export_changes(
 ):
     """
     Export changes for multiple competitors at once.
-    """
-    import io
-    import csv
-
-    cutoff = datetime.utcnow() - timedelta(days=days)
 
-    changes = db.query(DataChangeHistory).filter(
-        DataChangeHistory.competitor_id.in_(competitor_ids),
-        DataChangeHistory.changed_at >= cutoff
-    ).order_by(DataChangeHistory.changed_at.desc()).all()
+    Streams CSV (default), JSON, NDJSON or Parquet without loading the
+    history into memory.
+    """
+    format = check_format(format, ("csv", "json", "ndjson", "parquet"))
+    build = _change_history_query(days, competitor_ids)
+    filename = f"bulk_changelog_{datetime.now().strftime('%Y%m%d')}"
 
     if format == "csv":
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow([
+        rows = iter_rows(db, build, lambda c: [
+            c.changed_at.isoformat() if c.changed_at else "",
+            c.competitor_id,
+            c.competitor_name,
+            c.field_name,
+            c.old_value[:500] if c.old_value else "",
+            c.new_value[:500] if c.new_value else "",
+            c.changed_by or "system",
+            c.change_reason or ""
+        ])
+        header = [
             "Date", "Competitor ID", "Competitor Name", "Field",
             "Old Value", "New Value", "Changed By", "Reason"
-        ])
-
-        for c in changes:
-            writer.writerow([
-                c.changed_at.isoformat() if c.changed_at else "",
-                c.competitor_id,
-                c.competitor_name,
-                c.field_name,
-                (c.old_value[:500] if c.old_value else "")[:500],
-                (c.new_value[:500] if c.new_value else "")[:500],
-                c.changed_by or "system",
-                c.change_reason or ""
-            ])
-
-        output.seek(0)
-        return StreamingResponse(
-            iter([output.getvalue()]),
-            media_type="text/csv",
-            headers={
-                "Content-Disposition": f"attachment; filename=bulk_changelog_{datetime.now().strftime('%Y%m%d')}.csv"
-            }
-        )
-
-    return {
-        "total": len(changes),
-        "competitor_ids": competitor_ids,
-        "changes": [
-            {
-                "id": c.id,
-                "competitor_id": c.competitor_id,
-                "competitor_name": c.competitor_name,
-                "field_name": c.field_name,
-                "old_value": c.old_value,
-                "new_value": c.new_value,
-                "changed_at": c.changed_at.isoformat() if c.changed_at else None
-            }
-            for c in changes
         ]
-    }
+        return streaming_download(csv_chunks(header, rows), f"{filename}.csv", format)
+
+    return _stream_change_records(
+        db, build, format, filename,
+        tail=lambda count: {"total": count, "competitor_ids": competitor_ids}
+    )
 
 
 # ============== ACTIVITY LOGS ENDPOINTS (Shared across all users) ==============
@@ -5487,7 +5463,7 @@ async def refine_source_urls_all(
             _make_deep_link,
         )
         from content_matcher import (
-            fetch_page_text, find_value_on_page,
+            fetch_source_pages, find_value_on_page,
         )
 
         refine_db = SessionLocal()
@@ -5663,80 +5639,90 @@ async def refine_source_urls_all(
 
             total_pages = len(url_groups)
             pages_processed = 0
-            _page_sem = asyncio.Semaphore(10)
 
-            async def _match_page_group(page_url, sources_list):
-                """Fetch one page, match all fields targeting it."""
+            def _match_page_group(page_url, sources_list, page_text):
+                """Match all fields targeting one fetched page."""
                 nonlocal pages_processed
-                async with _page_sem:
-                    page_text = await fetch_page_text(page_url)
-                    if not page_text:
-                        # No content - mark as page_level
-                        for src in sources_list:
-                            if src.source_page_url:
-                                src.url_status = "page_level"
-                                # Strip fragment, keep page URL
-                                src.deep_link_url = (
-                                    src.source_page_url.split("#")[0]
-                                )
-                        pages_processed += 1
-                        return
-
+                if not page_text:
+                    # No content - mark as page_level
                     for src in sources_list:
-                        val = (src.current_value or "").strip()
-                        if not val or len(val) < 2:
-                            continue
+                        if src.source_page_url:
+                            src.url_status = "page_level"
+                            # Strip fragment, keep page URL
+                            src.deep_link_url = (
+                                src.source_page_url.split("#")[0]
+                            )
+                    pages_processed += 1
+                    return
 
-                        match = find_value_on_page(
-                            page_text, val,
-                            field_name=src.field_name or ""
+                for src in sources_list:
+                    val = (src.current_value or "").strip()
+                    if not val or len(val) < 2:
+                        continue
+
+                    match = find_value_on_page(
+                        page_text, val,
+                        field_name=src.field_name or ""
+                    )
+                    if match:
+                        # Build fragment from ACTUAL page text
+                        frag = build_text_fragment(
+                            match.matched_text,
+                            context_before=(
+                                match.context_before
+                                if match.context_before else None
+                            ),
+                            context_after=(
+                                match.context_after
+                                if match.context_after else None
+                            ),
                         )
-                        if match:
-                            # Build fragment from ACTUAL page text
-                            frag = build_text_fragment(
-                                match.matched_text,
-                                context_before=(
-                                    match.context_before
-                                    if match.context_before else None
-                                ),
-                                context_after=(
-                                    match.context_after
-                                    if match.context_after else None
-                                ),
-                            )
-                            if frag:
-                                page_base = (
-                                    src.source_page_url.split("#")[0]
-                                )
-                                src.deep_link_url = _make_deep_link(
-                                    page_base, frag
-                                )
-                                src.source_anchor_text = (
-                                    match.matched_text[:200]
-                                )
-                                src.url_status = "verified"
-                                _url_refinement_progress[task_id][
-                                    "sources_exact_match"
-                                ] += 1
-                        else:
-                            # Page found but text not matched
-                            src.url_status = "page_level"
+                        if frag:
                             page_base = (
                                 src.source_page_url.split("#")[0]
                             )
-                            src.deep_link_url = page_base
+                            src.deep_link_url = _make_deep_link(
+                                page_base, frag
+                            )
+                            src.source_anchor_text = (
+                                match.matched_text[:200]
+                            )
+                            src.url_status = "verified"
                             _url_refinement_progress[task_id][
-                                "sources_page_level"
+                                "sources_exact_match"
                             ] += 1
-
-                    pages_processed += 1
-
-            # Process page groups in parallel batches of 10
-            page_items = list(url_groups.items())
-            PAGE_BATCH = 10
-            for batch_start in range(0, len(page_items), PAGE_BATCH):
-                batch = page_items[
-                    batch_start: batch_start + PAGE_BATCH
+                    else:
+                        # Page found but text not matched
+                        src.url_status = "page_level"
+                        page_base = (
+                            src.source_page_url.split("#")[0]
+                        )
+                        src.deep_link_url = page_base
+                        _url_refinement_progress[task_id][
+                            "sources_page_level"
+                        ] += 1
+
+                pages_processed += 1
+
+            # Fetch each competitor's pages as one concurrent batch
+            # (pooled client, per-host limits, persistent page cache)
+            by_competitor: Dict[int, Dict[str, list]] = {}
+            for page_url, srcs in url_groups.items():
+                comp_id = srcs[0].competitor_id
+                by_competitor.setdefault(comp_id, {})[page_url] = srcs
+
+            async def _match_competitor(groups):
+                page_texts = await fetch_source_pages(
+                    [src for srcs in groups.values() for src in srcs]
+                )
+                for page_url, srcs in groups.items():
+                    _match_page_group(page_url, srcs, page_texts.get(page_url))
+
+            comp_items = list(by_competitor.values())
+            COMPETITOR_BATCH = 5
+            for batch_start in range(0, len(comp_items), COMPETITOR_BATCH):
+                batch = comp_items[
+                    batch_start: batch_start + COMPETITOR_BATCH
                 ]
                 pct = 50 + int(
                     (pages_processed / max(total_pages, 1)) * 50
@@ -5750,10 +5736,10 @@ async def refine_source_urls_all(
                 await asyncio.gather(
                     *[
                         asyncio.wait_for(
-                            _match_page_group(url, srcs),
-                            timeout=15.0,
+                            _match_competitor(groups),
+                            timeout=60.0,
                         )
-                        for url, srcs in batch
+                        for groups in batch
                     ],
                     return_exceptions=True,
                 )
@@ -5852,62 +5838,78 @@ async def enrich_from_providers(
         enrich_db = SessionLocal()
         try:
             from data_providers import get_active_providers as _gap
+            from data_providers.enrichment import EnrichmentEngine
             providers = _gap()
+            engine = EnrichmentEngine(providers)
 
             competitors = enrich_db.query(Competitor).filter(
                 Competitor.status != "deleted"
             ).all()
+            by_id = {comp.id: comp for comp in competitors}
+            remaining = {comp.id: len(providers) for comp in competitors}
 
-            total_updates = 0
-            total_sources = 0
-
-            for comp in competitors:
-                for provider in providers:
-                    try:
-                        result = await provider.query_for_competitor(comp.name)
-                        if result.error:
-                            continue
-
-                        # Apply mapped fields
-                        for field_name, value in result.fields.items():
-                            if hasattr(comp, field_name) and value is not None:
-                                old_val = getattr(comp, field_name, None)
-                                if str(old_val) != str(value):
-                                    setattr(comp, field_name, value)
-                                    total_updates += 1
-
-                            # Create DataSource record
-                            source_url = result.source_urls.get(field_name, "")
-                            new_source = DataSource(
-                                competitor_id=comp.id,
-                                field_name=field_name,
-                                current_value=str(value) if value else None,
-                                source_type="api",
-                                source_name=provider.provider_name,
-                                source_url=source_url,
-                                extraction_method="enterprise_provider",
-                                confidence_score=75,
-                                confidence_level="moderate",
-                                extracted_at=datetime.utcnow(),
-                            )
-                            enrich_db.add(new_source)
-                            total_sources += 1
-
-                    except Exception as prov_err:
-                        logger.warning(
-                            "Provider %s failed for %s: %s",
-                            provider.provider_name, comp.name, prov_err,
+            totals = {
+                "competitors_processed": 0,
+                "providers_used": provider_names,
+                "fields_updated": 0,
+                "sources_created": 0,
+            }
+            _ai_tasks[task_id]["progress"] = 0
+            _ai_tasks[task_id]["result"] = totals
+
+            # Providers run concurrently; results arrive as each query finishes
+            async for comp_id, result in engine.stream(
+                [(comp.id, comp.name) for comp in competitors]
+            ):
+                comp = by_id[comp_id]
+                if not result.error:
+                    # Apply mapped fields
+                    for field_name, value in result.fields.items():
+                        if hasattr(comp, field_name) and value is not None:
+                            old_val = getattr(comp, field_name, None)
+                            if str(old_val) != str(value):
+                                setattr(comp, field_name, value)
+                                totals["fields_updated"] += 1
+
+                        # Create DataSource record
+                        source_url = result.source_urls.get(field_name, "")
+                        new_source = DataSource(
+                            competitor_id=comp.id,
+                            field_name=field_name,
+                            current_value=str(value) if value else None,
+                            source_type="api",
+                            source_name=result.provider_name,
+                            source_url=source_url,
+                            extraction_method="enterprise_provider",
+                            confidence_score=75,
+                            confidence_level="moderate",
+                            extracted_at=datetime.utcnow(),
                         )
+                        enrich_db.add(new_source)
+                        totals["sources_created"] += 1
+
+                remaining[comp_id] -= 1
+                if remaining[comp_id] == 0:
+                    # All providers answered for this competitor
+                    enrich_db.commit()
+                    totals["competitors_processed"] += 1
+                    done = totals["competitors_processed"]
+                    _ai_tasks[task_id]["progress"] = min(
+                        int(done / max(len(competitors), 1) * 100), 99
+                    )
+                    _ai_tasks[task_id]["status_message"] = (
+                        f"Enriched {done}/{len(competitors)} competitors"
+                    )
 
-                enrich_db.commit()
+            enrich_db.commit()
 
             _ai_tasks[task_id]["status"] = "completed"
+            _ai_tasks[task_id]["progress"] = 100
             _ai_tasks[task_id]["completed_at"] = datetime.utcnow().isoformat()
             _ai_tasks[task_id]["result"] = {
+                **totals,
                 "competitors_processed": len(competitors),
-                "providers_used": provider_names,
-                "fields_updated": total_updates,
-                "sources_created": total_sources,
+                "provider_stats": engine.stats,
             }
         except Exception as e:
             logger.error("Provider enrichment failed: %s", e)
@@ -8430,191 +8432,17 @@ app.add_middleware(
 )
 
 # ==============================================================================
-# REL-001: API Rate Limiting Middleware
-# Per-IP: 100 requests/minute, Per-User: 1000 requests/minute
-# ==============================================================================
-from collections import defaultdict
-from time import time as current_time
-import threading
-
-class RateLimiter:
-    """Simple in-memory rate limiter with per-IP and per-user tracking."""
-
-    def __init__(self, ip_limit: int = 100, user_limit: int = 1000, window_seconds: int = 60):
-        self.ip_limit = ip_limit
-        self.user_limit = user_limit
-        self.window_seconds = window_seconds
-        self.ip_requests = defaultdict(list)
-        self.user_requests = defaultdict(list)
-        self._lock = threading.Lock()
-
-    def _clean_old_requests(self, requests_list: list, now: float) -> list:
-        """Remove requests older than the window."""
-        cutoff = now - self.window_seconds
-        return [ts for ts in requests_list if ts > cutoff]
-
-    def is_allowed(self, ip: str, user_id: str = None) -> tuple:
-        """Check if request is allowed. Returns (allowed, reason)."""
-        now = current_time()
-
-        with self._lock:
-            # Check IP rate limit
-            self.ip_requests[ip] = self._clean_old_requests(self.ip_requests[ip], now)
-            if len(self.ip_requests[ip]) >= self.ip_limit:
-                return False, f"IP rate limit exceeded ({self.ip_limit}/min)"
-
-            # Check user rate limit if authenticated
-            if user_id:
-                self.user_requests[user_id] = self._clean_old_requests(self.user_requests[user_id], now)
-                if len(self.user_requests[user_id]) >= self.user_limit:
-                    return False, f"User rate limit exceeded ({self.user_limit}/min)"
-
-            # Record this request
-            self.ip_requests[ip].append(now)
-            if user_id:
-                self.user_requests[user_id].append(now)
-
-            return True, None
-
-    def get_remaining(self, ip: str, user_id: str = None) -> dict:
-        """Get remaining requests for rate limit headers."""
-        now = current_time()
-        with self._lock:
-            ip_reqs = len(self._clean_old_requests(self.ip_requests.get(ip, []), now))
-            user_reqs = len(self._clean_old_requests(self.user_requests.get(user_id, []), now)) if user_id else 0
-        return {
-            "ip_remaining": max(0, self.ip_limit - ip_reqs),
-            "user_remaining": max(0, self.user_limit - user_reqs) if user_id else self.user_limit
-        }
-
-# Global rate limiter instance
-rate_limiter = RateLimiter(ip_limit=100, user_limit=1000, window_seconds=60)
-
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import JSONResponse
-
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Middleware to enforce rate limits on API requests."""
-
-    # Paths that skip rate limiting
-    EXEMPT_PATHS = {"/health", "/readiness", "/login.html", "/", "/app", "/static"}
-
-    async def dispatch(self, request: Request, call_next):
-        path = request.url.path
-
-        # Skip rate limiting for static files and exempt paths
-        if any(path.startswith(exempt) for exempt in self.EXEMPT_PATHS) or path.endswith(('.html', '.css', '.js', '.png', '.jpg', '.ico')):
-            return await call_next(request)
-
-        # Get client IP
-        client_ip = request.client.host if request.client else "unknown"
-        forwarded = request.headers.get("X-Forwarded-For")
-        if forwarded:
-            client_ip = forwarded.split(",")[0].strip()
-
-        # Try to get user ID from auth header (for user-specific limits)
-        user_id = None
-        auth_header = request.headers.get("Authorization", "")
-        if auth_header.startswith("Bearer "):
-            try:
-                from extended_features import auth_manager
-                token = auth_header.split(" ")[1]
-                payload = auth_manager.verify_token(token)
-                if payload:
-                    user_id = payload.get("sub")
-            except (ValueError, TypeError, ImportError):
-                pass
-
-        # Check rate limit
-        allowed, reason = rate_limiter.is_allowed(client_ip, user_id)
-
-        if not allowed:
-            # Return 429 Too Many Requests
-            return JSONResponse(
-                status_code=429,
-                content={
-                    "detail": reason,
-                    "retry_after": 60
-                },
-                headers={
-                    "Retry-After": "60",
-                    "X-RateLimit-Limit": str(rate_limiter.ip_limit),
-                    "X-RateLimit-Remaining": "0"
-                }
-            )
-
-        # Process request and add rate limit headers to response
-        response = await call_next(request)
-        remaining = rate_limiter.get_remaining(client_ip, user_id)
-        response.headers["X-RateLimit-Limit"] = str(rate_limiter.ip_limit)
-        response.headers["X-RateLimit-Remaining"] = str(remaining["ip_remaining"])
-
-        return response
-
-# Add rate limiting middleware
-app.add_middleware(RateLimitMiddleware)
-
-# ==============================================================================
-# PERF-002: In-Memory Caching Layer with TTL
+# PERF-002: API Response Caching with TTL
 # Caches: competitors (5min), dimensions (1hr), news (15min), products (30min)
+# Backed by the unified tiered cache (cache.py): in-process LRU (L1) plus
+# Redis (L2) shared across workers when REDIS_ENABLED=true.
 # ==============================================================================
-from functools import lru_cache
 import hashlib
+from cache import get_cache
+from performance import get_api_cache, get_single_flight, get_sync_single_flight
 
-class TTLCache:
-    """Simple TTL-based cache for API responses."""
-
-    def __init__(self):
-        self._cache = {}
-        self._timestamps = {}
-        self._lock = threading.Lock()
-
-    def get(self, key: str, ttl_seconds: int = 300) -> Any:
-        """Get cached value if not expired. Returns None if miss or expired."""
-        with self._lock:
-            if key not in self._cache:
-                return None
-
-            timestamp = self._timestamps.get(key, 0)
-            if current_time() - timestamp > ttl_seconds:
-                # Expired - clean up
-                del self._cache[key]
-                del self._timestamps[key]
-                return None
-
-            return self._cache[key]
-
-    def set(self, key: str, value: Any) -> None:
-        """Set cache value with current timestamp."""
-        with self._lock:
-            self._cache[key] = value
-            self._timestamps[key] = current_time()
-
-    def invalidate(self, pattern: str = None) -> int:
-        """Invalidate cache entries matching pattern (or all if None)."""
-        with self._lock:
-            if pattern is None:
-                count = len(self._cache)
-                self._cache.clear()
-                self._timestamps.clear()
-                return count
-
-            keys_to_delete = [k for k in self._cache if pattern in k]
-            for key in keys_to_delete:
-                del self._cache[key]
-                del self._timestamps[key]
-            return len(keys_to_delete)
-
-    def stats(self) -> dict:
-        """Get cache statistics."""
-        with self._lock:
-            return {
-                "entries": len(self._cache),
-                "keys": list(self._cache.keys())[:20]  # First 20 keys
-            }
-
-# Global cache instance
-api_cache = TTLCache()
+# Global cache instance ("api" namespace of the unified cache)
+api_cache = get_api_cache()
 
 # Cache TTL values (in seconds)
 CACHE_TTL = {
@@ -8636,6 +8464,11 @@ async def get_cache_stats(current_user: dict = Depends(get_current_user)):
     """Get cache statistics (admin only)."""
     return {
         "stats": api_cache.stats(),
+        "cache": get_cache().stats(),
+        "coalescing": {
+            "async": get_single_flight().stats(),
+            "sync": get_sync_single_flight().stats(),
+        },
         "ttl_config": CACHE_TTL
     }
 
@@ -8645,7 +8478,7 @@ async def invalidate_cache(
     current_user: dict = Depends(get_current_user)
 ):
     """Invalidate cache entries (admin only)."""
-    count = api_cache.invalidate(pattern)
+    count = api_cache.invalidate(pattern=pattern)
     return {"invalidated": count, "pattern": pattern or "all"}
 
 # ==============================================================================
@@ -8654,9 +8487,14 @@ async def invalidate_cache(
 # ==============================================================================
 
 from sqlalchemy import or_, func
+import search_index
 # SearchResult imported from schemas.competitors
 
 @app.get("/api/search")
+@cached_response(
+    ttl_seconds=300, stale_ttl_seconds=120, key_prefix="search:",
+    tags=["search"], unkeyed_params=("db", "current_user")
+)
 async def global_search(
     q: str,
     types: str = "all",  # comma-separated: competitor,product,news,knowledge
@@ -8666,21 +8504,27 @@ async def global_search(
 ):
     """
     Global search across all data types.
-    Uses LIKE for SQLite (FTS5 would require separate table setup).
-    Returns ranked results with snippets.
+    Uses the full-text index (FTS5 on SQLite, tsvector on PostgreSQL) with
+    BM25-style ranking and highlighted snippets; falls back to LIKE when no
+    index is available. Results are shared across users and concurrent
+    identical searches are coalesced.
     """
     if not q or len(q) < 2:
         return {"results": [], "total": 0, "query": q}
 
-    # Check cache first
-    cache_key_str = cache_key("search", q, types, limit)
-    cached = api_cache.get(cache_key_str, ttl_seconds=300)
-    if cached:
-        return cached
+    type_list = types.split(",") if types != "all" else ["competitor", "product", "news", "knowledge"]
+
+    indexed = search_index.search(db, q, type_list, limit=limit)
+    if indexed is not None:
+        return {
+            "results": indexed,
+            "total": len(indexed),
+            "query": q,
+            "types_searched": type_list
+        }
 
     results = []
     search_pattern = f"%{q.lower()}%"
-    type_list = types.split(",") if types != "all" else ["competitor", "product", "news", "knowledge"]
 
     # Search Competitors (using valid fields: notes, key_features, target_segments)
     if "competitor" in type_list:
@@ -8721,9 +8565,11 @@ async def global_search(
                 url=f"/competitors/{comp.id}"
             ))
 
-    # Search Products
+    # Search Products (competitor name joined in, not fetched per product)
     if "product" in type_list:
-        product_results = db.query(CompetitorProduct).filter(
+        product_results = db.query(CompetitorProduct, Competitor.name).outerjoin(
+            Competitor, Competitor.id == CompetitorProduct.competitor_id
+        ).filter(
             or_(
                 func.lower(CompetitorProduct.product_name).like(search_pattern),
                 func.lower(CompetitorProduct.description).like(search_pattern),
@@ -8731,13 +8577,12 @@ async def global_search(
             )
         ).limit(limit).all()
 
-        for prod in product_results:
-            comp = db.query(Competitor).filter(Competitor.id == prod.competitor_id).first()
+        for prod, competitor_name in product_results:
             results.append(SearchResult(
                 type="product",
                 id=prod.id,
                 title=prod.product_name or "Unknown Product",
-                subtitle=f"{comp.name if comp else 'Unknown'} | {prod.product_category or 'Product'}",
+                subtitle=f"{competitor_name or 'Unknown'} | {prod.product_category or 'Product'}",
                 snippet=prod.description[:150] + "..." if prod.description and len(prod.description) > 150 else prod.description,
                 score=1.0,
                 url=f"/competitors/{prod.competitor_id}"
@@ -8777,9 +8622,6 @@ async def global_search(
         "types_searched": type_list
     }
 
-    # Cache the result
-    api_cache.set(cache_key_str, response)
-
     return response
 
 @app.get("/api/search/suggestions")
@@ -8789,10 +8631,14 @@ async def search_suggestions(
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
-    """Get autocomplete suggestions for search."""
+    """Get autocomplete suggestions for search (prefix match on names)."""
     if not q or len(q) < 2:
         return {"suggestions": []}
 
+    indexed = search_index.suggest(db, q, limit=limit)
+    if indexed is not None:
+        return {"suggestions": indexed}
+
     search_pattern = f"%{q.lower()}%"
 
     # Get competitor names
@@ -8825,90 +8671,14 @@ async def search_suggestions(
 
 # ==============================================================================
 # INFRA-003: Database Backup Automation
-# Daily SQLite backups with retention policy
+# Daily online, incremental backups with retention policy (backup_manager.py)
 # ==============================================================================
 
-import shutil
 from pathlib import Path
-
-BACKUP_DIR = Path("backups")
-BACKUP_RETENTION_DAYS = 7
-
-def get_database_path() -> Path:
-    """Get the path to the SQLite database file."""
-    db_url = os.getenv("DATABASE_URL", "sqlite:///./certify_intel.db")
-    if db_url.startswith("sqlite:///"):
-        db_path = db_url.replace("sqlite:///", "")
-        if db_path.startswith("./"):
-            db_path = db_path[2:]
-        return Path(db_path)
-    return Path("certify_intel.db")
-
-def create_backup() -> dict:
-    """Create a backup of the database."""
-    try:
-        BACKUP_DIR.mkdir(exist_ok=True)
-        db_path = get_database_path()
-
-        if not db_path.exists():
-            return {"success": False, "error": "Database file not found"}
-
-        # Create timestamped backup
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_name = f"certify_intel_backup_{timestamp}.db"
-        backup_path = BACKUP_DIR / backup_name
-
-        shutil.copy2(db_path, backup_path)
-
-        # Also create a "latest" symlink/copy
-        latest_path = BACKUP_DIR / "certify_intel_latest.db"
-        if latest_path.exists():
-            latest_path.unlink()
-        shutil.copy2(backup_path, latest_path)
-
-        # Clean old backups (retention policy)
-        cleanup_old_backups()
-
-        file_size = backup_path.stat().st_size
-        return {
-            "success": True,
-            "backup_file": backup_name,
-            "backup_path": str(backup_path),
-            "size_bytes": file_size,
-            "size_mb": round(file_size / (1024 * 1024), 2),
-            "timestamp": timestamp
-        }
-    except Exception as e:
-        return {"success": False, "error": "An unexpected error occurred"}
-
-def cleanup_old_backups():
-    """Remove backups older than retention period."""
-    if not BACKUP_DIR.exists():
-        return
-
-    cutoff = datetime.now().timestamp() - (BACKUP_RETENTION_DAYS * 86400)
-
-    for backup_file in BACKUP_DIR.glob("certify_intel_backup_*.db"):
-        if backup_file.stat().st_mtime < cutoff:
-            backup_file.unlink()
-            logger.info(f"[Backup] Removed old backup: {backup_file.name}")
-
-def list_backups() -> list:
-    """List all available backups."""
-    if not BACKUP_DIR.exists():
-        return []
-
-    backups = []
-    for backup_file in sorted(BACKUP_DIR.glob("certify_intel_backup_*.db"), reverse=True):
-        stat = backup_file.stat()
-        backups.append({
-            "filename": backup_file.name,
-            "path": str(backup_file),
-            "size_bytes": stat.st_size,
-            "size_mb": round(stat.st_size / (1024 * 1024), 2),
-            "created_at": datetime.fromtimestamp(stat.st_mtime).isoformat()
-        })
-    return backups
+from backup_manager import (
+    BACKUP_DIR, BACKUP_RETENTION_DAYS, BackupError,
+    backup_source, create_backup, iter_backup, list_backups, resolve_backup, restore_backup,
+)
 
 @app.post("/api/backup/create")
 async def api_create_backup(current_user: dict = Depends(get_current_user)):
@@ -8916,7 +8686,7 @@ async def api_create_backup(current_user: dict = Depends(get_current_user)):
     if current_user.get("role") != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
 
-    result = create_backup()
+    result = await asyncio.to_thread(create_backup)
     if result["success"]:
         return result
     else:
@@ -8925,7 +8695,7 @@ async def api_create_backup(current_user: dict = Depends(get_current_user)):
 @app.get("/api/backup/list")
 async def api_list_backups(current_user: dict = Depends(get_current_user)):
     """List all available backups."""
-    backups = list_backups()
+    backups = await asyncio.to_thread(list_backups)
     return {
         "backups": backups,
         "total": len(backups),
@@ -8933,26 +8703,31 @@ async def api_list_backups(current_user: dict = Depends(get_current_user)):
         "backup_dir": str(BACKUP_DIR)
     }
 
+def _resolve_backup_or_404(filename: str) -> Path:
+    # Path traversal protection: only plain backup names inside BACKUP_DIR
+    try:
+        return resolve_backup(filename)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid filename")
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Backup not found")
+
 @app.get("/api/backup/download/{filename}")
 async def api_download_backup(
     filename: str,
     current_user: dict = Depends(get_current_user)
 ):
-    """Download a backup file (admin only)."""
+    """Download a backup as a database file, streamed and verified (admin only)."""
     if current_user.get("role") != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
 
-    # Path traversal protection: resolve to real path and verify within BACKUP_DIR
-    backup_path = (BACKUP_DIR / filename).resolve()
-    if not str(backup_path).startswith(str(BACKUP_DIR.resolve())):
-        raise HTTPException(status_code=400, detail="Invalid filename")
-    if not backup_path.exists() or not backup_path.name.startswith("certify_intel_"):
-        raise HTTPException(status_code=404, detail="Backup not found")
-
-    return FileResponse(
-        path=backup_path,
-        filename=filename,
-        media_type="application/octet-stream"
+    backup_path = _resolve_backup_or_404(filename)
+    extension = ".dump" if backup_source(backup_path) == "postgresql" else ".db"
+    download_name = backup_path.name.split(".")[0] + extension
+    return StreamingResponse(
+        iter_backup(backup_path),
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f"attachment; filename={download_name}"}
     )
 
 @app.post("/api/backup/restore/{filename}")
@@ -8960,33 +8735,18 @@ async def api_restore_backup(
     filename: str,
     current_user: dict = Depends(get_current_user)
 ):
-    """Restore from a backup file (admin only). Requires server restart."""
+    """Restore from a backup (admin only). The current state is backed up first."""
     if current_user.get("role") != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
 
-    # Path traversal protection: resolve to real path and verify within BACKUP_DIR
-    backup_path = (BACKUP_DIR / filename).resolve()
-    if not str(backup_path).startswith(str(BACKUP_DIR.resolve())):
-        raise HTTPException(status_code=400, detail="Invalid filename")
-    if not backup_path.exists() or not backup_path.name.startswith("certify_intel_"):
-        raise HTTPException(status_code=404, detail="Backup not found")
-
+    _resolve_backup_or_404(filename)
     try:
-        db_path = get_database_path()
-
-        # Create a backup of current state before restoring
-        pre_restore_backup = create_backup()
-
-        # Copy backup over current database
-        shutil.copy2(backup_path, db_path)
-
-        return {
-            "success": True,
-            "restored_from": filename,
-            "pre_restore_backup": pre_restore_backup.get("backup_file"),
-            "message": "Database restored. Please restart the server for changes to take effect."
-        }
+        return await asyncio.to_thread(restore_backup, filename)
+    except BackupError as e:
+        logger.error(f"[Backup] Restore from {filename} rejected: {e}")
+        raise HTTPException(status_code=422, detail=f"Backup failed verification: {e}")
     except Exception as e:
+        logger.error(f"[Backup] Restore from {filename} failed: {e}")
         raise HTTPException(status_code=500, detail="Restore failed. Please try again.")
 
 # ==============================================================================
@@ -9149,80 +8909,14 @@ async def get_competitor_subscription_status(
     }
 
 # ==============================================================================
-# REL-010: Security Headers Middleware
-# Extracted to middleware/security.py for modularity
+# REL-001 / REL-010 / PERF-008 / OBS-001: Request pipeline middleware
+# One pure-ASGI layer for API rate limiting (GCRA, Redis-backed when
+# REDIS_ENABLED=true), security headers, static caching headers,
+# correlation IDs and Prometheus request metrics. See middleware/pipeline.py.
 # ==============================================================================
-from middleware.security import SecurityHeadersMiddleware  # noqa: E402
+from middleware.pipeline import RequestPipelineMiddleware  # noqa: E402
 
-# Add security headers middleware (configurable via SECURITY_HEADERS_ENABLED env var)
-app.add_middleware(SecurityHeadersMiddleware)
-
-
-# ==============================================================================
-# PERF-008: Browser Caching Headers Middleware
-# Adds Cache-Control headers for static assets to improve load times
-# ==============================================================================
-
-class CachingHeadersMiddleware(BaseHTTPMiddleware):
-    """Middleware to add caching headers for static assets."""
-
-    # File extension to cache duration mapping (in seconds)
-    # v7.0.5: Disabled caching for JS/CSS/HTML to prevent stale version issues
-    CACHE_DURATIONS = {
-        # Immutable assets (hashed filenames) - 1 year
-        '.woff2': 31536000,
-        '.woff': 31536000,
-        '.ttf': 31536000,
-        '.eot': 31536000,
-        # Images - 1 week
-        '.png': 604800,
-        '.jpg': 604800,
-        '.jpeg': 604800,
-        '.gif': 604800,
-        '.ico': 604800,
-        '.svg': 604800,
-        '.webp': 604800,
-        # CSS/JS - no cache to prevent stale version issues (v7.0.5 fix)
-        '.css': 0,
-        '.js': 0,
-        # HTML - no cache (always fresh)
-        '.html': 0,
-    }
-
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-
-        path = request.url.path.lower()
-
-        # Skip API endpoints
-        if path.startswith('/api/'):
-            return response
-
-        # Determine cache duration based on file extension
-        for ext, duration in self.CACHE_DURATIONS.items():
-            if path.endswith(ext):
-                if duration > 0:
-                    # Check if version query parameter exists for longer caching
-                    if '?v=' in str(request.url):
-                        duration = 604800  # 1 week for versioned assets
-                    response.headers["Cache-Control"] = f"public, max-age={duration}"
-                    response.headers["Vary"] = "Accept-Encoding"
-                else:
-                    response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-                break
-
-        return response
-
-# Add caching headers middleware
-app.add_middleware(CachingHeadersMiddleware)
-
-# ==============================================================================
-# OBS-001: Prometheus Metrics Middleware
-# Tracks HTTP request count and duration. Zero overhead when METRICS_ENABLED=false.
-# ==============================================================================
-from middleware.metrics import MetricsMiddleware  # noqa: E402
-
-app.add_middleware(MetricsMiddleware)
+app.add_middleware(RequestPipelineMiddleware)
 
 # ==============================================================================
 # PERF-010: Performance Monitoring - Core Web Vitals Endpoint
@@ -9331,6 +9025,7 @@ async def get_corporate_profile(db: Session = Depends(get_db), current_user: dic
 
 def auto_fit_columns(worksheet):
     """Auto-fit all columns to the widest content."""
+    from openpyxl.utils import get_column_letter
     for column_cells in worksheet.columns:
         max_length = 0
         column_letter = get_column_letter(column_cells[0].column)
@@ -9352,11 +9047,13 @@ def auto_fit_columns(worksheet):
 
 def apply_white_background(worksheet, max_row=100, max_col=50):
     """Apply white background to all cells."""
+    from openpyxl.styles import PatternFill
+    white_fill = PatternFill(start_color="FFFFFF", end_color="FFFFFF", fill_type="solid")
     for row in range(1, max_row + 1):
         for col in range(1, max_col + 1):
             cell = worksheet.cell(row=row, column=col)
             if cell.fill.fgColor.rgb in (None, '00000000', 'FFFFFFFF') or cell.fill.fill_type is None:
-                cell.fill = WHITE_FILL
+                cell.fill = white_fill
 
 
 # NOTE: Early /api/export/excel removed (duplicate of comprehensive v6.1.2 version below at ~line 10942)
@@ -9605,49 +9302,47 @@ Top Competitors by Threat Level:
     )
 
 
+# Competitor fields in /api/export/json (JSON, NDJSON and Parquet)
+_COMPETITOR_EXPORT_FIELDS = (
+    "name", "website", "status", "threat_level", "last_updated", "notes",
+    "data_quality_score", "pricing_model", "base_price", "price_unit",
+    "product_categories", "key_features", "integration_partners", "certifications",
+    "target_segments", "customer_size_focus", "geographic_focus", "customer_count",
+    "customer_acquisition_rate", "key_customers", "g2_rating", "employee_count",
+    "employee_growth_rate", "year_founded", "headquarters", "funding_total",
+    "latest_round", "pe_vc_backers", "website_traffic", "social_following",
+    "recent_launches", "news_mentions",
+)
+
+
 @app.get("/api/export/json")
-def export_json(db: Session = Depends(get_db)):
-    """Export all competitor data as JSON."""
-    competitors = db.query(Competitor).filter(Competitor.is_deleted == False).all()
-    
-    data = []
-    for comp in competitors:
-        data.append({
-            "name": comp.name,
-            "website": comp.website,
-            "status": comp.status,
-            "threat_level": comp.threat_level,
-            "last_updated": comp.last_updated.isoformat() if comp.last_updated else None,
-            "notes": comp.notes,
-            "data_quality_score": comp.data_quality_score,
-            "pricing_model": comp.pricing_model,
-            "base_price": comp.base_price,
-            "price_unit": comp.price_unit,
-            "product_categories": comp.product_categories,
-            "key_features": comp.key_features,
-            "integration_partners": comp.integration_partners,
-            "certifications": comp.certifications,
-            "target_segments": comp.target_segments,
-            "customer_size_focus": comp.customer_size_focus,
-            "geographic_focus": comp.geographic_focus,
-            "customer_count": comp.customer_count,
-            "customer_acquisition_rate": comp.customer_acquisition_rate,
-            "key_customers": comp.key_customers,
-            "g2_rating": comp.g2_rating,
-            "employee_count": comp.employee_count,
-            "employee_growth_rate": comp.employee_growth_rate,
-            "year_founded": comp.year_founded,
-            "headquarters": comp.headquarters,
-            "funding_total": comp.funding_total,
-            "latest_round": comp.latest_round,
-            "pe_vc_backers": comp.pe_vc_backers,
-            "website_traffic": comp.website_traffic,
-            "social_following": comp.social_following,
-            "recent_launches": comp.recent_launches,
-            "news_mentions": comp.news_mentions,
-        })
-    
-    return {"competitors": data, "count": len(data), "exported_at": datetime.utcnow().isoformat()}
+def export_json(format: str = "json", db: Session = Depends(get_db)):
+    """
+    Export all competitor data as JSON (streamed).
+
+    ``format=ndjson`` gives one competitor per line; ``format=parquet`` a
+    typed Parquet file for analysts (requires pyarrow).
+    """
+    format = check_format(format, ("json", "ndjson", "parquet"))
+    records = iter_rows(
+        db,
+        lambda s: s.query(Competitor).filter(Competitor.is_deleted == False).order_by(Competitor.id),
+        lambda comp: model_fields(comp, _COMPETITOR_EXPORT_FIELDS),
+    )
+    filename = f"certify_intel_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+    if format == "ndjson":
+        return streaming_download(ndjson_chunks(records), f"{filename}.ndjson", format)
+    if format == "parquet":
+        schema = arrow_schema(Competitor, _COMPETITOR_EXPORT_FIELDS)
+        return streaming_download(parquet_chunks(schema, records), f"{filename}.parquet", format)
+    return StreamingResponse(
+        json_document_chunks(
+            "competitors", records,
+            tail=lambda count: {"count": count, "exported_at": datetime.utcnow().isoformat()}
+        ),
+        media_type="application/json"
+    )
 
 
 # Dashboard endpoints moved to routers/dashboard.py
@@ -9841,7 +9536,8 @@ async def get_refresh_history(limit: int = 10, db: Session = Depends(get_db)):
         "new_values_added": s.new_values_added,
         "errors_count": s.errors_count,
         "status": s.status,
-        "ai_summary": s.ai_summary
+        "ai_summary": s.ai_summary,
+        "stage_progress": json.loads(s.stage_progress) if s.stage_progress else None
     } for s in sessions]
 
 
@@ -10043,26 +9739,22 @@ async def _run_post_scrape_enrichment():
                     import asyncio
                     digest = await asyncio.to_thread(monitor.fetch_news, comp.name, 30)
                     if digest and digest.articles:
-                        from database import NewsArticleCache
-                        for article in digest.articles[:5]:
-                            # Check for duplicate
-                            existing = db.query(NewsArticleCache).filter(
-                                NewsArticleCache.url == article.url
-                            ).first()
-                            if not existing:
-                                cache_entry = NewsArticleCache(
-                                    competitor_id=comp.id,
-                                    competitor_name=comp.name,
-                                    title=article.title,
-                                    url=article.url,
-                                    source=article.source,
-                                    published_at=article.published_date if hasattr(article, 'published_date') else None,
-                                    snippet=article.summary[:500] if article.summary else None,
-                                    sentiment=article.sentiment if hasattr(article, 'sentiment') else 'neutral',
-                                    event_type=article.event_type if hasattr(article, 'event_type') else None
-                                )
-                                db.add(cache_entry)
-                                news_count += 1
+                        from news_ingest import ingest_articles, parse_published_date
+                        rows = [
+                            dict(
+                                competitor_id=comp.id,
+                                competitor_name=comp.name,
+                                title=article.title,
+                                url=article.url,
+                                source=article.source,
+                                published_at=parse_published_date(article.published_date),
+                                snippet=article.snippet[:500] if article.snippet else None,
+                                sentiment=article.sentiment or 'neutral',
+                                event_type=article.event_type
+                            )
+                            for article in digest.articles[:5]
+                        ]
+                        news_count += ingest_articles(db, rows).inserted
                         db.commit()
                 except Exception as news_err:
                     logger.warning(f"[Enrichment] News fetch failed for {comp.name}: {news_err}")
@@ -10686,7 +10378,7 @@ async def get_swot_analysis(
 def fetch_real_stock_data(ticker: str) -> Dict[str, Any]:
     """Fetch real-time stock data using yfinance."""
     try:
-        stock = yf.Ticker(ticker)
+        stock = _yfinance().Ticker(ticker)
         info = stock.info
         
         # Calculate change if not provided
@@ -11574,25 +11266,22 @@ async def add_discovered_competitors(
                         # Step 3: Fetch news articles
                         try:
                             from news_monitor import NewsMonitor
-                            from database import NewsArticleCache
+                            from news_ingest import ingest_articles
                             monitor = NewsMonitor()
                             digest = monitor.fetch_news(comp.name, days=30)
                             if digest and digest.articles:
-                                for article in digest.articles[:5]:
-                                    existing = enrich_db.query(NewsArticleCache).filter(
-                                        NewsArticleCache.url == article.url
-                                    ).first()
-                                    if not existing:
-                                        cache_entry = NewsArticleCache(
-                                            competitor_id=comp.id,
-                                            competitor_name=comp.name,
-                                            title=article.title,
-                                            url=article.url,
-                                            source=article.source,
-                                            snippet=article.summary[:500] if article.summary else None,
-                                            sentiment=article.sentiment if hasattr(article, 'sentiment') else 'neutral'
-                                        )
-                                        enrich_db.add(cache_entry)
+                                ingest_articles(enrich_db, [
+                                    dict(
+                                        competitor_id=comp.id,
+                                        competitor_name=comp.name,
+                                        title=article.title,
+                                        url=article.url,
+                                        source=article.source,
+                                        snippet=article.snippet[:500] if article.snippet else None,
+                                        sentiment=article.sentiment or 'neutral'
+                                    )
+                                    for article in digest.articles[:5]
+                                ])
                                 # v7.2: DataSource for news_mentions
                                 aurls = [
                                     a.url for a in digest.articles[:5]
@@ -13053,7 +12742,7 @@ async def fetch_news_for_competitors(
     Returns: {progress_key: str, status: "started", competitors_count: int}
     """
     import uuid as _uuid
-    from database import NewsArticleCache
+    from news_ingest import ingest_articles, parse_published_date
     from news_monitor import NewsMonitor, _news_fetch_progress
     from datetime import datetime
 
@@ -13139,43 +12828,28 @@ async def fetch_news_for_competitors(
                 finally:
                     loop.close()
 
-                articles_for_comp = 0
+                rows = []
                 for article in digest.articles:
                     if date_from and article.published_date and str(article.published_date) < date_from:
                         continue
                     if date_to and article.published_date and str(article.published_date) > date_to:
                         continue
 
-                    existing = local_db.query(NewsArticleCache).filter(
-                        NewsArticleCache.url == article.url
-                    ).first()
-
-                    if not existing:
-                        pub_date = None
-                        if article.published_date:
-                            for fmt in ["%Y-%m-%dT%H:%M:%S", "%Y-%m-%d", "%a, %d %b %Y %H:%M:%S %Z"]:
-                                try:
-                                    pub_date = datetime.strptime(str(article.published_date)[:19], fmt[:19])
-                                    break
-                                except (ValueError, TypeError):
-                                    continue
-
-                        new_entry = NewsArticleCache(
-                            competitor_id=comp.id,
-                            competitor_name=comp.name,
-                            title=article.title,
-                            url=article.url,
-                            source=getattr(article, 'source', '') or '',
-                            source_type="google_news",
-                            snippet=getattr(article, 'summary', '') or getattr(article, 'snippet', '') or '',
-                            sentiment=getattr(article, 'sentiment', 'neutral') or 'neutral',
-                            event_type=getattr(article, 'event_type', '') or '',
-                            is_major_event=getattr(article, 'is_major_event', False),
-                            published_at=pub_date or datetime.utcnow(),
-                            fetched_at=datetime.utcnow()
-                        )
-                        local_db.add(new_entry)
-                        articles_for_comp += 1
+                    rows.append(dict(
+                        competitor_id=comp.id,
+                        competitor_name=comp.name,
+                        title=article.title,
+                        url=article.url,
+                        source=getattr(article, 'source', '') or '',
+                        source_type="google_news",
+                        snippet=getattr(article, 'summary', '') or getattr(article, 'snippet', '') or '',
+                        sentiment=getattr(article, 'sentiment', 'neutral') or 'neutral',
+                        event_type=getattr(article, 'event_type', '') or '',
+                        is_major_event=getattr(article, 'is_major_event', False),
+                        published_at=parse_published_date(article.published_date) or datetime.utcnow(),
+                        fetched_at=datetime.utcnow()
+                    ))
+                articles_for_comp = ingest_articles(local_db, rows).inserted
 
                 local_db.commit()
 
@@ -13255,7 +12929,7 @@ async def refresh_news_cache(
         end_date: Optional end date (YYYY-MM-DD), default today
     """
     import uuid as _uuid
-    from database import NewsArticleCache
+    from news_ingest import ingest_articles, parse_published_date
     from news_monitor import NewsMonitor
     from datetime import datetime
 
@@ -13286,40 +12960,24 @@ async def refresh_news_cache(
             try:
                 digest = monitor.fetch_news(comp.name, days=days)
 
-                for article in digest.articles:
-                    # Check if article already exists
-                    existing = db.query(NewsArticleCache).filter(
-                        NewsArticleCache.url == article.url
-                    ).first()
-
-                    if not existing:
-                        # Parse published date
-                        pub_date = None
-                        if article.published_date:
-                            for fmt in ["%Y-%m-%dT%H:%M:%S", "%Y-%m-%d", "%a, %d %b %Y %H:%M:%S %Z"]:
-                                try:
-                                    pub_date = datetime.strptime(article.published_date[:19], fmt[:19])
-                                    break
-                                except (ValueError, TypeError):
-                                    continue
-
-                        # Create new cache entry
-                        cache_entry = NewsArticleCache(
-                            competitor_id=comp.id,
-                            competitor_name=comp.name,
-                            title=article.title,
-                            url=article.url,
-                            source=article.source,
-                            source_type="google_news",
-                            published_at=pub_date or datetime.utcnow(),
-                            snippet=article.snippet,
-                            sentiment=article.sentiment,
-                            event_type=article.event_type,
-                            is_major_event=article.is_major_event,
-                            fetched_at=datetime.utcnow(),
-                        )
-                        db.add(cache_entry)
-                        refreshed += 1
+                rows = [
+                    dict(
+                        competitor_id=comp.id,
+                        competitor_name=comp.name,
+                        title=article.title,
+                        url=article.url,
+                        source=article.source,
+                        source_type="google_news",
+                        published_at=parse_published_date(article.published_date) or datetime.utcnow(),
+                        snippet=article.snippet,
+                        sentiment=article.sentiment,
+                        event_type=article.event_type,
+                        is_major_event=article.is_major_event,
+                        fetched_at=datetime.utcnow(),
+                    )
+                    for article in digest.articles
+                ]
+                refreshed += ingest_articles(db, rows).inserted
 
                 db.commit()
 
@@ -13578,7 +13236,7 @@ def refresh_all_news_coverage(
             # Fallback to basic refresh
             logger.warning("[News Coverage] ComprehensiveNewsScraper not available, using basic refresh")
             from news_monitor import NewsMonitor
-            from database import NewsArticleCache
+            from news_ingest import ingest_articles
 
             monitor = NewsMonitor()
             competitors = db.query(Competitor).filter(Competitor.is_deleted == False).all()
@@ -13586,28 +13244,24 @@ def refresh_all_news_coverage(
             for comp in competitors:
                 try:
                     digest = monitor.fetch_news(comp.name, days=30)
-                    for article in digest.articles:
-                        existing = db.query(NewsArticleCache).filter(
-                            NewsArticleCache.url == article.url
-                        ).first()
-
-                        if not existing:
-                            cache_entry = NewsArticleCache(
-                                competitor_id=comp.id,
-                                competitor_name=comp.name,
-                                title=article.title[:500],
-                                url=article.url,
-                                source=article.source,
-                                source_type="news_monitor",
-                                published_at=datetime.utcnow(),
-                                snippet=article.snippet[:1000] if article.snippet else None,
-                                sentiment=article.sentiment,
-                                event_type=article.event_type,
-                                is_major_event=article.is_major_event,
-                                fetched_at=datetime.utcnow(),
-                                created_at=datetime.utcnow()
-                            )
-                            db.add(cache_entry)
+                    ingest_articles(db, [
+                        dict(
+                            competitor_id=comp.id,
+                            competitor_name=comp.name,
+                            title=article.title[:500],
+                            url=article.url,
+                            source=article.source,
+                            source_type="news_monitor",
+                            published_at=datetime.utcnow(),
+                            snippet=article.snippet[:1000] if article.snippet else None,
+                            sentiment=article.sentiment,
+                            event_type=article.event_type,
+                            is_major_event=article.is_major_event,
+                            fetched_at=datetime.utcnow(),
+                            created_at=datetime.utcnow()
+                        )
+                        for article in digest.articles
+                    ])
 
                     db.commit()
                 except Exception as e:
@@ -14041,6 +13695,7 @@ def get_competitor_employee_reviews(competitor_id: int, db: Session = Depends(ge
     if not competitor:
         raise HTTPException(status_code=404, detail="Competitor not found")
     
+    import glassdoor_scraper
     return glassdoor_scraper.get_glassdoor_data(competitor.name)
 
 @app.get("/api/competitors/{competitor_id}/jobs")
@@ -14050,6 +13705,7 @@ def get_competitor_jobs(competitor_id: int, db: Session = Depends(get_db)):
     if not competitor:
         raise HTTPException(status_code=404, detail="Competitor not found")
     
+    import indeed_scraper
     return indeed_scraper.get_job_data(competitor.name)
 
 @app.get("/api/competitors/{competitor_id}/sec-filings")
@@ -14059,6 +13715,7 @@ def get_competitor_sec_filings(competitor_id: int, db: Session = Depends(get_db)
     if not competitor:
         raise HTTPException(status_code=404, detail="Competitor not found")
     
+    import sec_edgar_scraper
     return sec_edgar_scraper.get_sec_data(competitor.name)
 
 @app.get("/api/competitors/{competitor_id}/patents")
@@ -14078,6 +13735,7 @@ def get_competitor_klas_ratings(competitor_id: int, db: Session = Depends(get_db
     if not competitor:
         raise HTTPException(status_code=404, detail="Competitor not found")
     
+    import klas_scraper
     return klas_scraper.get_klas_data(competitor.name)
 
 @app.get("/api/competitors/{competitor_id}/mobile-apps")
@@ -14087,6 +13745,7 @@ def get_competitor_mobile_apps(competitor_id: int, db: Session = Depends(get_db)
     if not competitor:
         raise HTTPException(status_code=404, detail="Competitor not found")
     
+    import appstore_scraper
     return appstore_scraper.get_app_store_data(competitor.name)
 
 @app.get("/api/competitors/{competitor_id}/social-sentiment")
@@ -14096,6 +13755,7 @@ def get_competitor_social_sentiment(competitor_id: int, db: Session = Depends(ge
     if not competitor:
         raise HTTPException(status_code=404, detail="Competitor not found")
     
+    import social_media_monitor
     analysis = social_media_monitor.analyze_social_sentiment(competitor.name)
     raw_data = social_media_monitor.get_social_data(competitor.name)
     return {**analysis, "recent_posts": raw_data.get("top_posts", [])}
@@ -14107,259 +13767,252 @@ def get_competitor_market_presence(competitor_id: int, db: Session = Depends(get
     if not competitor:
         raise HTTPException(status_code=404, detail="Competitor not found")
     
+    import himss_scraper
     return himss_scraper.get_himss_data(competitor.name)
 
 # ============== EXPORT ENDPOINTS ==============
 
+def _competitor_excel_row(comp: Competitor) -> Dict[str, Any]:
+    """One /api/export/excel row; the keys are the column headers."""
+    return {
+        # === CORE INFORMATION ===
+        "ID": comp.id,
+        "Company Name": comp.name,
+        "Website": comp.website,
+        "Status": comp.status,
+        "Threat Level": comp.threat_level,
+        "Last Updated": comp.last_updated.strftime("%Y-%m-%d %H:%M") if comp.last_updated else None,
+        "Notes": comp.notes,
+        "Data Quality Score": comp.data_quality_score,
+
+        # === PRICING ===
+        "Pricing Model": comp.pricing_model,
+        "Base Price": comp.base_price,
+        "Price Unit": comp.price_unit,
+
+        # === PRODUCT ===
+        "Product Categories": comp.product_categories,
+        "Key Features": comp.key_features,
+        "Integration Partners": comp.integration_partners,
+        "Certifications": comp.certifications,
+
+        # === MARKET ===
+        "Target Segments": comp.target_segments,
+        "Customer Size Focus": comp.customer_size_focus,
+        "Geographic Focus": comp.geographic_focus,
+        "Customer Count": comp.customer_count,
+        "Customer Acquisition Rate": comp.customer_acquisition_rate,
+        "Key Customers": comp.key_customers,
+        "G2 Rating": comp.g2_rating,
+
+        # === COMPANY ===
+        "Employee Count": comp.employee_count,
+        "Employee Growth Rate": comp.employee_growth_rate,
+        "Year Founded": comp.year_founded,
+        "Headquarters": comp.headquarters,
+        "Funding Total": comp.funding_total,
+        "Latest Round": comp.latest_round,
+        "PE/VC Backers": comp.pe_vc_backers,
+
+        # === DIGITAL PRESENCE ===
+        "Website Traffic": comp.website_traffic,
+        "Social Following": comp.social_following,
+        "Recent Launches": comp.recent_launches,
+        "News Mentions": comp.news_mentions,
+
+        # === PUBLIC COMPANY INFO ===
+        "Is Public": comp.is_public,
+        "Ticker Symbol": comp.ticker_symbol,
+        "Stock Exchange": comp.stock_exchange,
+
+        # === MARKET VERTICAL ===
+        "Primary Market": comp.primary_market,
+        "Markets Served": comp.markets_served,
+        "Market Focus Score": comp.market_focus_score,
+
+        # === PRODUCT OVERLAP ===
+        "Has PXP": comp.has_pxp,
+        "Has PMS": comp.has_pms,
+        "Has RCM": comp.has_rcm,
+        "Has Patient Mgmt": comp.has_patient_mgmt,
+        "Has Payments": comp.has_payments,
+        "Has Biometric": comp.has_biometric,
+        "Has Interoperability": comp.has_interoperability,
+        "Product Overlap Score": comp.product_overlap_score,
+
+        # === ENHANCED ANALYTICS ===
+        "Telehealth Capabilities": comp.telehealth_capabilities,
+        "AI Features": comp.ai_features,
+        "Mobile App Available": comp.mobile_app_available,
+        "HIPAA Compliant": comp.hipaa_compliant,
+        "EHR Integrations": comp.ehr_integrations,
+
+        # === DIMENSION SCORES ===
+        "Dim: Product Packaging Score": comp.dim_product_packaging_score,
+        "Dim: Integration Depth Score": comp.dim_integration_depth_score,
+        "Dim: Support Service Score": comp.dim_support_service_score,
+        "Dim: Retention Stickiness Score": comp.dim_retention_stickiness_score,
+        "Dim: User Adoption Score": comp.dim_user_adoption_score,
+        "Dim: Implementation TTV Score": comp.dim_implementation_ttv_score,
+        "Dim: Reliability Enterprise Score": comp.dim_reliability_enterprise_score,
+        "Dim: Pricing Flexibility Score": comp.dim_pricing_flexibility_score,
+        "Dim: Reporting Analytics Score": comp.dim_reporting_analytics_score,
+        "Dim: Overall Score": comp.dim_overall_score,
+        "Dim: Sales Priority": comp.dim_sales_priority,
+
+        # === SEC/FINANCIAL DATA ===
+        "Logo URL": comp.logo_url,
+        "SEC CIK": comp.sec_cik,
+        "Annual Revenue": comp.annual_revenue,
+        "Net Income": comp.net_income,
+        "SEC Employee Count": comp.sec_employee_count,
+        "Fiscal Year End": comp.fiscal_year_end,
+        "Email Pattern": comp.email_pattern,
+
+        # === SOCIAL MEDIA METRICS (NEW v6.1.2) ===
+        "LinkedIn Followers": getattr(comp, 'linkedin_followers', None),
+        "LinkedIn Employees": getattr(comp, 'linkedin_employees', None),
+        "LinkedIn URL": getattr(comp, 'linkedin_url', None),
+        "Twitter Followers": getattr(comp, 'twitter_followers', None),
+        "Twitter Handle": getattr(comp, 'twitter_handle', None),
+        "Facebook Followers": getattr(comp, 'facebook_followers', None),
+        "Instagram Followers": getattr(comp, 'instagram_followers', None),
+        "YouTube Subscribers": getattr(comp, 'youtube_subscribers', None),
+
+        # === FINANCIAL METRICS (NEW v6.1.2) ===
+        "Estimated Revenue": getattr(comp, 'estimated_revenue', None),
+        "Revenue Growth Rate": getattr(comp, 'revenue_growth_rate', None),
+        "Profit Margin": getattr(comp, 'profit_margin', None),
+        "Estimated Valuation": getattr(comp, 'estimated_valuation', None),
+        "Burn Rate": getattr(comp, 'burn_rate', None),
+        "Runway Months": getattr(comp, 'runway_months', None),
+        "Last Funding Date": getattr(comp, 'last_funding_date', None),
+        "Funding Stage": getattr(comp, 'funding_stage', None),
+        "Debt Financing": getattr(comp, 'debt_financing', None),
+        "Revenue Per Employee": getattr(comp, 'revenue_per_employee', None),
+
+        # === LEADERSHIP & TEAM (NEW v6.1.2) ===
+        "CEO Name": getattr(comp, 'ceo_name', None),
+        "CEO LinkedIn": getattr(comp, 'ceo_linkedin', None),
+        "CTO Name": getattr(comp, 'cto_name', None),
+        "CFO Name": getattr(comp, 'cfo_name', None),
+        "Executive Changes": getattr(comp, 'executive_changes', None),
+        "Board Members": getattr(comp, 'board_members', None),
+        "Advisors": getattr(comp, 'advisors', None),
+        "Founder Background": getattr(comp, 'founder_background', None),
+
+        # === EMPLOYEE & CULTURE (NEW v6.1.2) ===
+        "Glassdoor Rating": getattr(comp, 'glassdoor_rating', None),
+        "Glassdoor Reviews Count": getattr(comp, 'glassdoor_reviews_count', None),
+        "Glassdoor Recommend %": getattr(comp, 'glassdoor_recommend_pct', None),
+        "Indeed Rating": getattr(comp, 'indeed_rating', None),
+        "Employee Turnover Rate": getattr(comp, 'employee_turnover_rate', None),
+        "Hiring Velocity (Open Positions)": getattr(comp, 'hiring_velocity', None),
+
+        # === PRODUCT & TECHNOLOGY (NEW v6.1.2) ===
+        "Product Count": getattr(comp, 'product_count', None),
+        "Latest Product Launch": getattr(comp, 'latest_product_launch', None),
+        "Tech Stack": getattr(comp, 'tech_stack', None),
+        "Cloud Provider": getattr(comp, 'cloud_provider', None),
+        "API Available": getattr(comp, 'api_available', None),
+        "API Documentation URL": getattr(comp, 'api_documentation_url', None),
+        "Open Source Contributions": getattr(comp, 'open_source_contributions', None),
+        "R&D Investment %": getattr(comp, 'rd_investment_pct', None),
+
+        # === MARKET & COMPETITIVE (NEW v6.1.2) ===
+        "Estimated Market Share": getattr(comp, 'estimated_market_share', None),
+        "NPS Score": getattr(comp, 'nps_score', None),
+        "Customer Churn Rate": getattr(comp, 'customer_churn_rate', None),
+        "Average Contract Value": getattr(comp, 'average_contract_value', None),
+        "Sales Cycle Length": getattr(comp, 'sales_cycle_length', None),
+        "Competitive Win Rate": getattr(comp, 'competitive_win_rate', None),
+
+        # === REGULATORY & COMPLIANCE (NEW v6.1.2) ===
+        "SOC2 Certified": getattr(comp, 'soc2_certified', None),
+        "HITRUST Certified": getattr(comp, 'hitrust_certified', None),
+        "ISO 27001 Certified": getattr(comp, 'iso27001_certified', None),
+        "Legal Issues": getattr(comp, 'legal_issues', None),
+
+        # === PATENTS & IP (NEW v6.1.2) ===
+        "Patent Count": getattr(comp, 'patent_count', None),
+        "Recent Patents": getattr(comp, 'recent_patents', None),
+        "Trademark Count": getattr(comp, 'trademark_count', None),
+        "IP Litigation": getattr(comp, 'ip_litigation', None),
+
+        # === PARTNERSHIPS & ECOSYSTEM (NEW v6.1.2) ===
+        "Strategic Partners": getattr(comp, 'strategic_partners', None),
+        "Reseller Partners": getattr(comp, 'reseller_partners', None),
+        "Marketplace Presence": getattr(comp, 'marketplace_presence', None),
+        "Acquisition History": getattr(comp, 'acquisition_history', None),
+
+        # === CUSTOMER INTELLIGENCE (NEW v6.1.2) ===
+        "Notable Customer Wins": getattr(comp, 'notable_customer_wins', None),
+        "Customer Case Studies": getattr(comp, 'customer_case_studies', None),
+
+        # === METADATA ===
+        "Created At": comp.created_at.strftime("%Y-%m-%d %H:%M") if comp.created_at else None,
+        "Last Verified At": comp.last_verified_at.strftime("%Y-%m-%d %H:%M") if comp.last_verified_at else None,
+    }
+
+
 @app.get("/api/export/excel")
 def get_export_excel(db: Session = Depends(get_db)):
-    """Export all competitor data to Excel with comprehensive fields (v6.1.2)."""
-    import pandas as pd
-    from io import BytesIO
-    from fastapi.responses import StreamingResponse
+    """
+    Export all competitor data to Excel with comprehensive fields (v6.1.2).
 
-    competitors = db.query(Competitor).filter(Competitor.is_deleted == False).all()
+    Competitors are read in batches and written with openpyxl's write-only
+    mode, so memory use does not grow with the number of competitors.
+    """
+    from sqlalchemy import and_, case, func
 
-    if not competitors:
-        raise HTTPException(status_code=404, detail="No data to export")
+    def count_where(condition):
+        return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
 
-    # Convert to list of dicts with ALL fields including 50 new extended fields
-    data = []
-    for comp in competitors:
-        item = {
-            # === CORE INFORMATION ===
-            "ID": comp.id,
-            "Company Name": comp.name,
-            "Website": comp.website,
-            "Status": comp.status,
-            "Threat Level": comp.threat_level,
-            "Last Updated": comp.last_updated.strftime("%Y-%m-%d %H:%M") if comp.last_updated else None,
-            "Notes": comp.notes,
-            "Data Quality Score": comp.data_quality_score,
-
-            # === PRICING ===
-            "Pricing Model": comp.pricing_model,
-            "Base Price": comp.base_price,
-            "Price Unit": comp.price_unit,
-
-            # === PRODUCT ===
-            "Product Categories": comp.product_categories,
-            "Key Features": comp.key_features,
-            "Integration Partners": comp.integration_partners,
-            "Certifications": comp.certifications,
-
-            # === MARKET ===
-            "Target Segments": comp.target_segments,
-            "Customer Size Focus": comp.customer_size_focus,
-            "Geographic Focus": comp.geographic_focus,
-            "Customer Count": comp.customer_count,
-            "Customer Acquisition Rate": comp.customer_acquisition_rate,
-            "Key Customers": comp.key_customers,
-            "G2 Rating": comp.g2_rating,
-
-            # === COMPANY ===
-            "Employee Count": comp.employee_count,
-            "Employee Growth Rate": comp.employee_growth_rate,
-            "Year Founded": comp.year_founded,
-            "Headquarters": comp.headquarters,
-            "Funding Total": comp.funding_total,
-            "Latest Round": comp.latest_round,
-            "PE/VC Backers": comp.pe_vc_backers,
-
-            # === DIGITAL PRESENCE ===
-            "Website Traffic": comp.website_traffic,
-            "Social Following": comp.social_following,
-            "Recent Launches": comp.recent_launches,
-            "News Mentions": comp.news_mentions,
-
-            # === PUBLIC COMPANY INFO ===
-            "Is Public": comp.is_public,
-            "Ticker Symbol": comp.ticker_symbol,
-            "Stock Exchange": comp.stock_exchange,
-
-            # === MARKET VERTICAL ===
-            "Primary Market": comp.primary_market,
-            "Markets Served": comp.markets_served,
-            "Market Focus Score": comp.market_focus_score,
-
-            # === PRODUCT OVERLAP ===
-            "Has PXP": comp.has_pxp,
-            "Has PMS": comp.has_pms,
-            "Has RCM": comp.has_rcm,
-            "Has Patient Mgmt": comp.has_patient_mgmt,
-            "Has Payments": comp.has_payments,
-            "Has Biometric": comp.has_biometric,
-            "Has Interoperability": comp.has_interoperability,
-            "Product Overlap Score": comp.product_overlap_score,
-
-            # === ENHANCED ANALYTICS ===
-            "Telehealth Capabilities": comp.telehealth_capabilities,
-            "AI Features": comp.ai_features,
-            "Mobile App Available": comp.mobile_app_available,
-            "HIPAA Compliant": comp.hipaa_compliant,
-            "EHR Integrations": comp.ehr_integrations,
-
-            # === DIMENSION SCORES ===
-            "Dim: Product Packaging Score": comp.dim_product_packaging_score,
-            "Dim: Integration Depth Score": comp.dim_integration_depth_score,
-            "Dim: Support Service Score": comp.dim_support_service_score,
-            "Dim: Retention Stickiness Score": comp.dim_retention_stickiness_score,
-            "Dim: User Adoption Score": comp.dim_user_adoption_score,
-            "Dim: Implementation TTV Score": comp.dim_implementation_ttv_score,
-            "Dim: Reliability Enterprise Score": comp.dim_reliability_enterprise_score,
-            "Dim: Pricing Flexibility Score": comp.dim_pricing_flexibility_score,
-            "Dim: Reporting Analytics Score": comp.dim_reporting_analytics_score,
-            "Dim: Overall Score": comp.dim_overall_score,
-            "Dim: Sales Priority": comp.dim_sales_priority,
-
-            # === SEC/FINANCIAL DATA ===
-            "Logo URL": comp.logo_url,
-            "SEC CIK": comp.sec_cik,
-            "Annual Revenue": comp.annual_revenue,
-            "Net Income": comp.net_income,
-            "SEC Employee Count": comp.sec_employee_count,
-            "Fiscal Year End": comp.fiscal_year_end,
-            "Email Pattern": comp.email_pattern,
-
-            # === SOCIAL MEDIA METRICS (NEW v6.1.2) ===
-            "LinkedIn Followers": getattr(comp, 'linkedin_followers', None),
-            "LinkedIn Employees": getattr(comp, 'linkedin_employees', None),
-            "LinkedIn URL": getattr(comp, 'linkedin_url', None),
-            "Twitter Followers": getattr(comp, 'twitter_followers', None),
-            "Twitter Handle": getattr(comp, 'twitter_handle', None),
-            "Facebook Followers": getattr(comp, 'facebook_followers', None),
-            "Instagram Followers": getattr(comp, 'instagram_followers', None),
-            "YouTube Subscribers": getattr(comp, 'youtube_subscribers', None),
-
-            # === FINANCIAL METRICS (NEW v6.1.2) ===
-            "Estimated Revenue": getattr(comp, 'estimated_revenue', None),
-            "Revenue Growth Rate": getattr(comp, 'revenue_growth_rate', None),
-            "Profit Margin": getattr(comp, 'profit_margin', None),
-            "Estimated Valuation": getattr(comp, 'estimated_valuation', None),
-            "Burn Rate": getattr(comp, 'burn_rate', None),
-            "Runway Months": getattr(comp, 'runway_months', None),
-            "Last Funding Date": getattr(comp, 'last_funding_date', None),
-            "Funding Stage": getattr(comp, 'funding_stage', None),
-            "Debt Financing": getattr(comp, 'debt_financing', None),
-            "Revenue Per Employee": getattr(comp, 'revenue_per_employee', None),
-
-            # === LEADERSHIP & TEAM (NEW v6.1.2) ===
-            "CEO Name": getattr(comp, 'ceo_name', None),
-            "CEO LinkedIn": getattr(comp, 'ceo_linkedin', None),
-            "CTO Name": getattr(comp, 'cto_name', None),
-            "CFO Name": getattr(comp, 'cfo_name', None),
-            "Executive Changes": getattr(comp, 'executive_changes', None),
-            "Board Members": getattr(comp, 'board_members', None),
-            "Advisors": getattr(comp, 'advisors', None),
-            "Founder Background": getattr(comp, 'founder_background', None),
-
-            # === EMPLOYEE & CULTURE (NEW v6.1.2) ===
-            "Glassdoor Rating": getattr(comp, 'glassdoor_rating', None),
-            "Glassdoor Reviews Count": getattr(comp, 'glassdoor_reviews_count', None),
-            "Glassdoor Recommend %": getattr(comp, 'glassdoor_recommend_pct', None),
-            "Indeed Rating": getattr(comp, 'indeed_rating', None),
-            "Employee Turnover Rate": getattr(comp, 'employee_turnover_rate', None),
-            "Hiring Velocity (Open Positions)": getattr(comp, 'hiring_velocity', None),
-
-            # === PRODUCT & TECHNOLOGY (NEW v6.1.2) ===
-            "Product Count": getattr(comp, 'product_count', None),
-            "Latest Product Launch": getattr(comp, 'latest_product_launch', None),
-            "Tech Stack": getattr(comp, 'tech_stack', None),
-            "Cloud Provider": getattr(comp, 'cloud_provider', None),
-            "API Available": getattr(comp, 'api_available', None),
-            "API Documentation URL": getattr(comp, 'api_documentation_url', None),
-            "Open Source Contributions": getattr(comp, 'open_source_contributions', None),
-            "R&D Investment %": getattr(comp, 'rd_investment_pct', None),
-
-            # === MARKET & COMPETITIVE (NEW v6.1.2) ===
-            "Estimated Market Share": getattr(comp, 'estimated_market_share', None),
-            "NPS Score": getattr(comp, 'nps_score', None),
-            "Customer Churn Rate": getattr(comp, 'customer_churn_rate', None),
-            "Average Contract Value": getattr(comp, 'average_contract_value', None),
-            "Sales Cycle Length": getattr(comp, 'sales_cycle_length', None),
-            "Competitive Win Rate": getattr(comp, 'competitive_win_rate', None),
-
-            # === REGULATORY & COMPLIANCE (NEW v6.1.2) ===
-            "SOC2 Certified": getattr(comp, 'soc2_certified', None),
-            "HITRUST Certified": getattr(comp, 'hitrust_certified', None),
-            "ISO 27001 Certified": getattr(comp, 'iso27001_certified', None),
-            "Legal Issues": getattr(comp, 'legal_issues', None),
-
-            # === PATENTS & IP (NEW v6.1.2) ===
-            "Patent Count": getattr(comp, 'patent_count', None),
-            "Recent Patents": getattr(comp, 'recent_patents', None),
-            "Trademark Count": getattr(comp, 'trademark_count', None),
-            "IP Litigation": getattr(comp, 'ip_litigation', None),
-
-            # === PARTNERSHIPS & ECOSYSTEM (NEW v6.1.2) ===
-            "Strategic Partners": getattr(comp, 'strategic_partners', None),
-            "Reseller Partners": getattr(comp, 'reseller_partners', None),
-            "Marketplace Presence": getattr(comp, 'marketplace_presence', None),
-            "Acquisition History": getattr(comp, 'acquisition_history', None),
-
-            # === CUSTOMER INTELLIGENCE (NEW v6.1.2) ===
-            "Notable Customer Wins": getattr(comp, 'notable_customer_wins', None),
-            "Customer Case Studies": getattr(comp, 'customer_case_studies', None),
-
-            # === METADATA ===
-            "Created At": comp.created_at.strftime("%Y-%m-%d %H:%M") if comp.created_at else None,
-            "Last Verified At": comp.last_verified_at.strftime("%Y-%m-%d %H:%M") if comp.last_verified_at else None,
-        }
-        data.append(item)
-
-    df = pd.DataFrame(data)
-
-    # Create Excel buffer with multiple sheets
-    buffer = BytesIO()
-    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-        # Main data sheet
-        df.to_excel(writer, index=False, sheet_name="Competitors")
-
-        # Create summary sheet
-        summary_data = {
-            "Metric": [
-                "Total Competitors",
-                "High Threat",
-                "Medium Threat",
-                "Low Threat",
-                "Public Companies",
-                "With Products Identified",
-                "With Revenue Data",
-                "With Social Data",
-                "Export Date"
-            ],
-            "Value": [
-                len(competitors),
-                len([c for c in competitors if c.threat_level == "High"]),
-                len([c for c in competitors if c.threat_level == "Medium"]),
-                len([c for c in competitors if c.threat_level == "Low"]),
-                len([c for c in competitors if c.is_public]),
-                len([c for c in competitors if c.product_categories]),
-                len([c for c in competitors if c.annual_revenue]),
-                len([c for c in competitors if getattr(c, 'linkedin_followers', None)]),
-                datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            ]
-        }
-        summary_df = pd.DataFrame(summary_data)
-        summary_df.to_excel(writer, index=False, sheet_name="Summary")
-
-        # Auto-adjust column widths for main sheet
-        worksheet = writer.sheets["Competitors"]
-        for idx, col in enumerate(df.columns):
-            max_len = max(
-                df[col].astype(str).str.len().max() if len(df) > 0 else 0,
-                len(col)
-            )
-            worksheet.column_dimensions[chr(65 + idx) if idx < 26 else 'A' + chr(65 + idx - 26)].width = min(max_len + 2, 50)
+    active = Competitor.is_deleted == False
+    totals = db.query(
+        func.count(Competitor.id),
+        count_where(Competitor.threat_level == "High"),
+        count_where(Competitor.threat_level == "Medium"),
+        count_where(Competitor.threat_level == "Low"),
+        count_where(Competitor.is_public == True),
+        count_where(and_(Competitor.product_categories.isnot(None), Competitor.product_categories != "")),
+        count_where(and_(Competitor.annual_revenue.isnot(None), Competitor.annual_revenue != "")),
+        count_where(and_(Competitor.linkedin_followers.isnot(None), Competitor.linkedin_followers != 0)),
+    ).filter(active).one()
 
-    buffer.seek(0)
+    if not totals[0]:
+        raise HTTPException(status_code=404, detail="No data to export")
 
-    return StreamingResponse(
-        buffer,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename=certify_intel_full_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"}
+    header = list(_competitor_excel_row(Competitor()).keys())
+    rows = iter_rows(
+        db,
+        lambda s: s.query(Competitor).filter(active).order_by(Competitor.id),
+        lambda comp: list(_competitor_excel_row(comp).values()),
     )
 
+    metrics = [
+        "Total Competitors",
+        "High Threat",
+        "Medium Threat",
+        "Low Threat",
+        "Public Companies",
+        "With Products Identified",
+        "With Revenue Data",
+        "With Social Data",
+    ]
+    summary = [[metric, int(value)] for metric, value in zip(metrics, totals)]
+    summary.append(["Export Date", datetime.now().strftime("%Y-%m-%d %H:%M:%S")])
+
+    return streaming_download(
+        xlsx_chunks([
+            ("Competitors", header, rows),
+            ("Summary", ["Metric", "Value"], summary),
+        ]),
+        f"certify_intel_full_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+        "xlsx"
+    )
+
+
 
 # ============== USER MANAGEMENT ENDPOINTS ==============
 
@@ -14549,6 +14202,7 @@ def compare_innovation_metrics(competitor_ids: str, db: Session = Depends(get_db
         if comp:
             names.append(comp.name)
 
+    import uspto_scraper
     scraper = uspto_scraper.USPTOScraper()
     return scraper.compare_innovation(names)
 
@@ -14566,6 +14220,7 @@ def compare_social_metrics(competitor_ids: str, db: Session = Depends(get_db)):
         if comp:
             names.append(comp.name)
 
+    import social_media_monitor
     monitor = social_media_monitor.SocialMediaMonitor()
     return monitor.compare_social_presence(names)
 
@@ -16634,6 +16289,9 @@ else:
     logger.warning(f"Warning: Frontend directory not found at {frontend_dir}")
 
 
+startup_state.mark_imported()
+
+
 # ============== Start Server ==============
 if __name__ == "__main__":
     import uvicorn
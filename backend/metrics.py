@@ -9,15 +9,18 @@ All metrics default to OFF (METRICS_ENABLED=false). Zero overhead when disabled.
 
 Usage:
     from metrics import track_request, track_ai_call, track_cache
-    track_request("GET", "/api/competitors", 200, 0.045)
+    track_request("GET", "/api/competitors/{competitor_id}", 200, 0.045, 5120)
     track_ai_call("anthropic", "claude-opus-4-5-20250514", cost=0.012, duration=1.5)
+    track_ai_first_token("google", "gemini-3-flash-preview", 0.42)
     track_cache("get", hit=True)
+    track_embedding_cache("text-embedding-3-small", hits=12, misses=3)
 """
 
 import os
 import time
 import logging
-from typing import Dict, Any
+from bisect import bisect_left
+from typing import Dict, Any, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -71,6 +74,17 @@ if PROMETHEUS_AVAILABLE and METRICS_ENABLED:
         ["method", "path"],
         buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
     )
+    http_response_size = Histogram(
+        "http_response_size_bytes",
+        "HTTP response body size in bytes",
+        ["method", "path"],
+        buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+    )
+    http_requests_in_flight = Gauge(
+        "http_requests_in_flight",
+        "HTTP requests currently being handled",
+        ["method"]
+    )
 
     # AI metrics
     ai_requests_total = Counter(
@@ -89,6 +103,12 @@ if PROMETHEUS_AVAILABLE and METRICS_ENABLED:
         ["provider", "model"],
         buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
     )
+    ai_time_to_first_token = Histogram(
+        "ai_time_to_first_token_seconds",
+        "Time from a streamed AI request to its first token",
+        ["provider", "model"],
+        buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 20.0)
+    )
 
     # Database metrics
     db_connections_active = Gauge(
@@ -102,6 +122,11 @@ if PROMETHEUS_AVAILABLE and METRICS_ENABLED:
         "Cache operations",
         ["operation", "result"]
     )
+    embedding_cache_lookups = Counter(
+        "embedding_cache_lookups_total",
+        "Embedding cache lookups per text",
+        ["model", "result"]
+    )
 else:
     if METRICS_ENABLED and not PROMETHEUS_AVAILABLE:
         logger.warning(
@@ -111,11 +136,15 @@ else:
 
     http_requests_total = _NoOpMetric()
     http_request_duration = _NoOpMetric()
+    http_response_size = _NoOpMetric()
+    http_requests_in_flight = _NoOpMetric()
     ai_requests_total = _NoOpMetric()
     ai_cost_total = _NoOpMetric()
     ai_request_duration = _NoOpMetric()
+    ai_time_to_first_token = _NoOpMetric()
     db_connections_active = _NoOpMetric()
     cache_operations = _NoOpMetric()
+    embedding_cache_lookups = _NoOpMetric()
 
 
 # --- Convenience functions ---
@@ -125,19 +154,121 @@ _internal_counters: Dict[str, Any] = {
     "http_requests": 0,
     "ai_requests": 0,
     "ai_cost_usd": 0.0,
+    "ai_streams": 0,
+    "ai_ttft_seconds": 0.0,
     "cache_hits": 0,
     "cache_misses": 0,
+    "embedding_cache_hits": 0,
+    "embedding_cache_misses": 0,
     "started_at": time.time(),
 }
 
 
-def track_request(method: str, path: str, status: int, duration: float) -> None:
-    """Track an HTTP request."""
+# Upper bounds (seconds) of the in-process latency histogram per route
+ROUTE_LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75,
+    1.0, 2.5, 5.0, 7.5, 10.0, 30.0,
+)
+
+
+class RouteStats:
+    """Latency histogram and totals for one (method, route template)."""
+
+    __slots__ = ("count", "errors", "total_seconds", "max_seconds", "total_bytes", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.total_bytes = 0
+        # One slot per bucket plus overflow
+        self.buckets = [0] * (len(ROUTE_LATENCY_BUCKETS) + 1)
+
+    def observe(self, status: int, duration: float, response_size: int) -> None:
+        self.count += 1
+        if status >= 500:
+            self.errors += 1
+        self.total_seconds += duration
+        if duration > self.max_seconds:
+            self.max_seconds = duration
+        self.total_bytes += response_size
+        self.buckets[bisect_left(ROUTE_LATENCY_BUCKETS, duration)] += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate a latency quantile by interpolating within its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            if n and seen + n >= rank:
+                lower = ROUTE_LATENCY_BUCKETS[i - 1] if i else 0.0
+                upper = ROUTE_LATENCY_BUCKETS[i] if i < len(ROUTE_LATENCY_BUCKETS) else self.max_seconds
+                upper = min(upper, self.max_seconds)
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return self.max_seconds
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_seconds": round(self.total_seconds, 3),
+            "mean_ms": round(1000 * self.total_seconds / self.count, 2) if self.count else 0.0,
+            "p50_ms": round(1000 * self.quantile(0.5), 2),
+            "p95_ms": round(1000 * self.quantile(0.95), 2),
+            "p99_ms": round(1000 * self.quantile(0.99), 2),
+            "max_ms": round(1000 * self.max_seconds, 2),
+            "mean_response_bytes": self.total_bytes // self.count if self.count else 0,
+        }
+
+
+# Per-route stats for /api/metrics/hot-endpoints, keyed by (method, route)
+_route_stats: Dict[Tuple[str, str], RouteStats] = {}
+
+
+def track_request(
+    method: str, path: str, status: int, duration: float, response_size: int = 0
+) -> None:
+    """Track an HTTP request. ``path`` is the route template, not the raw URL."""
     http_requests_total.labels(method=method, path=path, status=str(status)).inc()
     http_request_duration.labels(method=method, path=path).observe(duration)
+    http_response_size.labels(method=method, path=path).observe(response_size)
+    stats = _route_stats.get((method, path))
+    if stats is None:
+        stats = _route_stats[(method, path)] = RouteStats()
+    stats.observe(status, duration, response_size)
     _internal_counters["http_requests"] += 1
 
 
+def track_in_flight(method: str, delta: int) -> None:
+    """Adjust the in-flight request gauge."""
+    http_requests_in_flight.labels(method=method).inc(delta)
+
+
+def get_hot_endpoints(
+    limit: int = 10,
+    in_flight: Optional[Dict[Tuple[str, str], int]] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Routes ranked by p95 latency and by total time spent serving them."""
+    in_flight = in_flight or {}
+    rows = []
+    for (method, route), stats in list(_route_stats.items()):
+        row = {"method": method, "route": route, **stats.summary()}
+        row["in_flight"] = in_flight.get((method, route), 0)
+        rows.append(row)
+    return {
+        "uptime_seconds": round(time.time() - _internal_counters["started_at"], 1),
+        "by_p95": sorted(rows, key=lambda r: r["p95_ms"], reverse=True)[:limit],
+        "by_total_time": sorted(rows, key=lambda r: r["total_seconds"], reverse=True)[:limit],
+    }
+
+
+def reset_route_stats() -> None:
+    _route_stats.clear()
+
+
 def track_ai_call(
     provider: str, model: str, cost: float = 0.0, duration: float = 0.0
 ) -> None:
@@ -151,6 +282,13 @@ def track_ai_call(
     _internal_counters["ai_cost_usd"] += cost
 
 
+def track_ai_first_token(provider: str, model: str, seconds: float) -> None:
+    """Track time to first token of a streamed AI response."""
+    ai_time_to_first_token.labels(provider=provider, model=model).observe(seconds)
+    _internal_counters["ai_streams"] += 1
+    _internal_counters["ai_ttft_seconds"] += seconds
+
+
 def track_cache(operation: str, hit: bool = True) -> None:
     """Track a cache operation."""
     cache_operations.labels(
@@ -162,9 +300,20 @@ def track_cache(operation: str, hit: bool = True) -> None:
         _internal_counters["cache_misses"] += 1
 
 
+def track_embedding_cache(model: str, hits: int = 0, misses: int = 0) -> None:
+    """Track embedding cache lookups (one count per text)."""
+    if hits:
+        embedding_cache_lookups.labels(model=model, result="hit").inc(hits)
+    if misses:
+        embedding_cache_lookups.labels(model=model, result="miss").inc(misses)
+    _internal_counters["embedding_cache_hits"] += hits
+    _internal_counters["embedding_cache_misses"] += misses
+
+
 def get_metrics_summary() -> Dict[str, Any]:
     """Return a JSON summary of metrics (used when Prometheus is not available)."""
     uptime = time.time() - _internal_counters["started_at"]
+    streams = _internal_counters["ai_streams"]
     return {
         "metrics_enabled": METRICS_ENABLED,
         "prometheus_available": PROMETHEUS_AVAILABLE,
@@ -172,6 +321,10 @@ def get_metrics_summary() -> Dict[str, Any]:
         "http_requests_total": _internal_counters["http_requests"],
         "ai_requests_total": _internal_counters["ai_requests"],
         "ai_cost_usd_total": round(_internal_counters["ai_cost_usd"], 6),
+        "ai_streams_total": streams,
+        "ai_ttft_avg_ms": round(_internal_counters["ai_ttft_seconds"] / streams * 1000, 1) if streams else 0.0,
         "cache_hits": _internal_counters["cache_hits"],
         "cache_misses": _internal_counters["cache_misses"],
+        "embedding_cache_hits": _internal_counters["embedding_cache_hits"],
+        "embedding_cache_misses": _internal_counters["embedding_cache_misses"],
     }
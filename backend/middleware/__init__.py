@@ -1,6 +1,7 @@
 """Security, performance, and observability middleware for Certify Intel backend."""
 
-from middleware.security import SecurityHeadersMiddleware  # noqa: F401
-from middleware.metrics import MetricsMiddleware  # noqa: F401
+from middleware.pipeline import RequestPipelineMiddleware  # noqa: F401
+from middleware.conditional import ConditionalGetMiddleware  # noqa: F401
+from middleware.rate_limit import GCRARateLimiter  # noqa: F401
 
-__all__ = ["SecurityHeadersMiddleware", "MetricsMiddleware"]
+__all__ = ["RequestPipelineMiddleware", "ConditionalGetMiddleware", "GCRARateLimiter"]
@@ -0,0 +1,123 @@
+"""
+Conditional GET (ETag / If-None-Match) for JSON API responses.
+
+Every successful GET /api/* response with a JSON body gets a strong ETag
+(hash of the body). When the request's If-None-Match already names it,
+the body is replaced with an empty 304, so polling clients skip the
+download and the JSON parse.
+
+Endpoints that can validate before doing any work set their own ETag
+(see data_versions.conditional_response); those responses pass through
+untouched.
+
+This layer must sit inside GZipMiddleware so it hashes the uncompressed
+body (gzip output embeds a timestamp).
+"""
+
+import hashlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Browsers keep the body but revalidate on every use
+CACHE_CONTROL = "private, no-cache"
+
+# Headers a 304 must repeat (RFC 9110 15.4.5); the rest describe the omitted body
+_NOT_MODIFIED_HEADERS = ("cache-control", "content-location", "date", "etag", "expires", "vary")
+
+
+def body_etag(body: bytes) -> str:
+    """Strong ETag for a response body."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison: W/"x" matches "x"."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == bare:
+            return True
+    return False
+
+
+def not_modified_message(headers: Headers) -> Message:
+    """http.response.start for a 304 carrying over the validator headers."""
+    raw = [
+        (k, v) for k, v in headers.raw
+        if k.decode("latin-1").lower() in _NOT_MODIFIED_HEADERS
+    ]
+    return {"type": "http.response.start", "status": 304, "headers": raw}
+
+
+class ConditionalGetMiddleware:
+    """Adds body-hash ETags to GET /api JSON responses and answers If-None-Match with 304."""
+
+    def __init__(self, app: ASGIApp, path_prefix: str = "/api/") -> None:
+        self.app = app
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not scope["path"].startswith(self.path_prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        held: Optional[Message] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal held, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message.get("headers", []))
+                if (
+                    message["status"] != 200
+                    or "etag" in headers
+                    or not headers.get("content-type", "").startswith("application/json")
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    # Hold the headers until the body is known
+                    held = message
+                return
+
+            start, held = held, None
+            passthrough = True
+            if message.get("more_body", False):
+                # Streamed body: no ETag
+                await send(start)
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            etag = body_etag(body)
+            headers = MutableHeaders(scope=start)
+            headers["ETag"] = etag
+            if "cache-control" not in headers:
+                headers["Cache-Control"] = CACHE_CONTROL
+
+            if etag_matches(if_none_match, etag):
+                await send(not_modified_message(headers))
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+            await send(start)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
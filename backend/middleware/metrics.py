@@ -1,64 +1,49 @@
 """
-HTTP metrics middleware for Certify Intel.
+HTTP metrics labels for Certify Intel.
 
-Tracks request count and duration per method/path/status.
-Zero overhead when METRICS_ENABLED=false (default).
+Request count, duration and response size are recorded by
+RequestPipelineMiddleware (middleware/pipeline.py) under the matched route
+template (``/api/products/{product_id}``), never the raw path, so there is
+one label per route whatever IDs clients send. Zero overhead when
+METRICS_ENABLED=false (default).
 """
 
-import time
 import logging
+from collections import Counter
+from typing import Dict, Tuple
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.types import Scope
 
 logger = logging.getLogger(__name__)
 
+# Paths to exclude from per-path metric labels to avoid high cardinality
+SKIP_PATHS = frozenset({"/health", "/readiness", "/metrics", "/favicon.ico"})
 
-class MetricsMiddleware(BaseHTTPMiddleware):
-    """Middleware to collect HTTP request metrics.
+# Label for requests that matched no route (404s for arbitrary paths)
+UNMATCHED_ROUTE = "<unmatched>"
 
-    Tracks total request count and request duration by method, path, and
-    status code. When METRICS_ENABLED is false, the middleware passes
-    through without any overhead.
-    """
+# Requests currently being handled, by id(scope). The router stores the
+# matched route in the scope, so in-flight counts per route can be read
+# while requests are still running.
+_active: Dict[int, Scope] = {}
 
-    # Paths to exclude from per-path metric labels to avoid high cardinality
-    _SKIP_PATHS = frozenset({"/health", "/readiness", "/metrics", "/favicon.ico"})
 
-    # Path prefixes that should be normalized (e.g., /api/competitors/123 -> /api/competitors/{id})
-    _NORMALIZE_PREFIXES = (
-        "/api/competitors/",
-        "/api/chat/sessions/",
-        "/api/ai/tasks/",
-        "/api/news-feed/",
-    )
+def route_label(scope: Scope) -> str:
+    """Route template of the matched route (``/api/changes/{change_id}/diff``)."""
+    route = scope.get("route")
+    if route is None:
+        return UNMATCHED_ROUTE
+    return getattr(route, "path_format", None) or getattr(route, "path", UNMATCHED_ROUTE)
 
-    def _normalize_path(self, path: str) -> str:
-        """Normalize paths with IDs to prevent high-cardinality labels."""
-        for prefix in self._NORMALIZE_PREFIXES:
-            if path.startswith(prefix):
-                # Replace the ID segment with {id}
-                rest = path[len(prefix):]
-                if rest and "/" not in rest:
-                    return prefix + "{id}"
-                elif rest and "/" in rest:
-                    parts = rest.split("/", 1)
-                    return prefix + "{id}/" + parts[1]
-        return path
 
-    async def dispatch(self, request: Request, call_next):
-        from metrics import METRICS_ENABLED, track_request
+def request_started(scope: Scope) -> None:
+    _active[id(scope)] = scope
 
-        if not METRICS_ENABLED:
-            return await call_next(request)
 
-        start = time.time()
-        response = await call_next(request)
-        duration = time.time() - start
+def request_finished(scope: Scope) -> None:
+    _active.pop(id(scope), None)
 
-        path = request.url.path
-        if path not in self._SKIP_PATHS:
-            normalized = self._normalize_path(path)
-            track_request(request.method, normalized, response.status_code, duration)
 
-        return response
+def in_flight_by_route() -> Dict[Tuple[str, str], int]:
+    """Requests in progress per (method, route); unrouted ones count as unmatched."""
+    return dict(Counter((s["method"], route_label(s)) for s in list(_active.values())))
@@ -0,0 +1,210 @@
+"""
+Single pure-ASGI request middleware for Certify Intel.
+
+Replaces the per-concern BaseHTTPMiddleware layers (rate limiting, security
+headers, static caching headers, metrics, correlation IDs). Each of those
+wrapped the app in its own task and response stream; here every request
+makes one pass:
+
+1. Rate limit API requests (GCRA, see rate_limit.py). The bearer token is
+   decoded at most once and stored on request.state for the auth
+   dependencies to reuse.
+2. Call the app, editing headers in place on http.response.start:
+   correlation ID, rate limit, security and browser caching headers.
+3. When METRICS_ENABLED=true, record request count, duration and response
+   size per route template, and the number of requests in flight.
+"""
+
+import time
+import uuid
+import logging
+from typing import Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from middleware.metrics import SKIP_PATHS, request_finished, request_started, route_label
+from middleware.rate_limit import GCRARateLimiter, RateLimitDecision, is_rate_limit_enabled
+from middleware.security import apply_security_headers, is_security_headers_enabled
+
+logger = logging.getLogger(__name__)
+
+TOKEN_STATE_KEY = "token_payload"
+_MISSING = object()
+
+
+def get_token_payload(scope: Scope, token: str) -> Optional[dict]:
+    """Decode a bearer token once per request; later calls return the cached payload."""
+    state = scope.setdefault("state", {})
+    cached = state.get(TOKEN_STATE_KEY, _MISSING)
+    if cached is not _MISSING and cached[0] == token:
+        return cached[1]
+    payload = None
+    try:
+        from extended_features import auth_manager
+        payload = auth_manager.verify_token(token)
+    except (ValueError, TypeError, ImportError):
+        pass
+    state[TOKEN_STATE_KEY] = (token, payload)
+    return payload
+
+
+def client_ip(scope: Scope, headers: Headers) -> str:
+    forwarded = headers.get("x-forwarded-for")
+    if forwarded:
+        return forwarded.split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class RequestPipelineMiddleware:
+    """Rate limiting, response headers and metrics in one ASGI layer."""
+
+    # Exact paths and path prefixes that skip rate limiting
+    EXEMPT_PATHS = frozenset({"/", "/health", "/readiness", "/login.html", "/app"})
+    EXEMPT_PREFIXES = ("/static/", "/app/")
+    STATIC_SUFFIXES = ('.html', '.css', '.js', '.png', '.jpg', '.ico')
+
+    # File extension to cache duration mapping (in seconds)
+    # v7.0.5: Disabled caching for JS/CSS/HTML to prevent stale version issues
+    CACHE_DURATIONS = {
+        # Immutable assets (hashed filenames) - 1 year
+        '.woff2': 31536000,
+        '.woff': 31536000,
+        '.ttf': 31536000,
+        '.eot': 31536000,
+        # Images - 1 week
+        '.png': 604800,
+        '.jpg': 604800,
+        '.jpeg': 604800,
+        '.gif': 604800,
+        '.ico': 604800,
+        '.svg': 604800,
+        '.webp': 604800,
+        # CSS/JS - no cache to prevent stale version issues (v7.0.5 fix)
+        '.css': 0,
+        '.js': 0,
+        # HTML - no cache (always fresh)
+        '.html': 0,
+    }
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rate_limiter: Optional[GCRARateLimiter] = None,
+        rate_limit: Optional[bool] = None,
+        security_headers: Optional[bool] = None,
+    ) -> None:
+        self.app = app
+        if rate_limit is None:
+            rate_limit = is_rate_limit_enabled()
+        self.rate_limiter = (rate_limiter or GCRARateLimiter()) if rate_limit else None
+        self.security_headers = (
+            is_security_headers_enabled() if security_headers is None else security_headers
+        )
+        if not self.security_headers:
+            logger.info("Security headers are DISABLED via SECURITY_HEADERS_ENABLED=false")
+
+    def _is_exempt(self, path: str) -> bool:
+        return (
+            path in self.EXEMPT_PATHS
+            or path.startswith(self.EXEMPT_PREFIXES)
+            or path.endswith(self.STATIC_SUFFIXES)
+        )
+
+    def _cache_control(self, scope: Scope) -> Optional[Tuple[str, bool]]:
+        """(Cache-Control value, add Vary) for static assets, None otherwise."""
+        path = scope["path"].lower()
+        if path.startswith('/api/'):
+            return None
+        for ext, duration in self.CACHE_DURATIONS.items():
+            if path.endswith(ext):
+                if duration > 0:
+                    # Versioned assets (?v=...) are cached longer
+                    if scope.get("query_string", b"").startswith(b"v="):
+                        duration = 604800
+                    return f"public, max-age={duration}", True
+                return "no-cache, no-store, must-revalidate", False
+        return None
+
+    async def _check_rate_limit(self, scope: Scope, headers: Headers) -> Optional[RateLimitDecision]:
+        if self.rate_limiter is None or self._is_exempt(scope["path"]):
+            return None
+        user_id = None
+        auth_header = headers.get("authorization", "")
+        if auth_header.startswith("Bearer "):
+            payload = get_token_payload(scope, auth_header[7:])
+            if payload:
+                user_id = payload.get("sub")
+        return await self.rate_limiter.hit(client_ip(scope, headers), user_id)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        request_headers = Headers(scope=scope)
+        correlation_id = request_headers.get("x-correlation-id") or str(uuid.uuid4())
+        https = (
+            request_headers.get("x-forwarded-proto", "") == "https"
+            or scope.get("scheme") == "https"
+        )
+        cache_control = self._cache_control(scope)
+        decision = await self._check_rate_limit(scope, request_headers)
+        status_code = 500
+        response_size = 0
+        tracked = self._track_start(scope)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            elif message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers["X-Correlation-ID"] = correlation_id
+                if decision is not None:
+                    headers["X-RateLimit-Limit"] = str(decision.limit)
+                    headers["X-RateLimit-Remaining"] = str(decision.remaining)
+                if self.security_headers:
+                    apply_security_headers(headers, https)
+                if cache_control is not None:
+                    headers["Cache-Control"] = cache_control[0]
+                    if cache_control[1]:
+                        headers["Vary"] = "Accept-Encoding"
+            await send(message)
+
+        try:
+            if decision is not None and not decision.allowed:
+                retry_after = GCRARateLimiter.retry_after_header(decision)
+                response = JSONResponse(
+                    status_code=429,
+                    content={"detail": decision.reason, "retry_after": int(retry_after)},
+                    headers={"Retry-After": retry_after},
+                )
+                await response(scope, receive, send_wrapper)
+            else:
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            if tracked:
+                self._track(scope, status_code, time.perf_counter() - start, response_size)
+
+    @staticmethod
+    def _track_start(scope: Scope) -> bool:
+        import metrics
+
+        if not metrics.METRICS_ENABLED or scope["path"] in SKIP_PATHS:
+            return False
+        request_started(scope)
+        metrics.track_in_flight(scope["method"], 1)
+        return True
+
+    @staticmethod
+    def _track(scope: Scope, status_code: int, duration: float, response_size: int) -> None:
+        import metrics
+
+        request_finished(scope)
+        metrics.track_in_flight(scope["method"], -1)
+        metrics.track_request(scope["method"], route_label(scope), status_code, duration, response_size)
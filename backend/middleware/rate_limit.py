@@ -0,0 +1,210 @@
+"""
+GCRA rate limiting for Certify Intel.
+
+The Generic Cell Rate Algorithm stores a single timestamp per key: the
+"theoretical arrival time" (TAT) of the next request. A request is allowed
+when it does not push the TAT more than one window ahead of now, which is
+equivalent to a token bucket of ``limit`` requests refilled evenly over the
+window, but needs constant memory and one read-modify-write per key.
+
+Backends:
+- memory: per-process dict (default)
+- redis: one Lua script call per request, so limits hold across uvicorn
+  workers. Used when REDIS_ENABLED=true; falls back to memory if Redis
+  is unreachable.
+
+Config:
+    RATE_LIMIT_ENABLED=false
+    RATE_LIMIT_IP_PER_MINUTE=100
+    RATE_LIMIT_USER_PER_MINUTE=1000
+"""
+
+import math
+import os
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def is_rate_limit_enabled() -> bool:
+    """Check if API rate limiting is enabled via env var."""
+    return os.getenv("RATE_LIMIT_ENABLED", "false").lower() in ("true", "1", "yes")
+
+
+@dataclass
+class RateLimitDecision:
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float = 0.0
+    reason: Optional[str] = None
+
+
+# (key, limit, window_seconds)
+Rule = Tuple[str, int, float]
+
+
+class MemoryGCRAStore:
+    """Per-process TAT store. Expired keys are swept once the dict grows."""
+
+    SWEEP_THRESHOLD = 10000
+
+    def __init__(self):
+        self._tat: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._next_sweep = self.SWEEP_THRESHOLD
+
+    async def check(self, rules: Sequence[Rule]) -> List[Tuple[bool, float, float]]:
+        return self.check_sync(rules)
+
+    def check_sync(self, rules: Sequence[Rule], now: Optional[float] = None) -> List[Tuple[bool, float, float]]:
+        """
+        Apply all rules atomically: the request is counted only if every rule allows it.
+
+        Returns one (allowed, retry_after, headroom) tuple per rule, where
+        headroom is how far (in seconds) the new TAT is from the window edge.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            results = []
+            new_tats = []
+            for key, limit, window in rules:
+                interval = window / limit
+                new_tat = max(self._tat.get(key, now), now) + interval
+                allow_at = new_tat - window
+                results.append((allow_at <= now, max(allow_at - now, 0.0), window - (new_tat - now)))
+                new_tats.append((key, new_tat))
+            if all(r[0] for r in results):
+                for key, new_tat in new_tats:
+                    self._tat[key] = new_tat
+                if len(self._tat) > self._next_sweep:
+                    self._sweep(now)
+            return results
+
+    def _sweep(self, now: float) -> None:
+        """Forget keys whose TAT has passed (they're back to a full burst anyway)."""
+        self._tat = {k: v for k, v in self._tat.items() if v > now}
+        self._next_sweep = max(self.SWEEP_THRESHOLD, len(self._tat) * 2)
+
+    def __len__(self) -> int:
+        return len(self._tat)
+
+
+class RedisGCRAStore:
+    """Shared TAT store; every rule for a request is checked and updated in one script call."""
+
+    KEY_PREFIX = "ci:ratelimit"
+
+    # KEYS: one per rule. ARGV: interval, window pairs. Uses the Redis clock so
+    # workers on different hosts agree on "now".
+    SCRIPT = """
+    local t = redis.call('TIME')
+    local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+    local results = {}
+    local updates = {}
+    local allowed = 1
+    for i, key in ipairs(KEYS) do
+        local interval = tonumber(ARGV[2 * i - 1])
+        local window = tonumber(ARGV[2 * i])
+        local tat = tonumber(redis.call('GET', key) or now)
+        if tat < now then tat = now end
+        local new_tat = tat + interval
+        local allow_at = new_tat - window
+        if allow_at > now then
+            allowed = 0
+            results[i] = {0, tostring(allow_at - now), tostring(window - (new_tat - now))}
+        else
+            results[i] = {1, '0', tostring(window - (new_tat - now))}
+        end
+        updates[i] = {key, new_tat, math.ceil((new_tat - now) * 1000)}
+    end
+    if allowed == 1 then
+        for _, u in ipairs(updates) do
+            redis.call('SET', u[1], string.format('%.6f', u[2]), 'PX', u[3])
+        end
+    end
+    return results
+    """
+
+    def __init__(self, redis_url: str):
+        import redis.asyncio as redis_async
+        self._client = redis_async.from_url(
+            redis_url, socket_connect_timeout=1, socket_timeout=1,
+        )
+        self._script = self._client.register_script(self.SCRIPT)
+
+    async def check(self, rules: Sequence[Rule]) -> List[Tuple[bool, float, float]]:
+        keys = [f"{self.KEY_PREFIX}:{key}" for key, _, _ in rules]
+        args = []
+        for _, limit, window in rules:
+            args.extend([window / limit, window])
+        raw = await self._script(keys=keys, args=args)
+        return [(int(a) == 1, float(r), float(h)) for a, r, h in raw]
+
+
+class GCRARateLimiter:
+    """Per-IP and per-user request limits over a sliding window."""
+
+    def __init__(
+        self,
+        ip_limit: Optional[int] = None,
+        user_limit: Optional[int] = None,
+        window_seconds: float = 60,
+        store=None,
+    ):
+        self.ip_limit = ip_limit or int(os.getenv("RATE_LIMIT_IP_PER_MINUTE", "100"))
+        self.user_limit = user_limit or int(os.getenv("RATE_LIMIT_USER_PER_MINUTE", "1000"))
+        self.window_seconds = window_seconds
+        self._memory = MemoryGCRAStore()
+        self.store = store if store is not None else self._default_store()
+        self.backend_errors = 0
+
+    def _default_store(self):
+        if os.getenv("REDIS_ENABLED", "false").lower() != "true":
+            return self._memory
+        try:
+            store = RedisGCRAStore(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+            logger.info("Rate limiter using Redis (limits shared across workers)")
+            return store
+        except Exception as e:
+            logger.warning(f"Redis rate limiter unavailable, using in-memory: {e}")
+            return self._memory
+
+    def _rules(self, ip: str, user_id: Optional[str]) -> List[Rule]:
+        rules = [(f"ip:{ip}", self.ip_limit, self.window_seconds)]
+        if user_id:
+            rules.append((f"user:{user_id}", self.user_limit, self.window_seconds))
+        return rules
+
+    async def hit(self, ip: str, user_id: Optional[str] = None) -> RateLimitDecision:
+        """Count a request against the IP (and user) limits."""
+        rules = self._rules(ip, user_id)
+        try:
+            results = await self.store.check(rules)
+        except Exception as e:
+            # Keep limiting per worker rather than failing open or closed
+            self.backend_errors += 1
+            logger.debug(f"Rate limit backend error, using in-memory: {e}")
+            results = await self._memory.check(rules)
+
+        ip_ok, ip_retry, ip_headroom = results[0]
+        ip_remaining = max(0, int(ip_headroom * self.ip_limit / self.window_seconds + 1e-9))
+        if not ip_ok:
+            return RateLimitDecision(
+                False, self.ip_limit, 0, ip_retry,
+                f"IP rate limit exceeded ({self.ip_limit}/min)",
+            )
+        if len(results) > 1 and not results[1][0]:
+            return RateLimitDecision(
+                False, self.user_limit, 0, results[1][1],
+                f"User rate limit exceeded ({self.user_limit}/min)",
+            )
+        return RateLimitDecision(True, self.ip_limit, ip_remaining)
+
+    @staticmethod
+    def retry_after_header(decision: RateLimitDecision) -> str:
+        return str(max(1, math.ceil(decision.retry_after)))
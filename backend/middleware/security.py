@@ -1,8 +1,8 @@
-"""Security headers middleware for FastAPI.
+"""Security headers for FastAPI responses.
 
-Adds Content-Security-Policy, HSTS, X-Frame-Options, X-Content-Type-Options,
-Referrer-Policy, Permissions-Policy, and X-XSS-Protection headers to all
-responses.
+Content-Security-Policy, HSTS, X-Frame-Options, X-Content-Type-Options,
+Referrer-Policy, Permissions-Policy, and X-XSS-Protection headers, added
+to all responses by RequestPipelineMiddleware (middleware/pipeline.py).
 
 Configurable via SECURITY_HEADERS_ENABLED env var (default: true).
 """
@@ -10,8 +10,7 @@ Configurable via SECURITY_HEADERS_ENABLED env var (default: true).
 import logging
 import os
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.datastructures import MutableHeaders
 
 logger = logging.getLogger(__name__)
 
@@ -21,11 +20,34 @@ def is_security_headers_enabled() -> bool:
     return os.getenv("SECURITY_HEADERS_ENABLED", "true").lower() in ("true", "1", "yes")
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Middleware to add security headers to all responses.
+CSP_POLICY = (
+    "default-src 'self'; "
+    "script-src 'self' 'unsafe-inline' 'unsafe-eval' https://cdn.jsdelivr.net https://cdnjs.cloudflare.com; "
+    "style-src 'self' 'unsafe-inline' https://fonts.googleapis.com https://cdn.jsdelivr.net; "
+    "font-src 'self' https://fonts.gstatic.com https://cdn.jsdelivr.net data:; "
+    "img-src 'self' data: https: blob:; "
+    "connect-src 'self' https://api.openai.com https://generativelanguage.googleapis.com wss: ws:; "
+    "frame-ancestors 'self'; "
+    "form-action 'self'; "
+    "base-uri 'self'"
+)
 
-    Adds CSP, HSTS, X-Frame-Options, X-Content-Type-Options,
-    Referrer-Policy, Permissions-Policy, and X-XSS-Protection.
+# Core security headers, added to every response
+SECURITY_HEADERS = (
+    ("X-Content-Type-Options", "nosniff"),
+    ("X-Frame-Options", "DENY"),
+    ("X-XSS-Protection", "1; mode=block"),
+    ("Referrer-Policy", "strict-origin-when-cross-origin"),
+    ("Permissions-Policy", "camera=(), microphone=(), geolocation=()"),
+    ("Content-Security-Policy", CSP_POLICY),
+)
+
+# HSTS - only sent over HTTPS (scheme or X-Forwarded-Proto)
+HSTS_HEADER = ("Strict-Transport-Security", "max-age=31536000; includeSubDomains")
+
+
+def apply_security_headers(headers: MutableHeaders, https: bool) -> None:
+    """Set the security headers on a response.
 
     CSP allows:
     - Inline scripts/styles (required for SPA)
@@ -34,47 +56,8 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     - WebSocket connections (ws:/wss:) for real-time updates
     - Data URIs and blob: for images
     - External API connections for AI providers
-
-    Disable via SECURITY_HEADERS_ENABLED=false in .env.
     """
-
-    CSP_POLICY = (
-        "default-src 'self'; "
-        "script-src 'self' 'unsafe-inline' 'unsafe-eval' https://cdn.jsdelivr.net https://cdnjs.cloudflare.com; "
-        "style-src 'self' 'unsafe-inline' https://fonts.googleapis.com https://cdn.jsdelivr.net; "
-        "font-src 'self' https://fonts.gstatic.com https://cdn.jsdelivr.net data:; "
-        "img-src 'self' data: https: blob:; "
-        "connect-src 'self' https://api.openai.com https://generativelanguage.googleapis.com wss: ws:; "
-        "frame-ancestors 'self'; "
-        "form-action 'self'; "
-        "base-uri 'self'"
-    )
-
-    def __init__(self, app, enabled: bool = True) -> None:
-        super().__init__(app)
-        self.enabled = enabled and is_security_headers_enabled()
-        if not self.enabled:
-            logger.info("SecurityHeadersMiddleware is DISABLED via SECURITY_HEADERS_ENABLED=false")
-
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-
-        if not self.enabled:
-            return response
-
-        # Core security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Permissions-Policy"] = "camera=(), microphone=(), geolocation=()"
-
-        # Content Security Policy
-        response.headers["Content-Security-Policy"] = self.CSP_POLICY
-
-        # HSTS - only enable if using HTTPS (check X-Forwarded-Proto or scheme)
-        forwarded_proto = request.headers.get("X-Forwarded-Proto", "")
-        if forwarded_proto == "https" or request.url.scheme == "https":
-            response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-
-        return response
+    for name, value in SECURITY_HEADERS:
+        headers[name] = value
+    if https:
+        headers[HSTS_HEADER[0]] = HSTS_HEADER[1]
@@ -0,0 +1,285 @@
+"""
+Certify Intel - News Ingestion
+==============================
+
+Single write path for NewsArticleCache. Every job that stores fetched news
+(daily refresh, news feed refresh, enrichment, discovery) hands its rows to
+``ingest_articles`` instead of querying by URL and adding rows one by one.
+
+- URLs are normalized (scheme/host case, default ports, fragments, tracking
+  parameters, query order, trailing slash) and hashed; ``url_hash`` carries
+  a unique index, so the same article reached through two links is stored
+  once.
+- Rows are written in batches with one ``INSERT ... ON CONFLICT (url_hash)``
+  per batch (DO NOTHING, or DO UPDATE to refresh analysis fields), on both
+  SQLite and PostgreSQL. A batch costs two round trips, not one per article.
+
+Usage:
+    from news_ingest import ingest_articles
+
+    result = ingest_articles(db, rows)   # rows: dicts of NewsArticleCache columns
+    db.commit()
+    logger.info(f"{result.inserted} new, {result.updated} refreshed")
+
+``ensure_url_hash_index(engine)`` adds the column to databases created
+before it existed, backfills hashes, archives duplicate rows (keeping the
+oldest) and creates the unique index. It runs at import of database.py and
+from Alembic revision 0009.
+"""
+
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from sqlalchemy import func, inspect, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+INDEX_NAME = "ux_news_url_hash"
+
+# Query parameters that identify a campaign or click, not the article
+_TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "mc_cid", "mc_eid",
+    "igshid", "ref", "ref_src", "cmpid", "ncid", "sr_share", "taid",
+}
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Refreshed on conflict when update_existing=True. A None in the incoming
+# row keeps the stored value.
+_REFRESH_COLUMNS = (
+    "title", "source", "snippet", "sentiment", "event_type", "is_major_event",
+    "dimension_tags", "fetched_at", "cache_expires_at",
+)
+
+# Rows per INSERT; ~16 bound columns each stays well under SQLite's
+# 32766-variable limit.
+DEFAULT_BATCH_SIZE = 200
+
+
+def normalize_url(url: Optional[str]) -> Optional[str]:
+    """
+    Canonical form of an article URL, or None if it isn't an http(s) URL.
+
+    Path case is preserved (paths are case-sensitive on most servers).
+    """
+    url = (url or "").strip()
+    if not url:
+        return None
+    if "://" not in url:
+        # Bare "host/path" gets https; "mailto:x", "javascript:x" are not links
+        head = url.split("/", 1)[0]
+        if ":" in head and not head.rsplit(":", 1)[1].isdigit():
+            return None
+        url = f"https://{url}"
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in _DEFAULT_PORTS or not parts.hostname:
+        return None
+    host = parts.hostname.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port != _DEFAULT_PORTS[scheme]:
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/") or "/"
+    # http and https copies of a page are the same article
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def url_hash(url: Optional[str]) -> Optional[str]:
+    """sha256 hex digest of the normalized URL (None for unusable URLs)."""
+    normalized = normalize_url(url)
+    if normalized is None:
+        return None
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def parse_published_date(value: Any) -> Optional[datetime]:
+    """
+    Naive UTC datetime from a feed date (ISO 8601, RFC 2822 or a datetime).
+
+    Returns None when the value can't be parsed.
+    """
+    if isinstance(value, datetime):
+        parsed = value
+    elif not value:
+        return None
+    else:
+        raw = str(value).strip()
+        try:
+            parsed = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+        except ValueError:
+            try:
+                parsed = parsedate_to_datetime(raw)
+            except (TypeError, ValueError):
+                return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+@dataclass
+class IngestResult:
+    """Outcome of one ingest_articles call."""
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0  # Already stored (DO NOTHING), repeated in the input, or no usable URL
+    inserted_urls: List[str] = field(default_factory=list)
+
+    def merge(self, other: "IngestResult") -> "IngestResult":
+        self.inserted += other.inserted
+        self.updated += other.updated
+        self.skipped += other.skipped
+        self.inserted_urls.extend(other.inserted_urls)
+        return self
+
+
+def _insert(dialect: str, table):
+    if dialect == "postgresql":
+        return postgresql.insert(table)
+    if dialect == "sqlite":
+        return sqlite.insert(table)
+    raise NotImplementedError(f"News ingestion does not support the {dialect} dialect")
+
+
+def ingest_articles(
+    db,
+    rows: Iterable[Dict[str, Any]],
+    update_existing: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> IngestResult:
+    """
+    Bulk-upsert article rows into NewsArticleCache. Does not commit.
+
+    Each row is a dict of NewsArticleCache column values and must have a
+    ``url``. Rows whose normalized URL is already stored are left alone, or
+    with ``update_existing`` have their analysis fields (sentiment, event
+    type, snippet, fetched_at, ...) refreshed. Within one call the first row
+    for a URL wins.
+    """
+    from database import NewsArticleCache
+
+    table = NewsArticleCache.__table__
+    dialect = db.get_bind().dialect.name
+    columns = [c.name for c in table.columns if c.name != "id"]
+    result = IngestResult()
+    now = datetime.utcnow()
+
+    pending: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        key = url_hash(row.get("url"))
+        if key is None or key in pending:
+            result.skipped += 1
+            continue
+        # Multi-row VALUES needs the same keys in every row
+        values = dict.fromkeys(columns)
+        values.update(is_archived=False, is_major_event=False, fetched_at=now, created_at=now)
+        values.update((k, v) for k, v in row.items() if k in values and v is not None)
+        values["url_hash"] = key
+        pending[key] = values
+        if len(pending) >= batch_size:
+            result.merge(_write_batch(db, table, dialect, pending, update_existing))
+            pending = {}
+    if pending:
+        result.merge(_write_batch(db, table, dialect, pending, update_existing))
+    return result
+
+
+def _write_batch(db, table, dialect: str, batch: Dict[str, Dict[str, Any]], update_existing: bool) -> IngestResult:
+    existing = set(db.execute(
+        select(table.c.url_hash).where(table.c.url_hash.in_(list(batch)))
+    ).scalars())
+
+    stmt = _insert(dialect, table).values(list(batch.values()))
+    if update_existing:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.url_hash],
+            set_={c: func.coalesce(stmt.excluded[c], table.c[c]) for c in _REFRESH_COLUMNS},
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=[table.c.url_hash])
+    db.execute(stmt)
+
+    new = [values["url"] for key, values in batch.items() if key not in existing]
+    return IngestResult(
+        inserted=len(new),
+        updated=len(existing) if update_existing else 0,
+        skipped=0 if update_existing else len(existing),
+        inserted_urls=new,
+    )
+
+
+# =============================================================================
+# SCHEMA
+# =============================================================================
+
+def create_url_hash_index(conn: Connection) -> None:
+    """
+    Add and backfill news_article_cache.url_hash and its unique index (idempotent).
+
+    Of several rows with the same normalized URL, the oldest keeps the hash
+    and the rest are archived, which hides them from every news read.
+    """
+    inspector = inspect(conn)
+    if "news_article_cache" not in inspector.get_table_names():
+        return
+    if INDEX_NAME in {ix["name"] for ix in inspector.get_indexes("news_article_cache")}:
+        return
+    if "url_hash" not in {c["name"] for c in inspector.get_columns("news_article_cache")}:
+        conn.execute(text("ALTER TABLE news_article_cache ADD COLUMN url_hash VARCHAR(64)"))
+
+    seen = set(conn.execute(text(
+        "SELECT url_hash FROM news_article_cache WHERE url_hash IS NOT NULL"
+    )).scalars())
+    hashes, duplicates = [], []
+    rows = conn.execute(text(
+        "SELECT id, url FROM news_article_cache "
+        "WHERE url_hash IS NULL AND (is_archived IS NULL OR is_archived = :false) ORDER BY id"
+    ), {"false": False})
+    for row_id, url in rows:
+        key = url_hash(url)
+        if key is None:
+            continue
+        if key in seen:
+            duplicates.append({"id": row_id})
+        else:
+            seen.add(key)
+            hashes.append({"id": row_id, "hash": key})
+    if hashes:
+        conn.execute(text("UPDATE news_article_cache SET url_hash = :hash WHERE id = :id"), hashes)
+    if duplicates:
+        conn.execute(
+            text("UPDATE news_article_cache SET is_archived = :true WHERE id = :id"),
+            [{**d, "true": True} for d in duplicates],
+        )
+    conn.execute(text(
+        f"CREATE UNIQUE INDEX IF NOT EXISTS {INDEX_NAME} ON news_article_cache (url_hash)"
+    ))
+    logger.info(
+        f"[News] Indexed {len(hashes)} article URLs, archived {len(duplicates)} duplicates"
+    )
+
+
+def drop_url_hash_index(conn: Connection) -> None:
+    """Remove the unique URL index (used by the Alembic downgrade)."""
+    conn.execute(text(f"DROP INDEX IF EXISTS {INDEX_NAME}"))
+
+
+def ensure_url_hash_index(engine: Engine) -> bool:
+    """Apply create_url_hash_index; False if it failed (ingestion then can't upsert)."""
+    try:
+        with engine.begin() as conn:
+            create_url_hash_index(conn)
+        return True
+    except Exception as e:
+        logger.warning(f"News URL index unavailable: {e}")
+        return False
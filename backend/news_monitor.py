@@ -10,11 +10,14 @@ v5.0.7: Added dimension tagging integration for Sales & Marketing module.
 import os
 import re
 import json
+import math
 import asyncio
+import hashlib
+import weakref
 import time
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Optional, Callable, Awaitable
+from dataclasses import dataclass, asdict, field
 import logging
 import urllib.parse
 import urllib.request
@@ -22,6 +25,8 @@ import xml.etree.ElementTree as ET
 
 import httpx
 
+from news_ingest import parse_published_date
+
 logger = logging.getLogger(__name__)
 
 # Module-level state for async progress tracking and circuit breaker
@@ -30,6 +35,22 @@ _circuit_breaker: Dict[str, Dict[str, Any]] = {}
 _CB_THRESHOLD = 3  # consecutive failures before opening circuit
 _CB_RESET_SECONDS = 3600  # 1 hour cooldown
 
+# Concurrent requests per news source, shared by all fetches on an event loop
+# so bulk fetches don't hammer one API. Override with
+# NEWS_SOURCE_CONCURRENCY="google_news=4,newsapi=2,..."; unlisted sources
+# get _DEFAULT_SOURCE_CONCURRENCY.
+SOURCE_CONCURRENCY: Dict[str, int] = {
+    "google_news": 4,
+    "newsapi": 2,
+    "bing_news": 2,
+    "gnews": 2,
+    "mediastack": 2,
+    "newsdata": 2,
+    "sec_edgar": 2,
+    "uspto": 2,
+}
+_DEFAULT_SOURCE_CONCURRENCY = 2
+
 # Import government data scrapers (v5.0.3)
 try:
     from sec_edgar_scraper import SECEdgarScraper, get_sec_news
@@ -82,6 +103,7 @@ class NewsArticle:
     is_major_event: bool
     event_type: Optional[str]  # funding, acquisition, product_launch, partnership
     dimension_tags: Optional[List[Dict[str, Any]]] = None  # v5.0.7: dimension classifications
+    fetched_from: Optional[str] = None  # Source that returned it (google_news, newsapi, ...); async fetches only
 
 
 @dataclass
@@ -93,6 +115,9 @@ class NewsDigest:
     sentiment_breakdown: Dict[str, int]
     major_events: List[NewsArticle]
     fetched_at: str
+    # Newest published date returned by each source that answered (None if
+    # it returned nothing dated); sources that failed are absent
+    source_watermarks: Dict[str, Optional[datetime]] = field(default_factory=dict)
 
 
 class NewsMonitor:
@@ -160,6 +185,12 @@ class NewsMonitor:
         self.sec_scraper = SECEdgarScraper() if self.include_sec else None
         self.patent_scraper = USPTOScraper() if self.include_patents else None
 
+        # One classification semaphore per event loop, shared by every
+        # fetch on that loop so bulk fetches respect the same cap
+        self._classify_semaphores: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        # Per-source request caps, one set per event loop for the same reason
+        self._source_semaphores: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
     # ============== Circuit Breaker (v5.1.0) ==============
 
     def _is_circuit_open(self, source_name: str) -> bool:
@@ -191,6 +222,36 @@ class NewsMonitor:
         """Reset failure count on successful fetch."""
         _circuit_breaker[source_name] = {"failures": 0, "last_failure": 0}
 
+    # ============== Per-Source Concurrency ==============
+
+    @staticmethod
+    def _source_limits() -> Dict[str, int]:
+        """SOURCE_CONCURRENCY with NEWS_SOURCE_CONCURRENCY overrides applied."""
+        limits = dict(SOURCE_CONCURRENCY)
+        for item in os.getenv("NEWS_SOURCE_CONCURRENCY", "").split(","):
+            source, _, value = item.partition("=")
+            if not source.strip():
+                continue
+            try:
+                limits[source.strip()] = max(1, int(value))
+            except ValueError:
+                logger.warning(f"Ignoring invalid NEWS_SOURCE_CONCURRENCY entry: {item!r}")
+        return limits
+
+    def _source_semaphore(self, source_name: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphores = self._source_semaphores.get(loop)
+        if semaphores is None:
+            semaphores = self._source_semaphores[loop] = {}
+        if source_name not in semaphores:
+            limit = self._source_limits().get(source_name, _DEFAULT_SOURCE_CONCURRENCY)
+            semaphores[source_name] = asyncio.Semaphore(limit)
+        return semaphores[source_name]
+
+    async def _limited(self, source_name: str, coro: Awaitable[List["NewsArticle"]]) -> List["NewsArticle"]:
+        async with self._source_semaphore(source_name):
+            return await coro
+
     # ============== Async Parallel Fetching (v5.1.0) ==============
 
     async def fetch_news_async(
@@ -200,6 +261,7 @@ class NewsMonitor:
         progress_key: Optional[str] = None,
         real_name: Optional[str] = None,
         website: Optional[str] = None,
+        since: Optional[Dict[str, datetime]] = None,
     ) -> NewsDigest:
         """
         Fetch news from all sources in parallel using async HTTP.
@@ -208,10 +270,21 @@ class NewsMonitor:
             company_name: Name of the company
             days: Number of days to look back
             progress_key: Optional key for tracking progress via get_news_fetch_progress()
+            since: Optional per-source watermark {source_name: datetime}; those
+                sources are asked only for newer articles (server-side where the
+                API has a date filter) and older ones are dropped
 
         Returns:
             NewsDigest with deduplicated, analyzed articles
         """
+        since = since or {}
+        now = datetime.utcnow()
+
+        def lookback_days(source_name: str) -> int:
+            if source_name not in since:
+                return days
+            return max(1, math.ceil((now - since[source_name]).total_seconds() / 86400))
+
         if progress_key:
             _news_fetch_progress[progress_key] = {
                 "status": "fetching",
@@ -228,31 +301,31 @@ class NewsMonitor:
             # Google News RSS (always available)
             if not self._is_circuit_open("google_news"):
                 source_tasks.append(
-                    ("google_news", self._fetch_google_news_async(client, company_name))
+                    ("google_news", self._fetch_google_news_async(client, company_name, since.get("google_news")))
                 )
 
             # NewsAPI
             if self.newsapi_key and not self._is_circuit_open("newsapi"):
                 source_tasks.append(
-                    ("newsapi", self._fetch_newsapi_async(client, company_name, days))
+                    ("newsapi", self._fetch_newsapi_async(client, company_name, lookback_days("newsapi")))
                 )
 
             # Bing News
             if self.bing_news_key and not self._is_circuit_open("bing_news"):
                 source_tasks.append(
-                    ("bing_news", self._fetch_bing_news_async(client, company_name))
+                    ("bing_news", self._fetch_bing_news_async(client, company_name, since.get("bing_news")))
                 )
 
             # GNews
             if self.gnews_api_key and not self._is_circuit_open("gnews"):
                 source_tasks.append(
-                    ("gnews", self._fetch_gnews_async(client, company_name))
+                    ("gnews", self._fetch_gnews_async(client, company_name, since.get("gnews")))
                 )
 
             # MediaStack
             if self.mediastack_api_key and not self._is_circuit_open("mediastack"):
                 source_tasks.append(
-                    ("mediastack", self._fetch_mediastack_async(client, company_name))
+                    ("mediastack", self._fetch_mediastack_async(client, company_name, since.get("mediastack")))
                 )
 
             # NewsData.io
@@ -264,7 +337,7 @@ class NewsMonitor:
             # SEC EDGAR (sync, wrapped in to_thread)
             if self.include_sec and not self._is_circuit_open("sec_edgar"):
                 source_tasks.append(
-                    ("sec_edgar", asyncio.to_thread(self._fetch_sec_filings, company_name, days))
+                    ("sec_edgar", asyncio.to_thread(self._fetch_sec_filings, company_name, lookback_days("sec_edgar")))
                 )
 
             # USPTO (sync, wrapped in to_thread)
@@ -276,13 +349,14 @@ class NewsMonitor:
             if progress_key:
                 _news_fetch_progress[progress_key]["total_sources"] = len(source_tasks)
 
-            # Run all source fetches in parallel
+            # Run all source fetches in parallel, each within its source's cap
             source_names = [name for name, _ in source_tasks]
-            coroutines = [coro for _, coro in source_tasks]
+            coroutines = [self._limited(name, coro) for name, coro in source_tasks]
             results = await asyncio.gather(*coroutines, return_exceptions=True)
 
         # Process results
         articles: List[NewsArticle] = []
+        source_watermarks: Dict[str, Optional[datetime]] = {}
         sources_checked = 0
 
         for source_name, result in zip(source_names, results):
@@ -292,7 +366,15 @@ class NewsMonitor:
                 logger.warning(f"Async fetch failed for {source_name}: {result}")
             else:
                 self._record_source_success(source_name)
-                articles.extend(result)
+                for article in result:
+                    article.fetched_from = source_name
+                dated = [(a, parse_published_date(a.published_date)) for a in result]
+                cutoff = since.get(source_name)
+                if cutoff is not None:
+                    # Undated articles are kept; ingestion dedupes them by URL
+                    dated = [(a, d) for a, d in dated if d is None or d >= cutoff]
+                source_watermarks[source_name] = max((d for _, d in dated if d), default=None)
+                articles.extend(a for a, _ in dated)
 
             if progress_key:
                 _news_fetch_progress[progress_key].update({
@@ -314,7 +396,7 @@ class NewsMonitor:
         )
 
         # v8.0.5: AI-powered sentiment + event_type classification (both in one call)
-        await asyncio.to_thread(self._analyze_sentiment_batch, unique_articles)
+        await self._analyze_sentiment_batch_async(unique_articles)
 
         # Dimension tagging
         if self.tag_dimensions:
@@ -341,18 +423,23 @@ class NewsMonitor:
             total_count=len(unique_articles),
             sentiment_breakdown=sentiment_counts,
             major_events=major_events,
-            fetched_at=datetime.utcnow().isoformat()
+            fetched_at=datetime.utcnow().isoformat(),
+            source_watermarks=source_watermarks,
         )
 
     # ============== Async HTTP Fetch Methods (v5.1.0) ==============
 
     async def _fetch_google_news_async(
-        self, client: httpx.AsyncClient, company_name: str
+        self, client: httpx.AsyncClient, company_name: str, since: Optional[datetime] = None
     ) -> List[NewsArticle]:
         """Async Google News RSS fetch."""
         articles: List[NewsArticle] = []
         try:
-            query = urllib.parse.quote(f'"{company_name}"')
+            search = f'"{company_name}"'
+            if since:
+                # after: is day-granular and exclusive
+                search += f" after:{(since - timedelta(days=1)):%Y-%m-%d}"
+            query = urllib.parse.quote(search)
             url = f"https://news.google.com/rss/search?q={query}&hl=en-US&gl=US&ceid=US:en"
             response = await client.get(url)
             response.raise_for_status()
@@ -423,13 +510,22 @@ class NewsMonitor:
         return articles
 
     async def _fetch_bing_news_async(
-        self, client: httpx.AsyncClient, company_name: str
+        self, client: httpx.AsyncClient, company_name: str, since: Optional[datetime] = None
     ) -> List[NewsArticle]:
         """Async Bing News API fetch."""
         articles: List[NewsArticle] = []
         try:
             query = urllib.parse.quote(f'"{company_name}"')
             url = f"https://api.bing.microsoft.com/v7.0/news/search?q={query}&count=100"
+            if since:
+                # Bing only offers coarse freshness windows
+                age = datetime.utcnow() - since
+                if age <= timedelta(days=1):
+                    url += "&freshness=Day"
+                elif age <= timedelta(days=7):
+                    url += "&freshness=Week"
+                elif age <= timedelta(days=30):
+                    url += "&freshness=Month"
             response = await client.get(
                 url, headers={"Ocp-Apim-Subscription-Key": self.bing_news_key}
             )
@@ -453,7 +549,7 @@ class NewsMonitor:
         return articles
 
     async def _fetch_gnews_async(
-        self, client: httpx.AsyncClient, company_name: str
+        self, client: httpx.AsyncClient, company_name: str, since: Optional[datetime] = None
     ) -> List[NewsArticle]:
         """Async GNews API fetch."""
         articles: List[NewsArticle] = []
@@ -463,6 +559,8 @@ class NewsMonitor:
                 f"https://gnews.io/api/v4/search?q={query}"
                 f"&lang=en&country=us&max=50&apikey={self.gnews_api_key}"
             )
+            if since:
+                url += f"&from={since:%Y-%m-%dT%H:%M:%SZ}"
             response = await client.get(url)
             response.raise_for_status()
             data = response.json()
@@ -484,7 +582,7 @@ class NewsMonitor:
         return articles
 
     async def _fetch_mediastack_async(
-        self, client: httpx.AsyncClient, company_name: str
+        self, client: httpx.AsyncClient, company_name: str, since: Optional[datetime] = None
     ) -> List[NewsArticle]:
         """Async MediaStack API fetch."""
         articles: List[NewsArticle] = []
@@ -495,6 +593,8 @@ class NewsMonitor:
                 f"?access_key={self.mediastack_api_key}"
                 f"&keywords={query}&languages=en&limit=50"
             )
+            if since:
+                url += f"&date={since:%Y-%m-%d},{datetime.utcnow():%Y-%m-%d}"
             response = await client.get(url)
             response.raise_for_status()
             data = response.json()
@@ -565,15 +665,23 @@ class NewsMonitor:
         self,
         competitors: List[Dict[str, Any]],
         days: int = 7,
-        progress_key: str = "default"
+        progress_key: str = "default",
+        concurrency: int = 10,
+        on_digest: Optional[Callable[[Dict[str, Any], NewsDigest], Awaitable[None]]] = None,
     ) -> Dict[str, Any]:
         """
         Fetch news for multiple competitors in parallel with concurrency limit.
 
         Args:
-            competitors: List of dicts with at least 'name' key (and optionally 'id')
+            competitors: List of dicts with at least 'name' key (and optionally
+                'id', 'website' and 'since', a per-source watermark dict passed
+                to fetch_news_async)
             days: Number of days to look back
             progress_key: Key for tracking progress via get_news_fetch_progress()
+            concurrency: Competitors fetched at once (each source also has its
+                own cap, see SOURCE_CONCURRENCY)
+            on_digest: Optional coroutine called with (competitor, digest) as
+                each competitor finishes, e.g. to persist its articles
 
         Returns:
             Summary dict with totals and per-competitor/per-source breakdowns
@@ -589,7 +697,7 @@ class NewsMonitor:
             "percentage": 0,
         }
 
-        sem = asyncio.Semaphore(10)
+        sem = asyncio.Semaphore(max(1, concurrency))
         per_competitor: Dict[str, int] = {}
         per_source: Dict[str, int] = {}
         sentiment_totals = {"positive": 0, "negative": 0, "neutral": 0}
@@ -602,7 +710,11 @@ class NewsMonitor:
 
             async with sem:
                 try:
-                    digest = await self.fetch_news_async(name, days=days)
+                    digest = await self.fetch_news_async(
+                        name, days=days, website=comp.get("website"), since=comp.get("since")
+                    )
+                    if on_digest is not None:
+                        await on_digest(comp, digest)
                     count = digest.total_count
                     per_competitor[name] = count
                     total_articles += count
@@ -1162,110 +1274,194 @@ class NewsMonitor:
         else:
             return "neutral"
 
-    def _ai_classify_batch(self, articles: List[NewsArticle]) -> None:
+    # ============== AI Classification ==============
+
+    CLASSIFY_BATCH_SIZE = 25
+    CLASSIFY_CACHE_NAMESPACE = "news"
+    CLASSIFY_CACHE_TTL = 7 * 24 * 3600  # Headlines don't get reclassified
+    VALID_SENTIMENTS = {"positive", "negative", "neutral"}
+    VALID_EVENT_TYPES = {
+        "funding", "acquisition", "product_launch", "partnership",
+        "leadership", "financial", "legal", "expansion", "general"
+    }
+
+    @staticmethod
+    def _title_hash(title: str) -> str:
+        """Hash of a headline with case, punctuation and spacing normalized."""
+        normalized = re.sub(r"[^\w\s]", "", (title or "").lower())
+        normalized = " ".join(normalized.split())
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+
+    def _build_classify_prompt(self, titles: List[str]) -> str:
+        """Prompt asking for sentiment + event_type for each numbered headline."""
+        headlines = [f"{idx}. {title}" for idx, title in enumerate(titles)]
+        return (
+            "Classify each news headline below. For EACH headline, provide:\n"
+            "- sentiment: exactly one of \"positive\", \"negative\", or \"neutral\"\n"
+            "- event_type: exactly one of \"funding\", \"acquisition\", \"product_launch\", "
+            "\"partnership\", \"leadership\", \"financial\", \"legal\", \"expansion\", or \"general\"\n\n"
+            "Rules:\n"
+            "- funding: fundraising rounds, investment, venture capital, Series A/B/C\n"
+            "- acquisition: M&A, buyouts, mergers, company purchases\n"
+            "- product_launch: new products, features, releases, platform launches\n"
+            "- partnership: alliances, collaborations, integrations, joint ventures\n"
+            "- leadership: executive hires, appointments, departures, board changes\n"
+            "- financial: earnings, revenue, IPO, stock, quarterly results, valuation\n"
+            "- legal: lawsuits, regulatory, compliance, FDA, patents, legal disputes\n"
+            "- expansion: new markets, office openings, geographic growth, headcount growth\n"
+            "- general: anything that doesn't fit the above categories\n\n"
+            "- positive: good news for the company (growth, wins, awards, strong results)\n"
+            "- negative: bad news (layoffs, lawsuits, losses, breaches, failures, declines)\n"
+            "- neutral: factual reporting without clear positive/negative framing\n\n"
+            "Respond with a JSON array of objects, one per headline, in the same order.\n"
+            "Example: [{\"sentiment\":\"positive\",\"event_type\":\"funding\"}, ...]\n\n"
+            "Headlines:\n" + "\n".join(headlines)
+        )
+
+    def _parse_classifications(self, result: Dict[str, Any], expected: int) -> Optional[List[Dict[str, str]]]:
+        """Validated [{sentiment, event_type}] from a router response, or None if unusable."""
+        classifications = result.get("response_json", {})
+        if isinstance(classifications, dict) and "raw" not in classifications:
+            # Handle case where response is wrapped in a key
+            for key in classifications:
+                if isinstance(classifications[key], list):
+                    classifications = classifications[key]
+                    break
+        if not isinstance(classifications, list) or len(classifications) != expected:
+            logger.warning(
+                f"AI classify: expected {expected} results, got "
+                f"{len(classifications) if isinstance(classifications, list) else 'non-list'}"
+            )
+            return None
+        parsed = []
+        for cls in classifications:
+            entry = {}
+            if isinstance(cls, dict):
+                s = str(cls.get("sentiment", "")).lower()
+                e = str(cls.get("event_type", "")).lower()
+                if s in self.VALID_SENTIMENTS:
+                    entry["sentiment"] = s
+                if e in self.VALID_EVENT_TYPES:
+                    entry["event_type"] = e
+            parsed.append(entry)
+        return parsed
+
+    @staticmethod
+    def _apply_classification(article: NewsArticle, cls: Dict[str, str]) -> None:
+        if cls.get("sentiment"):
+            article.sentiment = cls["sentiment"]
+        if cls.get("event_type"):
+            article.event_type = cls["event_type"]
+            article.is_major_event = cls["event_type"] != "general"
+
+    async def _ai_classify_batch_async(
+        self, articles: List[NewsArticle], concurrency: Optional[int] = None
+    ) -> None:
         """
         Classify sentiment AND event_type for articles using AI (Gemini).
 
-        Sends batches of up to 25 headlines to the AI router for accurate
-        classification. Falls back to keyword-based if AI is unavailable.
+        Headlines are deduplicated by normalized-title hash; ones classified
+        before come from the "news" cache namespace. The rest go to the AI
+        router in batches of 25, run concurrently under a per-loop semaphore
+        (NEWS_CLASSIFY_CONCURRENCY, default 4). A batch that fails or returns
+        malformed output falls back to keyword classification on its own.
 
         Args:
             articles: List of NewsArticle objects to classify (modified in place)
+            concurrency: Max batches in flight (overrides NEWS_CLASSIFY_CONCURRENCY)
         """
         if not articles:
             return
 
         try:
-            import asyncio as _asyncio
             from ai_router import get_ai_router, TaskType
-
+            from cache import get_cache
             router = get_ai_router()
-
-            # Process in batches of 25
-            batch_size = 25
-            for i in range(0, len(articles), batch_size):
-                batch = articles[i:i + batch_size]
-                headlines = []
-                for idx, a in enumerate(batch):
-                    headlines.append(f"{idx}. {a.title}")
-
-                prompt = (
-                    "Classify each news headline below. For EACH headline, provide:\n"
-                    "- sentiment: exactly one of \"positive\", \"negative\", or \"neutral\"\n"
-                    "- event_type: exactly one of \"funding\", \"acquisition\", \"product_launch\", "
-                    "\"partnership\", \"leadership\", \"financial\", \"legal\", \"expansion\", or \"general\"\n\n"
-                    "Rules:\n"
-                    "- funding: fundraising rounds, investment, venture capital, Series A/B/C\n"
-                    "- acquisition: M&A, buyouts, mergers, company purchases\n"
-                    "- product_launch: new products, features, releases, platform launches\n"
-                    "- partnership: alliances, collaborations, integrations, joint ventures\n"
-                    "- leadership: executive hires, appointments, departures, board changes\n"
-                    "- financial: earnings, revenue, IPO, stock, quarterly results, valuation\n"
-                    "- legal: lawsuits, regulatory, compliance, FDA, patents, legal disputes\n"
-                    "- expansion: new markets, office openings, geographic growth, headcount growth\n"
-                    "- general: anything that doesn't fit the above categories\n\n"
-                    "- positive: good news for the company (growth, wins, awards, strong results)\n"
-                    "- negative: bad news (layoffs, lawsuits, losses, breaches, failures, declines)\n"
-                    "- neutral: factual reporting without clear positive/negative framing\n\n"
-                    "Respond with a JSON array of objects, one per headline, in the same order.\n"
-                    "Example: [{\"sentiment\":\"positive\",\"event_type\":\"funding\"}, ...]\n\n"
-                    "Headlines:\n" + "\n".join(headlines)
-                )
-
-                try:
-                    loop = _asyncio.new_event_loop()
-                    try:
-                        result = loop.run_until_complete(
-                            router.generate_json(
-                                prompt=prompt,
-                                task_type=TaskType.CLASSIFICATION,
-                                system_prompt="You are a news classification expert. Respond ONLY with valid JSON.",
-                                max_tokens=2048,
-                                temperature=0.1
-                            )
-                        )
-                    finally:
-                        loop.close()
-
-                    classifications = result.get("response_json", {})
-                    if isinstance(classifications, dict) and "raw" not in classifications:
-                        # Handle case where response is wrapped in a key
-                        for key in classifications:
-                            if isinstance(classifications[key], list):
-                                classifications = classifications[key]
-                                break
-                    if isinstance(classifications, list) and len(classifications) == len(batch):
-                        valid_sentiments = {"positive", "negative", "neutral"}
-                        valid_events = {
-                            "funding", "acquisition", "product_launch", "partnership",
-                            "leadership", "financial", "legal", "expansion", "general"
-                        }
-                        for article, cls in zip(batch, classifications):
-                            if isinstance(cls, dict):
-                                s = cls.get("sentiment", "").lower()
-                                e = cls.get("event_type", "").lower()
-                                if s in valid_sentiments:
-                                    article.sentiment = s
-                                if e in valid_events:
-                                    article.event_type = e
-                                    article.is_major_event = e != "general"
-                    else:
-                        logger.warning(
-                            f"AI classify: expected {len(batch)} results, got "
-                            f"{len(classifications) if isinstance(classifications, list) else 'non-list'}"
-                        )
-                        self._keyword_classify_batch(batch)
-
-                except Exception as e:
-                    logger.warning(f"AI batch classification failed for batch {i // batch_size}: {e}")
-                    self._keyword_classify_batch(batch)
-
+            cache = get_cache()
         except ImportError:
             logger.warning("AI router not available, using keyword classification")
             self._keyword_classify_batch(articles)
+            return
         except Exception as e:
             logger.warning(f"AI classification setup failed: {e}")
             self._keyword_classify_batch(articles)
+            return
+
+        # Group articles sharing a headline so each is classified once
+        groups: Dict[str, List[NewsArticle]] = {}
+        for article in articles:
+            groups.setdefault(self._title_hash(article.title), []).append(article)
+
+        pending: List[str] = []
+        for title_hash, group in groups.items():
+            try:
+                cached = cache.get(title_hash, namespace=self.CLASSIFY_CACHE_NAMESPACE)
+            except Exception:
+                cached = None
+            if cached:
+                for article in group:
+                    self._apply_classification(article, cached)
+            else:
+                pending.append(title_hash)
+
+        if not pending:
+            return
+
+        if concurrency is not None:
+            semaphore = asyncio.Semaphore(max(1, concurrency))
+        else:
+            loop = asyncio.get_running_loop()
+            semaphore = self._classify_semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(max(1, int(os.getenv("NEWS_CLASSIFY_CONCURRENCY", "4"))))
+                self._classify_semaphores[loop] = semaphore
+        batch_size = self.CLASSIFY_BATCH_SIZE
+
+        async def _classify(batch_no: int, hashes: List[str]) -> None:
+            batch_articles = [a for h in hashes for a in groups[h]]
+            try:
+                async with semaphore:
+                    result = await router.generate_json(
+                        prompt=self._build_classify_prompt([groups[h][0].title for h in hashes]),
+                        task_type=TaskType.CLASSIFICATION,
+                        system_prompt="You are a news classification expert. Respond ONLY with valid JSON.",
+                        max_tokens=2048,
+                        temperature=0.1
+                    )
+                parsed = self._parse_classifications(result, len(hashes))
+            except Exception as e:
+                logger.warning(f"AI batch classification failed for batch {batch_no}: {e}")
+                parsed = None
+
+            if parsed is None:
+                self._keyword_classify_batch(batch_articles)
+                return
+
+            for title_hash, cls in zip(hashes, parsed):
+                for article in groups[title_hash]:
+                    self._apply_classification(article, cls)
+                if cls:
+                    try:
+                        cache.set(title_hash, cls, ttl=self.CLASSIFY_CACHE_TTL,
+                                  namespace=self.CLASSIFY_CACHE_NAMESPACE)
+                    except Exception:
+                        pass
+
+        await asyncio.gather(*(
+            _classify(i // batch_size, pending[i:i + batch_size])
+            for i in range(0, len(pending), batch_size)
+        ))
+
+    def _ai_classify_batch(self, articles: List[NewsArticle]) -> None:
+        """Sync entry point for _ai_classify_batch_async (callers without a running loop)."""
+        if not articles:
+            return
+        try:
+            asyncio.run(self._ai_classify_batch_async(articles))
+        except RuntimeError as e:
+            # Called from a thread that already runs an event loop
+            logger.warning(f"AI classification unavailable here ({e}), using keywords")
+            self._keyword_classify_batch(articles)
 
     def _keyword_classify_batch(self, articles: List[NewsArticle]) -> None:
         """Keyword-based fallback for sentiment + event_type classification."""
@@ -1291,8 +1487,18 @@ class NewsMonitor:
 
         # Use AI classification for both sentiment AND event_type
         self._ai_classify_batch(articles)
+        self._finalize_event_types(articles)
+
+    async def _analyze_sentiment_batch_async(self, articles: List[NewsArticle]) -> None:
+        """Async variant of _analyze_sentiment_batch for callers on the event loop."""
+        if not articles:
+            return
+
+        await self._ai_classify_batch_async(articles)
+        self._finalize_event_types(articles)
 
-        # Ensure all articles have event_type set (fallback for any missed)
+    def _finalize_event_types(self, articles: List[NewsArticle]) -> None:
+        """Ensure all articles have event_type set (fallback for any missed)."""
         for article in articles:
             if article.event_type is None:
                 article.event_type = self._detect_event_type(article.title + " " + article.snippet)
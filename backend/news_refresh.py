@@ -0,0 +1,279 @@
+"""
+Certify Intel - Incremental Daily News Refresh
+==============================================
+
+The 5 AM news job, built on NewsMonitor.fetch_all_competitors_async.
+Competitors are fetched concurrently (NEWS_REFRESH_CONCURRENCY) and every
+news source stays within its own request cap (NEWS_SOURCE_CONCURRENCY in
+news_monitor). Each (competitor, source) pair keeps a watermark in
+news_source_watermarks, and a run asks the source only for articles newer
+than it. Pairs without a watermark look back NEWS_REFRESH_INITIAL_DAYS.
+
+A competitor's articles and watermarks are committed together as soon as
+its fetch finishes, so a crash loses at most the competitors in flight.
+The run itself is recorded in persistent_cache. When the scheduler starts
+it calls ``run_daily_news_refresh(resume=True)``, which continues a run
+that never recorded its completion and skips the competitors already
+checked since that run began. A run where any competitor failed to store
+is not marked complete, so those competitors are retried on resume.
+
+Usage:
+    from news_refresh import run_daily_news_refresh
+
+    summary = await run_daily_news_refresh()
+    # {"competitors": 120, "skipped": 0, "inserted": 84, "updated": 311, ...}
+
+Config:
+    NEWS_REFRESH_CONCURRENCY=8
+    NEWS_REFRESH_INITIAL_DAYS=7
+"""
+
+import os
+import json
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from database import SessionLocal, Competitor, NewsSourceWatermark, PersistentCache
+from news_ingest import ingest_articles, parse_published_date
+
+logger = logging.getLogger(__name__)
+
+RUN_STATE_KEY = "news_refresh:daily_run"
+PROGRESS_KEY = "daily_news_refresh"
+
+
+def _initial_days() -> int:
+    return max(1, int(os.getenv("NEWS_REFRESH_INITIAL_DAYS", "7")))
+
+
+# =============================================================================
+# RUN STATE
+# =============================================================================
+
+def load_run_state(db) -> Optional[Dict[str, Any]]:
+    """The last recorded run: {"started_at": iso, "completed_at": iso | None}."""
+    row = db.query(PersistentCache).filter(PersistentCache.cache_key == RUN_STATE_KEY).first()
+    if row is None or not row.data_json:
+        return None
+    try:
+        return json.loads(row.data_json)
+    except ValueError:
+        return None
+
+
+def _save_run_state(db, state: Dict[str, Any]) -> None:
+    row = db.query(PersistentCache).filter(PersistentCache.cache_key == RUN_STATE_KEY).first()
+    if row is None:
+        row = PersistentCache(cache_key=RUN_STATE_KEY)
+        db.add(row)
+    row.data_json = json.dumps(state)
+    row.updated_at = datetime.utcnow()
+    db.commit()
+
+
+# =============================================================================
+# WATERMARKS
+# =============================================================================
+
+def load_watermarks(db, competitor_ids: Iterable[int]) -> Dict[int, Dict[str, NewsSourceWatermark]]:
+    """Stored watermarks as {competitor_id: {source: row}}."""
+    ids = list(competitor_ids)
+    if not ids:
+        return {}
+    out: Dict[int, Dict[str, NewsSourceWatermark]] = {}
+    rows = db.query(NewsSourceWatermark).filter(NewsSourceWatermark.competitor_id.in_(ids)).all()
+    for row in rows:
+        out.setdefault(row.competitor_id, {})[row.source] = row
+    return out
+
+
+def since_for(watermarks: Dict[str, NewsSourceWatermark], sources: Iterable[str], now: datetime) -> Dict[str, datetime]:
+    """
+    Per-source "newer than" dates for one competitor.
+
+    A source that has returned dated articles resumes from the newest of
+    them; one that returned nothing dated resumes from its last check.
+    """
+    default = now - timedelta(days=_initial_days())
+    since = {}
+    for source in sources:
+        row = watermarks.get(source)
+        since[source] = (row.last_published_at or row.last_checked_at) if row else default
+    return since
+
+
+def record_watermarks(
+    db,
+    competitor_id: int,
+    source_watermarks: Dict[str, Optional[datetime]],
+    checked_at: datetime,
+) -> None:
+    """Advance watermarks for the sources that answered. Does not commit."""
+    if not source_watermarks:
+        return
+    existing = {
+        row.source: row for row in db.query(NewsSourceWatermark).filter(
+            NewsSourceWatermark.competitor_id == competitor_id,
+            NewsSourceWatermark.source.in_(list(source_watermarks))
+        ).all()
+    }
+    for source, newest in source_watermarks.items():
+        row = existing.get(source)
+        if row is None:
+            row = NewsSourceWatermark(competitor_id=competitor_id, source=source)
+            db.add(row)
+        if newest and (row.last_published_at is None or newest > row.last_published_at):
+            # Watermarks never move backwards, and never past the check time
+            row.last_published_at = min(newest, checked_at)
+        row.last_checked_at = checked_at
+
+
+# =============================================================================
+# REFRESH
+# =============================================================================
+
+def _plan_run(session_factory, sources: List[str], resume: bool) -> Optional[Dict[str, Any]]:
+    """Start (or pick up) a run and list the competitors still to fetch."""
+    db = session_factory()
+    try:
+        now = datetime.utcnow()
+        if resume:
+            state = load_run_state(db)
+            if not state or state.get("completed_at"):
+                return None
+            started_at = parse_published_date(state.get("started_at")) or now
+            logger.info(f"[Daily News] Resuming refresh started at {started_at.isoformat()}")
+        else:
+            started_at = now
+            _save_run_state(db, {"started_at": now.isoformat(), "completed_at": None})
+
+        competitors = db.query(Competitor).filter(
+            Competitor.is_deleted == False  # noqa: E712
+        ).all()
+        watermarks = load_watermarks(db, [c.id for c in competitors])
+
+        pending = []
+        for comp in competitors:
+            marks = watermarks.get(comp.id, {})
+            if any(m.last_checked_at and m.last_checked_at >= started_at for m in marks.values()):
+                continue  # Done earlier in this run
+            pending.append({
+                "id": comp.id,
+                "name": comp.name,
+                "website": comp.website,
+                "since": since_for(marks, sources, now),
+            })
+        return {
+            "started_at": started_at,
+            "competitors": pending,
+            "skipped": len(competitors) - len(pending),
+        }
+    finally:
+        db.close()
+
+
+def _store_digest(session_factory, comp: Dict[str, Any], digest) -> Dict[str, int]:
+    """Persist one competitor's articles and watermarks in one transaction."""
+    db = session_factory()
+    try:
+        now = datetime.utcnow()
+        rows = [
+            dict(
+                competitor_id=comp["id"],
+                competitor_name=comp["name"],
+                title=article.title[:500] if article.title else "",
+                url=article.url,
+                source=article.source,
+                source_type=article.fetched_from or "daily_refresh",
+                published_at=parse_published_date(article.published_date) or now,
+                snippet=article.snippet[:1000] if article.snippet else None,
+                sentiment=article.sentiment,
+                event_type=article.event_type,
+                is_major_event=article.is_major_event,
+                dimension_tags=json.dumps(article.dimension_tags) if article.dimension_tags else None,
+                fetched_at=now,
+                cache_expires_at=None,  # permanent storage
+            )
+            for article in digest.articles
+        ]
+        # Articles seen before get their classification refreshed
+        result = ingest_articles(db, rows, update_existing=True)
+        record_watermarks(db, comp["id"], digest.source_watermarks, now)
+        db.commit()
+        return {"inserted": result.inserted, "updated": result.updated}
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _finish_run(session_factory, started_at: datetime) -> None:
+    db = session_factory()
+    try:
+        _save_run_state(db, {
+            "started_at": started_at.isoformat(),
+            "completed_at": datetime.utcnow().isoformat(),
+        })
+    finally:
+        db.close()
+
+
+async def run_daily_news_refresh(
+    resume: bool = False,
+    monitor=None,
+    session_factory=SessionLocal,
+) -> Optional[Dict[str, Any]]:
+    """
+    Fetch news newer than each (competitor, source) watermark and store it.
+
+    With ``resume=True`` only an interrupted run is continued; if the last
+    run completed this returns None without fetching anything.
+    """
+    from news_monitor import NewsMonitor, SOURCE_CONCURRENCY
+
+    monitor = monitor or NewsMonitor()
+    plan = await asyncio.to_thread(_plan_run, session_factory, list(SOURCE_CONCURRENCY), resume)
+    if plan is None:
+        return None
+
+    totals = {"inserted": 0, "updated": 0, "failed": 0}
+
+    async def persist(comp: Dict[str, Any], digest) -> None:
+        try:
+            stored = await asyncio.to_thread(_store_digest, session_factory, comp, digest)
+        except Exception:
+            totals["failed"] += 1
+            raise
+        totals["inserted"] += stored["inserted"]
+        totals["updated"] += stored["updated"]
+
+    fetched = await monitor.fetch_all_competitors_async(
+        plan["competitors"],
+        days=_initial_days(),
+        progress_key=PROGRESS_KEY,
+        concurrency=max(1, int(os.getenv("NEWS_REFRESH_CONCURRENCY", "8"))),
+        on_digest=persist,
+    )
+    if totals["failed"]:
+        # Left open so the next resume retries them (their watermarks were rolled back)
+        logger.warning(
+            f"[Daily News] {totals['failed']} competitor(s) failed to store; run left open for resume"
+        )
+    else:
+        await asyncio.to_thread(_finish_run, session_factory, plan["started_at"])
+
+    summary = {
+        "competitors": len(plan["competitors"]),
+        "skipped": plan["skipped"],
+        **totals,
+        "per_source": fetched.get("per_source", {}),
+    }
+    logger.info(
+        f"[Daily News] Stored {summary['inserted']} new and refreshed {summary['updated']} "
+        f"articles for {summary['competitors']} competitors "
+        f"({summary['skipped']} already done, {summary['failed']} failed)"
+    )
+    return summary
@@ -35,9 +35,13 @@ Usage:
 """
 
 import os
+import gzip
+import json
 import logging
 import functools
+import threading
 import time
+from collections import deque
 from typing import Optional, Dict, Any, Callable
 from contextlib import asynccontextmanager
 from datetime import datetime
@@ -54,6 +58,13 @@ LANGFUSE_HOST = os.getenv("LANGFUSE_HOST", "http://localhost:3000")
 LANGFUSE_PUBLIC_KEY = os.getenv("LANGFUSE_PUBLIC_KEY", "")
 LANGFUSE_SECRET_KEY = os.getenv("LANGFUSE_SECRET_KEY", "")
 
+# Background export (HTTP client only; the official SDK batches on its own)
+LANGFUSE_BUFFER_SIZE = int(os.getenv("LANGFUSE_BUFFER_SIZE", "10000"))
+LANGFUSE_FLUSH_AT = int(os.getenv("LANGFUSE_FLUSH_AT", "50"))
+LANGFUSE_FLUSH_INTERVAL = float(os.getenv("LANGFUSE_FLUSH_INTERVAL", "5"))
+LANGFUSE_MAX_BATCH = int(os.getenv("LANGFUSE_MAX_BATCH", "200"))
+LANGFUSE_GZIP = os.getenv("LANGFUSE_GZIP", "true").lower() == "true"
+
 
 # =============================================================================
 # LANGFUSE CLIENT
@@ -62,24 +73,146 @@ LANGFUSE_SECRET_KEY = os.getenv("LANGFUSE_SECRET_KEY", "")
 _langfuse_client = None
 
 
+class LangfuseExporter:
+    """Background export pipeline for Langfuse ingestion events.
+
+    Events go into a bounded ring buffer; when it is full the oldest event is
+    dropped. A daemon thread sends them in batches of at most ``max_batch``
+    when ``flush_at`` events are waiting or every ``flush_interval`` seconds,
+    so callers never wait on the network.
+
+    ``send(events)`` performs one upload and returns True on success.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[list], bool],
+        buffer_size: int = LANGFUSE_BUFFER_SIZE,
+        flush_at: int = LANGFUSE_FLUSH_AT,
+        flush_interval: float = LANGFUSE_FLUSH_INTERVAL,
+        max_batch: int = LANGFUSE_MAX_BATCH,
+    ):
+        self._send = send
+        self._buffer = deque(maxlen=max(1, buffer_size))
+        self._flush_at = max(1, flush_at)
+        self._flush_interval = max(0.01, flush_interval)
+        self._max_batch = max(1, max_batch)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._idle = threading.Condition(self._lock)
+        self._in_flight = 0
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"queued": 0, "exported": 0, "dropped": 0, "failed": 0, "batches": 0}
+
+    def add(self, event: dict) -> None:
+        """Queue an event; never blocks on I/O."""
+        with self._lock:
+            if self._closed:
+                self.stats["dropped"] += 1
+                return
+            if len(self._buffer) == self._buffer.maxlen:
+                self.stats["dropped"] += 1
+            self._buffer.append(event)
+            self.stats["queued"] += 1
+            pending = len(self._buffer)
+            if self._thread is None:
+                self._start()
+        if pending >= self._flush_at:
+            self._wake.set()
+
+    def _start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="langfuse-exporter", daemon=True)
+        self._thread.start()
+
+    def _take(self) -> list:
+        with self._lock:
+            count = min(len(self._buffer), self._max_batch)
+            batch = [self._buffer.popleft() for _ in range(count)]
+            self._in_flight = count
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            while True:
+                batch = self._take()
+                if not batch:
+                    break
+                try:
+                    ok = self._send(batch)
+                except Exception as e:
+                    logger.warning(f"Langfuse export failed: {e}")
+                    ok = False
+                with self._lock:
+                    self.stats["batches"] += 1
+                    self.stats["exported" if ok else "failed"] += len(batch)
+                    self._in_flight = 0
+            with self._lock:
+                self._idle.notify_all()
+                if self._closed:
+                    return
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._buffer) + self._in_flight
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Ask the thread to send now; with ``timeout``, wait until the buffer drains."""
+        self._wake.set()
+        if timeout is None:
+            return True
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while self._buffer or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._thread is None:
+                    return False
+                self._wake.set()
+                self._idle.wait(remaining)
+            return True
+
+    def close(self, timeout: float = 5.0) -> bool:
+        """Send what is buffered (up to ``timeout`` seconds) and stop the thread."""
+        drained = self.flush(timeout=timeout)
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+        self._wake.set()
+        if thread is not None:
+            thread.join(timeout=1)
+        if not drained:
+            logger.warning(f"Langfuse exporter closed with {self.pending()} events unsent")
+        return drained
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self.stats, "buffered": len(self._buffer)}
+
+
 class LangfuseHTTPClient:
     """Lightweight Langfuse HTTP client for Python 3.14+ compatibility.
 
     The official langfuse SDK uses pydantic.v1 which is broken on Python 3.14.
     This client sends traces/scores via the Langfuse REST API directly.
+    Events are uploaded by a LangfuseExporter thread, never by the caller.
     """
 
-    def __init__(self, public_key: str, secret_key: str, host: str):
-        import requests as _requests
-        self._session = _requests.Session()
+    def __init__(self, public_key: str, secret_key: str, host: str,
+                 session=None, **exporter_options):
+        if session is None:
+            import requests as _requests
+            session = _requests.Session()
+        self._session = session
         self._session.auth = (public_key, secret_key)
         self._host = host.rstrip("/")
-        self._batch = []
+        self._exporter = LangfuseExporter(self._post_batch, **exporter_options)
 
     def _event(self, event_type: str, body: dict):
         """Add a batch event with required top-level id and timestamp."""
         import uuid
-        self._batch.append({
+        self._exporter.add({
             "id": str(uuid.uuid4()),
             "type": event_type,
             "timestamp": datetime.now(tz=__import__('datetime').timezone.utc).isoformat(),
@@ -126,26 +259,39 @@ class LangfuseHTTPClient:
             body["traceId"] = trace_id
         self._event("score-create", body)
 
-    def flush(self):
-        """Send all batched events to Langfuse."""
-        if not self._batch:
-            return
-        try:
-            resp = self._session.post(
-                f"{self._host}/api/public/ingestion",
-                json={"batch": self._batch},
-                timeout=5
-            )
-            if resp.status_code not in (200, 207):
-                logger.warning(f"Langfuse ingestion returned {resp.status_code}: {resp.text[:200]}")
-            self._batch.clear()
-        except Exception as e:
-            logger.warning(f"Langfuse flush failed: {e}")
-            self._batch.clear()
-
-    def shutdown(self):
-        """Flush remaining events and close session."""
-        self.flush()
+    def _post_batch(self, events: list) -> bool:
+        """Upload one batch (runs on the exporter thread)."""
+        body = json.dumps({"batch": events}, default=str).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if LANGFUSE_GZIP:
+            body = gzip.compress(body, compresslevel=6)
+            headers["Content-Encoding"] = "gzip"
+        resp = self._session.post(
+            f"{self._host}/api/public/ingestion",
+            data=body,
+            headers=headers,
+            timeout=5
+        )
+        if resp.status_code not in (200, 207):
+            logger.warning(f"Langfuse ingestion returned {resp.status_code}: {resp.text[:200]}")
+            return False
+        return True
+
+    def flush(self, timeout: Optional[float] = None):
+        """Ask the exporter to send buffered events now.
+
+        Returns immediately unless ``timeout`` is given, in which case it
+        waits up to that long for the buffer to drain.
+        """
+        return self._exporter.flush(timeout=timeout)
+
+    def stats(self) -> Dict[str, int]:
+        """Exporter counters: queued, exported, dropped, failed, batches, buffered."""
+        return self._exporter.snapshot()
+
+    def shutdown(self, timeout: float = 5.0):
+        """Send remaining events (up to ``timeout`` seconds) and close the session."""
+        self._exporter.close(timeout=timeout)
         self._session.close()
 
     def get_prompt(self, name, version=None):
@@ -284,8 +430,11 @@ def shutdown_langfuse():
 
     if _langfuse_client:
         try:
-            _langfuse_client.flush()
-            _langfuse_client.shutdown()
+            if isinstance(_langfuse_client, LangfuseHTTPClient):
+                _langfuse_client.shutdown()
+            else:
+                _langfuse_client.flush()
+                _langfuse_client.shutdown()
             logger.info("Langfuse client shut down")
         except Exception as e:
             logger.error(f"Error shutting down Langfuse: {e}")
@@ -614,8 +763,14 @@ async def check_langfuse_health() -> Dict[str, Any]:
     try:
         langfuse = get_langfuse()
         if langfuse:
-            # Try to flush to verify connection
-            langfuse.flush()
+            if isinstance(langfuse, LangfuseHTTPClient):
+                # Exports run in the background; report their counters
+                langfuse.flush()
+                result["exporter"] = langfuse.stats()
+            else:
+                # The SDK flush blocks, so keep it off the event loop
+                import asyncio
+                await asyncio.to_thread(langfuse.flush)
             result["connected"] = True
     except Exception as e:
         result["error"] = str(e)
@@ -672,9 +827,8 @@ if __name__ == "__main__":
             print("  Context manager trace created")
 
         # Flush
-        langfuse = get_langfuse()
-        if langfuse:
-            langfuse.flush()
+        if get_langfuse():
+            shutdown_langfuse()
             print("\nTraces flushed to Langfuse")
             print(f"View at: {LANGFUSE_HOST}")
 
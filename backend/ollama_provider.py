@@ -12,7 +12,7 @@ Config:
 
 import os
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, AsyncIterator
 
 logger = logging.getLogger(__name__)
 
@@ -87,6 +87,41 @@ class OllamaProvider:
             "model": use_model,
         }
 
+    async def stream(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        usage: Optional[Dict[str, int]] = None,
+    ) -> AsyncIterator[str]:
+        """Stream text chunks via local Ollama; token counts go to ``usage``."""
+        client = self._get_client()
+        if not client:
+            raise RuntimeError("Ollama client not available")
+
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        stream = await client.chat.completions.create(
+            model=model or self.default_model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+
+        async for chunk in stream:
+            if chunk.usage and usage is not None:
+                usage["tokens_input"] = chunk.usage.prompt_tokens
+                usage["tokens_output"] = chunk.usage.completion_tokens
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
     async def list_models(self) -> List[str]:
         """List available Ollama models."""
         try:
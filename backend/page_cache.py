@@ -0,0 +1,137 @@
+"""
+Certify Intel - Persistent Page Cache
+=====================================
+
+On-disk cache of fetched page text for content_matcher.fetch_page_text,
+keyed by URL. URL refinement and source verification fetch the same
+competitor pages over and over; with this cache a page is downloaded once
+and afterwards only revalidated.
+
+Each entry keeps the extracted visible text together with the page's
+ETag / Last-Modified validators. Entries younger than the fetch TTL are
+served as-is; older entries are revalidated with a conditional GET and a
+304 just refreshes their timestamp.
+
+Past PAGE_CACHE_MAX_ENTRIES the least recently used rows are evicted
+(sqlite_cache.SQLiteCache), through an index on last_used_at.
+
+Config:
+    PAGE_CACHE_ENABLED=true
+    PAGE_CACHE_PATH=./page_cache.db
+    PAGE_CACHE_MAX_ENTRIES=5000
+"""
+
+import os
+import time
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from sqlite_cache import SharedCache, SQLiteCache, default_cache_path
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedPage:
+    """A cached page and the validators to revalidate it with."""
+    url: str
+    text: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float = 0.0
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class PageCache(SQLiteCache):
+    """SQLite-backed URL -> page text cache."""
+
+    TABLE = "pages"
+    COLUMNS = (
+        "url TEXT PRIMARY KEY,"
+        " text TEXT NOT NULL,"
+        " etag TEXT,"
+        " last_modified TEXT,"
+        " fetched_at REAL NOT NULL,"
+        " last_used_at REAL NOT NULL"
+    )
+    KEY = ("url",)
+
+    def __init__(self, path: Optional[str] = None, max_entries: Optional[int] = None):
+        super().__init__(
+            path or default_cache_path("PAGE_CACHE_PATH", "page_cache.db"),
+            max_entries=max_entries or int(os.getenv("PAGE_CACHE_MAX_ENTRIES", "5000")),
+        )
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Return the cached page for ``url`` (fresh or not), or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, etag, last_modified, fetched_at FROM pages WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE pages SET last_used_at = ? WHERE url = ?", (time.time(), url)
+            )
+            self._conn.commit()
+        self.hits += 1
+        return CachedPage(url, row[0], row[1], row[2], row[3])
+
+    def put(
+        self,
+        url: str,
+        text: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Store a freshly fetched page, evicting the least recently used past max_entries."""
+        now = time.time()
+        with self._lock:
+            exists = self._conn.execute(
+                "SELECT 1 FROM pages WHERE url = ?", (url,)
+            ).fetchone() is not None
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages "
+                "(url, text, etag, last_modified, fetched_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, text, etag, last_modified, now, now),
+            )
+            self._stored(0 if exists else 1)
+            self._conn.commit()
+
+    def touch(self, url: str) -> None:
+        """Mark a page as revalidated (304 Not Modified) without rewriting its text."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE pages SET fetched_at = ?, last_used_at = ? WHERE url = ?",
+                (now, now, url),
+            )
+            self._conn.commit()
+
+
+_shared: SharedCache[PageCache] = SharedCache(PageCache, "Page cache unavailable, fetching every time")
+
+
+def is_enabled() -> bool:
+    return os.getenv("PAGE_CACHE_ENABLED", "true").lower() == "true"
+
+
+def get_page_cache() -> Optional[PageCache]:
+    """Shared cache instance, or None when disabled or the file can't be opened."""
+    return _shared.get(is_enabled())
+
+
+def reset_page_cache() -> None:
+    """Close and forget the shared instance (tests, config changes)."""
+    _shared.reset()
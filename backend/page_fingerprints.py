@@ -0,0 +1,120 @@
+"""
+Certify Intel - Page Fingerprint Store
+Content-hash change detection for scraped competitor pages.
+
+Each (competitor, URL) pair keeps a sha256 of the page's normalized text,
+the server's ETag / Last-Modified validators and the extraction produced
+from that text. On the next refresh the scraper sends conditional requests,
+and pages whose text is unchanged reuse the stored extraction instead of
+going back through the LLM.
+"""
+import hashlib
+import json
+import re
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from database import PageFingerprint
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_content(text: Optional[str]) -> str:
+    """Collapse whitespace and case so cosmetic reflows don't count as changes."""
+    return _WHITESPACE_RE.sub(" ", text or "").strip().lower()
+
+
+def content_hash(text: Optional[str]) -> str:
+    """sha256 hex digest of the normalized page text."""
+    return hashlib.sha256(normalize_content(text).encode("utf-8")).hexdigest()
+
+
+def load_fingerprints(db, competitor_ids: Iterable[int]) -> Dict[int, Dict[str, Dict[str, Any]]]:
+    """
+    Load stored fingerprints as plain dicts: {competitor_id: {url: fingerprint}}.
+
+    Plain dicts (not ORM rows) so they can be handed to scrape/extract
+    workers without touching the session.
+    """
+    ids = list(competitor_ids)
+    if not ids:
+        return {}
+    out: Dict[int, Dict[str, Dict[str, Any]]] = {}
+    rows = db.query(PageFingerprint).filter(PageFingerprint.competitor_id.in_(ids)).all()
+    for row in rows:
+        try:
+            extraction = json.loads(row.extraction_json) if row.extraction_json else None
+        except (TypeError, ValueError):
+            extraction = None
+        out.setdefault(row.competitor_id, {})[row.url] = {
+            "page_type": row.page_type,
+            "content_hash": row.content_hash,
+            "etag": row.etag,
+            "last_modified": row.last_modified,
+            "extraction": extraction,
+        }
+    return out
+
+
+def conditional_validators(fingerprints: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, str]]:
+    """
+    Validators to send per URL: {url: {"etag": ..., "last_modified": ...}}.
+
+    Only pages with a stored extraction qualify; a 304 for any other page
+    would leave nothing to extract from.
+    """
+    validators = {}
+    for url, fp in fingerprints.items():
+        if fp.get("extraction") is None:
+            continue
+        entry = {k: fp[k] for k in ("etag", "last_modified") if fp.get(k)}
+        if entry:
+            validators[url] = entry
+    return validators
+
+
+def record_fingerprints(db, competitor_id: int, entries: List[Dict[str, Any]]) -> int:
+    """
+    Upsert fingerprints for one competitor. Does not commit.
+
+    Each entry has url, page_type, content_hash, etag, last_modified,
+    not_modified and extraction (an ExtractedData or dict). Returns the
+    number of pages whose content hash changed (new pages included).
+    """
+    if not entries:
+        return 0
+    now = datetime.utcnow()
+    existing = {
+        row.url: row for row in db.query(PageFingerprint).filter(
+            PageFingerprint.competitor_id == competitor_id,
+            PageFingerprint.url.in_([e["url"] for e in entries])
+        ).all()
+    }
+    changed = 0
+    for entry in entries:
+        extraction = entry.get("extraction")
+        if extraction is not None and not isinstance(extraction, dict):
+            extraction = asdict(extraction)
+        row = existing.get(entry["url"])
+        if row is None:
+            row = PageFingerprint(competitor_id=competitor_id, url=entry["url"], last_changed_at=now)
+            db.add(row)
+            existing[entry["url"]] = row
+            changed += 1
+        elif row.content_hash != entry["content_hash"]:
+            row.last_changed_at = now
+            changed += 1
+        row.page_type = entry.get("page_type") or row.page_type
+        row.content_hash = entry["content_hash"]
+        if entry.get("not_modified"):
+            # A 304 may omit validators; keep the ones that produced it
+            row.etag = entry.get("etag") or row.etag
+            row.last_modified = entry.get("last_modified") or row.last_modified
+        else:
+            row.etag = entry.get("etag")
+            row.last_modified = entry.get("last_modified")
+        if extraction is not None:
+            row.extraction_json = json.dumps(extraction)
+        row.last_checked_at = now
+    return changed
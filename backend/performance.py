@@ -5,8 +5,9 @@ Certify Intel v7.0 - Performance Optimization Module
 Provides caching, lazy loading, and query optimization utilities.
 
 Features:
-- TTL-based caching with automatic invalidation
+- TTL-based caching with automatic invalidation (backed by the tiered cache in cache.py)
 - Response caching decorator for FastAPI endpoints
+- Request coalescing (single-flight) and stale-while-revalidate
 - Query result caching for database operations
 - Lazy loading utilities for large datasets
 - Response compression middleware
@@ -23,16 +24,20 @@ Usage:
         ...
 """
 
+import asyncio
 import logging
 import hashlib
 import threading
 import time
 import gzip
 import json
-from typing import Any, Callable, Optional, Dict, List, TypeVar, Generic
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Optional, Dict, List, Tuple, TypeVar, Generic
 from functools import wraps
 from datetime import datetime, timedelta
 
+from cache import get_cache, configure_namespace
+
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
@@ -44,65 +49,52 @@ T = TypeVar('T')
 
 class PerformanceCache:
     """
-    Thread-safe TTL cache with statistics and automatic cleanup.
+    Namespaced view over the unified tiered cache (see cache.py).
 
-    Improvements over basic TTLCache:
-    - Automatic background cleanup of expired entries
-    - Hit/miss statistics for monitoring
-    - Size limits to prevent memory issues
-    - Tag-based invalidation
+    Storage, LRU/TTL eviction and tag invalidation are handled by
+    ``cache.get_cache()``, so with Redis enabled every uvicorn worker shares
+    the same entries and invalidations. This class only scopes keys to a
+    namespace with its own byte budget and default TTL.
     """
 
-    def __init__(self, max_size: int = 1000, default_ttl: int = 300):
-        self._cache: Dict[str, Any] = {}
-        self._timestamps: Dict[str, float] = {}
-        self._tags: Dict[str, set] = {}  # key -> set of tags
-        self._tag_keys: Dict[str, set] = {}  # tag -> set of keys
-        self._lock = threading.RLock()
-        self._max_size = max_size
+    def __init__(
+        self,
+        max_size: int = 1000,
+        default_ttl: int = 300,
+        namespace: str = "default",
+        max_bytes: Optional[int] = None
+    ):
+        self._namespace = namespace
         self._default_ttl = default_ttl
+        configure_namespace(namespace, max_bytes=max_bytes, max_entries=max_size)
 
-        # Statistics
-        self._hits = 0
-        self._misses = 0
-        self._evictions = 0
+    @property
+    def namespace(self) -> str:
+        return self._namespace
 
     def get(self, key: str, ttl_seconds: Optional[int] = None) -> Optional[Any]:
-        """Get cached value if not expired."""
-        ttl = ttl_seconds or self._default_ttl
-
-        with self._lock:
-            if key not in self._cache:
-                self._misses += 1
-                return None
-
-            timestamp = self._timestamps.get(key, 0)
-            if time.time() - timestamp > ttl:
-                # Expired
-                self._remove_key(key)
-                self._misses += 1
-                return None
+        """
+        Get cached value if not expired.
 
-            self._hits += 1
-            return self._cache[key]
+        ``ttl_seconds`` is accepted for backward compatibility; expiry is
+        fixed when the entry is written (see ``set``).
+        """
+        return get_cache().get(key, namespace=self._namespace)
 
-    def set(self, key: str, value: Any, tags: Optional[List[str]] = None) -> None:
+    def set(
+        self,
+        key: str,
+        value: Any,
+        tags: Optional[List[str]] = None,
+        ttl_seconds: Optional[int] = None
+    ) -> None:
         """Set cache value with optional tags for group invalidation."""
-        with self._lock:
-            # Check size limit
-            if len(self._cache) >= self._max_size and key not in self._cache:
-                self._evict_oldest()
-
-            self._cache[key] = value
-            self._timestamps[key] = time.time()
-
-            # Handle tags
-            if tags:
-                self._tags[key] = set(tags)
-                for tag in tags:
-                    if tag not in self._tag_keys:
-                        self._tag_keys[tag] = set()
-                    self._tag_keys[tag].add(key)
+        get_cache().set(
+            key, value,
+            ttl=ttl_seconds or self._default_ttl,
+            namespace=self._namespace,
+            tags=tags
+        )
 
     def invalidate(self, key: str = None, tag: str = None, pattern: str = None) -> int:
         """
@@ -110,96 +102,43 @@ class PerformanceCache:
 
         Args:
             key: Specific key to invalidate
-            tag: Invalidate all entries with this tag
+            tag: Invalidate all entries with this tag (in every namespace)
             pattern: Invalidate all entries with key containing pattern
 
         Returns:
             Number of entries invalidated
         """
-        with self._lock:
-            count = 0
-
-            if key:
-                if key in self._cache:
-                    self._remove_key(key)
-                    count = 1
-
-            elif tag:
-                keys_to_remove = list(self._tag_keys.get(tag, set()))
-                for k in keys_to_remove:
-                    self._remove_key(k)
-                count = len(keys_to_remove)
-
-            elif pattern:
-                keys_to_remove = [k for k in self._cache if pattern in k]
-                for k in keys_to_remove:
-                    self._remove_key(k)
-                count = len(keys_to_remove)
-
-            else:
-                # Clear all
-                count = len(self._cache)
-                self._cache.clear()
-                self._timestamps.clear()
-                self._tags.clear()
-                self._tag_keys.clear()
-
-            return count
-
-    def _remove_key(self, key: str) -> None:
-        """Remove a key and clean up associated tags."""
-        if key in self._cache:
-            del self._cache[key]
-        if key in self._timestamps:
-            del self._timestamps[key]
-        if key in self._tags:
-            for tag in self._tags[key]:
-                if tag in self._tag_keys:
-                    self._tag_keys[tag].discard(key)
-            del self._tags[key]
-
-    def _evict_oldest(self) -> None:
-        """Evict oldest entry when size limit reached."""
-        if not self._timestamps:
-            return
-
-        oldest_key = min(self._timestamps, key=self._timestamps.get)
-        self._remove_key(oldest_key)
-        self._evictions += 1
+        cache = get_cache()
+        if key:
+            exists = cache.get(key, namespace=self._namespace) is not None
+            cache.delete(key, namespace=self._namespace)
+            return int(exists)
+        if tag:
+            return cache.invalidate_tag(tag)
+        if pattern:
+            return cache.invalidate_pattern(pattern, namespace=self._namespace)
+        count = self.stats().get("entries", 0)
+        cache.clear(namespace=self._namespace)
+        return count
 
     def stats(self) -> Dict[str, Any]:
-        """Get cache statistics."""
-        with self._lock:
-            total_requests = self._hits + self._misses
-            hit_rate = (self._hits / total_requests * 100) if total_requests > 0 else 0
-
-            return {
-                "entries": len(self._cache),
-                "max_size": self._max_size,
-                "hits": self._hits,
-                "misses": self._misses,
-                "hit_rate_pct": round(hit_rate, 2),
-                "evictions": self._evictions,
-                "tags": list(self._tag_keys.keys())
-            }
+        """Get cache statistics for this namespace."""
+        stats = get_cache().stats()
+        l1 = stats.get("l1", stats)
+        ns_stats = dict(l1.get("namespaces", {}).get(self._namespace, {}))
+        ns_stats["namespace"] = self._namespace
+        ns_stats["backend"] = stats.get("backend")
+        return ns_stats
 
     def cleanup_expired(self) -> int:
         """Remove all expired entries. Returns count of removed entries."""
-        with self._lock:
-            now = time.time()
-            expired = [
-                k for k, ts in self._timestamps.items()
-                if now - ts > self._default_ttl
-            ]
-            for key in expired:
-                self._remove_key(key)
-            return len(expired)
+        return get_cache().purge_expired(namespace=self._namespace)
 
 
 # Global cache instances
-_api_cache = PerformanceCache(max_size=500, default_ttl=300)
-_query_cache = PerformanceCache(max_size=200, default_ttl=600)
-_agent_cache = PerformanceCache(max_size=100, default_ttl=120)
+_api_cache = PerformanceCache(max_size=500, default_ttl=300, namespace="api", max_bytes=32 * 1024 * 1024)
+_query_cache = PerformanceCache(max_size=200, default_ttl=600, namespace="query", max_bytes=16 * 1024 * 1024)
+_agent_cache = PerformanceCache(max_size=100, default_ttl=120, namespace="agent", max_bytes=8 * 1024 * 1024)
 
 
 def get_api_cache() -> PerformanceCache:
@@ -217,10 +156,181 @@ def get_agent_cache() -> PerformanceCache:
     return _agent_cache
 
 
+# =============================================================================
+# REQUEST COALESCING (SINGLE-FLIGHT)
+# =============================================================================
+
+class SingleFlight:
+    """
+    Coalesce concurrent async calls with the same key into one computation.
+
+    The first caller starts the work as a task; callers arriving while it is
+    still running await the same task. The task is shielded, so a caller that
+    disconnects does not cancel the computation for everyone else.
+
+    Usage:
+        flight = get_single_flight()
+        result = await flight.do("dashboard", lambda: compute_dashboard())
+    """
+
+    def __init__(self):
+        self._inflight: Dict[tuple, "asyncio.Task"] = {}
+        self._lock = threading.Lock()
+        self._leaders = 0
+        self._followers = 0
+        self._background = 0
+
+    def _start(self, key: str, fn: Callable[[], Awaitable[T]]) -> Tuple["asyncio.Task", bool]:
+        loop = asyncio.get_running_loop()
+        # Tasks are bound to a loop, so flights are too
+        flight_key = (id(loop), key)
+        with self._lock:
+            task = self._inflight.get(flight_key)
+            if task is not None:
+                return task, False
+            task = loop.create_task(fn())
+            self._inflight[flight_key] = task
+
+        def _done(t, k=flight_key):
+            with self._lock:
+                if self._inflight.get(k) is t:
+                    del self._inflight[k]
+            if not t.cancelled():
+                t.exception()  # Mark retrieved even if every caller went away
+
+        task.add_done_callback(_done)
+        return task, True
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn() once for all concurrent callers using the same key."""
+        task, leader = self._start(key, fn)
+        with self._lock:
+            if leader:
+                self._leaders += 1
+            else:
+                self._followers += 1
+        return await asyncio.shield(task)
+
+    def refresh(self, key: str, fn: Callable[[], Awaitable[Any]]) -> bool:
+        """Start fn() in the background unless a flight for key is already running."""
+        _, started = self._start(key, fn)
+        if started:
+            with self._lock:
+                self._background += 1
+        return started
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "in_flight": len(self._inflight),
+                "leaders": self._leaders,
+                "coalesced": self._followers,
+                "background_refreshes": self._background,
+            }
+
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SyncSingleFlight:
+    """
+    Thread-based single-flight for sync code (FastAPI runs sync endpoints
+    in a thread pool, so concurrent requests arrive on different threads).
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self._leaders = 0
+        self._followers = 0
+        self._background = 0
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """Run fn() once for all concurrent callers using the same key."""
+        with self._lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._inflight[key] = call
+                self._leaders += 1
+            else:
+                self._followers += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            call.event.set()
+
+    def refresh(self, key: str, fn: Callable[[], Any]) -> bool:
+        """Run fn() on a daemon thread unless a flight for key is already running."""
+        with self._lock:
+            if key in self._inflight:
+                return False
+            self._background += 1
+
+        def _run():
+            try:
+                self.do(key, fn)
+            except Exception as e:
+                logger.warning(f"Background refresh failed for {key}: {e}")
+
+        threading.Thread(target=_run, name=f"swr-refresh-{key[:32]}", daemon=True).start()
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "in_flight": len(self._inflight),
+                "leaders": self._leaders,
+                "coalesced": self._followers,
+                "background_refreshes": self._background,
+            }
+
+
+# Global coalescing instances
+_single_flight = SingleFlight()
+_sync_single_flight = SyncSingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    """Get the async single-flight group."""
+    return _single_flight
+
+
+def get_sync_single_flight() -> SyncSingleFlight:
+    """Get the thread-based single-flight group."""
+    return _sync_single_flight
+
+
 # =============================================================================
 # CACHING DECORATORS
 # =============================================================================
 
+# Request-scoped dependencies that never affect the result
+DEFAULT_UNKEYED_PARAMS = ("db", "background_tasks")
+
+_SWR_MARKER = "__swr__"
+
+
 def cache_key(*args, **kwargs) -> str:
     """Generate a cache key from function arguments."""
     key_parts = [str(a) for a in args]
@@ -229,14 +339,62 @@ def cache_key(*args, **kwargs) -> str:
     return hashlib.md5(key_str.encode()).hexdigest()
 
 
+def _swr_wrap(value: Any, ttl_seconds: int, stale_ttl_seconds: int) -> Any:
+    """Store the freshness deadline next to the value when SWR is enabled."""
+    if not stale_ttl_seconds:
+        return value
+    return {_SWR_MARKER: True, "value": value, "fresh_until": time.time() + ttl_seconds}
+
+
+def _swr_unwrap(cached: Any) -> Tuple[Any, bool]:
+    """Return (value, is_stale) for a cached entry."""
+    if isinstance(cached, dict) and cached.get(_SWR_MARKER):
+        return cached["value"], time.time() > cached["fresh_until"]
+    return cached, False
+
+
+@contextmanager
+def _detached_kwargs(kwargs: Dict[str, Any]):
+    """
+    Swap request-scoped dependencies for ones a background refresh can own.
+
+    The request's DB session is closed once the response is sent, so a
+    stale-while-revalidate refresh gets its own session.
+    """
+    refreshed = dict(kwargs)
+    if "background_tasks" in refreshed:
+        refreshed["background_tasks"] = None
+    if "db" not in refreshed:
+        yield refreshed
+        return
+    from database import SessionLocal
+    session = SessionLocal()
+    try:
+        refreshed["db"] = session
+        yield refreshed
+    finally:
+        session.close()
+
+
 def cached_response(
     ttl_seconds: int = 300,
     tags: Optional[List[str]] = None,
-    key_prefix: str = ""
+    key_prefix: str = "",
+    stale_ttl_seconds: int = 0,
+    unkeyed_params: Tuple[str, ...] = DEFAULT_UNKEYED_PARAMS
 ):
     """
     Decorator for caching FastAPI endpoint responses.
 
+    Concurrent misses for the same key are coalesced into one computation.
+    With ``stale_ttl_seconds`` set, an expired entry is still served for that
+    long while a single background refresh recomputes it. Parameters named
+    in ``unkeyed_params`` (the DB session, by default) are left out of the
+    cache key; pass ``current_user`` too when the response is not per-user.
+
+    Works for both ``async def`` and plain ``def`` endpoints; sync endpoints
+    stay sync so FastAPI keeps running them in its thread pool.
+
     Usage:
         @app.get("/api/competitors")
         @cached_response(ttl_seconds=300, tags=["competitors"])
@@ -244,59 +402,108 @@ def cached_response(
             ...
     """
     def decorator(func: Callable):
+        func_key = f"{key_prefix}{func.__name__}" if key_prefix else func.__name__
+
+        def make_key(args, kwargs) -> str:
+            keyed = {k: v for k, v in kwargs.items() if k not in unkeyed_params}
+            return f"{func_key}:{cache_key(*args, **keyed)}"
+
+        def store(key, result):
+            _api_cache.set(
+                key, _swr_wrap(result, ttl_seconds, stale_ttl_seconds),
+                tags=tags, ttl_seconds=ttl_seconds + stale_ttl_seconds
+            )
+            return result
+
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                key = make_key(args, kwargs)
+
+                cached = _api_cache.get(key)
+                if cached is not None:
+                    value, stale = _swr_unwrap(cached)
+                    if stale:
+                        async def _revalidate():
+                            with _detached_kwargs(kwargs) as fresh_kwargs:
+                                return store(key, await func(*args, **fresh_kwargs))
+                        _single_flight.refresh(key, _revalidate)
+                    logger.debug(f"Cache {'STALE' if stale else 'HIT'}: {func_key}")
+                    return value
+
+                logger.debug(f"Cache MISS: {func_key}")
+
+                async def _compute():
+                    return store(key, await func(*args, **kwargs))
+                return await _single_flight.do(key, _compute)
+            return wrapper
+
         @wraps(func)
-        async def wrapper(*args, **kwargs):
-            # Generate cache key
-            func_key = f"{key_prefix}{func.__name__}" if key_prefix else func.__name__
-            key = f"{func_key}:{cache_key(*args, **kwargs)}"
+        def sync_wrapper(*args, **kwargs):
+            key = make_key(args, kwargs)
 
-            # Check cache
-            cached = _api_cache.get(key, ttl_seconds)
+            cached = _api_cache.get(key)
             if cached is not None:
-                logger.debug(f"Cache HIT: {func_key}")
-                return cached
+                value, stale = _swr_unwrap(cached)
+                if stale:
+                    def _revalidate():
+                        with _detached_kwargs(kwargs) as fresh_kwargs:
+                            return store(key, func(*args, **fresh_kwargs))
+                    _sync_single_flight.refresh(key, _revalidate)
+                logger.debug(f"Cache {'STALE' if stale else 'HIT'}: {func_key}")
+                return value
 
-            # Execute function
             logger.debug(f"Cache MISS: {func_key}")
-            result = await func(*args, **kwargs)
-
-            # Cache result
-            _api_cache.set(key, result, tags=tags)
-
-            return result
-        return wrapper
+            return _sync_single_flight.do(key, lambda: store(key, func(*args, **kwargs)))
+        return sync_wrapper
     return decorator
 
 
 def cache_query_result(
     cache_name: str,
     ttl_seconds: int = 600,
-    tags: Optional[List[str]] = None
+    tags: Optional[List[str]] = None,
+    stale_ttl_seconds: int = 0,
+    unkeyed_params: Tuple[str, ...] = DEFAULT_UNKEYED_PARAMS
 ):
     """
     Decorator for caching database query results.
 
+    Concurrent misses from different threads share one query. With
+    ``stale_ttl_seconds`` set, expired results are served while one
+    background thread re-runs the query with its own DB session.
+
     Usage:
         @cache_query_result("competitors", ttl=300)
         def get_all_competitors(db):
             return db.query(Competitor).all()
     """
     def decorator(func: Callable):
+        def store(key, result):
+            _query_cache.set(
+                key, _swr_wrap(result, ttl_seconds, stale_ttl_seconds),
+                tags=tags or [cache_name], ttl_seconds=ttl_seconds + stale_ttl_seconds
+            )
+            return result
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            key = f"query:{cache_name}:{cache_key(*args, **kwargs)}"
+            keyed = {k: v for k, v in kwargs.items() if k not in unkeyed_params}
+            key = f"query:{cache_name}:{cache_key(*args, **keyed)}"
 
-            cached = _query_cache.get(key, ttl_seconds)
+            cached = _query_cache.get(key)
             if cached is not None:
-                logger.debug(f"Query cache HIT: {cache_name}")
-                return cached
+                value, stale = _swr_unwrap(cached)
+                if stale:
+                    def _revalidate():
+                        with _detached_kwargs(kwargs) as fresh_kwargs:
+                            return store(key, func(*args, **fresh_kwargs))
+                    _sync_single_flight.refresh(key, _revalidate)
+                logger.debug(f"Query cache {'STALE' if stale else 'HIT'}: {cache_name}")
+                return value
 
             logger.debug(f"Query cache MISS: {cache_name}")
-            result = func(*args, **kwargs)
-
-            _query_cache.set(key, result, tags=tags or [cache_name])
-
-            return result
+            return _sync_single_flight.do(key, lambda: store(key, func(*args, **kwargs)))
         return wrapper
     return decorator
 
@@ -320,7 +527,7 @@ def cache_agent_response(ttl_seconds: int = 120):
                 return cached
 
             result = await func(*args, **kwargs)
-            _agent_cache.set(key, result)
+            _agent_cache.set(key, result, ttl_seconds=ttl_seconds)
 
             return result
         return wrapper
@@ -609,7 +816,6 @@ def timed(operation: str):
                 duration_ms = (time.time() - start) * 1000
                 _perf_monitor.record(operation, duration_ms)
 
-        import asyncio
         if asyncio.iscoroutinefunction(func):
             return async_wrapper
         return wrapper
@@ -621,27 +827,25 @@ def timed(operation: str):
 # =============================================================================
 
 def invalidate_competitor_cache(competitor_id: int = None):
-    """Invalidate all competitor-related caches."""
+    """Invalidate all competitor-related caches (on every worker when Redis is enabled)."""
     if competitor_id:
         _api_cache.invalidate(pattern=f"competitor:{competitor_id}")
         _query_cache.invalidate(pattern=f"competitor:{competitor_id}")
     else:
-        _api_cache.invalidate(tag="competitors")
-        _query_cache.invalidate(tag="competitors")
+        # Tags span namespaces, so one call covers the API and query caches
+        get_cache().invalidate_tag("competitors")
     logger.info(f"Invalidated competitor cache: {competitor_id or 'all'}")
 
 
 def invalidate_news_cache():
     """Invalidate news-related caches."""
-    _api_cache.invalidate(tag="news")
-    _query_cache.invalidate(tag="news")
+    get_cache().invalidate_tag("news")
     logger.info("Invalidated news cache")
 
 
 def invalidate_kb_cache():
     """Invalidate knowledge base caches (also clears agent cache)."""
-    _api_cache.invalidate(tag="kb")
-    _query_cache.invalidate(tag="kb")
+    get_cache().invalidate_tag("kb")
     _agent_cache.invalidate()  # Clear all agent responses since KB changed
     logger.info("Invalidated KB and agent caches")
 
@@ -665,6 +869,12 @@ __all__ = [
     'get_query_cache',
     'get_agent_cache',
 
+    # Coalescing
+    'SingleFlight',
+    'SyncSingleFlight',
+    'get_single_flight',
+    'get_sync_single_flight',
+
     # Decorators
     'cached_response',
     'cache_query_result',
@@ -21,6 +21,7 @@ from typing import Dict, List, Any, Optional
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from database import SessionLocal, Competitor, CompetitorProduct, DataSource, NewsArticleCache
+from news_ingest import ingest_articles
 
 
 # ==============================================================================
@@ -365,39 +366,28 @@ def populate_news_cache(db) -> Dict[str, int]:
                     for a in digest.articles
                 ]
 
-            articles_added = 0
-            for article in articles:
-                # Check if already cached
-                existing = db.query(NewsArticleCache).filter(
-                    NewsArticleCache.url == article.get("url", "")
-                ).first()
-
-                if not existing and article.get("url"):
-                    try:
-                        # Parse date
-                        pub_date = _parse_date(article.get("published_at"))
-
-                        cache_entry = NewsArticleCache(
-                            competitor_id=comp.id,
-                            competitor_name=comp.name,
-                            title=article.get("title", "")[:500],
-                            url=article.get("url", ""),
-                            source=article.get("source", "Unknown"),
-                            source_type=article.get("source_type", "unknown"),
-                            published_at=pub_date,
-                            snippet=article.get("snippet", "")[:1000] if article.get("snippet") else None,
-                            sentiment=article.get("sentiment", "neutral"),
-                            event_type=article.get("event_type"),
-                            is_major_event=article.get("is_major_event", False),
-                            fetched_at=datetime.utcnow(),
-                            cache_expires_at=datetime.utcnow() + timedelta(hours=24),
-                            created_at=datetime.utcnow()
-                        )
-                        db.add(cache_entry)
-                        articles_added += 1
-                        stats["articles_cached"] += 1
-                    except Exception as e:
-                        pass
+            rows = [
+                dict(
+                    competitor_id=comp.id,
+                    competitor_name=comp.name,
+                    title=(article.get("title") or "")[:500],
+                    url=article.get("url", ""),
+                    source=article.get("source", "Unknown"),
+                    source_type=article.get("source_type", "unknown"),
+                    published_at=_parse_date(article.get("published_at")),
+                    snippet=article.get("snippet", "")[:1000] if article.get("snippet") else None,
+                    sentiment=article.get("sentiment", "neutral"),
+                    event_type=article.get("event_type"),
+                    is_major_event=article.get("is_major_event", False),
+                    fetched_at=datetime.utcnow(),
+                    cache_expires_at=datetime.utcnow() + timedelta(hours=24),
+                    created_at=datetime.utcnow()
+                )
+                for article in articles
+                if article.get("url")
+            ]
+            articles_added = ingest_articles(db, rows).inserted
+            stats["articles_cached"] += articles_added
 
             print(f"{articles_added} articles")
             db.commit()
@@ -0,0 +1,17 @@
+"""
+Certify Intel - Async Repositories
+
+SQLAlchemy 2.0 async queries for the hot ``async def`` endpoints, grouped
+by router. Each function takes an ``AsyncSession`` (from
+``Depends(get_async_db)`` or ``get_async_session()``) so the endpoint
+awaits the database instead of blocking the event loop:
+
+    from repositories import chat as chat_repo
+
+    @router.get("/sessions")
+    async def list_chat_sessions(db: AsyncSession = Depends(get_async_db), ...):
+        sessions = await chat_repo.list_active_sessions(db, user_id)
+
+Set DB_LOOP_GUARD=warn (or raise) to find endpoints that still run sync
+queries on the event loop (see database.py).
+"""
@@ -0,0 +1,106 @@
+"""
+Certify Intel - Chat Session Repository
+
+Async queries behind routers/chat.py.
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import ChatSession, ChatMessage
+
+
+async def list_active_sessions(session: AsyncSession, user_id: int) -> List[ChatSession]:
+    """Active sessions of a user, most recently updated first."""
+    result = await session.execute(
+        select(ChatSession).where(
+            ChatSession.user_id == user_id,
+            ChatSession.is_active == True  # noqa: E712
+        ).order_by(ChatSession.updated_at.desc())
+    )
+    return result.scalars().all()
+
+
+async def latest_session_for_context(
+    session: AsyncSession, user_id: int, page_context: str
+) -> Optional[ChatSession]:
+    """Most recent active session of a user for a page context."""
+    result = await session.execute(
+        select(ChatSession).where(
+            ChatSession.user_id == user_id,
+            ChatSession.page_context == page_context,
+            ChatSession.is_active == True  # noqa: E712
+        ).order_by(ChatSession.updated_at.desc()).limit(1)
+    )
+    return result.scalars().first()
+
+
+async def get_user_session(
+    session: AsyncSession, session_id: int, user_id: int
+) -> Optional[ChatSession]:
+    """A session by ID, only if it belongs to the user."""
+    result = await session.execute(
+        select(ChatSession).where(
+            ChatSession.id == session_id,
+            ChatSession.user_id == user_id
+        )
+    )
+    return result.scalars().first()
+
+
+async def list_messages(session: AsyncSession, session_id: int) -> List[ChatMessage]:
+    """Messages of a session, oldest first."""
+    result = await session.execute(
+        select(ChatMessage).where(
+            ChatMessage.session_id == session_id
+        ).order_by(ChatMessage.created_at.asc())
+    )
+    return result.scalars().all()
+
+
+async def create_session(
+    session: AsyncSession,
+    user_id: int,
+    page_context: str,
+    competitor_id: Optional[int] = None,
+    title: Optional[str] = None,
+) -> ChatSession:
+    chat_session = ChatSession(
+        user_id=user_id,
+        page_context=page_context,
+        competitor_id=competitor_id,
+        title=title,
+    )
+    session.add(chat_session)
+    await session.commit()
+    await session.refresh(chat_session)
+    return chat_session
+
+
+async def add_message(
+    session: AsyncSession,
+    chat_session: ChatSession,
+    role: str,
+    content: str,
+    metadata_json: Optional[str] = None,
+) -> ChatMessage:
+    """Append a message and touch the session's updated_at."""
+    msg = ChatMessage(
+        session_id=chat_session.id,
+        role=role,
+        content=content,
+        metadata_json=metadata_json,
+    )
+    session.add(msg)
+    chat_session.updated_at = datetime.utcnow()
+    await session.commit()
+    await session.refresh(msg)
+    return msg
+
+
+async def deactivate_session(session: AsyncSession, chat_session: ChatSession) -> None:
+    chat_session.is_active = False
+    await session.commit()
@@ -0,0 +1,63 @@
+"""
+Certify Intel - Dashboard Repository
+
+Async queries behind routers/dashboard.py.
+"""
+
+from datetime import datetime
+from typing import List, Tuple
+
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import Competitor, ChangeLog
+
+
+async def top_threats(session: AsyncSession, limit: int = 5) -> List[Competitor]:
+    """
+    Highest-threat competitors: High first, then Medium, then the rest,
+    each ordered by product_overlap_score (NULLs last).
+    """
+    # Sort with NULLs last: use case expression to push NULLs to bottom
+    overlap_sort = case(
+        (Competitor.product_overlap_score.is_(None), 0),
+        else_=Competitor.product_overlap_score
+    ).desc()
+
+    results: List[Competitor] = []
+    for level in ("high", "medium", None):
+        remaining = limit - len(results)
+        if remaining <= 0:
+            break
+        query = select(Competitor).where(Competitor.is_deleted == False)  # noqa: E712
+        if level:
+            query = query.where(Competitor.threat_level.ilike(level))
+        if results:
+            query = query.where(~Competitor.id.in_([c.id for c in results]))
+        result = await session.execute(query.order_by(overlap_sort).limit(remaining))
+        results.extend(result.scalars().all())
+    return results
+
+
+async def active_threat_counts(session: AsyncSession) -> List[Tuple[str, int]]:
+    """(threat_level, count) for active, non-deleted competitors."""
+    result = await session.execute(
+        select(Competitor.threat_level, func.count(Competitor.id)).where(
+            Competitor.is_deleted == False,  # noqa: E712
+            Competitor.status == "Active"
+        ).group_by(Competitor.threat_level)
+    )
+    return result.all()
+
+
+async def threat_level_changes_since(session: AsyncSession, cutoff: datetime) -> List[ChangeLog]:
+    """Threat level changes (with both values) since ``cutoff``, newest first."""
+    result = await session.execute(
+        select(ChangeLog).where(
+            ChangeLog.change_type == "threat_level",
+            ChangeLog.detected_at >= cutoff,
+            ChangeLog.new_value.isnot(None),
+            ChangeLog.previous_value.isnot(None)
+        ).order_by(ChangeLog.detected_at.desc())
+    )
+    return result.scalars().all()
@@ -0,0 +1,148 @@
+"""
+Certify Intel - Teams Repository
+
+Async queries behind the read endpoints of routers/teams.py. User,
+competitor and reply-count lookups that used to run once per row are
+joined into the main query.
+"""
+
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import (
+    User, Team, TeamMembership, CompetitorAnnotation, AnnotationReply,
+    DashboardConfiguration, TeamActivity, Competitor
+)
+
+
+def _member_counts():
+    return (
+        select(TeamMembership.team_id, func.count(TeamMembership.id).label("member_count"))
+        .group_by(TeamMembership.team_id)
+        .subquery()
+    )
+
+
+async def list_user_teams(session: AsyncSession, user_id: int) -> List[Tuple[Team, int]]:
+    """(team, member_count) for every active team the user belongs to."""
+    counts = _member_counts()
+    my_team_ids = select(TeamMembership.team_id).where(TeamMembership.user_id == user_id)
+    result = await session.execute(
+        select(Team, func.coalesce(counts.c.member_count, 0))
+        .outerjoin(counts, counts.c.team_id == Team.id)
+        .where(Team.id.in_(my_team_ids), Team.is_active == True)  # noqa: E712
+    )
+    return [(team, count) for team, count in result.all()]
+
+
+async def get_active_team(session: AsyncSession, team_id: int) -> Optional[Team]:
+    result = await session.execute(
+        select(Team).where(Team.id == team_id, Team.is_active == True)  # noqa: E712
+    )
+    return result.scalars().first()
+
+
+async def get_membership(
+    session: AsyncSession, team_id: int, user_id: int, roles: Optional[Sequence[str]] = None
+) -> Optional[TeamMembership]:
+    query = select(TeamMembership).where(
+        TeamMembership.team_id == team_id,
+        TeamMembership.user_id == user_id
+    )
+    if roles:
+        query = query.where(TeamMembership.role.in_(roles))
+    result = await session.execute(query)
+    return result.scalars().first()
+
+
+async def count_members(session: AsyncSession, team_id: int) -> int:
+    result = await session.execute(
+        select(func.count(TeamMembership.id)).where(TeamMembership.team_id == team_id)
+    )
+    return result.scalar() or 0
+
+
+async def list_members(session: AsyncSession, team_id: int) -> List[Tuple[TeamMembership, User]]:
+    """(membership, user) pairs of a team; memberships of deleted users are skipped."""
+    result = await session.execute(
+        select(TeamMembership, User)
+        .join(User, User.id == TeamMembership.user_id)
+        .where(TeamMembership.team_id == team_id)
+    )
+    return [(m, u) for m, u in result.all()]
+
+
+async def list_annotations(
+    session: AsyncSession,
+    *conditions: Any,
+    order_by: Sequence[Any] = (),
+    limit: Optional[int] = None,
+) -> List[Tuple[CompetitorAnnotation, Optional[str], Optional[str], Optional[str], int]]:
+    """
+    Annotations matching ``conditions`` as
+    (annotation, user_email, user_name, competitor_name, replies_count).
+    """
+    replies = (
+        select(AnnotationReply.annotation_id, func.count(AnnotationReply.id).label("replies_count"))
+        .group_by(AnnotationReply.annotation_id)
+        .subquery()
+    )
+    query = (
+        select(
+            CompetitorAnnotation,
+            User.email,
+            User.full_name,
+            Competitor.name,
+            func.coalesce(replies.c.replies_count, 0),
+        )
+        .outerjoin(User, User.id == CompetitorAnnotation.user_id)
+        .outerjoin(Competitor, Competitor.id == CompetitorAnnotation.competitor_id)
+        .outerjoin(replies, replies.c.annotation_id == CompetitorAnnotation.id)
+        .where(*conditions)
+        .order_by(*order_by)
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    result = await session.execute(query)
+    return [tuple(row) for row in result.all()]
+
+
+async def list_replies(
+    session: AsyncSession, annotation_id: int
+) -> List[Tuple[AnnotationReply, Optional[str], Optional[str]]]:
+    """(reply, user_email, user_name) for an annotation, oldest first."""
+    result = await session.execute(
+        select(AnnotationReply, User.email, User.full_name)
+        .outerjoin(User, User.id == AnnotationReply.user_id)
+        .where(AnnotationReply.annotation_id == annotation_id)
+        .order_by(AnnotationReply.created_at.asc())
+    )
+    return [tuple(row) for row in result.all()]
+
+
+async def get_dashboard_config(
+    session: AsyncSession, config_type: str, config_key: str
+) -> Optional[DashboardConfiguration]:
+    result = await session.execute(
+        select(DashboardConfiguration).where(
+            DashboardConfiguration.config_type == config_type,
+            DashboardConfiguration.config_key == config_key
+        )
+    )
+    return result.scalars().first()
+
+
+async def list_team_activity(
+    session: AsyncSession, team_id: int, limit: int
+) -> List[Tuple[TeamActivity, Optional[str]]]:
+    """(activity, competitor_name) for a team, newest first."""
+    result = await session.execute(
+        select(TeamActivity, Competitor.name)
+        .outerjoin(Competitor, Competitor.id == TeamActivity.competitor_id)
+        .where(TeamActivity.team_id == team_id)
+        .order_by(TeamActivity.created_at.desc())
+        .limit(limit)
+    )
+    return [tuple(row) for row in result.all()]
@@ -5,7 +5,7 @@ Certify Intel v7.0 - Agent API Router
 FastAPI router for AI agent endpoints.
 
 Endpoints:
-- POST /api/agents/query - Send query to orchestrator
+- POST /api/agents/query - Send query to orchestrator (SSE token stream on request)
 - POST /api/agents/dashboard - Direct dashboard queries
 - POST /api/agents/discovery - Run competitor discovery
 - POST /api/agents/battlecard - Generate battlecard
@@ -20,12 +20,15 @@ All endpoints include:
 - Knowledge Base integration for RAG-powered responses
 """
 
+import asyncio
 import logging
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Request
 from pydantic import BaseModel, Field
 
+from sse import event_stream_response, wants_event_stream
+
 logger = logging.getLogger(__name__)
 
 # Input sanitization for security
@@ -95,7 +98,7 @@ def get_knowledge_base():
     if _kb_instance is None:
         try:
             from knowledge_base import KnowledgeBase
-            _kb_instance = KnowledgeBase()
+            _kb_instance = KnowledgeBase(vector_store=get_vector_store())
             logger.info("KnowledgeBase initialized for agent router")
         except Exception as e:
             logger.warning(f"Could not initialize KnowledgeBase: {e}")
@@ -110,9 +113,9 @@ def get_vector_store():
     global _vs_instance
     if _vs_instance is None:
         try:
-            from vector_store import VectorStore
-            _vs_instance = VectorStore()
-            logger.info("VectorStore initialized for agent router")
+            from vector_store import get_vector_store as _get_default_vector_store
+            _vs_instance = _get_default_vector_store()
+            logger.info(f"{type(_vs_instance).__name__} initialized for agent router")
         except Exception as e:
             logger.warning(f"Could not initialize VectorStore: {e}")
             _vs_instance = None
@@ -130,6 +133,7 @@ class AgentQueryRequest(BaseModel):
     session_id: Optional[str] = Field(None, description="Session ID for conversation context")
     competitor_id: Optional[int] = Field(None, description="Specific competitor ID for context")
     context: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Additional context")
+    stream: bool = Field(False, description="Stream the response as Server-Sent Events")
 
 
 class AgentQueryResponse(BaseModel):
@@ -206,6 +210,10 @@ async def agent_query(request: Request, query_request: AgentQueryRequest):
     - "Find telehealth competitors" → Discovery Agent
     - "Generate battlecard for Epic" → Battlecard Agent
     - "Latest news about Athenahealth" → News Agent
+
+    With ``Accept: text/event-stream`` (or ``"stream": true``) the answer is
+    sent as Server-Sent Events: ``token`` events while the agent's model
+    generates, then a ``done`` event with the full AgentQueryResponse.
     """
     start_time = datetime.utcnow()
 
@@ -231,7 +239,7 @@ async def agent_query(request: Request, query_request: AgentQueryRequest):
         competitor_id = query_request.competitor_id or context.get("competitor_id")
         competitor_name = context.get("competitor_name")
 
-        result = await run_agent_query(
+        query_kwargs = dict(
             query=query,  # Use sanitized query
             user_id=query_request.user_id,
             session_id=query_request.session_id,
@@ -241,21 +249,11 @@ async def agent_query(request: Request, query_request: AgentQueryRequest):
             knowledge_base_context=context.get("kb_context"),
             competitor_context=context.get("competitor_context")
         )
+        if wants_event_stream(request, query_request.stream):
+            return event_stream_response(_stream_agent_query(query_kwargs, start_time))
 
-        latency = (datetime.utcnow() - start_time).total_seconds() * 1000
-
-        return AgentQueryResponse(
-            response=result.get("response", ""),
-            agent=result.get("target_agent", "unknown"),
-            citations=result.get("citations", []),
-            cost_usd=result.get("total_cost_usd", 0.0),
-            tokens_used=result.get("total_tokens", 0),
-            latency_ms=latency,
-            metadata={
-                "route_confidence": result.get("route_confidence", 0.0),
-                "agent_outputs": result.get("agent_outputs", {})
-            }
-        )
+        result = await run_agent_query(**query_kwargs)
+        return _query_response(result, start_time)
 
     except ImportError as e:
         logger.error(f"Agent orchestrator not available: {e}")
@@ -268,6 +266,51 @@ async def agent_query(request: Request, query_request: AgentQueryRequest):
         raise HTTPException(status_code=500, detail="Agent query failed. Please try again.")
 
 
+def _query_response(result: Dict[str, Any], start_time: datetime) -> AgentQueryResponse:
+    """Build the /query response from a run_agent_query result."""
+    latency = (datetime.utcnow() - start_time).total_seconds() * 1000
+
+    return AgentQueryResponse(
+        response=result.get("response", ""),
+        agent=result.get("target_agent", "unknown"),
+        citations=result.get("citations", []),
+        cost_usd=result.get("total_cost_usd", 0.0),
+        tokens_used=result.get("total_tokens", 0),
+        latency_ms=latency,
+        metadata={
+            "route_confidence": result.get("route_confidence", 0.0),
+            "agent_outputs": result.get("agent_outputs", {})
+        }
+    )
+
+
+async def _stream_agent_query(query_kwargs: Dict[str, Any], start_time: datetime):
+    """
+    SSE events for /query.
+
+    The orchestrator only returns its final state, so model output is taken
+    from the AI router as it is generated (ai_router.forward_tokens) while
+    the query runs in its own task.
+    """
+    from agents import run_agent_query
+    from ai_router import forward_tokens
+
+    tokens: asyncio.Queue = asyncio.Queue()
+    with forward_tokens(tokens.put_nowait):
+        task = asyncio.create_task(run_agent_query(**query_kwargs))
+    task.add_done_callback(lambda _: tokens.put_nowait(None))
+    try:
+        while (text := await tokens.get()) is not None:
+            yield {"type": "token", "text": text}
+        result = task.result()
+    finally:
+        # Client went away mid-stream
+        if not task.done():
+            task.cancel()
+
+    yield {"type": "done", **_query_response(result, start_time).model_dump()}
+
+
 @router.post("/dashboard", response_model=AgentQueryResponse)
 @rate_limit("10/minute")
 async def dashboard_query(request: Request, query_request: AgentQueryRequest):
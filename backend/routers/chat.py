@@ -7,26 +7,31 @@ Endpoints:
 - GET    /api/chat/sessions/{session_id}/messages - Get messages for a session
 - POST   /api/chat/sessions - Create new chat session
 - POST   /api/chat/sessions/{session_id}/messages - Add message to session
+         (with Accept: text/event-stream, a user message gets a streamed AI reply)
 - DELETE /api/chat/sessions/{session_id} - Soft-delete a chat session
 """
 
 import json
 import logging
-from datetime import datetime
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from database import get_db, ChatSession, ChatMessage
+from constants import NO_HALLUCINATION_INSTRUCTION
+from database import get_async_db, AsyncSessionLocal
 from dependencies import get_current_user
+from repositories import chat as chat_repo
+from sse import event_stream_response, wants_event_stream
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/chat", tags=["Chat"])
 
+CHAT_PERSONA = "You are a competitive intelligence analyst for Certify Health."
+
 
 @router.get("/sessions")
 async def list_chat_sessions(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """List active chat sessions for the current user, sorted by most recent."""
@@ -34,10 +39,7 @@ async def list_chat_sessions(
     if not user_id:
         raise HTTPException(status_code=401, detail="User ID not found")
 
-    sessions = db.query(ChatSession).filter(
-        ChatSession.user_id == user_id,
-        ChatSession.is_active == True  # noqa: E712
-    ).order_by(ChatSession.updated_at.desc()).all()
+    sessions = await chat_repo.list_active_sessions(db, user_id)
 
     return {
         "sessions": [
@@ -57,7 +59,7 @@ async def list_chat_sessions(
 @router.get("/sessions/by-context/{page_context}")
 async def get_session_by_context(
     page_context: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Get the active chat session for a specific page context and current user."""
@@ -65,18 +67,12 @@ async def get_session_by_context(
     if not user_id:
         raise HTTPException(status_code=401, detail="User ID not found")
 
-    session = db.query(ChatSession).filter(
-        ChatSession.user_id == user_id,
-        ChatSession.page_context == page_context,
-        ChatSession.is_active == True  # noqa: E712
-    ).order_by(ChatSession.updated_at.desc()).first()
+    session = await chat_repo.latest_session_for_context(db, user_id, page_context)
 
     if not session:
         return {"session": None}
 
-    messages = db.query(ChatMessage).filter(
-        ChatMessage.session_id == session.id
-    ).order_by(ChatMessage.created_at.asc()).all()
+    messages = await chat_repo.list_messages(db, session.id)
 
     return {
         "session": {
@@ -103,22 +99,17 @@ async def get_session_by_context(
 @router.get("/sessions/{session_id}/messages")
 async def get_chat_messages(
     session_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Get all messages for a chat session (must belong to current user)."""
     user_id = current_user.get("id")
 
-    session = db.query(ChatSession).filter(
-        ChatSession.id == session_id,
-        ChatSession.user_id == user_id
-    ).first()
+    session = await chat_repo.get_user_session(db, session_id, user_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    messages = db.query(ChatMessage).filter(
-        ChatMessage.session_id == session_id
-    ).order_by(ChatMessage.created_at.asc()).all()
+    messages = await chat_repo.list_messages(db, session_id)
 
     return {
         "session_id": session_id,
@@ -138,7 +129,7 @@ async def get_chat_messages(
 @router.post("/sessions")
 async def create_chat_session(
     request: dict,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Create a new chat session."""
@@ -150,15 +141,13 @@ async def create_chat_session(
     competitor_id = request.get("competitor_id")
     title = request.get("title")
 
-    session = ChatSession(
+    session = await chat_repo.create_session(
+        db,
         user_id=user_id,
         page_context=page_context,
         competitor_id=competitor_id,
         title=title,
     )
-    db.add(session)
-    db.commit()
-    db.refresh(session)
 
     return {
         "id": session.id,
@@ -173,16 +162,22 @@ async def create_chat_session(
 async def add_chat_message(
     session_id: int,
     request: dict,
-    db: Session = Depends(get_db),
+    http_request: Request,
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
-    """Add a message to an existing chat session."""
+    """
+    Add a message to an existing chat session.
+
+    When a user message is posted with ``Accept: text/event-stream`` (or
+    ``"stream": true``), the response is an event stream instead: a
+    ``message`` event with the stored user message, ``token`` events with
+    the AI reply as it is generated, and a ``done`` event with the stored
+    assistant message.
+    """
     user_id = current_user.get("id")
 
-    session = db.query(ChatSession).filter(
-        ChatSession.id == session_id,
-        ChatSession.user_id == user_id
-    ).first()
+    session = await chat_repo.get_user_session(db, session_id, user_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
@@ -199,25 +194,29 @@ async def add_chat_message(
     if not session.title and role == "user":
         session.title = content[:80] + ("..." if len(content) > 80 else "")
 
-    msg = ChatMessage(
-        session_id=session_id,
+    msg = await chat_repo.add_message(
+        db,
+        session,
         role=role,
         content=content,
         metadata_json=metadata_json if isinstance(metadata_json, str) else (
             json.dumps(metadata_json) if metadata_json else None
         ),
     )
-    db.add(msg)
 
-    # Touch session updated_at
-    session.updated_at = datetime.utcnow()
+    if role == "user" and wants_event_stream(http_request, request.get("stream")):
+        history = await chat_repo.list_messages(db, session_id)
+        return event_stream_response(
+            _stream_reply(session_id, user_id, _message_payload(msg), history[-10:])
+        )
+
+    return _message_payload(msg)
 
-    db.commit()
-    db.refresh(msg)
 
+def _message_payload(msg) -> dict:
     return {
         "id": msg.id,
-        "session_id": session_id,
+        "session_id": msg.session_id,
         "role": msg.role,
         "content": msg.content,
         "metadata_json": msg.metadata_json,
@@ -225,23 +224,61 @@ async def add_chat_message(
     }
 
 
+async def _stream_reply(session_id: int, user_id: int, user_message: dict, history: list):
+    """SSE events for an AI reply to the session's latest messages; the reply is saved when complete."""
+    from ai_router import get_ai_router, TaskType
+
+    yield {"type": "message", **user_message}
+
+    prompt = "".join(f"\n[{m.role.upper()}]: {m.content}" for m in history)
+    prompt += "\n\nRespond to the latest user message above, with full context of the conversation."
+
+    result = {}
+    async for event in get_ai_router().stream(
+        prompt=prompt,
+        task_type=TaskType.CHAT,
+        system_prompt=CHAT_PERSONA + NO_HALLUCINATION_INSTRUCTION,
+        user_id=str(user_id),
+    ):
+        if event["type"] == "token":
+            yield event
+        else:
+            result = event
+
+    # Own session: the request's session may be closed once the stream ends
+    async with AsyncSessionLocal() as db:
+        session = await chat_repo.get_user_session(db, session_id, user_id)
+        if not session:
+            yield {"type": "error", "message": "Session not found"}
+            return
+        msg = await chat_repo.add_message(
+            db,
+            session,
+            role="assistant",
+            content=result["response"],
+            metadata_json=json.dumps({
+                "provider": result.get("provider"),
+                "model": result.get("model"),
+                "endpoint": "chat_stream",
+            }),
+        )
+
+    yield {"type": "done", **_message_payload(msg), "ttft_ms": result.get("ttft_ms")}
+
+
 @router.delete("/sessions/{session_id}")
 async def delete_chat_session(
     session_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Soft-delete a chat session (set is_active=False)."""
     user_id = current_user.get("id")
 
-    session = db.query(ChatSession).filter(
-        ChatSession.id == session_id,
-        ChatSession.user_id == user_id
-    ).first()
+    session = await chat_repo.get_user_session(db, session_id, user_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    session.is_active = False
-    db.commit()
+    await chat_repo.deactivate_session(db, session)
 
     return {"success": True, "session_id": session_id}
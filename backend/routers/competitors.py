@@ -20,6 +20,7 @@ from database import (
     get_db, SessionLocal, Competitor, DataSource, DataChangeHistory,
 )
 from dependencies import get_current_user, get_current_user_optional, log_activity
+from data_versions import conditional_response
 from constants import KNOWN_TICKERS
 from schemas.competitors import (
     CompetitorCreate, CompetitorResponse, CorrectionRequest,
@@ -67,6 +68,7 @@ def _lookup_ticker_dynamically(company_name: str) -> dict:
 
 
 @router.get("", response_model=List[CompetitorResponse])
+@conditional_response(tables=["competitors"])
 async def list_competitors(
     status: Optional[str] = None,
     threat_level: Optional[str] = None,
@@ -12,9 +12,11 @@ from datetime import datetime, timedelta
 from typing import Dict, Any
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from database import get_db, Competitor, ChangeLog
+from database import get_db, get_async_db, Competitor
 from dependencies import get_current_user, get_current_user_optional
+from repositories import dashboard as dashboard_repo
 
 logger = logging.getLogger(__name__)
 
@@ -54,58 +56,11 @@ def get_dashboard_stats(
 
 @router.get("/top-threats")
 async def get_top_threats(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Return top 5 highest-threat competitors for the dashboard."""
-    from sqlalchemy import case
-
-    # Sort with NULLs last: use case expression to push NULLs to bottom
-    overlap_sort = case(
-        (Competitor.product_overlap_score.is_(None), 0),
-        else_=Competitor.product_overlap_score
-    ).desc()
-
-    # First get High-threat competitors sorted by product_overlap_score
-    high_threats = db.query(Competitor).filter(
-        Competitor.is_deleted == False,  # noqa: E712
-        Competitor.threat_level.ilike("high")
-    ).order_by(overlap_sort).limit(5).all()
-
-    results = list(high_threats)
-
-    # If fewer than 5 High-threat, fill with Medium-threat
-    if len(results) < 5:
-        remaining = 5 - len(results)
-        existing_ids = [c.id for c in results]
-        medium_query = db.query(Competitor).filter(
-            Competitor.is_deleted == False,  # noqa: E712
-            Competitor.threat_level.ilike("medium")
-        )
-        if existing_ids:
-            medium_query = medium_query.filter(
-                ~Competitor.id.in_(existing_ids)
-            )
-        medium_threats = medium_query.order_by(
-            overlap_sort
-        ).limit(remaining).all()
-        results.extend(medium_threats)
-
-    # If still fewer than 5, fill with Low-threat or any remaining
-    if len(results) < 5:
-        remaining = 5 - len(results)
-        existing_ids = [c.id for c in results]
-        low_query = db.query(Competitor).filter(
-            Competitor.is_deleted == False,  # noqa: E712
-        )
-        if existing_ids:
-            low_query = low_query.filter(
-                ~Competitor.id.in_(existing_ids)
-            )
-        low_threats = low_query.order_by(
-            overlap_sort
-        ).limit(remaining).all()
-        results.extend(low_threats)
+    results = await dashboard_repo.top_threats(db, limit=5)
 
     return {
         "top_threats": [
@@ -126,7 +81,7 @@ async def get_top_threats(
 
 @router.get("/threat-trends")
 async def get_threat_trends(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ) -> Dict[str, Any]:
     """Return weekly threat-level snapshots over the last 90 days.
@@ -137,18 +92,12 @@ async def get_threat_trends(
     """
     try:
         from collections import defaultdict
-        from sqlalchemy import func as sa_func
 
         cutoff = datetime.utcnow() - timedelta(days=90)
         now = datetime.utcnow()
 
         # 1. Current snapshot from actual competitor data
-        current_counts = db.query(
-            Competitor.threat_level, sa_func.count(Competitor.id)
-        ).filter(
-            Competitor.is_deleted == False,  # noqa: E712
-            Competitor.status == "Active"
-        ).group_by(Competitor.threat_level).all()
+        current_counts = await dashboard_repo.active_threat_counts(db)
 
         current = {"high": 0, "medium": 0, "low": 0}
         for level, count in current_counts:
@@ -157,12 +106,7 @@ async def get_threat_trends(
                 current[key] = count
 
         # 2. Get historical changes with both old and new values
-        changes = db.query(ChangeLog).filter(
-            ChangeLog.change_type == "threat_level",
-            ChangeLog.detected_at >= cutoff,
-            ChangeLog.new_value.isnot(None),
-            ChangeLog.previous_value.isnot(None)
-        ).order_by(ChangeLog.detected_at.desc()).all()
+        changes = await dashboard_repo.threat_level_changes_since(db, cutoff)
 
         # 3. Group changes by ISO week
         weekly_changes: Dict[str, list] = defaultdict(list)
@@ -4,20 +4,25 @@ Certify Intel - Health & Version Router
 Endpoints:
 - GET /api/version - Application version info
 - GET /health - Kubernetes/Docker liveness probe
-- GET /readiness - Kubernetes/Docker readiness probe (checks all dependencies)
+- GET /readiness - Kubernetes/Docker readiness probe (checks all dependencies
+  and background startup tasks)
 - GET /api/health - Legacy health endpoint
+- GET /metrics - Prometheus metrics (or a JSON summary)
+- GET /api/metrics/hot-endpoints - Slowest and busiest routes
 """
 
 import os
 import logging
 from datetime import datetime
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from fastapi.responses import JSONResponse
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from database import get_db
+from dependencies import get_current_user
 from constants import __version__
+from startup import startup_state
 
 logger = logging.getLogger(__name__)
 
@@ -42,9 +47,16 @@ async def health_check(db: Session = Depends(get_db)):
 
 @router.get("/readiness")
 async def readiness_check(db: Session = Depends(get_db)):
-    """Kubernetes/Docker readiness probe - checks all dependencies."""
+    """Kubernetes/Docker readiness probe - checks all dependencies.
+
+    Returns 503 with status "starting" until the required background
+    startup tasks (knowledge base preinstall, seeding) have finished.
+    """
     checks = {}
 
+    # Background startup tasks
+    checks["startup"] = startup_state.is_ready
+
     # Database check
     try:
         db.execute(text("SELECT 1"))
@@ -77,16 +89,20 @@ async def readiness_check(db: Session = Depends(get_db)):
     if litellm_enabled:
         checks["litellm"] = True
 
-    # Critical checks that must pass (database, ai_router)
-    critical_ok = checks.get("database", False) and checks.get("ai_router", False)
+    # Critical checks that must pass (startup, database, ai_router)
+    critical_ok = (
+        checks["startup"] and checks.get("database", False) and checks.get("ai_router", False)
+    )
     all_ok = all(checks.values())
 
-    # Return 200 for ready/degraded, 503 only if critical services are down
+    # Return 200 for ready/degraded, 503 while starting or if critical services are down
     status_code = 200 if critical_ok else 503
     if all_ok:
         status_text = "ready"
     elif critical_ok:
         status_text = "degraded"
+    elif not checks["startup"]:
+        status_text = "starting"
     else:
         status_text = "unhealthy"
 
@@ -96,6 +112,7 @@ async def readiness_check(db: Session = Depends(get_db)):
             "status": status_text,
             "version": __version__,
             "checks": checks,
+            "startup": startup_state.to_dict(),
         }
     )
 
@@ -119,6 +136,28 @@ async def metrics_endpoint():
     return get_metrics_summary()
 
 
+@router.get("/api/metrics/hot-endpoints")
+async def hot_endpoints(
+    limit: int = Query(10, ge=1, le=100),
+    current_user: dict = Depends(get_current_user),
+):
+    """Top routes by p95 latency and by total time, since startup.
+
+    Routes are keyed by their template (``/api/products/{product_id}``).
+    Latency quantiles are estimated from a fixed-bucket histogram.
+    Requires METRICS_ENABLED=true.
+    """
+    from metrics import METRICS_ENABLED, get_hot_endpoints
+    from middleware.metrics import in_flight_by_route
+
+    in_flight = in_flight_by_route()
+    return {
+        "metrics_enabled": METRICS_ENABLED,
+        "in_flight": sum(in_flight.values()),
+        **get_hot_endpoints(limit, in_flight),
+    }
+
+
 @router.get("/api/health")
 def api_health():
     """Legacy health endpoint."""
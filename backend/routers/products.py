@@ -11,6 +11,8 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
 from pydantic import BaseModel
 
+from data_versions import conditional_response
+
 logger = logging.getLogger(__name__)
 
 from database import get_db, Competitor, CompetitorProduct, DataSource
@@ -100,6 +102,7 @@ _discovery_status = {
 # ==============================================================================
 
 @router.get("/", response_model=List[ProductResponse])
+@conditional_response(tables=["competitor_products"])
 async def list_all_products(
     competitor_id: Optional[int] = None,
     category: Optional[str] = None,
@@ -6,16 +6,18 @@ Handles team management, annotations, and role-based dashboard configuration.
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
 import json
 
 from database import (
-    get_db, User, Team, TeamMembership, CompetitorAnnotation,
+    get_db, get_async_db, get_user_by_email, User, Team, TeamMembership, CompetitorAnnotation,
     AnnotationReply, DashboardConfiguration, TeamActivity, Competitor
 )
 from extended_features import auth_manager
+from repositories import teams as teams_repo
 
 router = APIRouter(prefix="/api/teams", tags=["Teams"])
 
@@ -23,7 +25,9 @@ router = APIRouter(prefix="/api/teams", tags=["Teams"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+async def get_current_user(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
+) -> User:
     """Verify JWT token and return current user."""
     if not token:
         raise HTTPException(status_code=401, detail="Not authenticated")
@@ -32,7 +36,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     if not payload:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
-    user = db.query(User).filter(User.email == payload.get("sub")).first()
+    user = await get_user_by_email(db, payload.get("sub"))
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
 
@@ -148,56 +152,40 @@ async def create_team(
 
 @router.get("", response_model=List[TeamResponse])
 async def list_teams(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """List all teams the current user belongs to."""
-    memberships = db.query(TeamMembership).filter(
-        TeamMembership.user_id == current_user.id
-    ).all()
-
-    team_ids = [m.team_id for m in memberships]
-    teams = db.query(Team).filter(Team.id.in_(team_ids), Team.is_active == True).all()
-
-    result = []
-    for team in teams:
-        member_count = db.query(TeamMembership).filter(
-            TeamMembership.team_id == team.id
-        ).count()
-        result.append(TeamResponse(
+    return [
+        TeamResponse(
             id=team.id,
             name=team.name,
             description=team.description,
             member_count=member_count,
             created_at=team.created_at
-        ))
-
-    return result
+        )
+        for team, member_count in await teams_repo.list_user_teams(db, current_user.id)
+    ]
 
 
 @router.get("/{team_id}", response_model=TeamResponse)
 async def get_team(
     team_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get team details."""
-    team = db.query(Team).filter(Team.id == team_id, Team.is_active == True).first()
+    team = await teams_repo.get_active_team(db, team_id)
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
 
     # Check membership
-    membership = db.query(TeamMembership).filter(
-        TeamMembership.team_id == team_id,
-        TeamMembership.user_id == current_user.id
-    ).first()
+    membership = await teams_repo.get_membership(db, team_id, current_user.id)
 
     if not membership and current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Not a member of this team")
 
-    member_count = db.query(TeamMembership).filter(
-        TeamMembership.team_id == team_id
-    ).count()
+    member_count = await teams_repo.count_members(db, team_id)
 
     return TeamResponse(
         id=team.id,
@@ -211,27 +199,20 @@ async def get_team(
 @router.get("/{team_id}/members", response_model=List[TeamMemberResponse])
 async def get_team_members(
     team_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get all members of a team."""
-    memberships = db.query(TeamMembership).filter(
-        TeamMembership.team_id == team_id
-    ).all()
-
-    result = []
-    for m in memberships:
-        user = db.query(User).filter(User.id == m.user_id).first()
-        if user:
-            result.append(TeamMemberResponse(
-                user_id=user.id,
-                email=user.email,
-                full_name=user.full_name,
-                role=m.role,
-                joined_at=m.joined_at
-            ))
-
-    return result
+    return [
+        TeamMemberResponse(
+            user_id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            role=m.role,
+            joined_at=m.joined_at
+        )
+        for m, user in await teams_repo.list_members(db, team_id)
+    ]
 
 
 @router.post("/{team_id}/members")
@@ -379,103 +360,75 @@ async def create_annotation(
     )
 
 
+def _annotation_response(a, user_email, user_name, competitor_name, replies_count) -> AnnotationResponse:
+    return AnnotationResponse(
+        id=a.id,
+        competitor_id=a.competitor_id,
+        competitor_name=competitor_name,
+        user_email=user_email or "Unknown",
+        user_name=user_name,
+        title=a.title,
+        content=a.content,
+        annotation_type=a.annotation_type,
+        priority=a.priority,
+        is_public=a.is_public,
+        is_pinned=a.is_pinned,
+        replies_count=replies_count,
+        created_at=a.created_at,
+        updated_at=a.updated_at
+    )
+
+
 @router.get("/annotations/competitor/{competitor_id}", response_model=List[AnnotationResponse])
 async def get_competitor_annotations(
     competitor_id: int,
     annotation_type: Optional[str] = None,
     include_private: bool = False,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get all annotations for a competitor."""
-    query = db.query(CompetitorAnnotation).filter(
-        CompetitorAnnotation.competitor_id == competitor_id
-    )
+    conditions = [CompetitorAnnotation.competitor_id == competitor_id]
 
     if annotation_type:
-        query = query.filter(CompetitorAnnotation.annotation_type == annotation_type)
+        conditions.append(CompetitorAnnotation.annotation_type == annotation_type)
 
     if not include_private:
         # Show public annotations or user's own
-        query = query.filter(
+        conditions.append(
             (CompetitorAnnotation.is_public == True) |
             (CompetitorAnnotation.user_id == current_user.id)
         )
 
-    annotations = query.order_by(
-        CompetitorAnnotation.is_pinned.desc(),
-        CompetitorAnnotation.created_at.desc()
-    ).all()
-
-    result = []
-    for a in annotations:
-        user = db.query(User).filter(User.id == a.user_id).first()
-        competitor = db.query(Competitor).filter(Competitor.id == a.competitor_id).first()
-        replies_count = db.query(AnnotationReply).filter(
-            AnnotationReply.annotation_id == a.id
-        ).count()
-
-        result.append(AnnotationResponse(
-            id=a.id,
-            competitor_id=a.competitor_id,
-            competitor_name=competitor.name if competitor else None,
-            user_email=user.email if user else "Unknown",
-            user_name=user.full_name if user else None,
-            title=a.title,
-            content=a.content,
-            annotation_type=a.annotation_type,
-            priority=a.priority,
-            is_public=a.is_public,
-            is_pinned=a.is_pinned,
-            replies_count=replies_count,
-            created_at=a.created_at,
-            updated_at=a.updated_at
-        ))
-
-    return result
+    rows = await teams_repo.list_annotations(
+        db,
+        *conditions,
+        order_by=(
+            CompetitorAnnotation.is_pinned.desc(),
+            CompetitorAnnotation.created_at.desc()
+        ),
+    )
+
+    return [_annotation_response(*row) for row in rows]
 
 
 @router.get("/annotations/team/{team_id}", response_model=List[AnnotationResponse])
 async def get_team_annotations(
     team_id: int,
     limit: int = Query(default=50, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get recent annotations from a team."""
-    annotations = db.query(CompetitorAnnotation).filter(
+    rows = await teams_repo.list_annotations(
+        db,
         CompetitorAnnotation.team_id == team_id,
-        CompetitorAnnotation.is_public == True
-    ).order_by(
-        CompetitorAnnotation.created_at.desc()
-    ).limit(limit).all()
-
-    result = []
-    for a in annotations:
-        user = db.query(User).filter(User.id == a.user_id).first()
-        competitor = db.query(Competitor).filter(Competitor.id == a.competitor_id).first()
-        replies_count = db.query(AnnotationReply).filter(
-            AnnotationReply.annotation_id == a.id
-        ).count()
-
-        result.append(AnnotationResponse(
-            id=a.id,
-            competitor_id=a.competitor_id,
-            competitor_name=competitor.name if competitor else None,
-            user_email=user.email if user else "Unknown",
-            user_name=user.full_name if user else None,
-            title=a.title,
-            content=a.content,
-            annotation_type=a.annotation_type,
-            priority=a.priority,
-            is_public=a.is_public,
-            is_pinned=a.is_pinned,
-            replies_count=replies_count,
-            created_at=a.created_at,
-            updated_at=a.updated_at
-        ))
-
-    return result
+        CompetitorAnnotation.is_public == True,
+        order_by=(CompetitorAnnotation.created_at.desc(),),
+        limit=limit,
+    )
+
+    return [_annotation_response(*row) for row in rows]
 
 
 @router.put("/annotations/{annotation_id}")
@@ -589,26 +542,20 @@ async def add_reply(
 @router.get("/annotations/{annotation_id}/replies")
 async def get_replies(
     annotation_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get all replies to an annotation."""
-    replies = db.query(AnnotationReply).filter(
-        AnnotationReply.annotation_id == annotation_id
-    ).order_by(AnnotationReply.created_at.asc()).all()
-
-    result = []
-    for r in replies:
-        user = db.query(User).filter(User.id == r.user_id).first()
-        result.append({
+    return [
+        {
             "id": r.id,
-            "user_email": user.email if user else "Unknown",
-            "user_name": user.full_name if user else None,
+            "user_email": user_email or "Unknown",
+            "user_name": user_name,
             "content": r.content,
             "created_at": r.created_at.isoformat()
-        })
-
-    return result
+        }
+        for r, user_email, user_name in await teams_repo.list_replies(db, annotation_id)
+    ]
 
 
 # =============================================================================
@@ -649,15 +596,12 @@ DEFAULT_ROLE_CONFIGS = {
 
 @router.get("/dashboard/config")
 async def get_dashboard_config(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get the current user's dashboard configuration."""
     # First check for user-specific config
-    user_config = db.query(DashboardConfiguration).filter(
-        DashboardConfiguration.config_type == "user",
-        DashboardConfiguration.config_key == str(current_user.id)
-    ).first()
+    user_config = await teams_repo.get_dashboard_config(db, "user", str(current_user.id))
 
     if user_config:
         return {
@@ -680,10 +624,7 @@ async def get_dashboard_config(
         }
 
     # Fall back to role-based config
-    role_config = db.query(DashboardConfiguration).filter(
-        DashboardConfiguration.config_type == "role",
-        DashboardConfiguration.config_key == current_user.role
-    ).first()
+    role_config = await teams_repo.get_dashboard_config(db, "role", current_user.role)
 
     if role_config:
         return {
@@ -870,30 +811,19 @@ async def unpin_competitor(
 async def get_team_activity(
     team_id: int,
     limit: int = Query(default=20, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get recent activity for a team."""
-    activities = db.query(TeamActivity).filter(
-        TeamActivity.team_id == team_id
-    ).order_by(
-        TeamActivity.created_at.desc()
-    ).limit(limit).all()
-
-    result = []
-    for a in activities:
-        competitor = None
-        if a.competitor_id:
-            competitor = db.query(Competitor).filter(Competitor.id == a.competitor_id).first()
-
-        result.append({
+    return [
+        {
             "id": a.id,
             "user_email": a.user_email,
             "activity_type": a.activity_type,
             "activity_details": json.loads(a.activity_details) if a.activity_details else None,
             "competitor_id": a.competitor_id,
-            "competitor_name": competitor.name if competitor else None,
+            "competitor_name": competitor_name,
             "created_at": a.created_at.isoformat()
-        })
-
-    return result
+        }
+        for a, competitor_name in await teams_repo.list_team_activity(db, team_id, limit)
+    ]
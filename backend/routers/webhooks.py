@@ -4,6 +4,7 @@ Certify Intel - Webhooks Router
 Endpoints:
 - POST /api/webhooks/{webhook_id}/test - Send a test event to a webhook
 - GET  /api/webhooks/events - List available webhook event types
+- GET  /api/webhooks/delivery - Delivery worker and outbox counters
 - GET  /api/webhooks - Get all configured webhooks
 - POST /api/webhooks - Configure a new webhook
 - DELETE /api/webhooks/{id} - Delete (deactivate) a webhook
@@ -42,6 +43,13 @@ def list_webhook_events():
     return {"event_types": WebhookManager.EVENT_TYPES}
 
 
+@router.get("/delivery")
+def get_webhook_delivery_stats(current_user: dict = Depends(get_current_user)):
+    """Delivery worker counters (queued, delivered, retries, failed, dropped) and outbox size."""
+    from webhooks import get_webhook_manager
+    return get_webhook_manager().delivery_stats()
+
+
 @router.get("")
 def get_webhooks(
     db: Session = Depends(get_db),
@@ -11,6 +11,7 @@ Features:
 """
 import os
 import json
+import time
 import asyncio
 import logging
 from datetime import datetime, timedelta
@@ -22,9 +23,10 @@ from apscheduler.triggers.date import DateTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR
 
-from scraper import CompetitorScraper, ScrapeResult
+from scraper import BrowserContextPool, CompetitorScraper, DomainRateLimiter, ScrapeResult
 from extractor import GPTExtractor, ExtractedData
 from database import SessionLocal, Competitor, ChangeLog, RefreshSession
+from page_fingerprints import content_hash, conditional_validators, load_fingerprints, record_fingerprints
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -51,32 +53,137 @@ def job_listener(event):
 scheduler.add_listener(job_listener, EVENT_JOB_EXECUTED | EVENT_JOB_ERROR)
 
 
+def _extracted_from_dict(data: Dict[str, Any]) -> ExtractedData:
+    """Rebuild a stored extraction, ignoring fields ExtractedData no longer has."""
+    return ExtractedData(**{k: v for k, v in data.items() if k in ExtractedData.__dataclass_fields__})
+
+
+class RefreshProgress:
+    """
+    Per-stage progress and timing for one refresh run.
+
+    Serialised as JSON into ``RefreshSession.stage_progress`` so the refresh
+    history can show where a long run is (and where its time went).
+    """
+
+    STAGES = ("scrape", "extract", "persist")
+
+    def __init__(self, total: int, flush_interval: float = 2.0):
+        self.flush_interval = flush_interval
+        self._last_flush = 0.0
+        self.stages: Dict[str, Dict[str, Any]] = {
+            name: {
+                "total": total,
+                "done": 0,
+                "failed": 0,
+                "busy_seconds": 0.0,
+                "started_at": None,
+                "finished_at": None,
+            }
+            for name in self.STAGES
+        }
+        # Page-level fingerprint counters: conditional-request hits and
+        # extractions skipped because the page text was unchanged
+        self.stages["scrape"]["pages_not_modified"] = 0
+        self.stages["extract"]["pages_extracted"] = 0
+        self.stages["extract"]["pages_skipped"] = 0
+
+    def start(self, stage: str) -> float:
+        """Mark the stage as started (first item only) and return a timer."""
+        info = self.stages[stage]
+        if info["started_at"] is None:
+            info["started_at"] = datetime.utcnow().isoformat()
+        return time.monotonic()
+
+    def record(self, stage: str, started: float, ok: bool = True) -> None:
+        """Count one finished item for a stage."""
+        info = self.stages[stage]
+        info["busy_seconds"] = round(info["busy_seconds"] + time.monotonic() - started, 3)
+        info["done" if ok else "failed"] += 1
+
+    def count(self, stage: str, key: str, n: int = 1) -> None:
+        """Bump a page-level counter on a stage."""
+        self.stages[stage][key] = self.stages[stage].get(key, 0) + n
+
+    def skip(self, stage: str, count: int = 1) -> None:
+        """Shrink a stage's total when upstream failures mean items never reach it."""
+        self.stages[stage]["total"] -= count
+
+    def finish(self, stage: str) -> None:
+        self.stages[stage]["finished_at"] = datetime.utcnow().isoformat()
+
+    def to_json(self) -> str:
+        return json.dumps(self.stages)
+
+    def flush(self, db, refresh_session: RefreshSession, force: bool = False) -> None:
+        """Write progress to the session row, at most once per flush_interval."""
+        now = time.monotonic()
+        if not force and now - self._last_flush < self.flush_interval:
+            return
+        self._last_flush = now
+        try:
+            refresh_session.stage_progress = self.to_json()
+            db.commit()
+        except Exception as e:
+            logger.debug(f"Refresh progress flush skipped: {e}")
+            db.rollback()
+
+
 class CompetitorRefreshJob:
-    """Job that scrapes and updates competitor data."""
+    """
+    Job that scrapes and updates competitor data.
+
+    Competitors flow through a three-stage pipeline:
+
+    - scrape: ``scrape_concurrency`` workers share a pool of browser contexts;
+      politeness comes from per-domain token buckets, not a global sleep
+    - extract: LLM extraction runs in worker threads so it never blocks the loop;
+      pages whose normalized text matches their stored fingerprint reuse the
+      previous extraction instead (see page_fingerprints.py)
+    - persist: a single writer applies changes and page fingerprints on the
+      job's DB session
 
-    def __init__(self):
+    Each stage reports progress and timing to the run's RefreshSession row.
+    """
+
+    PAGES_TO_SCRAPE = ["homepage", "pricing", "about", "products"]
+
+    def __init__(
+        self,
+        scrape_concurrency: Optional[int] = None,
+        extract_concurrency: Optional[int] = None,
+        domain_rate_per_second: Optional[float] = None,
+        domain_burst: Optional[int] = None
+    ):
         self.scraper = None
         self.extractor = GPTExtractor()
+        self.scrape_concurrency = max(1, scrape_concurrency or int(os.getenv("REFRESH_SCRAPE_CONCURRENCY", "4")))
+        self.extract_concurrency = max(1, extract_concurrency or int(os.getenv("REFRESH_EXTRACT_CONCURRENCY", "4")))
+        self.domain_rate_per_second = domain_rate_per_second or float(os.getenv("REFRESH_DOMAIN_RATE", "0.5"))
+        self.domain_burst = domain_burst or int(os.getenv("REFRESH_DOMAIN_BURST", "2"))
 
     async def run_full_refresh(
         self,
         competitor_ids: Optional[List[int]] = None,
-        stagger_delay: float = 2.0
+        stagger_delay: Optional[float] = None
     ) -> List[Dict[str, Any]]:
         """
         Run a full data refresh for all or specified competitors.
 
         Args:
             competitor_ids: Optional list of specific competitor IDs to refresh
-            stagger_delay: Delay between each competitor to avoid rate limiting
+            stagger_delay: Optional minimum seconds between requests to the same
+                domain. Overrides the per-domain token rate; competitors on
+                different domains are never staggered against each other.
 
         Returns:
-            List of result dictionaries for each competitor
+            List of result dictionaries for each competitor, in input order
         """
         start_time = datetime.utcnow()
         logger.info(f"Starting competitor refresh job at {start_time}")
 
         db = SessionLocal()
+        refresh_session = None
 
         try:
             # Get competitors to refresh (all non-deleted, not just Active)
@@ -91,110 +198,270 @@ class CompetitorRefreshJob:
                 ).all()
 
             total_count = len(competitors)
-            logger.info(f"Refreshing {total_count} competitors...")
+            logger.info(
+                f"Refreshing {total_count} competitors "
+                f"(scrape x{self.scrape_concurrency}, extract x{self.extract_concurrency})..."
+            )
 
             # Create RefreshSession for tracking
+            progress = RefreshProgress(total_count)
             refresh_session = RefreshSession(
                 competitors_scanned=total_count,
-                status="in_progress"
+                status="in_progress",
+                stage_progress=progress.to_json()
             )
             db.add(refresh_session)
             db.commit()
             db.refresh(refresh_session)
-            session_id = refresh_session.id
 
-            results = []
-            success_count = 0
-            changes_total = 0
+            if stagger_delay:
+                limiter = DomainRateLimiter(rate_per_second=1.0 / stagger_delay, burst=1)
+            else:
+                limiter = DomainRateLimiter(self.domain_rate_per_second, self.domain_burst)
 
-            async with CompetitorScraper(headless=True) as scraper:
-                for idx, competitor in enumerate(competitors, 1):
-                    logger.info(f"[{idx}/{total_count}] Processing {competitor.name}...")
+            fingerprints = load_fingerprints(db, [c.id for c in competitors])
 
-                    try:
-                        # Scrape competitor website with enhanced scraping
-                        scrape_result = await scraper.scrape_competitor(
-                            name=competitor.name,
-                            website=competitor.website,
-                            pages_to_scrape=["homepage", "pricing", "about", "products"]
-                        )
+            results = await self._run_pipeline(
+                db, competitors, refresh_session, progress, limiter, fingerprints
+            )
 
-                        if scrape_result.success and scrape_result.pages:
-                            # Extract data from scraped content
-                            extractions = []
-                            for page in scrape_result.pages:
-                                try:
-                                    extracted = self.extractor.extract_from_content(
-                                        competitor.name,
-                                        page.content,
-                                        page.page_type
-                                    )
-                                    extractions.append(extracted)
-                                except Exception as ext_err:
-                                    logger.warning(f"Extraction failed for {competitor.name}/{page.page_type}: {ext_err}")
-
-                            if extractions:
-                                # Merge extractions
-                                merged = self.extractor.merge_extractions(extractions)
-
-                                # Update competitor with new data and detect changes
-                                changes = self._update_competitor(db, competitor, merged)
-                                changes_total += len(changes)
-
-                                results.append({
-                                    "competitor": competitor.name,
-                                    "success": True,
-                                    "pages_scraped": len(scrape_result.pages),
-                                    "changes_detected": len(changes),
-                                    "duration": scrape_result.scrape_duration_seconds
-                                })
-                                success_count += 1
-                            else:
-                                results.append({
-                                    "competitor": competitor.name,
-                                    "success": False,
-                                    "error": "No data extracted"
-                                })
-                        else:
-                            results.append({
-                                "competitor": competitor.name,
-                                "success": False,
-                                "error": scrape_result.error or "No pages scraped"
-                            })
-
-                    except Exception as e:
-                        logger.error(f"Error processing {competitor.name}: {e}")
-                        results.append({
-                            "competitor": competitor.name,
-                            "success": False,
-                            "error": str(e)
-                        })
-
-                    # Stagger requests to avoid rate limiting
-                    if idx < total_count:
-                        await asyncio.sleep(stagger_delay)
+            success_count = sum(1 for r in results if r.get("success"))
+            changes_total = sum(r.get("changes_detected", 0) for r in results)
 
             # Update RefreshSession
             refresh_session.completed_at = datetime.utcnow()
             refresh_session.status = "completed"
             refresh_session.changes_detected = changes_total
-            refresh_session.new_values_added = sum(1 for r in results if r.get("success"))
+            refresh_session.new_values_added = success_count
+            refresh_session.errors_count = total_count - success_count
+            refresh_session.stage_progress = progress.to_json()
             db.commit()
 
             duration = (datetime.utcnow() - start_time).total_seconds()
             logger.info(
                 f"Refresh complete in {duration:.1f}s. "
-                f"Success: {success_count}/{total_count}, Changes: {changes_total}"
+                f"Success: {success_count}/{total_count}, Changes: {changes_total}, "
+                f"rate-limit wait: {limiter.total_wait_seconds:.1f}s"
             )
 
             return results
 
         except Exception as e:
             logger.error(f"Refresh job failed: {e}")
+            if refresh_session is not None:
+                try:
+                    db.rollback()
+                    refresh_session.status = "failed"
+                    refresh_session.completed_at = datetime.utcnow()
+                    db.commit()
+                except Exception:
+                    db.rollback()
             raise
         finally:
             db.close()
-    
+
+    async def _run_pipeline(
+        self,
+        db,
+        competitors: List[Competitor],
+        refresh_session: RefreshSession,
+        progress: RefreshProgress,
+        limiter: DomainRateLimiter,
+        fingerprints: Optional[Dict[int, Dict[str, Dict[str, Any]]]] = None
+    ) -> List[Dict[str, Any]]:
+        """Drive competitors through the scrape -> extract -> persist stages."""
+        by_id = {c.id: c for c in competitors}
+        fingerprints = fingerprints or {}
+        results: Dict[int, Dict[str, Any]] = {}
+
+        scrape_q: asyncio.Queue = asyncio.Queue()
+        # Bounded hand-off queues give back-pressure: scrapers pause when
+        # extraction falls behind instead of buffering every page in memory.
+        extract_q: asyncio.Queue = asyncio.Queue(maxsize=self.scrape_concurrency * 2)
+        persist_q: asyncio.Queue = asyncio.Queue(maxsize=self.extract_concurrency * 2)
+
+        for competitor in competitors:
+            # Workers only see plain values; the ORM objects stay with the persist stage
+            scrape_q.put_nowait((competitor.id, competitor.name, competitor.website))
+
+        def fail(competitor_id: int, name: str, error: str, stages_skipped: tuple) -> None:
+            results[competitor_id] = {"competitor": name, "success": False, "error": error}
+            for stage in stages_skipped:
+                progress.skip(stage)
+
+        async def scrape_worker(scraper: CompetitorScraper, pool: BrowserContextPool) -> None:
+            while True:
+                try:
+                    competitor_id, name, website = scrape_q.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                started = progress.start("scrape")
+                try:
+                    async with pool.acquire() as context:
+                        scrape_result = await scraper.scrape_competitor(
+                            name=name,
+                            website=website,
+                            pages_to_scrape=self.PAGES_TO_SCRAPE,
+                            context=context,
+                            validators=conditional_validators(fingerprints.get(competitor_id, {}))
+                        )
+                except Exception as e:
+                    logger.error(f"Error scraping {name}: {e}")
+                    progress.record("scrape", started, ok=False)
+                    fail(competitor_id, name, str(e), ("extract", "persist"))
+                    continue
+
+                if scrape_result.success and scrape_result.pages:
+                    progress.record("scrape", started)
+                    progress.count(
+                        "scrape", "pages_not_modified",
+                        sum(1 for p in scrape_result.pages if getattr(p, "not_modified", False))
+                    )
+                    await extract_q.put((competitor_id, name, scrape_result))
+                else:
+                    progress.record("scrape", started, ok=False)
+                    fail(competitor_id, name, scrape_result.error or "No pages scraped", ("extract", "persist"))
+
+        async def extract(competitor_id: int, name: str, scrape_result) -> Optional[tuple]:
+            """Extract one competitor's pages; returns the persist item, or None if nothing was extracted."""
+            known = fingerprints.get(competitor_id, {})
+            extractions = []
+            page_entries = []
+            for page in scrape_result.pages:
+                not_modified = getattr(page, "not_modified", False)
+                fingerprint = known.get(page.url)
+                if not_modified and fingerprint:
+                    digest = fingerprint["content_hash"]
+                else:
+                    digest = content_hash(page.content)
+                entry = {
+                    "url": page.url,
+                    "page_type": page.page_type,
+                    "content_hash": digest,
+                    "etag": getattr(page, "etag", None),
+                    "last_modified": getattr(page, "last_modified", None),
+                    "not_modified": not_modified,
+                    "extraction": None,
+                }
+                if fingerprint and fingerprint.get("extraction") is not None \
+                        and fingerprint["content_hash"] == digest:
+                    extractions.append(_extracted_from_dict(fingerprint["extraction"]))
+                    page_entries.append(entry)
+                    progress.count("extract", "pages_skipped")
+                    continue
+                if not_modified:
+                    continue  # Nothing to extract from and no stored result
+                try:
+                    extracted = await asyncio.to_thread(
+                        self.extractor.extract_from_content,
+                        name,
+                        page.content,
+                        page.page_type
+                    )
+                    extractions.append(extracted)
+                    entry["extraction"] = extracted
+                    page_entries.append(entry)
+                    progress.count("extract", "pages_extracted")
+                except Exception as ext_err:
+                    logger.warning(f"Extraction failed for {name}/{page.page_type}: {ext_err}")
+
+            if not extractions:
+                return None
+            merged = self.extractor.merge_extractions(extractions)
+            return (competitor_id, name, scrape_result, merged, page_entries)
+
+        async def extract_worker() -> None:
+            while True:
+                item = await extract_q.get()
+                if item is None:
+                    return
+                competitor_id, name, scrape_result = item
+                started = progress.start("extract")
+                try:
+                    persist_item = await extract(competitor_id, name, scrape_result)
+                except Exception as e:
+                    # One bad competitor must not take the worker (and the queue) down
+                    logger.error(f"Error extracting {name}: {e}")
+                    progress.record("extract", started, ok=False)
+                    fail(competitor_id, name, str(e), ("persist",))
+                    continue
+                if persist_item is not None:
+                    progress.record("extract", started)
+                    await persist_q.put(persist_item)
+                else:
+                    progress.record("extract", started, ok=False)
+                    fail(competitor_id, name, "No data extracted", ("persist",))
+
+        async def persist_worker() -> None:
+            while True:
+                item = await persist_q.get()
+                if item is None:
+                    return
+                competitor_id, name, scrape_result, merged, page_entries = item
+                started = progress.start("persist")
+                try:
+                    # Flushed by _update_competitor's commit
+                    record_fingerprints(db, competitor_id, page_entries)
+                    changes = self._update_competitor(db, by_id[competitor_id], merged)
+                    results[competitor_id] = {
+                        "competitor": name,
+                        "success": True,
+                        "pages_scraped": len(scrape_result.pages),
+                        "changes_detected": len(changes),
+                        "duration": scrape_result.scrape_duration_seconds
+                    }
+                    progress.record("persist", started)
+                except Exception as e:
+                    logger.error(f"Error saving {name}: {e}")
+                    db.rollback()
+                    progress.record("persist", started, ok=False)
+                    results[competitor_id] = {"competitor": name, "success": False, "error": str(e)}
+                progress.flush(db, refresh_session)
+
+        async def scrape_stage() -> None:
+            try:
+                async with CompetitorScraper(headless=True, rate_limiter=limiter) as scraper:
+                    async with BrowserContextPool(scraper, size=self.scrape_concurrency) as pool:
+                        await asyncio.gather(*(
+                            scrape_worker(scraper, pool) for _ in range(self.scrape_concurrency)
+                        ))
+            except Exception as e:
+                # Browser failed to start: everything still queued fails fast
+                logger.error(f"Scrape stage failed: {e}")
+                while not scrape_q.empty():
+                    competitor_id, name, _ = scrape_q.get_nowait()
+                    progress.record("scrape", progress.start("scrape"), ok=False)
+                    fail(competitor_id, name, str(e), ("extract", "persist"))
+            finally:
+                progress.finish("scrape")
+                for _ in range(self.extract_concurrency):
+                    await extract_q.put(None)
+
+        async def extract_stage() -> None:
+            try:
+                # Every worker has drained before the persist sentinel goes out
+                outcomes = await asyncio.gather(
+                    *(extract_worker() for _ in range(self.extract_concurrency)),
+                    return_exceptions=True
+                )
+                for outcome in outcomes:
+                    if isinstance(outcome, Exception):
+                        logger.error(f"Extract worker stopped: {outcome}")
+            finally:
+                progress.finish("extract")
+                await persist_q.put(None)
+
+        async def persist_stage() -> None:
+            try:
+                await persist_worker()
+            finally:
+                progress.finish("persist")
+                progress.flush(db, refresh_session, force=True)
+
+        await asyncio.gather(scrape_stage(), extract_stage(), persist_stage())
+
+        return [results[c.id] for c in competitors if c.id in results]
+
     def _update_competitor(self, db, competitor: Competitor, extracted: ExtractedData) -> List[ChangeLog]:
         """Update competitor data and log changes."""
         changes = []
@@ -330,74 +597,29 @@ def schedule_daily_backup():
 
 
 def schedule_daily_news_refresh():
-    """Schedule daily news refresh for all competitors at 5 AM."""
-    from news_monitor import NewsMonitor
-    from database import NewsArticleCache
-
-    def _run_daily_news() -> None:
-        """Sync function that fetches news for all non-deleted competitors."""
-        db = SessionLocal()
-        try:
-            competitors = db.query(Competitor).filter(
-                Competitor.is_deleted == False  # noqa: E712
-            ).all()
+    """
+    Schedule the incremental daily news refresh for all competitors at 5 AM.
 
-            monitor = NewsMonitor()
-            total_new = 0
-
-            for comp in competitors:
-                try:
-                    digest = monitor.fetch_news(comp.name, days=1)
-
-                    for article in digest.articles:
-                        # Deduplicate against existing cache by URL
-                        exists = db.query(NewsArticleCache).filter(
-                            NewsArticleCache.url == article.url
-                        ).first()
-
-                        if not exists:
-                            cached = NewsArticleCache(
-                                competitor_id=comp.id,
-                                competitor_name=comp.name,
-                                title=article.title[:500] if article.title else "",
-                                url=article.url,
-                                source=article.source,
-                                source_type="daily_refresh",
-                                published_at=datetime.utcnow(),
-                                snippet=article.snippet[:1000] if article.snippet else None,
-                                sentiment=article.sentiment,
-                                event_type=article.event_type,
-                                is_major_event=article.is_major_event,
-                                dimension_tags=json.dumps(article.dimension_tags) if article.dimension_tags else None,
-                                fetched_at=datetime.utcnow(),
-                                cache_expires_at=None,  # permanent storage
-                            )
-                            db.add(cached)
-                            total_new += 1
-
-                    db.commit()
-
-                except Exception as e:
-                    logger.error(f"[Daily News] Error fetching for {comp.name}: {e}")
-                    db.rollback()
-
-            logger.info(
-                f"[Daily News] Refreshed {total_new} articles "
-                f"for {len(competitors)} competitors"
-            )
-
-        except Exception as e:
-            logger.error(f"[Daily News] Job failed: {e}")
-        finally:
-            db.close()
+    Also schedules a one-off run shortly after startup that continues an
+    interrupted refresh (it does nothing if the last one completed).
+    """
+    from news_refresh import run_daily_news_refresh
 
     scheduler.add_job(
-        _run_daily_news,
+        run_daily_news_refresh,
         CronTrigger(hour=5, minute=0),
         id="daily_news_refresh",
         name="Daily News Refresh",
         replace_existing=True
     )
+    scheduler.add_job(
+        run_daily_news_refresh,
+        DateTrigger(run_date=datetime.now() + timedelta(minutes=1)),
+        kwargs={"resume": True},
+        id="daily_news_refresh_resume",
+        name="Resume Interrupted News Refresh",
+        replace_existing=True
+    )
     logger.info("Scheduled daily news refresh for 5 AM")
 
 
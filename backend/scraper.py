@@ -13,7 +13,9 @@ import asyncio
 import re
 import os
 import json
-from typing import Dict, List, Optional, Tuple
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from urllib.parse import urljoin, urlparse
@@ -44,6 +46,9 @@ class ScrapedPage:
     meta_description: Optional[str] = None
     links_found: List[str] = field(default_factory=list)
     status_code: int = 200
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    not_modified: bool = False  # 304 to a conditional request; content is empty
 
 
 @dataclass
@@ -80,6 +85,111 @@ class ExtractedData:
     employee_count: Optional[str] = None
 
 
+class DomainRateLimiter:
+    """
+    Per-domain token buckets for polite concurrent scraping.
+
+    Each host gets ``burst`` tokens that refill at ``rate_per_second``.
+    Requests to different domains never wait on each other; requests to
+    the same domain queue up behind a per-domain lock.
+    """
+
+    def __init__(self, rate_per_second: float = 0.5, burst: int = 2):
+        if rate_per_second <= 0:
+            raise ValueError("rate_per_second must be positive")
+        self.rate = rate_per_second
+        self.burst = max(1, burst)
+        self._buckets: Dict[str, List[float]] = {}  # domain -> [tokens, last_refill]
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.total_wait_seconds = 0.0
+
+    @staticmethod
+    def domain_for(url: str) -> str:
+        """Bucket key for a URL: lowercase host without a leading www."""
+        if "://" not in url:
+            url = f"https://{url}"
+        host = (urlparse(url).hostname or "").lower()
+        return host[4:] if host.startswith("www.") else host
+
+    async def acquire(self, url: str) -> float:
+        """Wait for a token for the URL's domain. Returns seconds waited."""
+        domain = self.domain_for(url)
+        lock = self._locks.setdefault(domain, asyncio.Lock())
+        async with lock:
+            now = time.monotonic()
+            tokens, last = self._buckets.get(domain, (float(self.burst), now))
+            tokens = min(float(self.burst), tokens + (now - last) * self.rate)
+            waited = 0.0
+            if tokens < 1.0:
+                waited = (1.0 - tokens) / self.rate
+                await asyncio.sleep(waited)
+                now = time.monotonic()
+                tokens = 1.0
+            self._buckets[domain] = [tokens - 1.0, now]
+            self.total_wait_seconds += waited
+            return waited
+
+
+class BrowserContextPool:
+    """
+    Fixed-size pool of reusable Playwright browser contexts.
+
+    Contexts are created lazily up to ``size`` and handed back to the pool
+    with cookies cleared, so concurrent competitor scrapes share a handful
+    of contexts instead of opening and tearing one down per competitor.
+    """
+
+    def __init__(self, scraper: "CompetitorScraper", size: int = 4):
+        self.scraper = scraper
+        self.size = max(1, size)
+        self._semaphore = asyncio.Semaphore(self.size)
+        self._idle: List = []
+        self._all: List = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator:
+        """Check out a context; it is returned (or discarded if broken) on exit."""
+        async with self._semaphore:
+            context = self._idle.pop() if self._idle else None
+            if context is None:
+                context = await self.scraper._new_context()
+                self._all.append(context)
+            healthy = True
+            try:
+                yield context
+            except BaseException:
+                healthy = False
+                raise
+            finally:
+                if healthy:
+                    try:
+                        await context.clear_cookies()
+                        self._idle.append(context)
+                    except Exception:
+                        healthy = False
+                if not healthy:
+                    self._all.remove(context)
+                    try:
+                        await context.close()
+                    except Exception:
+                        pass
+
+    async def close(self) -> None:
+        """Close every context the pool has created."""
+        contexts, self._all, self._idle = self._all, [], []
+        for context in contexts:
+            try:
+                await context.close()
+            except Exception:
+                pass
+
+
 class CompetitorScraper:
     """
     Scrapes competitor websites to extract content for AI analysis.
@@ -118,12 +228,14 @@ class CompetitorScraper:
         headless: bool = True,
         timeout_ms: int = 30000,
         capture_screenshots: bool = False,
-        screenshot_dir: str = "./screenshots"
+        screenshot_dir: str = "./screenshots",
+        rate_limiter: Optional[DomainRateLimiter] = None
     ):
         self.headless = headless
         self.timeout_ms = timeout_ms
         self.capture_screenshots = capture_screenshots
         self.screenshot_dir = screenshot_dir
+        self.rate_limiter = rate_limiter
         self.browser: Optional[Browser] = None
 
         # Create screenshot directory if needed
@@ -149,13 +261,31 @@ class CompetitorScraper:
             await self.browser.close()
         if hasattr(self, 'playwright'):
             await self.playwright.stop()
-    
+
+    async def _new_context(self):
+        """Create a browser context with the scraper's standard fingerprint."""
+        return await self.browser.new_context(
+            viewport={"width": 1920, "height": 1080},
+            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+            extra_http_headers={
+                "Accept-Language": "en-US,en;q=0.9",
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+            }
+        )
+
+    async def _throttle(self, url: str) -> None:
+        """Wait for the per-domain rate limiter, if one is configured."""
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire(url)
+
     async def scrape_competitor(
         self,
         name: str,
         website: str,
         pages_to_scrape: List[str] = None,
-        discover_pages: bool = True
+        discover_pages: bool = True,
+        context=None,
+        validators: Optional[Dict[str, Dict[str, str]]] = None
     ) -> ScrapeResult:
         """
         Scrape a competitor's website comprehensively.
@@ -165,6 +295,11 @@ class CompetitorScraper:
             website: Base website URL
             pages_to_scrape: List of page types to scrape (uses DEFAULT_PAGES if None)
             discover_pages: If True, discover additional pages from navigation
+            context: Optional browser context (e.g. from a BrowserContextPool).
+                It is left open; only the page opened on it is closed.
+            validators: Optional {url: {"etag", "last_modified"}} from a previous
+                scrape. Those URLs are requested conditionally and tried first
+                for their page type; a 304 yields a page with not_modified=True.
 
         Returns:
             ScrapeResult with all scraped pages
@@ -188,15 +323,11 @@ class CompetitorScraper:
         screenshots = []
         total_content = 0
 
+        owns_context = context is None
+        page = None
         try:
-            context = await self.browser.new_context(
-                viewport={"width": 1920, "height": 1080},
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
-                extra_http_headers={
-                    "Accept-Language": "en-US,en;q=0.9",
-                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                }
-            )
+            if owns_context:
+                context = await self._new_context()
             page = await context.new_page()
 
             # Block unnecessary resources for faster scraping
@@ -211,14 +342,19 @@ class CompetitorScraper:
             # Scrape each requested page type
             scraped_urls = set()  # Avoid duplicates
 
+            validators = validators or {}
             for page_type in pages_to_scrape:
                 urls_to_try = self._get_page_urls(website, page_type)
+                # URLs that worked last time go first
+                urls_to_try.sort(key=lambda u: u not in validators)
 
                 for url in urls_to_try:
                     if url in scraped_urls:
                         continue
 
-                    scraped = await self._scrape_page_with_retry(page, url, page_type, name)
+                    scraped = await self._scrape_page_with_retry(
+                        page, url, page_type, name, validators.get(url)
+                    )
                     if scraped:
                         scraped_pages.append(scraped)
                         scraped_urls.add(url)
@@ -230,8 +366,6 @@ class CompetitorScraper:
 
                         break  # Found a working URL for this page type
 
-            await context.close()
-
             duration = (datetime.utcnow() - start_time).total_seconds()
 
             return ScrapeResult(
@@ -256,7 +390,15 @@ class CompetitorScraper:
                 total_content_length=total_content,
                 scrape_duration_seconds=duration
             )
-    
+        finally:
+            try:
+                if owns_context and context is not None:
+                    await context.close()
+                elif page is not None:
+                    await page.close()
+            except Exception:
+                pass
+
     async def scrape(self, url: str) -> dict:
         """
         Simple scrape method for compatibility with main.py calls.
@@ -346,6 +488,7 @@ class CompetitorScraper:
     async def _discover_navigation_links(self, page: Page, homepage_url: str) -> List[str]:
         """Discover navigation links from the homepage."""
         try:
+            await self._throttle(homepage_url)
             await page.goto(homepage_url, wait_until="domcontentloaded", timeout=self.timeout_ms)
             await page.wait_for_timeout(1500)
 
@@ -393,14 +536,15 @@ class CompetitorScraper:
         page: Page,
         url: str,
         page_type: str,
-        competitor_name: str
+        competitor_name: str,
+        validators: Optional[Dict[str, str]] = None
     ) -> Optional[ScrapedPage]:
         """Scrape a page with retry logic and exponential backoff."""
         last_error = None
 
         for attempt in range(self.MAX_RETRIES):
             try:
-                result = await self._scrape_page(page, url, page_type, competitor_name)
+                result = await self._scrape_page(page, url, page_type, competitor_name, validators)
                 if result:
                     return result
             except PlaywrightTimeout:
@@ -461,7 +605,8 @@ class CompetitorScraper:
         page: Page,
         url: str,
         page_type: str,
-        competitor_name: str = ""
+        competitor_name: str = "",
+        validators: Optional[Dict[str, str]] = None
     ) -> Optional[ScrapedPage]:
         """
         Scrape a single page with enhanced extraction.
@@ -471,21 +616,44 @@ class CompetitorScraper:
             url: URL to scrape
             page_type: Type of page (pricing, about, etc.)
             competitor_name: Name of competitor for screenshot naming
+            validators: Optional {"etag", "last_modified"} for a conditional request
 
         Returns:
             ScrapedPage object or None if failed
         """
         try:
-            response = await page.goto(
-                url,
-                wait_until="domcontentloaded",
-                timeout=self.timeout_ms
-            )
+            await self._throttle(url)
+            conditional = self._conditional_headers(validators)
+            if conditional:
+                await page.set_extra_http_headers(conditional)
+            try:
+                response = await page.goto(
+                    url,
+                    wait_until="domcontentloaded",
+                    timeout=self.timeout_ms
+                )
+            finally:
+                if conditional:
+                    await page.set_extra_http_headers({})
 
             if not response:
                 return None
 
             status_code = response.status
+            headers = response.headers or {}
+            if status_code == 304 and conditional:
+                return ScrapedPage(
+                    url=url,
+                    title="",
+                    content="",
+                    html="",
+                    scraped_at=datetime.utcnow(),
+                    page_type=page_type,
+                    status_code=status_code,
+                    etag=headers.get("etag") or validators.get("etag"),
+                    last_modified=headers.get("last-modified") or validators.get("last_modified"),
+                    not_modified=True
+                )
             if status_code >= 400:
                 return None
 
@@ -551,12 +719,26 @@ class CompetitorScraper:
                 screenshot_path=screenshot_path,
                 meta_description=meta_desc,
                 links_found=links,
-                status_code=status_code
+                status_code=status_code,
+                etag=headers.get("etag"),
+                last_modified=headers.get("last-modified")
             )
 
         except Exception as e:
             print(f"Error scraping {url}: {e}")
             return None
+
+    @staticmethod
+    def _conditional_headers(validators: Optional[Dict[str, str]]) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for stored validators."""
+        if not validators:
+            return {}
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
     
     async def discover_pricing_page(self, page: Page, website: str) -> Optional[str]:
         """Try to discover the pricing page URL."""
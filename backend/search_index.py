@@ -0,0 +1,429 @@
+"""
+Certify Intel - Full-Text Search Index
+======================================
+
+Backs /api/search and /api/search/suggestions with a real full-text index
+instead of ``LIKE '%q%'`` table scans.
+
+- SQLite: FTS5 external-content tables (one per searchable table) kept in
+  sync by AFTER INSERT/UPDATE/DELETE triggers, ranked with bm25() and
+  highlighted with snippet().
+- PostgreSQL: a weighted ``search_tsv`` tsvector generated column with a GIN
+  index (kept in sync by Postgres itself), ranked with ts_rank_cd() and
+  highlighted with ts_headline().
+
+Snippets are HTML-escaped and matches wrapped in ``<mark>``.
+
+Usage:
+    from search_index import ensure_search_index, search, suggest
+
+    ensure_search_index(engine)     # idempotent; also done lazily on first search
+    hits = search(db, "patient intake", types=["competitor", "product"], limit=20)
+    names = suggest(db, "athe", limit=10)
+
+Both ``search`` and ``suggest`` return None when no index is available for
+the current database, so callers can fall back to LIKE queries.
+"""
+
+import html
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+# Control characters never appear in indexed text, so they are safe
+# highlight markers to swap for <mark> after HTML-escaping the snippet.
+_HL_OPEN = "\x02"
+_HL_CLOSE = "\x03"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Postgres weight letters, most important first
+_PG_WEIGHTS = ("A", "B", "C", "D")
+
+
+@dataclass(frozen=True)
+class SearchSource:
+    """One searchable table and how its columns are weighted."""
+    type: str                               # Result type reported to the client
+    table: str                              # Content table
+    columns: Tuple[Tuple[str, float], ...]  # (column, bm25 weight); first column is the title
+    suggest_column: str                     # Column used for prefix suggestions
+
+    @property
+    def fts_table(self) -> str:
+        return f"fts_{self.table}"
+
+    @property
+    def column_names(self) -> List[str]:
+        return [c for c, _ in self.columns]
+
+
+SEARCH_SOURCES: Dict[str, SearchSource] = {
+    "competitor": SearchSource(
+        type="competitor",
+        table="competitors",
+        columns=(
+            ("name", 10.0),
+            ("key_features", 2.0),
+            ("target_segments", 2.0),
+            ("notes", 1.0),
+            ("website", 1.0),
+        ),
+        suggest_column="name",
+    ),
+    "product": SearchSource(
+        type="product",
+        table="competitor_products",
+        columns=(
+            ("product_name", 10.0),
+            ("product_category", 3.0),
+            ("description", 1.0),
+        ),
+        suggest_column="product_name",
+    ),
+    "knowledge": SearchSource(
+        type="knowledge",
+        table="knowledge_base",
+        columns=(
+            ("title", 10.0),
+            ("tags", 3.0),
+            ("content_text", 1.0),
+        ),
+        suggest_column="title",
+    ),
+}
+
+# engine URL -> whether the index is usable
+_index_state: Dict[str, bool] = {}
+_index_lock = threading.Lock()
+
+
+# =============================================================================
+# INDEX CREATION
+# =============================================================================
+
+def _sqlite_ddl(source: SearchSource) -> List[str]:
+    cols = source.column_names
+    col_list = ", ".join(cols)
+    new_vals = ", ".join(f"new.{c}" for c in cols)
+    old_vals = ", ".join(f"old.{c}" for c in cols)
+    fts = source.fts_table
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{col_list}, content='{source.table}', content_rowid='id', "
+        f"tokenize='porter unicode61', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {source.table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_vals}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {source.table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_vals}); END",
+        # Only re-index when an indexed column changes, not on every timestamp bump
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {col_list} ON {source.table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_vals}); "
+        f"INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_vals}); END",
+    ]
+
+
+def _pg_ddl(source: SearchSource) -> List[str]:
+    parts = []
+    for i, (col, _) in enumerate(source.columns):
+        weight = _PG_WEIGHTS[min(i, len(_PG_WEIGHTS) - 1)]
+        parts.append(f"setweight(to_tsvector('english', coalesce({col}::text, '')), '{weight}')")
+    vector = " || ".join(parts)
+    return [
+        f"ALTER TABLE {source.table} ADD COLUMN IF NOT EXISTS search_tsv tsvector "
+        f"GENERATED ALWAYS AS ({vector}) STORED",
+        f"CREATE INDEX IF NOT EXISTS ix_{source.table}_search_tsv "
+        f"ON {source.table} USING GIN (search_tsv)",
+    ]
+
+
+def create_search_index(conn: Connection) -> bool:
+    """
+    Create the full-text index objects on an open connection (idempotent).
+
+    Returns True if the dialect is supported and the index is in place.
+    """
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        # Triggers resolve columns when they fire, so a missing column (an old
+        # database that was never migrated) would break every insert.
+        for source in SEARCH_SOURCES.values():
+            existing = {row[1] for row in conn.execute(text(f"PRAGMA table_info({source.table})"))}
+            missing = set(source.column_names) - existing
+            if missing:
+                logger.warning(f"Skipping FTS5 index: {source.table} lacks columns {sorted(missing)}")
+                return False
+        for source in SEARCH_SOURCES.values():
+            # Dropping the content table drops its triggers too, so a missing
+            # trigger means the index may be out of sync with the rows.
+            in_sync = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = :name"),
+                {"name": f"{source.fts_table}_ai"}
+            ).first()
+            for stmt in _sqlite_ddl(source):
+                conn.execute(text(stmt))
+            if not in_sync:
+                # Backfill rows that existed before the triggers did
+                conn.execute(text(f"INSERT INTO {source.fts_table}({source.fts_table}) VALUES ('rebuild')"))
+                logger.info(f"Built FTS5 index {source.fts_table}")
+        return True
+    if dialect == "postgresql":
+        for source in SEARCH_SOURCES.values():
+            for stmt in _pg_ddl(source):
+                conn.execute(text(stmt))
+        return True
+    return False
+
+
+def drop_search_index(conn: Connection) -> None:
+    """Remove the full-text index objects (used by the Alembic downgrade)."""
+    dialect = conn.dialect.name
+    for source in SEARCH_SOURCES.values():
+        if dialect == "sqlite":
+            for suffix in ("ai", "ad", "au"):
+                conn.execute(text(f"DROP TRIGGER IF EXISTS {source.fts_table}_{suffix}"))
+            conn.execute(text(f"DROP TABLE IF EXISTS {source.fts_table}"))
+        elif dialect == "postgresql":
+            conn.execute(text(f"DROP INDEX IF EXISTS ix_{source.table}_search_tsv"))
+            conn.execute(text(f"ALTER TABLE {source.table} DROP COLUMN IF EXISTS search_tsv"))
+    _index_state.clear()
+
+
+def ensure_search_index(engine: Engine) -> bool:
+    """Create the index once per engine. Returns False if unavailable (e.g. no FTS5)."""
+    key = str(engine.url)
+    if key in _index_state:
+        return _index_state[key]
+    with _index_lock:
+        if key in _index_state:
+            return _index_state[key]
+        try:
+            with engine.begin() as conn:
+                available = create_search_index(conn)
+        except Exception as e:
+            logger.warning(f"Full-text search index unavailable, falling back to LIKE: {e}")
+            available = False
+        _index_state[key] = available
+        return available
+
+
+# =============================================================================
+# QUERY HELPERS
+# =============================================================================
+
+def _tokens(q: str) -> List[str]:
+    return _TOKEN_RE.findall(q.lower())[:12]
+
+
+def _fts5_query(tokens: List[str], column: Optional[str] = None) -> str:
+    """Build an FTS5 MATCH expression: all terms required, last one as a prefix."""
+    terms = [f'"{t}"' for t in tokens[:-1]] + [f'"{tokens[-1]}"*']
+    expr = " ".join(terms)
+    return f"{column} : ({expr})" if column else expr
+
+
+def _tsquery(tokens: List[str]) -> str:
+    """Build a to_tsquery() expression: all terms required, last one as a prefix."""
+    return " & ".join(tokens[:-1] + [f"{tokens[-1]}:*"])
+
+
+def _render_snippet(raw: Optional[str]) -> Optional[str]:
+    """HTML-escape a snippet and turn highlight markers into <mark> tags."""
+    if not raw:
+        return None
+    escaped = html.escape(raw)
+    return escaped.replace(_HL_OPEN, "<mark>").replace(_HL_CLOSE, "</mark>")
+
+
+def _sqlite_search(db, source: SearchSource, match: str, limit: int) -> List[Dict[str, Any]]:
+    fts = source.fts_table
+    weights = ", ".join(str(w) for _, w in source.columns)
+    snippet = f"snippet({fts}, -1, :hl_open, :hl_close, '...', 16)"
+    params = {"match": match, "limit": limit, "hl_open": _HL_OPEN, "hl_close": _HL_CLOSE}
+
+    if source.type == "competitor":
+        sql = f"""
+            SELECT c.id, c.name AS title, c.target_segments, c.threat_level,
+                   {snippet} AS snip, bm25({fts}, {weights}) AS rank
+            FROM {fts} JOIN competitors c ON c.id = {fts}.rowid
+            WHERE {fts} MATCH :match AND (c.is_deleted = 0 OR c.is_deleted IS NULL)
+            ORDER BY rank LIMIT :limit
+        """
+    elif source.type == "product":
+        sql = f"""
+            SELECT p.id, p.product_name AS title, p.product_category, p.competitor_id,
+                   c.name AS competitor_name, {snippet} AS snip, bm25({fts}, {weights}) AS rank
+            FROM {fts} JOIN competitor_products p ON p.id = {fts}.rowid
+            LEFT JOIN competitors c ON c.id = p.competitor_id
+            WHERE {fts} MATCH :match
+            ORDER BY rank LIMIT :limit
+        """
+    else:
+        sql = f"""
+            SELECT k.id, k.title AS title, k.source_type, k.tags,
+                   {snippet} AS snip, bm25({fts}, {weights}) AS rank
+            FROM {fts} JOIN knowledge_base k ON k.id = {fts}.rowid
+            WHERE {fts} MATCH :match
+            ORDER BY rank LIMIT :limit
+        """
+    rows = db.execute(text(sql), params).mappings().all()
+    # bm25() is lower-is-better; flip it so scores sort descending like before
+    return [dict(r, score=-float(r["rank"])) for r in rows]
+
+
+def _pg_search(db, source: SearchSource, tsquery: str, limit: int) -> List[Dict[str, Any]]:
+    body_cols = [c for c in source.column_names[1:]]
+    body = " || ' ' || ".join(f"coalesce({c}::text, '')" for c in body_cols)
+    headline_opts = (
+        f"StartSel={_HL_OPEN}, StopSel={_HL_CLOSE}, MaxWords=24, MinWords=8, MaxFragments=1"
+    )
+    params = {"tsq": tsquery, "limit": limit, "opts": headline_opts}
+
+    if source.type == "competitor":
+        sql = f"""
+            SELECT c.id, c.name AS title, c.target_segments, c.threat_level,
+                   ts_headline('english', {body}, q, :opts) AS snip,
+                   ts_rank_cd(c.search_tsv, q) AS rank
+            FROM competitors c, to_tsquery('english', :tsq) q
+            WHERE c.search_tsv @@ q AND (c.is_deleted = false OR c.is_deleted IS NULL)
+            ORDER BY rank DESC LIMIT :limit
+        """
+    elif source.type == "product":
+        sql = f"""
+            SELECT p.id, p.product_name AS title, p.product_category, p.competitor_id,
+                   c.name AS competitor_name,
+                   ts_headline('english', {body}, q, :opts) AS snip,
+                   ts_rank_cd(p.search_tsv, q) AS rank
+            FROM competitor_products p
+            CROSS JOIN to_tsquery('english', :tsq) q
+            LEFT JOIN competitors c ON c.id = p.competitor_id
+            WHERE p.search_tsv @@ q
+            ORDER BY rank DESC LIMIT :limit
+        """
+    else:
+        sql = f"""
+            SELECT k.id, k.title AS title, k.source_type, k.tags,
+                   ts_headline('english', {body}, q, :opts) AS snip,
+                   ts_rank_cd(k.search_tsv, q) AS rank
+            FROM knowledge_base k, to_tsquery('english', :tsq) q
+            WHERE k.search_tsv @@ q
+            ORDER BY rank DESC LIMIT :limit
+        """
+    rows = db.execute(text(sql), params).mappings().all()
+    return [dict(r, score=float(r["rank"])) for r in rows]
+
+
+def _to_result(source: SearchSource, row: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a row like schemas.competitors.SearchResult."""
+    if source.type == "competitor":
+        subtitle = f"{row.get('target_segments') or 'Competitor'} | {row.get('threat_level') or 'Unknown'} threat"
+        url = f"/competitors/{row['id']}"
+    elif source.type == "product":
+        subtitle = f"{row.get('competitor_name') or 'Unknown'} | {row.get('product_category') or 'Product'}"
+        url = f"/competitors/{row.get('competitor_id')}"
+    else:
+        subtitle = f"{row.get('source_type') or 'Document'} | {row.get('tags') or ''}"
+        url = f"/knowledge/{row['id']}"
+    default_titles = {"competitor": "Unknown Competitor", "product": "Unknown Product", "knowledge": "Untitled"}
+    return {
+        "type": source.type,
+        "id": row["id"],
+        "title": row.get("title") or default_titles[source.type],
+        "subtitle": subtitle,
+        "snippet": _render_snippet(row.get("snip")),
+        "score": round(row["score"], 4),
+        "url": url,
+    }
+
+
+# =============================================================================
+# PUBLIC API
+# =============================================================================
+
+def search(db, q: str, types: List[str], limit: int = 20) -> Optional[List[Dict[str, Any]]]:
+    """
+    Ranked full-text search across the requested result types.
+
+    Returns a list of SearchResult-shaped dicts sorted by relevance, or None
+    if the database has no full-text index (caller should fall back).
+    """
+    bind = db.get_bind()
+    if not ensure_search_index(bind):
+        return None
+    tokens = _tokens(q)
+    if not tokens:
+        return []
+
+    dialect = bind.dialect.name
+    results: List[Dict[str, Any]] = []
+    for type_name in types:
+        source = SEARCH_SOURCES.get(type_name)
+        if source is None:
+            continue
+        if dialect == "sqlite":
+            rows = _sqlite_search(db, source, _fts5_query(tokens), limit)
+        else:
+            rows = _pg_search(db, source, _tsquery(tokens), limit)
+        results.extend(_to_result(source, row) for row in rows)
+
+    results.sort(key=lambda r: r["score"], reverse=True)
+    return results[:limit]
+
+
+def suggest(db, q: str, limit: int = 10) -> Optional[List[Dict[str, str]]]:
+    """
+    Prefix suggestions from competitor and product names.
+
+    "athe" matches "Athenahealth"; multi-word input requires every word,
+    with the last one treated as a prefix. Returns None if no index.
+    """
+    bind = db.get_bind()
+    if not ensure_search_index(bind):
+        return None
+    tokens = _tokens(q)
+    if not tokens:
+        return []
+
+    dialect = bind.dialect.name
+    suggestions: List[Dict[str, str]] = []
+    for type_name in ("competitor", "product"):
+        source = SEARCH_SOURCES[type_name]
+        col = source.suggest_column
+        if dialect == "sqlite":
+            fts = source.fts_table
+            deleted_filter = (
+                "AND (t.is_deleted = 0 OR t.is_deleted IS NULL)" if type_name == "competitor" else ""
+            )
+            rows = db.execute(text(f"""
+                SELECT t.{col} AS name FROM {fts} JOIN {source.table} t ON t.id = {fts}.rowid
+                WHERE {fts} MATCH :match {deleted_filter}
+                ORDER BY bm25({fts}) LIMIT :limit
+            """), {"match": _fts5_query(tokens, column=col), "limit": limit}).all()
+        else:
+            deleted_filter = (
+                "AND (t.is_deleted = false OR t.is_deleted IS NULL)" if type_name == "competitor" else ""
+            )
+            # The GIN index narrows candidates; ts_filter keeps title-weight (A) matches only
+            rows = db.execute(text(f"""
+                SELECT t.{col} AS name FROM {source.table} t, to_tsquery('english', :tsq) q
+                WHERE t.search_tsv @@ q AND ts_filter(t.search_tsv, '{{a}}') @@ q {deleted_filter}
+                ORDER BY ts_rank_cd(t.search_tsv, q) DESC LIMIT :limit
+            """), {"tsq": _tsquery(tokens), "limit": limit}).all()
+        suggestions.extend({"text": name, "type": type_name} for (name,) in rows if name)
+
+    seen = set()
+    unique = []
+    for s in suggestions:
+        if s["text"] not in seen:
+            seen.add(s["text"])
+            unique.append(s)
+            if len(unique) >= limit:
+                break
+    return unique
@@ -0,0 +1,189 @@
+"""
+Certify Intel - SQLite Cache Base
+=================================
+
+Shared plumbing for the single-file SQLite caches (embedding_cache,
+page_cache, ai_response_cache, data_providers/id_cache): one connection
+shared behind a lock, WAL journaling, a WITHOUT ROWID table, least
+recently used eviction and the process-wide instance opened on first use.
+
+A cache subclasses SQLiteCache, declares its table and keeps only its own
+key/value logic:
+
+    class PageCache(SQLiteCache):
+        TABLE = "pages"
+        COLUMNS = "url TEXT PRIMARY KEY, text TEXT NOT NULL, last_used_at REAL NOT NULL"
+        KEY = ("url",)
+
+    _shared = SharedCache(PageCache, "Page cache unavailable, fetching every time")
+
+Writes report the rows (and bytes, for SIZE_COLUMN caches) they added with
+``_stored``. Past ``max_entries`` or ``max_bytes`` the least recently used
+rows, by LRU_COLUMN, are evicted down to 90% of the limit.
+"""
+
+import os
+import sys
+import math
+import logging
+import sqlite3
+import threading
+from typing import Callable, Dict, Generic, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+# Evictions stop once the cache is back under this share of its limit
+EVICT_TO = 0.9
+
+
+def default_cache_path(env_var: str, filename: str) -> str:
+    """``env_var`` if set, else ``filename`` next to the exe (PyInstaller) or in the cwd."""
+    configured = os.getenv(env_var)
+    if configured:
+        return configured
+    if getattr(sys, 'frozen', False):
+        return os.path.join(os.path.dirname(sys.executable), filename)
+    return f"./{filename}"
+
+
+class SQLiteCache:
+    """
+    Base for caches kept in one SQLite table.
+
+    Thread-safe; a single connection is shared behind ``_lock``, which
+    subclass methods hold around every statement.
+    """
+
+    TABLE: str = ""
+    COLUMNS: str = ""  # Column and PRIMARY KEY definitions for CREATE TABLE
+    KEY: Tuple[str, ...] = ()
+    LRU_COLUMN: Optional[str] = "last_used_at"  # None: no eviction
+    SIZE_COLUMN: Optional[str] = None  # Byte size per row, for max_bytes
+
+    def __init__(self, path: str, max_entries: Optional[int] = None, max_bytes: Optional[int] = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"CREATE TABLE IF NOT EXISTS {self.TABLE} ({self.COLUMNS}) WITHOUT ROWID")
+        if self.LRU_COLUMN:
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_{self.TABLE}_last_used ON {self.TABLE}({self.LRU_COLUMN})"
+            )
+        self._conn.commit()
+        self._count = self._conn.execute(f"SELECT COUNT(*) FROM {self.TABLE}").fetchone()[0]
+        self._size = self._conn.execute(
+            f"SELECT COALESCE(SUM({self.SIZE_COLUMN}), 0) FROM {self.TABLE}"
+        ).fetchone()[0] if self.SIZE_COLUMN else 0
+
+    # -------------------------------------------------------------------------
+    # Bookkeeping (lock held)
+    # -------------------------------------------------------------------------
+
+    def _stored(self, rows: int, size: int = 0) -> None:
+        """Count rows/bytes a write added and evict past the limits."""
+        self._count += rows
+        self._size += size
+        if self._over(self._count, self._size, 1.0):
+            self._evict()
+
+    def _removed(self, rows: int, size: int = 0) -> None:
+        self._count -= rows
+        self._size -= size
+
+    def _over(self, count: int, size: int, share: float) -> bool:
+        if self.max_entries is not None and count > math.ceil(self.max_entries * share):
+            return True
+        return self.max_bytes is not None and size > math.ceil(self.max_bytes * share)
+
+    def _evict(self) -> None:
+        """Drop the least recently used rows down to 90% of the limits."""
+        if not self.LRU_COLUMN:
+            return
+        columns = ", ".join(self.KEY + ((self.SIZE_COLUMN,) if self.SIZE_COLUMN else ()))
+        cursor = self._conn.execute(f"SELECT {columns} FROM {self.TABLE} ORDER BY {self.LRU_COLUMN}")
+        doomed = []
+        count, size = self._count, self._size
+        for row in cursor:
+            if not self._over(count, size, EVICT_TO):
+                break
+            doomed.append(row[:len(self.KEY)])
+            count -= 1
+            size -= row[-1] if self.SIZE_COLUMN else 0
+        cursor.close()
+        where = " AND ".join(f"{column} = ?" for column in self.KEY)
+        self._conn.executemany(f"DELETE FROM {self.TABLE} WHERE {where}", doomed)
+        self._count, self._size = count, size
+        logger.info(f"Evicted {len(doomed)} rows from {self.TABLE} cache ({self._count} left)")
+
+    # -------------------------------------------------------------------------
+    # Maintenance
+    # -------------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, object]:
+        total = self.hits + self.misses
+        stats: Dict[str, object] = {"path": self.path, "entries": self._count}
+        if self.max_entries is not None:
+            stats["max_entries"] = self.max_entries
+        if self.max_bytes is not None:
+            stats["size_bytes"] = self._size
+            stats["max_bytes"] = self.max_bytes
+        stats.update(
+            hits=self.hits,
+            misses=self.misses,
+            hit_rate=round(self.hits / total, 4) if total else 0.0,
+        )
+        return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.TABLE}")
+            self._conn.commit()
+            self._count = 0
+            self._size = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+CacheT = TypeVar("CacheT", bound=SQLiteCache)
+
+
+class SharedCache(Generic[CacheT]):
+    """The process-wide instance of one cache class, opened on first use."""
+
+    def __init__(self, factory: Callable[[], CacheT], unavailable: str):
+        self.factory = factory
+        self.unavailable = unavailable  # Logged (with the error) if opening fails
+        self.instance: Optional[CacheT] = None
+        self._lock = threading.Lock()
+
+    def get(self, enabled: bool = True) -> Optional[CacheT]:
+        """The shared instance, or None when disabled or the file can't be opened."""
+        if not enabled:
+            return None
+        if self.instance is None:
+            with self._lock:
+                if self.instance is None:
+                    try:
+                        self.instance = self.factory()
+                    except Exception as e:
+                        logger.warning(f"{self.unavailable}: {e}")
+                        return None
+        return self.instance
+
+    def reset(self) -> None:
+        """Close and forget the shared instance (tests, config changes)."""
+        with self._lock:
+            if self.instance is not None:
+                self.instance.close()
+            self.instance = None
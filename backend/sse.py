@@ -0,0 +1,73 @@
+"""
+Certify Intel - Server-Sent Events
+==================================
+
+Helpers for endpoints that stream AI output as it is generated. An
+endpoint keeps its JSON response by default and switches to an event
+stream when the client sends ``Accept: text/event-stream`` (or a
+``"stream": true`` flag in the body):
+
+    @router.post("/api/analytics/chat")
+    async def chat(request: Request, ...):
+        if wants_event_stream(request, body.get("stream")):
+            return event_stream_response(events())
+        ...
+
+Events are dicts with a ``type`` key (``token``, ``done``, ``error``, ...);
+the type becomes the SSE event name and the rest is sent as JSON data:
+
+    event: token
+    data: {"text": "Phreesia"}
+
+An exception inside the event generator ends the stream with an ``error``
+event, since the status code has already been sent by then.
+"""
+
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+EVENT_STREAM = "text/event-stream"
+
+
+def wants_event_stream(request: Request, flag: Optional[Any] = None) -> bool:
+    """True if the client asked for an event stream (Accept header or body flag)."""
+    if flag:
+        return True
+    return EVENT_STREAM in request.headers.get("accept", "")
+
+
+def format_event(event: Dict[str, Any]) -> str:
+    """Encode one event dict as an SSE frame."""
+    data = {k: v for k, v in event.items() if k != "type"}
+    return f"event: {event.get('type', 'message')}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _frames(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    try:
+        async for event in events:
+            yield format_event(event)
+    except Exception as e:
+        logger.error(f"Event stream failed: {e}", exc_info=True)
+        yield format_event({
+            "type": "error",
+            "message": "An error occurred processing your request. Please try again.",
+        })
+
+
+def event_stream_response(events: AsyncIterator[Dict[str, Any]]) -> StreamingResponse:
+    """Stream event dicts to the client as Server-Sent Events."""
+    return StreamingResponse(
+        _frames(events),
+        media_type=EVENT_STREAM,
+        headers={
+            "Cache-Control": "no-cache",
+            # Tell nginx not to buffer the stream
+            "X-Accel-Buffering": "no",
+        },
+    )
@@ -0,0 +1,220 @@
+"""
+Certify Intel - Startup State and Import Profiling
+==================================================
+
+Tracks how long the backend takes to become ready and which startup work
+is still running, for the /readiness probe.
+
+main.py imports this module first, so the import clock starts with the
+process's first application import. The lifespan handler runs only the
+quick, essential steps before serving; slower work (knowledge base
+preinstall, seeding, scheduler startup, provider diagnostics) runs as
+background tasks registered here:
+
+    startup_state.start_task("kb_preinstall", preinstall, required=True)
+    startup_state.start_task("scheduler", start_scheduler_with_retry)
+    yield
+
+The service reports "starting" (503 on /readiness) until every required
+task has finished. Optional tasks are reported but never hold readiness
+back. A warning is logged when readiness takes longer than
+STARTUP_BUDGET_SECONDS (default 10).
+
+Import-time report (per module, from ``python -X importtime``):
+
+    python startup.py            # top 30 modules imported by main
+    python startup.py --top 50 scheduler
+"""
+
+import os
+import re
+import sys
+import time
+import asyncio
+import inspect
+import logging
+import subprocess
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+PROCESS_START = time.perf_counter()
+
+
+def startup_budget_seconds() -> float:
+    return float(os.getenv("STARTUP_BUDGET_SECONDS", "10"))
+
+
+@dataclass
+class StartupTask:
+    name: str
+    required: bool
+    status: str = "pending"  # pending | running | done | failed
+    started_at: Optional[float] = None
+    duration_ms: Optional[float] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "required": self.required,
+            "duration_ms": self.duration_ms,
+            "error": self.error,
+        }
+
+
+@dataclass
+class StartupState:
+    """Import and lifespan timings plus background startup tasks."""
+
+    imported_at: Optional[float] = None
+    serving_at: Optional[float] = None
+    ready_at: Optional[float] = None
+    tasks: Dict[str, StartupTask] = field(default_factory=dict)
+    _handles: List[asyncio.Task] = field(default_factory=list)
+
+    def mark_imported(self) -> None:
+        """Called at the end of main.py's module body."""
+        self.imported_at = time.perf_counter()
+
+    def mark_serving(self) -> None:
+        """Called when lifespan hands over to the server."""
+        self.serving_at = time.perf_counter()
+        self._check_ready()
+
+    def start_task(
+        self,
+        name: str,
+        func: Callable[[], Union[Any, Awaitable[Any]]],
+        required: bool = False,
+    ) -> asyncio.Task:
+        """Run ``func`` in the background; sync functions run in a worker thread."""
+        task = self.tasks[name] = StartupTask(name, required)
+        handle = asyncio.get_running_loop().create_task(self._run(task, func), name=f"startup:{name}")
+        self._handles.append(handle)
+        return handle
+
+    async def _run(self, task: StartupTask, func: Callable) -> None:
+        task.status = "running"
+        task.started_at = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(func):
+                await func()
+            else:
+                await asyncio.to_thread(func)
+            task.status = "done"
+        except asyncio.CancelledError:
+            task.status = "failed"
+            task.error = "cancelled"
+            raise
+        except Exception as e:
+            task.status = "failed"
+            task.error = str(e)[:200]
+            logger.warning(f"[!] Startup task '{task.name}' failed: {e}")
+        finally:
+            task.duration_ms = round(1000 * (time.perf_counter() - task.started_at), 1)
+            logger.info(f"Startup task '{task.name}' {task.status} in {task.duration_ms:.0f} ms")
+            self._check_ready()
+
+    @property
+    def is_ready(self) -> bool:
+        """True once no required task is pending or running."""
+        return all(t.status in ("done", "failed") for t in self.tasks.values() if t.required)
+
+    def _check_ready(self) -> None:
+        if self.ready_at is not None or self.serving_at is None or not self.is_ready:
+            return
+        self.ready_at = time.perf_counter()
+        elapsed = self.ready_at - PROCESS_START
+        budget = startup_budget_seconds()
+        if elapsed > budget:
+            logger.warning(
+                f"[!] Ready after {elapsed:.1f}s, over the {budget:.0f}s startup budget "
+                f"(run `python startup.py` for an import-time report)"
+            )
+        else:
+            logger.info(f"[OK] Ready after {elapsed:.1f}s")
+
+    async def cancel(self) -> None:
+        """Cancel background startup tasks that are still running (on shutdown)."""
+        pending = [h for h in self._handles if not h.done()]
+        for handle in pending:
+            handle.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        self._handles.clear()
+
+    def to_dict(self) -> Dict[str, Any]:
+        def ms(at: Optional[float]) -> Optional[float]:
+            return round(1000 * (at - PROCESS_START), 1) if at is not None else None
+
+        return {
+            "status": "ready" if self.is_ready else "starting",
+            "import_ms": ms(self.imported_at),
+            "serving_ms": ms(self.serving_at),
+            "ready_ms": ms(self.ready_at),
+            "budget_ms": round(1000 * startup_budget_seconds()),
+            "tasks": {name: task.to_dict() for name, task in self.tasks.items()},
+        }
+
+
+startup_state = StartupState()
+
+
+# =============================================================================
+# IMPORT-TIME PROFILING
+# =============================================================================
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)")
+
+
+def parse_importtime(output: str) -> List[Dict[str, Any]]:
+    """Parse ``-X importtime`` output into per-module self/cumulative milliseconds."""
+    modules = []
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        modules.append({
+            "module": name,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+            "depth": (len(indent) - 1) // 2,
+        })
+    return modules
+
+
+def import_profile(module: str = "main", timeout: float = 120) -> List[Dict[str, Any]]:
+    """Import ``module`` in a fresh interpreter and return its import times, slowest first."""
+    env = {**os.environ, "TESTING": os.getenv("TESTING", "true")}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    modules = parse_importtime(result.stderr)
+    if result.returncode != 0 and not modules:
+        raise RuntimeError(f"import {module} failed: {result.stderr[-500:]}")
+    return sorted(modules, key=lambda m: m["cumulative_ms"], reverse=True)
+
+
+def format_profile(modules: List[Dict[str, Any]], top: int = 30) -> str:
+    lines = [f"{'cumulative ms':>14} {'self ms':>10}  module"]
+    for m in modules[:top]:
+        lines.append(f"{m['cumulative_ms']:>14.1f} {m['self_ms']:>10.1f}  {'  ' * m['depth']}{m['module']}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Per-module import time report")
+    parser.add_argument("module", nargs="?", default="main")
+    parser.add_argument("--top", type=int, default=30)
+    args = parser.parse_args()
+    print(format_profile(import_profile(args.module), args.top))
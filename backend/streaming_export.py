@@ -0,0 +1,311 @@
+"""
+Certify Intel - Streaming Exports
+=================================
+
+Constant-memory exports: rows are read from the database in batches with a
+server-side cursor (``yield_per``) and written out as they arrive, so the
+size of an export no longer decides the size of the worker.
+
+    @app.get("/api/changes/export")
+    def export_changes(...):
+        rows = iter_rows(db, lambda s: s.query(DataChangeHistory)..., _change_row)
+        return streaming_download(csv_chunks(HEADER, rows), "changes.csv", "csv")
+
+Formats:
+
+- CSV and NDJSON are written row by row and sent with chunked transfer.
+- JSON documents stream the list and put the counts at the end.
+- Excel uses openpyxl's write-only workbook; the workbook is built in a
+  temporary file (rows are never held in memory) and then streamed.
+- Parquet (optional, needs ``pyarrow``) writes one row group per batch
+  into a temporary file and then streams it.
+
+Each export reads through its own session on the request session's engine,
+so it does not depend on the request session surviving until the last byte
+is sent. Batch size is EXPORT_BATCH_SIZE (default 500).
+"""
+
+import io
+import os
+import csv
+import json
+import logging
+import tempfile
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import types as sqltypes
+from sqlalchemy.orm import Query, Session
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "json": "application/json",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# Bytes per chunk when streaming a finished temporary file
+FILE_CHUNK_SIZE = 64 * 1024
+
+# Widest Excel column, in characters
+MAX_COLUMN_WIDTH = 50
+
+
+def export_batch_size() -> int:
+    return max(1, int(os.getenv("EXPORT_BATCH_SIZE", "500")))
+
+
+# =============================================================================
+# READING
+# =============================================================================
+
+def iter_batches(
+    db: Session,
+    build_query: Callable[[Session], Query],
+    batch_size: Optional[int] = None,
+) -> Iterator[list]:
+    """
+    Yield lists of at most ``batch_size`` results from a server-side cursor.
+
+    ``db`` is the request session. The export reads through its own session
+    on the same engine, passed to ``build_query`` and closed when the
+    generator finishes or is closed.
+    """
+    batch_size = batch_size or export_batch_size()
+    export_db = Session(bind=db.get_bind())
+    try:
+        results = iter(build_query(export_db).yield_per(batch_size))
+        while True:
+            batch = list(islice(results, batch_size))
+            if not batch:
+                return
+            yield batch
+    finally:
+        export_db.close()
+
+
+def iter_rows(
+    db: Session,
+    build_query: Callable[[Session], Query],
+    to_row: Callable[[Any], Any],
+    batch_size: Optional[int] = None,
+) -> Iterator[Any]:
+    """Yield ``to_row(obj)`` for each result, reading in batches."""
+    for batch in iter_batches(db, build_query, batch_size):
+        for obj in batch:
+            yield to_row(obj)
+
+
+def model_fields(obj: Any, fields: Sequence[str]) -> Dict[str, Any]:
+    """Plain dict of the named attributes (raw values, for any format)."""
+    return {name: getattr(obj, name, None) for name in fields}
+
+
+# =============================================================================
+# WRITERS
+# =============================================================================
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=_json_default, ensure_ascii=False)
+
+
+def _batched(rows: Iterable[Any], size: int) -> Iterator[list]:
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def csv_chunks(
+    header: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    batch_size: Optional[int] = None,
+) -> Iterator[bytes]:
+    """CSV, one chunk per batch of rows (plus one for the header)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    yield buffer.getvalue().encode("utf-8")
+    for batch in _batched(rows, batch_size or export_batch_size()):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(batch)
+        yield buffer.getvalue().encode("utf-8")
+
+
+def ndjson_chunks(rows: Iterable[Dict[str, Any]], batch_size: Optional[int] = None) -> Iterator[bytes]:
+    """Newline-delimited JSON, one object per line."""
+    for batch in _batched(rows, batch_size or export_batch_size()):
+        yield "".join(_dumps(row) + "\n" for row in batch).encode("utf-8")
+
+
+def json_document_chunks(
+    key: str,
+    rows: Iterable[Any],
+    tail: Optional[Callable[[int], Dict[str, Any]]] = None,
+    batch_size: Optional[int] = None,
+) -> Iterator[bytes]:
+    """
+    A JSON object ``{key: [rows...], **tail(count)}`` streamed row by row.
+
+    Fields that depend on the row count go in ``tail``, after the list.
+    """
+    yield ("{" + _dumps(key) + ": [").encode("utf-8")
+    count = 0
+    for batch in _batched(rows, batch_size or export_batch_size()):
+        parts = []
+        for row in batch:
+            parts.append(("," if count else "") + _dumps(row))
+            count += 1
+        yield "".join(parts).encode("utf-8")
+    closing = "]"
+    for name, value in (tail(count) if tail else {}).items():
+        closing += ", " + _dumps(name) + ": " + _dumps(value)
+    yield (closing + "}").encode("utf-8")
+
+
+def _stream_temp_file(write: Callable[[str], None], suffix: str) -> Iterator[bytes]:
+    """Let ``write(path)`` build a file, stream it, then delete it."""
+    fd, path = tempfile.mkstemp(prefix="certify_export_", suffix=suffix)
+    os.close(fd)
+    try:
+        write(path)
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(FILE_CHUNK_SIZE)
+                if not chunk:
+                    return
+                yield chunk
+    finally:
+        try:
+            os.remove(path)
+        except OSError as e:
+            logger.warning(f"Could not remove export file {path}: {e}")
+
+
+def xlsx_chunks(
+    sheets: Sequence[Tuple[str, Sequence[str], Iterable[Sequence[Any]]]],
+    column_widths: Optional[Dict[str, Sequence[int]]] = None,
+) -> Iterator[bytes]:
+    """
+    An Excel workbook with one sheet per ``(title, header, rows)``.
+
+    Write-only sheets cannot be measured after the fact, so column widths
+    come from the header length unless ``column_widths[title]`` is given.
+    """
+    from openpyxl import Workbook
+    from openpyxl.utils import get_column_letter
+
+    column_widths = column_widths or {}
+
+    def write(path: str) -> None:
+        wb = Workbook(write_only=True)
+        for title, header, rows in sheets:
+            ws = wb.create_sheet(title=title)
+            widths = column_widths.get(title) or [len(str(h)) + 2 for h in header]
+            for idx, width in enumerate(widths, start=1):
+                ws.column_dimensions[get_column_letter(idx)].width = min(max(width, 10), MAX_COLUMN_WIDTH)
+            ws.append(list(header))
+            for row in rows:
+                ws.append(list(row))
+        wb.save(path)
+
+    return _stream_temp_file(write, ".xlsx")
+
+
+def arrow_schema(model: Any, fields: Sequence[str]):
+    """Arrow schema for model columns; unknown or non-column fields become strings."""
+    columns = model.__table__.columns
+    arrow_fields = []
+    for name in fields:
+        column = columns.get(name)
+        column_type = column.type if column is not None else None
+        if isinstance(column_type, sqltypes.Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(column_type, sqltypes.Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column_type, (sqltypes.Float, sqltypes.Numeric)):
+            arrow_type = pa.float64()
+        elif isinstance(column_type, sqltypes.DateTime):
+            arrow_type = pa.timestamp("us")
+        elif isinstance(column_type, sqltypes.Date):
+            arrow_type = pa.date32()
+        else:
+            arrow_type = pa.string()
+        arrow_fields.append(pa.field(name, arrow_type))
+    return pa.schema(arrow_fields)
+
+
+def parquet_chunks(
+    schema,
+    rows: Iterable[Dict[str, Any]],
+    batch_size: Optional[int] = None,
+) -> Iterator[bytes]:
+    """Parquet with one row group per batch (requires pyarrow)."""
+    if not PARQUET_AVAILABLE:
+        raise RuntimeError("pyarrow is not installed")
+    string_fields = [f.name for f in schema if pa.types.is_string(f.type)]
+
+    def write(path: str) -> None:
+        with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+            for batch in _batched(rows, batch_size or export_batch_size()):
+                for row in batch:
+                    for name in string_fields:
+                        value = row.get(name)
+                        if value is not None and not isinstance(value, str):
+                            row[name] = str(value)
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+
+    return _stream_temp_file(write, ".parquet")
+
+
+# =============================================================================
+# RESPONSES
+# =============================================================================
+
+def check_format(format: str, allowed: Sequence[str]) -> str:
+    """Validate a ``format`` query parameter (400 if unknown, 501 if Parquet is unavailable)."""
+    format = (format or "").lower()
+    if format == "excel":
+        format = "xlsx"
+    if format not in allowed:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown format: {format}. Use one of: {', '.join(allowed)}",
+        )
+    if format == "parquet" and not PARQUET_AVAILABLE:
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+    return format
+
+
+def streaming_download(chunks: Iterator[bytes], filename: str, format: str) -> StreamingResponse:
+    """Attachment response sent with chunked transfer encoding."""
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
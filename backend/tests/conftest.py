@@ -9,6 +9,7 @@ import sys
 import pytest
 import hashlib
 import secrets
+import tempfile
 from datetime import datetime, timedelta
 from typing import Generator
 
@@ -19,6 +20,14 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 os.environ['TESTING'] = 'true'
 os.environ['DATABASE_URL'] = 'sqlite:///./test_certify_intel.db'
 os.environ.setdefault('SECRET_KEY', 'test-secret-key-for-pytest-do-not-use-in-prod')
+# Tests that exercise the persistent embedding cache enable it with a tmp path
+os.environ.setdefault('EMBEDDING_CACHE_ENABLED', 'false')
+os.environ.setdefault('PROVIDER_ID_CACHE_ENABLED', 'false')
+os.environ.setdefault('PAGE_CACHE_ENABLED', 'false')
+os.environ.setdefault('AI_RESPONSE_CACHE_ENABLED', 'false')
+# The API rate limiter would throttle the shared TestClient IP; tests build their own
+os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')
+os.environ.setdefault('LOCAL_VECTOR_INDEX_DIR', os.path.join(tempfile.gettempdir(), 'certify_intel_test_vector_index'))
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
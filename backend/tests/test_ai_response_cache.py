@@ -0,0 +1,166 @@
+"""
+Certify Intel - AI Response Cache Tests
+Tests for the persisted AIRouter response cache: repeats of low-temperature
+prompts skip the provider and count as saved spend, per-task TTLs, size
+based eviction and surviving a restart.
+"""
+import pytest
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytestmark = pytest.mark.timeout(10)
+
+
+@pytest.fixture
+def response_cache(tmp_path, monkeypatch):
+    """Enable the shared cache on a fresh file for one test."""
+    import ai_response_cache
+    monkeypatch.setenv("AI_RESPONSE_CACHE_ENABLED", "true")
+    cache = ai_response_cache.AIResponseCache(path=str(tmp_path / "responses.db"))
+    monkeypatch.setattr(ai_response_cache._shared, "instance", cache)
+    yield cache
+    cache.close()
+
+
+def _router():
+    """AIRouter whose OpenAI calls are counted instead of sent."""
+    from ai_router import AIRouter
+
+    router = AIRouter()
+    router._count_prompt_tokens = lambda prompt, system_prompt: 1000
+    calls = []
+
+    async def fake_openai(config, prompt, system_prompt, max_tokens, temperature):
+        calls.append(prompt)
+        return f"answer to {prompt}", 500
+
+    router._generate_openai = fake_openai
+    return router, calls
+
+
+class TestRouterCaching:
+
+    async def test_repeat_is_served_from_cache_and_saved(self, response_cache):
+        from ai_router import TaskType
+        router, calls = _router()
+
+        kwargs = dict(task_type=TaskType.CLASSIFICATION, model_override="gpt-4o", temperature=0.1)
+        first = await router.generate("classify this", **kwargs)
+        second = await router.generate("classify this", **kwargs)
+
+        assert calls == ["classify this"]
+        assert second["response"] == first["response"]
+        assert second["cached"] is True
+        assert second["cost_usd"] == 0.0
+        assert second["saved_usd"] == pytest.approx(first["cost_usd"])
+        assert router.cost_tracker.get_today_spend() == pytest.approx(first["cost_usd"])
+        assert router.cost_tracker.get_today_savings() == pytest.approx(first["cost_usd"])
+        summary = router.cost_tracker.get_usage_summary()
+        assert summary["total_requests"] == 1
+        assert summary["cache_hits"] == 1
+
+    async def test_cache_is_read_and_written_off_the_event_loop(self, response_cache, monkeypatch):
+        import threading
+        from ai_router import TaskType
+        router, calls = _router()
+        threads = []
+        for name in ("get", "put"):
+            method = getattr(response_cache, name)
+            monkeypatch.setattr(response_cache, name,
+                                lambda *a, _m=method: threads.append(threading.current_thread()) or _m(*a))
+
+        kwargs = dict(task_type=TaskType.CLASSIFICATION, model_override="gpt-4o", temperature=0.1)
+        await router.generate("classify this", **kwargs)
+        assert (await router.generate("classify this", **kwargs))["cached"] is True
+        assert len(threads) == 3 and threading.current_thread() not in threads
+
+    async def test_key_covers_parameters_and_model(self, response_cache):
+        from ai_router import TaskType
+        router, calls = _router()
+
+        base = dict(task_type=TaskType.CLASSIFICATION, model_override="gpt-4o", temperature=0.1)
+        await router.generate("p", **base)
+        await router.generate("p", **{**base, "max_tokens": 100})
+        await router.generate("p", **{**base, "temperature": 0.2})
+        await router.generate("p", **{**base, "model_override": "gpt-4o-mini"})
+        await router.generate("p", system_prompt="be brief", **base)
+        assert len(calls) == 5
+
+    async def test_generate_json_is_cached(self, response_cache):
+        from ai_router import TaskType
+        router, calls = _router()
+
+        kwargs = dict(task_type=TaskType.CLASSIFICATION, model_override="gpt-4o", temperature=0.1)
+        await router.generate_json("extract", **kwargs)
+        result = await router.generate_json("extract", **kwargs)
+        assert len(calls) == 1
+        assert result["cached"] is True
+
+    async def test_high_temperature_and_chat_are_not_cached(self, response_cache):
+        from ai_router import TaskType
+        router, calls = _router()
+
+        for _ in range(2):
+            await router.generate("hot", TaskType.CLASSIFICATION, model_override="gpt-4o", temperature=0.7)
+            await router.generate("chat", TaskType.CHAT, model_override="gpt-4o", temperature=0.0)
+        assert calls == ["hot", "chat", "hot", "chat"]
+
+    async def test_disabled_by_default(self, monkeypatch):
+        from ai_router import TaskType
+        monkeypatch.delenv("AI_RESPONSE_CACHE_ENABLED", raising=False)
+        router, calls = _router()
+
+        for _ in range(2):
+            await router.generate("p", TaskType.CLASSIFICATION, model_override="gpt-4o", temperature=0.0)
+        assert len(calls) == 2
+
+
+class TestAIResponseCache:
+
+    def test_ttl_per_task_type(self, monkeypatch):
+        from ai_response_cache import cache_ttl_seconds
+        monkeypatch.setenv("AI_RESPONSE_CACHE_TTL_HOURS", "classification=2, analysis=0, chat=1")
+        assert cache_ttl_seconds("classification", 0.0) == 7200
+        assert cache_ttl_seconds("summarization", 0.0) == 24 * 3600
+        assert cache_ttl_seconds("analysis", 0.0) is None
+        assert cache_ttl_seconds("chat", 0.0) == 3600
+        assert cache_ttl_seconds("strategy", 0.0) is None
+        assert cache_ttl_seconds("classification", 0.9) is None
+
+    def test_expired_entries_are_misses(self, response_cache):
+        response_cache.put("k", "classification", {"response": "x"}, ttl_seconds=0.01)
+        time.sleep(0.02)
+        assert response_cache.get("k") is None
+        assert response_cache.stats()["entries"] == 0
+        assert response_cache.stats()["size_bytes"] == 0
+
+    def test_evicts_least_recently_used_past_size_limit(self, tmp_path):
+        from ai_response_cache import AIResponseCache
+        cache = AIResponseCache(path=str(tmp_path / "small.db"), max_bytes=1000)
+        payload = {"response": "x" * 280}
+        cache.put("a", "classification", payload, 3600)
+        cache.put("b", "classification", payload, 3600)
+        cache.put("c", "classification", payload, 3600)
+        assert cache.get("a") is not None  # a is now more recent than b
+        cache.put("d", "classification", payload, 3600)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("d") is not None
+        assert cache.stats()["size_bytes"] <= 900
+        cache.close()
+
+    def test_survives_restart(self, tmp_path):
+        from ai_response_cache import AIResponseCache
+        path = str(tmp_path / "persist.db")
+        cache = AIResponseCache(path=path)
+        cache.put("k", "summarization", {"response": "kept"}, 3600)
+        cache.close()
+
+        reopened = AIResponseCache(path=path)
+        assert reopened.get("k") == {"response": "kept"}
+        assert reopened.stats()["size_bytes"] > 0
+        reopened.close()
@@ -342,6 +342,126 @@ class TestCostSavings:
         assert savings_pct > 80, f"Expected >80% savings, got {savings_pct:.1f}%"
 
 
+# =============================================================================
+# TEST: Streaming
+# =============================================================================
+
+def _streaming_router(fail=()):
+    """AIRouter whose providers stream canned text; providers in ``fail`` raise."""
+    from ai_router import AIRouter
+
+    router = AIRouter()
+    router._count_prompt_tokens = lambda prompt, system_prompt: 10
+    calls = []
+
+    async def fake_stream(config, prompt, system_prompt, max_tokens, temperature, usage):
+        calls.append(config.name)
+        behaviour = dict(fail).get(config.provider)
+        if behaviour == "before":
+            raise RuntimeError("provider down")
+        for text in ("Hello", " world"):
+            yield text
+            if behaviour == "after":
+                raise RuntimeError("connection reset")
+        usage["tokens_output"] = 2
+
+    router._stream_provider = fake_stream
+    return router, calls
+
+
+class TestStreaming:
+    """Test AIRouter.stream token streaming."""
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_tokens_then_done(self):
+        from ai_router import TaskType
+
+        router, _ = _streaming_router()
+        events = [e async for e in router.stream("hi", TaskType.CHAT, model_override="gpt-4o")]
+
+        assert [e["text"] for e in events[:-1]] == ["Hello", " world"]
+        done = events[-1]
+        assert done["type"] == "done"
+        assert done["response"] == "Hello world"
+        assert done["tokens_output"] == 2
+        assert done["ttft_ms"] is not None
+        assert done["cost_usd"] == router.cost_tracker.get_today_spend() > 0
+
+    @pytest.mark.asyncio
+    async def test_falls_back_before_first_token(self):
+        from ai_router import TaskType
+
+        router, calls = _streaming_router(fail=[("anthropic", "before")])
+        events = [e async for e in router.stream("hi", TaskType.ANALYSIS, model_override="claude-opus-4.5")]
+
+        assert calls == ["claude-opus-4.5", "gpt-4o"]
+        assert events[-1]["model"] == "gpt-4o"
+        assert router.cost_tracker.get_usage_summary()["total_requests"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failure_after_first_token_raises_and_records_usage(self):
+        from ai_router import TaskType
+
+        router, calls = _streaming_router(fail=[("openai", "after")])
+        received = []
+        with pytest.raises(RuntimeError, match="connection reset"):
+            async for event in router.stream("hi", TaskType.CHAT, model_override="gpt-4o"):
+                received.append(event)
+
+        assert calls == ["gpt-4o"]
+        assert [e["text"] for e in received] == ["Hello"]
+        assert router.cost_tracker.get_usage_summary()["total_requests"] == 1
+
+    @pytest.mark.asyncio
+    async def test_forward_tokens_streams_generate_but_not_json(self):
+        from ai_router import TaskType, forward_tokens
+
+        router, _ = _streaming_router()
+
+        async def fake_generate(**kwargs):
+            return {"response": '{"ok": true}'}
+
+        router._generate = fake_generate
+        seen = []
+        with forward_tokens(seen.append):
+            result = await router.generate("hi", TaskType.CHAT, model_override="gpt-4o")
+            parsed = await router.generate_json("hi", TaskType.CHAT, model_override="gpt-4o")
+
+        assert seen == ["Hello", " world"]
+        assert result["response"] == "Hello world"
+        assert parsed["response_json"] == {"ok": True}
+
+
+class TestRequestCoalescing:
+    """Test that concurrent identical generate() calls share a provider call."""
+
+    @pytest.mark.asyncio
+    async def test_shared_per_user_and_agent(self):
+        from ai_router import AIRouter, TaskType
+
+        router = AIRouter()
+        router._count_prompt_tokens = lambda prompt, system_prompt: 10
+        calls = []
+
+        async def fake_openai(config, prompt, system_prompt, max_tokens, temperature):
+            calls.append(prompt)
+            await asyncio.sleep(0.05)
+            return "answer", 5
+
+        router._generate_openai = fake_openai
+
+        def ask(user_id, agent_type="dashboard"):
+            return router.generate("top threats?", TaskType.CHAT, model_override="gpt-4o",
+                                   user_id=user_id, agent_type=agent_type)
+
+        results = await asyncio.gather(ask("u1"), ask("u1"), ask("u2"), ask("u1", "battlecard"))
+
+        assert len(calls) == 3
+        assert all(r["response"] == "answer" for r in results)
+        by_caller = {(r.user_id, r.agent_type) for r in router.cost_tracker._usage_records}
+        assert by_caller == {("u1", "dashboard"), ("u2", "dashboard"), ("u1", "battlecard")}
+
+
 # =============================================================================
 # RUN TESTS
 # =============================================================================
@@ -0,0 +1,171 @@
+"""
+Certify Intel - Analytics Dashboard Snapshot Tests
+Tests for the aggregate-query dashboard snapshot: section values, the
+30-day/7-day windows, and per-section invalidation on commit.
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+pytestmark = pytest.mark.timeout(10)
+
+
+@pytest.fixture
+def snap_db():
+    """Fresh in-memory database, empty cache and change listeners installed."""
+    from database import Base
+    import cache
+    import analytics_snapshot
+
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    cache.reset_cache()
+    analytics_snapshot.install_change_listeners()
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+        cache.reset_cache()
+
+
+def _seed(db):
+    from database import Competitor, DataChangeHistory, NewsArticleCache
+    now = datetime.utcnow()
+    db.add_all([
+        Competitor(name="Epic", status="Active", threat_level="High", data_quality_score=80,
+                   customer_count="2,500+", last_updated=now - timedelta(days=2),
+                   dim_product_packaging_score=4, dim_support_service_score=2),
+        Competitor(name="Cerner", status="Active", threat_level="", data_quality_score=None,
+                   last_updated=now - timedelta(days=7, hours=23),
+                   dim_product_packaging_score=2),
+        Competitor(name="Phreesia", status="", threat_level="Medium", data_quality_score=60,
+                   last_updated=now - timedelta(days=40)),
+        Competitor(name="Odd Threat", status="Discovered", threat_level="Critical",
+                   last_updated=now - timedelta(days=31, hours=1)),
+        Competitor(name="Deleted Co", status="Active", threat_level="High", is_deleted=True,
+                   dim_product_packaging_score=5),
+    ])
+    db.add_all([
+        NewsArticleCache(title="Up", sentiment="positive", published_at=now - timedelta(days=1)),
+        NewsArticleCache(title="Down", sentiment="negative", published_at=now - timedelta(days=3)),
+        NewsArticleCache(title="Meh", sentiment=None, published_at=now - timedelta(days=5)),
+        NewsArticleCache(title="Mixed", sentiment="mixed", published_at=now - timedelta(days=5)),
+        NewsArticleCache(title="Old", sentiment="positive", published_at=now - timedelta(days=45)),
+        NewsArticleCache(title="Archived", sentiment="positive", published_at=now, is_archived=True),
+    ])
+    db.add_all([
+        DataChangeHistory(competitor_id=1, field_name="pricing", changed_at=now - timedelta(days=1)),
+        DataChangeHistory(competitor_id=1, field_name="notes", changed_at=now - timedelta(days=9)),
+    ])
+    db.commit()
+
+
+class TestDashboardSnapshot:
+
+    def test_aggregates_match_dashboard_shape(self, snap_db):
+        from analytics_snapshot import get_dashboard_snapshot
+        _seed(snap_db)
+        data = get_dashboard_snapshot(snap_db)
+
+        assert data["summary"] == {
+            "total_competitors": 4,
+            "active_count": 2,
+            "discovered_count": 1,
+            "avg_data_quality": 35.0,
+            "fresh_data_count": 2,
+            "stale_data_count": 2,
+            "recent_changes": 1,
+        }
+        assert data["status_distribution"] == {"Active": 2, "Unknown": 1, "Discovered": 1}
+        # Missing threat counts as Low; unknown levels are ignored
+        assert data["threat_distribution"] == {"High": 1, "Medium": 1, "Low": 1}
+        # Unset sentiment counts as neutral; other labels only count toward the total
+        assert data["news_sentiment"] == {
+            "counts": {"positive": 1, "negative": 1, "neutral": 1}, "total": 4
+        }
+        assert data["dimension_averages"] == {"Product Packaging": 3.0, "Support Service": 2.0}
+
+    def test_market_positioning(self, snap_db):
+        from analytics_snapshot import get_dashboard_snapshot
+        _seed(snap_db)
+        epic = get_dashboard_snapshot(snap_db)["market_positioning"][0]
+        assert epic == {"name": "Epic", "x": 80, "y": 2500, "threat": "High", "size": 30, "website": None}
+        names = [m["name"] for m in get_dashboard_snapshot(snap_db)["market_positioning"]]
+        assert "Deleted Co" not in names
+
+    def test_empty_database(self, snap_db):
+        from analytics_snapshot import get_dashboard_snapshot
+        data = get_dashboard_snapshot(snap_db)
+        assert data["summary"]["total_competitors"] == 0
+        assert data["summary"]["avg_data_quality"] == 0
+        assert data["dimension_averages"] == {}
+        assert data["news_sentiment"]["total"] == 0
+
+    def test_commit_recomputes_only_changed_section(self, snap_db, monkeypatch):
+        import analytics_snapshot
+        from database import NewsArticleCache
+        _seed(snap_db)
+        analytics_snapshot.get_dashboard_snapshot(snap_db)
+
+        calls = []
+        for name, fn in list(analytics_snapshot.SECTIONS.items()):
+            def _spy(db, _fn=fn, _name=name):
+                calls.append(_name)
+                return _fn(db)
+            monkeypatch.setitem(analytics_snapshot.SECTIONS, name, _spy)
+
+        # Served entirely from the snapshot
+        analytics_snapshot.get_dashboard_snapshot(snap_db)
+        assert calls == []
+
+        snap_db.add(NewsArticleCache(title="New", sentiment="negative", published_at=datetime.utcnow()))
+        snap_db.commit()
+        data = analytics_snapshot.get_dashboard_snapshot(snap_db)
+        assert calls == ["news"]
+        assert data["news_sentiment"]["counts"]["negative"] == 2
+
+    def test_rollback_does_not_invalidate(self, snap_db, monkeypatch):
+        import analytics_snapshot
+        from database import Competitor
+        _seed(snap_db)
+        analytics_snapshot.get_dashboard_snapshot(snap_db)
+        invalidated = []
+        monkeypatch.setattr(analytics_snapshot, "invalidate_sections", lambda *n: invalidated.extend(n))
+
+        snap_db.add(Competitor(name="Tentative"))
+        snap_db.flush()
+        snap_db.rollback()
+        snap_db.commit()
+        assert invalidated == []
+
+        competitor = snap_db.query(Competitor).filter_by(name="Epic").one()
+        competitor.threat_level = "Low"
+        snap_db.commit()
+        assert invalidated == ["competitors"]
+
+    def test_bulk_ingest_invalidates_news(self, snap_db):
+        import analytics_snapshot
+        from news_ingest import ingest_articles
+        _seed(snap_db)
+        before = analytics_snapshot.get_dashboard_snapshot(snap_db)["news_sentiment"]["counts"]
+
+        ingest_articles(snap_db, [{
+            "competitor_id": 1, "competitor_name": "Epic", "title": "Bulk",
+            "url": "https://example.com/bulk", "sentiment": "negative",
+            "published_at": datetime.utcnow(),
+        }])
+        snap_db.commit()
+        after = analytics_snapshot.get_dashboard_snapshot(snap_db)["news_sentiment"]["counts"]
+        assert after["negative"] == before["negative"] + 1
@@ -0,0 +1,196 @@
+"""
+Certify Intel - Async Repository Tests
+Tests for the AsyncSession query helpers in repositories/ and the
+DB_LOOP_GUARD check for blocking sync queries on the event loop.
+"""
+import pytest
+import sys
+import os
+import asyncio
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+pytestmark = pytest.mark.timeout(30)
+
+
+@pytest.fixture
+async def session(tmp_path):
+    """AsyncSession on a fresh SQLite file with every table created."""
+    from database import Base
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'repo.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as s:
+        yield s
+    await engine.dispose()
+
+
+async def _add(session, *objects):
+    session.add_all(objects)
+    await session.commit()
+    return objects
+
+
+class TestChatRepository:
+
+    async def test_session_lifecycle(self, session):
+        from repositories import chat as chat_repo
+
+        other = await chat_repo.create_session(session, user_id=2, page_context="dashboard")
+        chat = await chat_repo.create_session(session, user_id=1, page_context="dashboard")
+        await chat_repo.add_message(session, chat, "user", "hello")
+        await chat_repo.add_message(session, chat, "assistant", "hi")
+
+        assert [s.id for s in await chat_repo.list_active_sessions(session, 1)] == [chat.id]
+        latest = await chat_repo.latest_session_for_context(session, 1, "dashboard")
+        assert latest.id == chat.id
+        assert [m.content for m in await chat_repo.list_messages(session, chat.id)] == ["hello", "hi"]
+        assert await chat_repo.get_user_session(session, other.id, 1) is None
+
+        await chat_repo.deactivate_session(session, chat)
+        assert await chat_repo.list_active_sessions(session, 1) == []
+
+
+class TestDashboardRepository:
+
+    async def test_top_threats_fills_by_level(self, session):
+        from database import Competitor
+        from repositories import dashboard as dashboard_repo
+
+        await _add(
+            session,
+            Competitor(name="High A", threat_level="High", product_overlap_score=40),
+            Competitor(name="High B", threat_level="high", product_overlap_score=90),
+            Competitor(name="Medium", threat_level="Medium", product_overlap_score=10),
+            Competitor(name="Low", threat_level="Low", product_overlap_score=None),
+            Competitor(name="Deleted", threat_level="High", product_overlap_score=99, is_deleted=True),
+        )
+        names = [c.name for c in await dashboard_repo.top_threats(session, limit=4)]
+        assert names == ["High B", "High A", "Medium", "Low"]
+
+    async def test_threat_level_changes_since(self, session):
+        from database import ChangeLog
+        from repositories import dashboard as dashboard_repo
+
+        now = datetime.utcnow()
+        await _add(
+            session,
+            ChangeLog(competitor_id=1, change_type="threat_level", previous_value="Low",
+                      new_value="High", detected_at=now - timedelta(days=1)),
+            ChangeLog(competitor_id=1, change_type="threat_level", previous_value="Medium",
+                      new_value="Low", detected_at=now - timedelta(days=200)),
+            ChangeLog(competitor_id=1, change_type="pricing", previous_value="1",
+                      new_value="2", detected_at=now),
+        )
+        changes = await dashboard_repo.threat_level_changes_since(session, now - timedelta(days=90))
+        assert [c.new_value for c in changes] == ["High"]
+
+
+class TestTeamsRepository:
+
+    async def test_teams_members_and_counts(self, session):
+        from database import User, Team, TeamMembership
+        from repositories import teams as teams_repo
+
+        alice, bob = await _add(
+            session,
+            User(email="alice@example.com", full_name="Alice"),
+            User(email="bob@example.com", full_name="Bob"),
+        )
+        team, other = await _add(session, Team(name="Sales"), Team(name="Other"))
+        await _add(
+            session,
+            TeamMembership(team_id=team.id, user_id=alice.id, role="owner"),
+            TeamMembership(team_id=team.id, user_id=bob.id),
+            TeamMembership(team_id=other.id, user_id=bob.id),
+        )
+
+        assert [(t.name, n) for t, n in await teams_repo.list_user_teams(session, alice.id)] == [("Sales", 2)]
+        assert await teams_repo.count_members(session, team.id) == 2
+        assert await teams_repo.get_membership(session, team.id, bob.id, roles=["owner"]) is None
+        members = await teams_repo.list_members(session, team.id)
+        assert sorted(u.email for _, u in members) == ["alice@example.com", "bob@example.com"]
+
+    async def test_annotations_join_user_competitor_and_reply_count(self, session):
+        from database import User, Competitor, CompetitorAnnotation, AnnotationReply
+        from repositories import teams as teams_repo
+
+        user, competitor = await _add(
+            session, User(email="ann@example.com", full_name="Ann"), Competitor(name="Acme")
+        )
+        note, orphan = await _add(
+            session,
+            CompetitorAnnotation(competitor_id=competitor.id, user_id=user.id, content="note"),
+            CompetitorAnnotation(competitor_id=competitor.id, user_id=999, content="orphan"),
+        )
+        await _add(
+            session,
+            AnnotationReply(annotation_id=note.id, user_id=user.id, content="r1"),
+            AnnotationReply(annotation_id=note.id, user_id=user.id, content="r2"),
+        )
+
+        rows = await teams_repo.list_annotations(
+            session,
+            CompetitorAnnotation.competitor_id == competitor.id,
+            order_by=(CompetitorAnnotation.id,),
+        )
+        assert [row[1:] for row in rows] == [
+            ("ann@example.com", "Ann", "Acme", 2),
+            (None, None, "Acme", 0),
+        ]
+        replies = await teams_repo.list_replies(session, note.id)
+        assert [(r.content, email) for r, email, _ in replies] == [("r1", "ann@example.com"), ("r2", "ann@example.com")]
+
+
+class TestEventLoopGuard:
+
+    def _query(self):
+        from database import engine
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT 1")).scalar()
+
+    def test_off_by_default(self, monkeypatch):
+        monkeypatch.delenv("DB_LOOP_GUARD", raising=False)
+
+        async def handler():
+            return self._query()
+
+        assert asyncio.run(handler()) == 1
+
+    def test_raise_mode_flags_queries_on_the_loop(self, monkeypatch):
+        from database import SyncQueryOnEventLoop, allow_sync_db
+        monkeypatch.setenv("DB_LOOP_GUARD", "raise")
+
+        async def handler():
+            return self._query()
+
+        async def exempt():
+            with allow_sync_db():
+                return self._query()
+
+        async def in_thread():
+            return await asyncio.to_thread(self._query)
+
+        with pytest.raises(SyncQueryOnEventLoop, match="test_async_repositories.py"):
+            asyncio.run(handler())
+        assert asyncio.run(exempt()) == 1
+        assert asyncio.run(in_thread()) == 1
+        assert self._query() == 1
+
+    def test_warn_mode_counts_call_sites(self, monkeypatch):
+        from database import sync_query_sites
+        monkeypatch.setenv("DB_LOOP_GUARD", "warn")
+
+        async def handler():
+            self._query()
+            return self._query()
+
+        before = sum(sync_query_sites().values())
+        assert asyncio.run(handler()) == 1
+        assert sum(sync_query_sites().values()) == before + 2
+        assert any("in _query" in site for site in sync_query_sites())
@@ -0,0 +1,148 @@
+"""
+Certify Intel - Backup Manager Tests
+Tests for online SQLite backups into the compressed, deduplicating chunk
+store, retention and chunk garbage collection, and verified restores.
+"""
+import pytest
+import sys
+import os
+import json
+import sqlite3
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytestmark = pytest.mark.timeout(10)
+
+
+@pytest.fixture
+def live_db(tmp_path, monkeypatch):
+    """A WAL-mode SQLite database with some rows, backed up into tmp_path/backups."""
+    import backup_manager
+
+    db_path = tmp_path / "live.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, body TEXT)")
+    conn.executemany("INSERT INTO items (body) VALUES (?)", [(f"row {i} " * 40,) for i in range(3000)])
+    conn.commit()
+    conn.close()
+
+    monkeypatch.setattr(backup_manager, "BACKUP_DIR", tmp_path / "backups")
+    monkeypatch.setattr(backup_manager, "CHUNK_SIZE", 64 * 1024)
+    monkeypatch.setattr(backup_manager, "database_url", lambda: f"sqlite:///{db_path}")
+    return db_path
+
+
+def _count(db_path, where=""):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM items {where}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _manifest(backup_dir, name):
+    return json.loads((backup_dir / name).read_text())
+
+
+class TestCreateBackup:
+
+    def test_backup_is_chunked_and_compressed(self, live_db):
+        import backup_manager
+        result = backup_manager.create_backup()
+        assert result["success"] is True
+        assert result["backup_file"].endswith(".manifest")
+        assert result["size_bytes"] == os.path.getsize(live_db)
+        # Repetitive rows compress well
+        assert 0 < result["stored_bytes"] < result["size_bytes"] / 4
+        assert result["new_chunks"] == result["chunks"] > 1
+
+    def test_unchanged_chunks_are_stored_once(self, live_db):
+        import backup_manager
+        first = backup_manager.create_backup()
+
+        conn = sqlite3.connect(live_db)
+        conn.execute("UPDATE items SET body = 'changed' WHERE id = 2999")
+        conn.commit()
+        conn.close()
+        second = backup_manager.create_backup()
+
+        assert second["backup_file"] != first["backup_file"]
+        assert 0 < second["new_chunks"] < second["chunks"] / 2
+        assert second["stored_bytes"] < first["stored_bytes"] / 2
+
+    def test_missing_database(self, live_db):
+        import backup_manager
+        os.remove(live_db)
+        assert backup_manager.create_backup() == {"success": False, "error": "Database file not found"}
+
+    def test_prune_removes_old_manifests_and_their_chunks(self, live_db):
+        import backup_manager
+        old = backup_manager.create_backup()
+        old_path = backup_manager.BACKUP_DIR / old["backup_file"]
+        os.utime(old_path, (0, 0))
+
+        conn = sqlite3.connect(live_db)
+        conn.execute("DELETE FROM items WHERE id > 100")
+        conn.commit()
+        conn.execute("VACUUM")
+        conn.close()
+        new = backup_manager.create_backup()
+
+        assert not old_path.exists()
+        assert [b["filename"] for b in backup_manager.list_backups()] == [new["backup_file"]]
+        stored = {p.name.split(".")[0] for p in (backup_manager.BACKUP_DIR / "chunks").glob("*/*")}
+        assert stored == {d for d, _ in _manifest(backup_manager.BACKUP_DIR, new["backup_file"])["chunks"]}
+
+
+class TestRestore:
+
+    def test_restore_round_trip(self, live_db):
+        import backup_manager
+        backup = backup_manager.create_backup()
+        backup_manager.verify_backup(backup["backup_file"])
+
+        conn = sqlite3.connect(live_db)
+        conn.execute("DELETE FROM items")
+        conn.commit()
+        conn.close()
+
+        result = backup_manager.restore_backup(backup["backup_file"])
+        assert result["success"] is True
+        assert result["pre_restore_backup"] != backup["backup_file"]
+        assert _count(live_db) == 3000
+
+    def test_corrupt_chunk_is_rejected_before_touching_the_database(self, live_db):
+        import backup_manager
+        backup = backup_manager.create_backup()
+        digest = _manifest(backup_manager.BACKUP_DIR, backup["backup_file"])["chunks"][1][0]
+        chunk = next((backup_manager.BACKUP_DIR / "chunks" / digest[:2]).glob(f"{digest}.*"))
+        raw = backup_manager._decompress(chunk.read_bytes(), chunk.suffix)
+        chunk.write_bytes(backup_manager._compress(b"x" + raw[1:])[0])
+
+        conn = sqlite3.connect(live_db)
+        conn.execute("DELETE FROM items WHERE id <= 10")
+        conn.commit()
+        conn.close()
+
+        with pytest.raises(backup_manager.BackupError):
+            backup_manager.restore_backup(backup["backup_file"])
+        assert _count(live_db) == 2990
+
+    def test_names_outside_the_backup_dir_are_refused(self, live_db):
+        import backup_manager
+        backup_manager.create_backup()
+        with pytest.raises(ValueError):
+            backup_manager.resolve_backup("../live.db")
+        with pytest.raises(FileNotFoundError):
+            backup_manager.resolve_backup("certify_intel_backup_19990101_000000.manifest")
+
+    def test_legacy_file_backups_are_listed_and_streamed(self, live_db):
+        import backup_manager
+        backup_manager.BACKUP_DIR.mkdir(parents=True)
+        legacy = backup_manager.BACKUP_DIR / "certify_intel_backup_20250101_000000.db"
+        legacy.write_bytes(live_db.read_bytes())
+        listed = backup_manager.list_backups()
+        assert listed[0]["format"] == "file"
+        assert b"".join(backup_manager.iter_backup(legacy)) == live_db.read_bytes()
+
@@ -110,6 +110,208 @@ class TestInMemoryCache:
         assert cache.get("key") == "new"
 
 
+class TestInMemoryCacheLRU:
+    """Tests for LRU ordering, byte budgets, namespaces and tags."""
+
+    def test_lru_evicts_least_recently_used(self):
+        from cache import InMemoryCache
+        cache = InMemoryCache(max_entries=3)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 3)
+        cache.get("a")  # "b" is now least recently used
+        cache.set("d", 4)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("d") == 4
+
+    def test_byte_budget_evicts(self):
+        from cache import InMemoryCache
+        cache = InMemoryCache()
+        cache.configure_namespace("small", max_bytes=250)
+        for i in range(5):
+            cache.set(f"k{i}", "x" * 100, namespace="small")
+        ns_stats = cache.stats()["namespaces"]["small"]
+        assert ns_stats["bytes"] <= 250
+        assert ns_stats["evictions"] == 3
+        assert cache.get("k4", namespace="small") == "x" * 100
+
+    def test_oversized_value_not_cached(self):
+        from cache import InMemoryCache
+        cache = InMemoryCache()
+        cache.configure_namespace("tiny", max_bytes=10)
+        cache.set("big", "x" * 100, namespace="tiny")
+        assert cache.get("big", namespace="tiny") is None
+
+    def test_namespaces_are_isolated(self):
+        from cache import InMemoryCache
+        cache = InMemoryCache()
+        cache.set("k", "api", namespace="api")
+        cache.set("k", "query", namespace="query")
+        assert cache.get("k", namespace="api") == "api"
+        cache.clear(namespace="api")
+        assert cache.get("k", namespace="api") is None
+        assert cache.get("k", namespace="query") == "query"
+
+    def test_tag_invalidation_spans_namespaces(self):
+        from cache import InMemoryCache
+        cache = InMemoryCache()
+        cache.set("a", 1, namespace="api", tags=["competitors"])
+        cache.set("b", 2, namespace="query", tags=["competitors", "news"])
+        cache.set("c", 3, namespace="query", tags=["news"])
+        assert cache.invalidate_tag("competitors") == 2
+        assert cache.get("a", namespace="api") is None
+        assert cache.get("b", namespace="query") is None
+        assert cache.get("c", namespace="query") == 3
+
+    def test_stats_track_hits_and_misses(self):
+        from cache import InMemoryCache
+        cache = InMemoryCache()
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("missing")
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate_pct"] == 50.0
+
+
+class _FakeRedisBus:
+    """Shared storage + pub/sub standing in for one Redis server."""
+
+    def __init__(self):
+        self.store = {}
+        self.tags = {}
+        self.subscribers = []
+
+
+class _FakeL2:
+    """Minimal RedisCache stand-in used to exercise TieredCache."""
+
+    def __init__(self, bus):
+        self.bus = bus
+
+    def get_with_ttl(self, key, namespace="default"):
+        return self.bus.store.get((namespace, key)), None
+
+    def set(self, key, value, ttl=300, namespace="default", tags=None):
+        self.bus.store[(namespace, key)] = value
+        for tag in tags or ():
+            self.bus.tags.setdefault(tag, set()).add((namespace, key))
+        return True
+
+    def delete(self, key, namespace="default"):
+        self.bus.store.pop((namespace, key), None)
+
+    def clear(self, namespace=None):
+        self.bus.store.clear()
+
+    def keys(self, pattern=None, namespace="default"):
+        return [k for ns, k in self.bus.store if ns == namespace]
+
+    def pop_tag(self, tag):
+        members = self.bus.tags.pop(tag, set())
+        for member in members:
+            self.bus.store.pop(member, None)
+        return list(members)
+
+    def invalidate_pattern(self, pattern, namespace=None):
+        doomed = [m for m in self.bus.store if pattern in m[1]]
+        for member in doomed:
+            del self.bus.store[member]
+        return len(doomed)
+
+    def publish(self, message):
+        for callback in self.bus.subscribers:
+            callback(message)
+
+    def subscribe(self, callback):
+        self.bus.subscribers.append(callback)
+
+    def close(self):
+        pass
+
+    def stats(self):
+        return {"backend": "fake"}
+
+
+class TestTieredCache:
+    """Tests for the L1 + L2 tiered cache."""
+
+    def _workers(self):
+        from cache import InMemoryCache, TieredCache
+        bus = _FakeRedisBus()
+        return (
+            TieredCache(InMemoryCache(), _FakeL2(bus)),
+            TieredCache(InMemoryCache(), _FakeL2(bus)),
+        )
+
+    def test_l2_hit_promotes_into_l1(self):
+        w1, w2 = self._workers()
+        w1.set("k", {"v": 1}, namespace="api")
+        assert w2.l1.get("k", namespace="api") is None
+        assert w2.get("k", namespace="api") == {"v": 1}
+        assert w2.l1.get("k", namespace="api") == {"v": 1}
+
+    def test_tag_invalidation_reaches_other_workers(self):
+        w1, w2 = self._workers()
+        w1.set("k", "v", namespace="api", tags=["competitors"])
+        assert w2.get("k", namespace="api") == "v"  # now cached in w2's L1
+        w1.invalidate_tag("competitors")
+        assert w2.l1.get("k", namespace="api") is None
+        assert w2.get("k", namespace="api") is None
+
+    def test_set_drops_stale_l1_copy_on_other_workers(self):
+        w1, w2 = self._workers()
+        w1.set("k", "old")
+        assert w2.get("k") == "old"
+        w1.set("k", "new")
+        assert w2.get("k") == "new"
+
+    def test_l1_ttl_is_capped(self):
+        from cache import InMemoryCache, TieredCache
+        cache = TieredCache(InMemoryCache(), _FakeL2(_FakeRedisBus()), l1_max_ttl=1)
+        cache.set("k", "v", ttl=3600)
+        time.sleep(1.1)
+        assert cache.l1.get("k") is None
+        assert cache.get("k") == "v"  # still served from L2
+
+    def test_stats_include_both_tiers(self):
+        w1, _ = self._workers()
+        stats = w1.stats()
+        assert stats["backend"] == "tiered"
+        assert "namespaces" in stats["l1"]
+        assert stats["l2"]["backend"] == "fake"
+
+
+class TestPerformanceCacheFacade:
+    """PerformanceCache should delegate to the unified cache."""
+
+    def test_round_trip_and_tag_invalidation(self):
+        from cache import reset_cache
+        from performance import PerformanceCache
+        reset_cache()
+        pc = PerformanceCache(max_size=10, default_ttl=60, namespace="perf_test")
+        pc.set("key", {"a": 1}, tags=["perf"])
+        assert pc.get("key") == {"a": 1}
+        assert pc.invalidate(tag="perf") == 1
+        assert pc.get("key") is None
+        reset_cache()
+
+    def test_namespace_stats(self):
+        from cache import reset_cache
+        from performance import PerformanceCache
+        reset_cache()
+        pc = PerformanceCache(max_size=2, default_ttl=60, namespace="perf_stats")
+        for i in range(3):
+            pc.set(f"k{i}", i)
+        stats = pc.stats()
+        assert stats["namespace"] == "perf_stats"
+        assert stats["entries"] == 2
+        assert stats["evictions"] == 1
+        reset_cache()
+
+
 # ==============================================================================
 # get_cache Singleton Tests
 # ==============================================================================
@@ -258,3 +460,160 @@ class TestTaskService:
         # Direct dict mutation (how main.py currently works)
         svc.tasks["t1"]["status"] = "completed"
         assert svc.get("t1")["status"] == "completed"
+
+
+# ==============================================================================
+# Request Coalescing Tests
+# ==============================================================================
+
+class TestSingleFlight:
+    """Concurrent identical calls should share one computation."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_computation(self):
+        import asyncio
+        from performance import SingleFlight
+        flight = SingleFlight()
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"value": 42}
+
+        results = await asyncio.gather(*[flight.do("k", compute) for _ in range(10)])
+        assert calls == 1
+        assert all(r == {"value": 42} for r in results)
+        assert flight.stats()["coalesced"] == 9
+        assert flight.stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_all_callers(self):
+        import asyncio
+        from performance import SingleFlight
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            flight.do("k", fail), flight.do("k", fail), return_exceptions=True
+        )
+        assert all(isinstance(r, ValueError) for r in results)
+
+    def test_sync_single_flight_coalesces_threads(self):
+        import threading
+        from performance import SyncSingleFlight
+        flight = SyncSingleFlight()
+        calls = 0
+        started = threading.Event()
+
+        def compute():
+            nonlocal calls
+            calls += 1
+            started.set()
+            time.sleep(0.1)
+            return "done"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(flight.do("k", compute)))
+            for _ in range(5)
+        ]
+        threads[0].start()
+        started.wait(1)
+        for t in threads[1:]:
+            t.start()
+        for t in threads:
+            t.join(2)
+        assert calls == 1
+        assert results == ["done"] * 5
+
+
+class TestCachedResponseCoalescing:
+    """cached_response should coalesce misses and serve stale entries."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_compute_once(self):
+        import asyncio
+        from cache import reset_cache
+        from performance import cached_response
+        reset_cache()
+        calls = 0
+
+        @cached_response(ttl_seconds=60, key_prefix="coalesce_test:")
+        async def endpoint(q: str = "x", db=None):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"q": q}
+
+        results = await asyncio.gather(*[endpoint(q="a", db=object()) for _ in range(5)])
+        assert calls == 1  # db is not part of the key
+        assert results == [{"q": "a"}] * 5
+        reset_cache()
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_while_refreshing(self):
+        import asyncio
+        from cache import reset_cache
+        from performance import cached_response
+        reset_cache()
+        calls = 0
+
+        @cached_response(ttl_seconds=1, stale_ttl_seconds=30, key_prefix="swr_test:")
+        async def endpoint():
+            nonlocal calls
+            calls += 1
+            return {"version": calls}
+
+        assert await endpoint() == {"version": 1}
+        await asyncio.sleep(1.1)
+        # Expired: the stale value comes back immediately, a refresh runs in the background
+        assert await endpoint() == {"version": 1}
+        await asyncio.sleep(0.05)
+        assert await endpoint() == {"version": 2}
+        assert calls == 2
+        reset_cache()
+
+    def test_sync_endpoint_stays_sync(self):
+        import asyncio
+        from performance import cached_response
+
+        @cached_response(ttl_seconds=60, key_prefix="sync_test:")
+        def endpoint(db=None):
+            return {"ok": True}
+
+        assert not asyncio.iscoroutinefunction(endpoint)
+        assert endpoint(db=object()) == {"ok": True}
+
+
+class TestAIRouterCoalescing:
+    """AIRouter.generate should share one provider call for identical requests."""
+
+    @pytest.mark.asyncio
+    async def test_identical_generate_calls_share_provider_call(self):
+        import asyncio
+        from unittest.mock import patch
+        from ai_router import AIRouter, TaskType
+        router = AIRouter()
+        calls = 0
+
+        async def fake_generate(**kwargs):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"response": "hi", "model": "m", "cost_usd": 0.01}
+
+        with patch.object(router, "_generate", side_effect=fake_generate):
+            results = await asyncio.gather(*[
+                router.generate(prompt="same", task_type=TaskType.CHAT) for _ in range(4)
+            ])
+            other = await router.generate(prompt="different", task_type=TaskType.CHAT)
+
+        assert calls == 2
+        assert all(r["response"] == "hi" for r in results)
+        assert results[0] is not results[1]  # each caller gets its own dict
+        assert other["response"] == "hi"
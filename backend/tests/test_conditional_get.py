@@ -0,0 +1,197 @@
+"""
+Certify Intel - Conditional GET Tests
+Tests for ETag / If-None-Match support: body-hash ETags from
+ConditionalGetMiddleware, data_versions change counters, and
+conditional_response answering 304 before the endpoint runs.
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import Depends, FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+pytestmark = pytest.mark.timeout(10)
+
+
+@pytest.fixture
+def version_db():
+    """In-memory database with the version listeners installed."""
+    from database import Base
+    import data_versions
+
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    data_versions.install_version_listeners()
+    SessionLocal = sessionmaker(bind=engine)
+    yield SessionLocal
+    engine.dispose()
+
+
+def _middleware_client():
+    from middleware.conditional import ConditionalGetMiddleware
+
+    app = FastAPI()
+    state = {"items": [1, 2, 3]}
+
+    @app.get("/api/items")
+    async def items():
+        return {"items": state["items"]}
+
+    @app.get("/api/text")
+    async def text():
+        return PlainTextResponse("hello")
+
+    @app.get("/api/stream")
+    async def stream():
+        async def chunks():
+            yield b'{"a":'
+            yield b'1}'
+        return StreamingResponse(chunks(), media_type="application/json")
+
+    @app.get("/api/missing")
+    async def missing():
+        from fastapi import HTTPException
+        raise HTTPException(status_code=404, detail="nope")
+
+    @app.post("/api/items")
+    async def add():
+        state["items"].append(len(state["items"]) + 1)
+        return {"items": state["items"]}
+
+    app.add_middleware(ConditionalGetMiddleware)
+    return TestClient(app)
+
+
+class TestConditionalGetMiddleware:
+
+    def test_etag_and_not_modified(self):
+        client = _middleware_client()
+        first = client.get("/api/items")
+        etag = first.headers["ETag"]
+        assert etag.startswith('"') and first.headers["Cache-Control"] == "private, no-cache"
+
+        again = client.get("/api/items", headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        assert again.content == b""
+        assert again.headers["ETag"] == etag
+        assert "content-length" not in again.headers or again.headers["content-length"] == "0"
+
+        # Weak comparison and lists of candidates
+        assert client.get("/api/items", headers={"If-None-Match": f'"x", W/{etag}'}).status_code == 304
+
+    def test_changed_body_gets_new_etag(self):
+        client = _middleware_client()
+        etag = client.get("/api/items").headers["ETag"]
+        assert "ETag" not in client.post("/api/items").headers
+        changed = client.get("/api/items", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.json() == {"items": [1, 2, 3, 4]}
+        assert changed.headers["ETag"] != etag
+
+    def test_non_json_streamed_and_errors_pass_through(self):
+        client = _middleware_client()
+        assert "ETag" not in client.get("/api/text").headers
+        streamed = client.get("/api/stream")
+        assert streamed.json() == {"a": 1}
+        assert "ETag" not in streamed.headers
+        assert "ETag" not in client.get("/api/missing").headers
+
+
+class TestDataVersions:
+
+    def test_commit_bumps_tracked_tables_only(self, version_db):
+        from data_versions import get_versions, track_tables
+        from database import Competitor, User
+        track_tables("competitors")
+        db = version_db()
+        db.add(Competitor(name="Epic"))
+        db.add(User(email="a@example.com", hashed_password="x"))
+        db.commit()
+        versions = get_versions(db, ["competitors", "users"])
+        assert versions == {"competitors": 1, "users": 0}
+
+        db.query(Competitor).filter_by(name="Epic").update({"threat_level": "High"})
+        db.commit()
+        assert get_versions(db, ["competitors"])["competitors"] == 2
+        db.close()
+
+    def test_rollback_and_reads_do_not_bump(self, version_db):
+        from data_versions import get_versions, track_tables
+        from database import Competitor
+        track_tables("competitors")
+        db = version_db()
+        db.add(Competitor(name="Tentative"))
+        db.flush()
+        db.rollback()
+        db.query(Competitor).all()
+        db.commit()
+        assert get_versions(db, ["competitors"])["competitors"] == 0
+        db.close()
+
+
+class TestConditionalResponse:
+
+    def _client(self, version_db, calls):
+        from data_versions import conditional_response
+        from database import Competitor
+
+        def get_db():
+            db = version_db()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app = FastAPI()
+
+        @app.get("/api/competitors")
+        @conditional_response(tables=["competitors"])
+        async def list_competitors(limit: int = 100, db: Session = Depends(get_db)):
+            calls.append(limit)
+            return [c.name for c in db.query(Competitor).order_by(Competitor.id).limit(limit)]
+
+        return TestClient(app)
+
+    def test_not_modified_skips_the_endpoint(self, version_db):
+        calls = []
+        client = self._client(version_db, calls)
+        first = client.get("/api/competitors")
+        etag = first.headers["ETag"]
+        response = client.get("/api/competitors", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert calls == [100]
+
+    def test_etag_changes_with_writes_and_query(self, version_db):
+        from database import Competitor
+        calls = []
+        client = self._client(version_db, calls)
+        etag = client.get("/api/competitors").headers["ETag"]
+        assert client.get("/api/competitors?limit=5").headers["ETag"] != etag
+
+        db = version_db()
+        db.add(Competitor(name="Cerner"))
+        db.commit()
+        db.close()
+        response = client.get("/api/competitors", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json() == ["Cerner"]
+        assert response.headers["ETag"] != etag
+
+    def test_time_bucket_bounds_staleness(self, version_db, monkeypatch):
+        import data_versions
+        calls = []
+        client = self._client(version_db, calls)
+        etag = client.get("/api/competitors").headers["ETag"]
+        now = data_versions.time.time()
+        monkeypatch.setattr(data_versions.time, "time", lambda: now + data_versions.version_max_age())
+        assert client.get("/api/competitors", headers={"If-None-Match": etag}).status_code == 200
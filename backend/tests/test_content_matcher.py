@@ -389,3 +389,126 @@ async def test_build_content_aware_fragment_fetch_fails():
     assert result is None
 
     clear_cache()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Pooled fetching and persistent page cache
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+def _mock_client(*responses):
+    client = AsyncMock()
+    client.is_closed = False
+    client.get = AsyncMock(side_effect=list(responses))
+    return client
+
+
+def _response(status_code, text="", headers=None):
+    resp = MagicMock()
+    resp.status_code = status_code
+    resp.text = text
+    resp.headers = headers or {}
+    return resp
+
+
+@pytest.fixture
+def disk_cache(tmp_path, monkeypatch):
+    """Enable the on-disk page cache with a temporary file."""
+    import page_cache
+    monkeypatch.setenv("PAGE_CACHE_ENABLED", "true")
+    cache = page_cache.PageCache(path=str(tmp_path / "pages.db"))
+    monkeypatch.setattr(page_cache._shared, "instance", cache)
+    clear_cache()
+    yield cache
+    clear_cache()
+    cache.close()
+
+
+def test_memory_cache_evicts_least_recently_used(monkeypatch):
+    """The in-memory cache drops its oldest entry once full."""
+    import content_matcher
+    monkeypatch.setattr(content_matcher, "MAX_CACHE_ENTRIES", 2)
+    clear_cache()
+    content_matcher._remember("https://a.example.com", "a")
+    content_matcher._remember("https://b.example.com", "b")
+    assert content_matcher._cached_text("https://a.example.com") == "a"
+    content_matcher._remember("https://c.example.com", "c")
+    assert list(_page_cache) == ["https://a.example.com", "https://c.example.com"]
+    clear_cache()
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    from page_cache import PageCache
+    cache = PageCache(path=str(tmp_path / "small.db"), max_entries=2)
+    cache.put("https://a.example.com", "a")
+    cache.put("https://b.example.com", "b")
+    cache.put("https://a.example.com", "a2")  # replace, not a new row
+    cache.put("https://c.example.com", "c")
+    assert cache.stats()["entries"] == 2
+    assert cache.get("https://b.example.com") is None
+    assert cache.get("https://a.example.com").text == "a2"
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_page_cache_persists_and_revalidates(disk_cache):
+    """Stale pages are revalidated with their ETag; a 304 reuses the cached text."""
+    import content_matcher
+    url = "https://example.com/about"
+    first = _mock_client(_response(200, "<p>About us</p>", {"ETag": '"v1"'}))
+    with patch("content_matcher.httpx.AsyncClient", return_value=first):
+        assert await fetch_page_text(url) == "About us"
+    assert disk_cache.get(url).etag == '"v1"'
+
+    # Process restart: memory cache empty, disk copy still fresh
+    _page_cache.clear()
+    assert await fetch_page_text(url) == "About us"
+
+    # Expire the entry; the next fetch sends If-None-Match
+    _page_cache.clear()
+    disk_cache._conn.execute("UPDATE pages SET fetched_at = 0")
+    revalidate = _mock_client(_response(304))
+    with patch("content_matcher.httpx.AsyncClient", return_value=revalidate):
+        await content_matcher.close_shared_client()
+        assert await fetch_page_text(url) == "About us"
+    headers = revalidate.get.call_args.kwargs["headers"]
+    assert headers["If-None-Match"] == '"v1"'
+    assert disk_cache.get(url).fetched_at > 0
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_is_read_off_the_event_loop(disk_cache, monkeypatch):
+    """Disk hits (SELECT + last_used_at UPDATE) don't block the event loop thread."""
+    import threading
+    url = "https://example.com/pricing"
+    disk_cache.put(url, "Pricing")
+    readers = []
+    get = disk_cache.get
+    monkeypatch.setattr(disk_cache, "get", lambda u: readers.append(threading.current_thread()) or get(u))
+    assert await fetch_page_text(url) == "Pricing"
+    assert readers and threading.current_thread() not in readers
+
+
+@pytest.mark.asyncio
+async def test_fetch_source_pages_batches_unique_urls():
+    """All of a competitor's source pages are fetched once each, concurrently."""
+    clear_cache()
+    sources = [
+        MagicMock(source_page_url="https://example.com/pricing", source_url=None),
+        MagicMock(source_page_url="https://example.com/pricing", source_url=None),
+        MagicMock(source_page_url=None, source_url="https://example.com/team"),
+    ]
+    client = AsyncMock()
+    client.is_closed = False
+    client.get = AsyncMock(side_effect=lambda url, headers=None: _response(200, f"<p>{url}</p>"))
+
+    from content_matcher import fetch_source_pages
+    with patch("content_matcher.httpx.AsyncClient", return_value=client):
+        pages = await fetch_source_pages(sources)
+
+    assert pages == {
+        "https://example.com/pricing": "https://example.com/pricing",
+        "https://example.com/team": "https://example.com/team",
+    }
+    assert client.get.call_count == 2
+    clear_cache()
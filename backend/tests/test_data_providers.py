@@ -37,6 +37,12 @@ from data_providers.orbis import OrbisProvider
 # ──────────────────────────────────────────────────────────────────────────────
 
 
+@pytest.fixture(autouse=True)
+def no_provider_id_cache(monkeypatch):
+    """Tests here clear os.environ; keep the on-disk ID cache off regardless."""
+    monkeypatch.setattr("data_providers.id_cache.is_enabled", lambda: False)
+
+
 @pytest.fixture
 def mock_provider_env():
     """Mock environment with PitchBook and Crunchbase configured."""
@@ -0,0 +1,172 @@
+"""
+Certify Intel - Embedding Cache Tests
+Tests for the persistent (model, text hash) embedding cache and the
+embedding paths that use it: only misses reach the provider, vectors
+survive a restart, LRU pruning and hit/miss metrics.
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from unittest.mock import MagicMock, patch
+
+pytestmark = pytest.mark.timeout(10)
+
+
+@pytest.fixture
+def emb_cache(tmp_path, monkeypatch):
+    """Enable the shared cache on a fresh file for one test."""
+    import embedding_cache
+    monkeypatch.setenv("EMBEDDING_CACHE_ENABLED", "true")
+    cache = embedding_cache.EmbeddingCache(path=str(tmp_path / "embeddings.db"))
+    monkeypatch.setattr(embedding_cache._shared, "instance", cache)
+    yield cache
+    cache.close()
+
+
+class _FakeProvider:
+    """Records which texts were sent to the provider."""
+
+    def __init__(self, dim=4):
+        self.dim = dim
+        self.calls = []
+
+    def vector(self, text):
+        rng = np.random.default_rng(abs(hash(text)) % (2 ** 32))
+        return rng.normal(size=self.dim).tolist()
+
+    async def __call__(self, texts):
+        self.calls.append(list(texts))
+        return [self.vector(t) for t in texts]
+
+
+class TestEmbeddingCache:
+
+    async def test_only_misses_are_embedded(self, emb_cache):
+        from embedding_cache import cached_embed
+        provider = _FakeProvider()
+        first = await cached_embed("model-a", ["alpha", "beta"], provider)
+        second = await cached_embed("model-a", ["beta", "gamma", "alpha", "gamma"], provider)
+        assert provider.calls == [["alpha", "beta"], ["gamma"]]
+        assert np.array_equal(second[0], first[1])
+        assert np.array_equal(second[2], first[0])
+        assert np.array_equal(second[1], second[3])
+        assert all(v.dtype == np.float32 for v in second)
+
+    async def test_hits_are_copies_served_off_the_event_loop(self, emb_cache, monkeypatch):
+        import threading
+        from embedding_cache import cached_embed
+        readers = []
+        get_many = emb_cache.get_many
+        monkeypatch.setattr(emb_cache, "get_many",
+                            lambda *a: readers.append(threading.current_thread()) or get_many(*a))
+        provider = _FakeProvider()
+        first = await cached_embed("model-a", ["alpha"], provider)
+        original = first[0].copy()
+        first[0] *= 0  # Callers may edit their vectors in place
+        second = await cached_embed("model-a", ["alpha"], provider)
+        second[0][0] = 99.0
+        third = await cached_embed("model-a", ["alpha"], provider)
+        assert np.array_equal(third[0], original)
+        assert len(provider.calls) == 1
+        assert readers and threading.current_thread() not in readers
+
+    async def test_keys_are_normalized_and_per_model(self, emb_cache):
+        from embedding_cache import cached_embed
+        provider = _FakeProvider()
+        await cached_embed("model-a", ["Pricing  strategy\n"], provider)
+        await cached_embed("model-a", [" Pricing strategy"], provider)
+        assert len(provider.calls) == 1
+        # Case is significant, and another model never reuses the vector
+        await cached_embed("model-a", ["pricing strategy"], provider)
+        await cached_embed("model-b", ["Pricing strategy"], provider)
+        assert len(provider.calls) == 3
+
+    async def test_vectors_persist_across_instances(self, emb_cache, tmp_path, monkeypatch):
+        import embedding_cache
+        provider = _FakeProvider()
+        original = await embedding_cache.cached_embed("model-a", ["persisted"], provider)
+        emb_cache.close()
+
+        reopened = embedding_cache.EmbeddingCache(path=emb_cache.path)
+        monkeypatch.setattr(embedding_cache._shared, "instance", reopened)
+        again = await embedding_cache.cached_embed("model-a", ["persisted"], provider)
+        assert len(provider.calls) == 1
+        assert np.allclose(again[0], original[0])
+        assert reopened.stats()["entries"] == 1
+        reopened.close()
+
+    def test_prunes_least_recently_used(self, tmp_path):
+        from embedding_cache import EmbeddingCache, text_key
+        cache = EmbeddingCache(path=str(tmp_path / "small.db"), max_entries=10, memory_entries=1)
+        for i in range(10):
+            cache.put_many("m", [(text_key(f"t{i}"), np.full(3, i, dtype=np.float32))])
+        # Touch t0 so it is the most recently used
+        cache.get_many("m", [text_key("t0")])
+        cache.put_many("m", [(text_key("t10"), np.zeros(3, dtype=np.float32))])
+        assert cache.stats()["entries"] == 9
+        remaining = cache.get_many("m", [text_key(f"t{i}") for i in range(11)])
+        assert text_key("t0") in remaining
+        assert text_key("t1") not in remaining
+        cache.close()
+
+    async def test_disabled_cache_calls_provider(self, monkeypatch):
+        import embedding_cache
+        monkeypatch.setenv("EMBEDDING_CACHE_ENABLED", "false")
+        provider = _FakeProvider()
+        await embedding_cache.cached_embed("model-a", ["x", "x"], provider)
+        await embedding_cache.cached_embed("model-a", ["x"], provider)
+        assert provider.calls == [["x", "x"], ["x"]]
+
+    async def test_hit_miss_metrics_exported(self, emb_cache):
+        import metrics
+        from embedding_cache import cached_embed
+        before = metrics.get_metrics_summary()
+        provider = _FakeProvider()
+        await cached_embed("model-a", ["one", "two"], provider)
+        await cached_embed("model-a", ["one", "three"], provider)
+        after = metrics.get_metrics_summary()
+        assert after["embedding_cache_hits"] - before["embedding_cache_hits"] == 1
+        assert after["embedding_cache_misses"] - before["embedding_cache_misses"] == 3
+        assert emb_cache.stats()["hit_rate"] == 0.25
+
+
+class TestEmbeddingPaths:
+
+    async def test_knowledge_base_batch_embed_uses_cache(self, emb_cache):
+        from knowledge_base import KnowledgeBase
+        kb = KnowledgeBase()
+        provider = _FakeProvider()
+        kb._embed_openai = provider
+        first = await kb._batch_embed(["chunk one", "chunk two"])
+        second = await kb._batch_embed(["chunk two", "chunk three"])
+        assert provider.calls == [["chunk one", "chunk two"], ["chunk three"]]
+        assert isinstance(second[0], list)
+        assert np.allclose(second[0], first[1])
+
+    async def test_vector_store_shares_cache_with_knowledge_base(self, emb_cache):
+        from knowledge_base import KnowledgeBase
+        from vector_store import VectorStore
+        kb = KnowledgeBase()
+        kb._embed_openai = _FakeProvider()
+        await kb._batch_embed(["what is epic pricing"])
+
+        vs = VectorStore()
+        provider = _FakeProvider()
+        vs._embed_uncached = provider
+        embedding = await vs.embed_text("what is epic pricing")
+        assert provider.calls == []
+        assert embedding.shape == (4,)
+
+    def test_local_embed_batch_encodes_only_misses(self, emb_cache):
+        from local_embeddings import embed_batch
+        mock_model = MagicMock()
+        mock_model.encode.side_effect = lambda texts, **kw: np.ones((len(texts), 384))
+        with patch("local_embeddings._get_model", return_value=mock_model):
+            embed_batch(["text1", "text2"])
+            result = embed_batch(["text2", "text3"])
+        assert len(result) == 2 and len(result[0]) == 384
+        assert [c.args[0] for c in mock_model.encode.call_args_list] == [["text1", "text2"], ["text3"]]
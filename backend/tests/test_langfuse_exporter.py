@@ -0,0 +1,173 @@
+"""
+Certify Intel - Langfuse Exporter Tests
+Tests for the background Langfuse export pipeline: size and time flush
+triggers, drop-oldest backpressure, gzip batch uploads, counters, and
+draining on shutdown.
+"""
+import pytest
+import sys
+import os
+import gzip
+import json
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytestmark = pytest.mark.timeout(10)
+
+
+class _Sink:
+    """``send`` callable recording batches; can be held closed with ``gate``."""
+
+    def __init__(self, ok=True):
+        self.batches = []
+        self.ok = ok
+        self.gate = threading.Event()
+        self.gate.set()
+        self.called = threading.Event()
+
+    def __call__(self, events):
+        self.called.set()
+        self.gate.wait(5)
+        self.batches.append(list(events))
+        return self.ok
+
+
+class _Response:
+    status_code = 207
+    text = ""
+
+
+class _Session:
+    """Stand-in for requests.Session capturing posts."""
+
+    def __init__(self):
+        self.auth = None
+        self.posts = []
+        self.closed = False
+
+    def post(self, url, data=None, headers=None, timeout=None):
+        self.posts.append({"url": url, "data": data, "headers": headers})
+        return _Response()
+
+    def close(self):
+        self.closed = True
+
+
+def _exporter(sink, **kwargs):
+    from observability import LangfuseExporter
+    kwargs.setdefault("flush_interval", 60)
+    return LangfuseExporter(sink, **kwargs)
+
+
+def _wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestExporter:
+
+    def test_size_trigger_sends_a_batch(self):
+        sink = _Sink()
+        exporter = _exporter(sink, flush_at=3)
+        for i in range(3):
+            exporter.add({"n": i})
+        assert _wait_for(lambda: exporter.stats["exported"] == 3)
+        assert sink.batches == [[{"n": 0}, {"n": 1}, {"n": 2}]]
+        exporter.close(timeout=1)
+
+    def test_time_trigger_sends_a_partial_batch(self):
+        sink = _Sink()
+        exporter = _exporter(sink, flush_at=100, flush_interval=0.05)
+        exporter.add({"n": 1})
+        assert _wait_for(lambda: sink.batches)
+        assert exporter.snapshot()["buffered"] == 0
+        exporter.close(timeout=1)
+
+    def test_batches_are_capped(self):
+        sink = _Sink()
+        exporter = _exporter(sink, flush_at=100, max_batch=2)
+        for i in range(5):
+            exporter.add({"n": i})
+        assert exporter.flush(timeout=2)
+        assert [len(b) for b in sink.batches] == [2, 2, 1]
+        assert exporter.stats["batches"] == 3
+        exporter.close(timeout=1)
+
+    def test_full_buffer_drops_oldest(self):
+        sink = _Sink()
+        sink.gate.clear()
+        exporter = _exporter(sink, flush_at=1, buffer_size=3, max_batch=1)
+        exporter.add({"n": 0})
+        assert sink.called.wait(2)  # {"n": 0} is in flight, the buffer is empty
+        for i in range(1, 6):
+            exporter.add({"n": i})
+        assert exporter.stats["dropped"] == 2
+        sink.gate.set()
+        assert exporter.flush(timeout=2)
+        assert [b[0]["n"] for b in sink.batches] == [0, 3, 4, 5]
+        assert exporter.snapshot() == {
+            "queued": 6, "exported": 4, "dropped": 2, "failed": 0, "batches": 4, "buffered": 0,
+        }
+        exporter.close(timeout=1)
+
+    def test_add_does_not_wait_for_uploads(self):
+        sink = _Sink()
+        sink.gate.clear()
+        exporter = _exporter(sink, flush_at=1)
+        exporter.add({"n": 0})
+        assert sink.called.wait(2)
+        start = time.monotonic()
+        for i in range(100):
+            exporter.add({"n": i})
+        exporter.flush()
+        assert time.monotonic() - start < 0.5
+        sink.gate.set()
+        exporter.close(timeout=2)
+
+    def test_failures_are_counted(self):
+        def send(events):
+            raise ConnectionError("down")
+        exporter = _exporter(send, flush_at=100)
+        exporter.add({"n": 1})
+        exporter.add({"n": 2})
+        assert exporter.flush(timeout=2)
+        assert exporter.stats["failed"] == 2 and exporter.stats["exported"] == 0
+        exporter.close(timeout=1)
+
+    def test_close_drains_and_stops(self):
+        sink = _Sink()
+        exporter = _exporter(sink, flush_at=100)
+        exporter.add({"n": 1})
+        assert exporter.close(timeout=2)
+        assert sink.batches == [[{"n": 1}]]
+        assert not exporter._thread.is_alive()
+        exporter.add({"n": 2})
+        assert exporter.stats["dropped"] == 1
+
+
+class TestHTTPClient:
+
+    def test_events_are_uploaded_gzipped(self):
+        from observability import LangfuseHTTPClient
+        session = _Session()
+        client = LangfuseHTTPClient("pk", "sk", "http://langfuse.local/", session=session, flush_at=100)
+        trace = client.trace(name="dashboard_request", user_id=7, input={"query": "hi"})
+        trace.generation(name="llm", model="gpt-4o").end(output="ok")
+        client.score(name="ai_cost", value=0.01, trace_id=trace.id)
+        assert session.posts == []
+
+        client.shutdown(timeout=2)
+        assert session.closed and session.auth == ("pk", "sk")
+        post = session.posts[0]
+        assert post["url"] == "http://langfuse.local/api/public/ingestion"
+        assert post["headers"]["Content-Encoding"] == "gzip"
+        events = json.loads(gzip.decompress(post["data"]))["batch"]
+        assert [e["type"] for e in events] == [
+            "trace-create", "generation-create", "generation-update", "score-create",
+        ]
+        assert events[0]["body"]["userId"] == "7"
+        assert client.stats()["exported"] == 4
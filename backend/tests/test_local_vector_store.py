@@ -0,0 +1,197 @@
+"""
+Certify Intel - Local Vector Index Tests
+Tests for the embedded pgvector fallback (local_vector_store.py): cosine
+top-k, metadata pre-filtering, upserts/deletes, persistence, IVF
+partitioning, compaction and backend selection.
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from vector_store import DocumentChunk
+
+pytestmark = pytest.mark.timeout(30)
+
+
+def _unit(vec):
+    vec = np.asarray(vec, dtype=np.float32)
+    return vec / np.linalg.norm(vec)
+
+
+def _chunks(vectors, metadata=None):
+    return [
+        DocumentChunk(chunk_index=i, content=f"chunk {i}", embedding=np.asarray(v),
+                      metadata=(metadata or {}), token_count=3)
+        for i, v in enumerate(vectors)
+    ]
+
+
+@pytest.fixture
+def store(tmp_path):
+    from local_vector_store import LocalVectorStore
+    s = LocalVectorStore(index_dir=str(tmp_path / "index"))
+    yield s
+
+
+class TestLocalVectorSearch:
+
+    async def test_top_k_by_cosine(self, store):
+        await store.insert_document("doc-a", "a.txt", "text", "hash-a", "tester")
+        await store.batch_insert_chunks("doc-a", _chunks([[1, 0, 0], [0.8, 0.6, 0], [0, 1, 0], [0, 0, 1]]))
+        results = await store.search_by_embedding(np.array([1.0, 0.1, 0]), limit=2, min_similarity=0.0)
+        assert [r.content for r in results] == ["chunk 0", "chunk 1"]
+        assert results[0].similarity == pytest.approx(float(_unit([1, 0.1, 0]) @ [1, 0, 0]), rel=1e-5)
+        assert results[0].document_id == "doc-a"
+
+    async def test_min_similarity_threshold(self, store):
+        await store.batch_insert_chunks("doc-a", _chunks([[1, 0], [0, 1]]))
+        results = await store.search_by_embedding(np.array([1.0, 0.0]), limit=10, min_similarity=0.7)
+        assert [r.content for r in results] == ["chunk 0"]
+
+    async def test_metadata_prefilter(self, store):
+        await store.batch_insert_chunks("doc-epic", _chunks([[1, 0], [0.9, 0.1]], {"competitor": "Epic", "tags": ["ehr", "pricing"]}))
+        await store.batch_insert_chunks("doc-cerner", _chunks([[1, 0]], {"competitor": "Cerner"}))
+        results = await store.search_by_embedding(np.array([1.0, 0.0]), limit=10, min_similarity=0.0,
+                                                  filter_metadata={"competitor": "Cerner"})
+        assert [r.document_id for r in results] == ["doc-cerner"]
+        results = await store.search_by_embedding(np.array([1.0, 0.0]), limit=10, min_similarity=0.0,
+                                                  filter_metadata={"tags": "pricing"})
+        assert {r.document_id for r in results} == {"doc-epic"}
+
+    async def test_reinsert_replaces_chunks(self, store):
+        await store.insert_document("doc-a", "a.txt", "text", "hash-a", "tester")
+        await store.batch_insert_chunks("doc-a", _chunks([[1, 0], [0, 1]]))
+        await store.batch_insert_chunks("doc-a", [DocumentChunk(chunk_index=0, content="rewritten",
+                                                                embedding=np.array([1.0, 0.0]))])
+        results = await store.search_by_embedding(np.array([1.0, 0.0]), limit=10, min_similarity=0.5)
+        assert [r.content for r in results] == ["rewritten"]
+        assert len(await store.get_document_chunks("doc-a")) == 2
+
+    async def test_duplicate_content_hash_returns_existing_id(self, store):
+        first = await store.insert_document("doc-a", "a.txt", "text", "same-hash", "tester")
+        second = await store.insert_document("doc-b", "b.txt", "text", "same-hash", "tester")
+        assert first == second == "doc-a"
+
+    async def test_delete_and_persistence(self, store, tmp_path):
+        from local_vector_store import LocalVectorStore
+        await store.insert_document("doc-a", "a.txt", "text", "hash-a", "tester")
+        await store.insert_document("doc-b", "b.txt", "text", "hash-b", "tester")
+        await store.batch_insert_chunks("doc-a", _chunks([[1, 0]]))
+        await store.batch_insert_chunks("doc-b", _chunks([[0.9, 0.1]]))
+        assert await store.delete_document("doc-a") is True
+        assert await store.delete_document("doc-a") is False
+        await store.close()
+
+        reopened = LocalVectorStore(index_dir=str(tmp_path / "index"))
+        results = await reopened.search_by_embedding(np.array([1.0, 0.0]), limit=5, min_similarity=0.0)
+        assert [r.document_id for r in results] == ["doc-b"]
+        stats = await reopened.get_stats()
+        assert stats["backend"] == "local"
+        assert stats["chunk_count"] == 1
+        assert stats["tombstoned_rows"] == 1
+
+    async def test_dimension_mismatch_rejected(self, store):
+        await store.batch_insert_chunks("doc-a", _chunks([[1, 0, 0]]))
+        with pytest.raises(ValueError):
+            await store.batch_insert_chunks("doc-b", _chunks([[1, 0]]))
+        # search() swallows errors like the pgvector store does
+        store.embed_text = lambda text: _async_value(np.array([1.0, 0.0]))
+        assert await store.search("anything") == []
+
+    async def test_empty_index_skips_query_embedding(self, store):
+        async def _boom(text):
+            raise AssertionError("should not embed")
+        store.embed_text = _boom
+        assert await store.search("pricing") == []
+
+
+async def _async_value(value):
+    return value
+
+
+class TestIVFIndex:
+
+    async def test_ivf_matches_exact_search(self, store):
+        rng = np.random.default_rng(42)
+        centers = rng.normal(size=(8, 32))
+        vectors = np.concatenate([c + 0.05 * rng.normal(size=(200, 32)) for c in centers])
+        await store.batch_insert_chunks("doc-a", _chunks(vectors))
+        queries = centers + 0.05 * rng.normal(size=centers.shape)
+
+        exact = [[r.chunk_id for r in await store.search_by_embedding(q, limit=5, min_similarity=0.0)]
+                 for q in queries]
+        assert await store.build_ivf_index(nlist=8) is True
+        assert (await store.get_index_info())["index_type"] == "ivf"
+        approx = [[r.chunk_id for r in await store.search_by_embedding(q, limit=5, min_similarity=0.0)]
+                  for q in queries]
+        recall = np.mean([len(set(a) & set(e)) / 5 for a, e in zip(approx, exact)])
+        assert recall >= 0.9
+
+        # Rows added after the build are assigned to a list and searchable
+        await store.batch_insert_chunks("doc-b", [DocumentChunk(chunk_index=0, content="late",
+                                                                embedding=centers[3])])
+        top = await store.search_by_embedding(centers[3], limit=1, min_similarity=0.0)
+        assert top[0].content == "late"
+
+    async def test_auto_builds_ivf_past_threshold(self, tmp_path):
+        from local_vector_store import LocalVectorStore
+        store = LocalVectorStore(index_dir=str(tmp_path / "auto"), ivf_min_rows=50)
+        rng = np.random.default_rng(0)
+        await store.batch_insert_chunks("doc-a", _chunks(rng.normal(size=(40, 8))))
+        assert (await store.get_index_info())["index_type"] == "flat"
+        await store.batch_insert_chunks("doc-b", _chunks(rng.normal(size=(20, 8))))
+        assert (await store.get_index_info())["index_type"] == "ivf"
+
+    async def test_compact_drops_tombstones(self, store):
+        await store.insert_document("doc-a", "a.txt", "text", "hash-a", "tester")
+        await store.batch_insert_chunks("doc-a", _chunks([[1, 0], [0, 1]]))
+        await store.batch_insert_chunks("doc-b", _chunks([[0.7, 0.7]]))
+        await store.delete_document("doc-a")
+        assert await store.compact() == {"rows_before": 3, "rows_after": 1}
+        results = await store.search_by_embedding(np.array([1.0, 1.0]), limit=5, min_similarity=0.0)
+        assert [(r.chunk_id, r.document_id) for r in results] == [(0, "doc-b")]
+
+
+    async def test_bulk_insert_builds_ivf_after_load(self, store):
+        rng = np.random.default_rng(7)
+        loaded = await store.bulk_insert_chunks(
+            {f"doc-{i}": _chunks(rng.normal(size=(50, 8))) for i in range(4)},
+            rebuild_index="hnsw"
+        )
+        assert loaded == 200
+        info = await store.get_index_info()
+        assert info["index_type"] == "ivf"
+        assert info["chunk_count"] == 200
+
+
+class TestBackendSelection:
+
+    def test_auto_selects_local_without_postgres(self, monkeypatch, tmp_path):
+        import vector_store
+        from local_vector_store import LocalVectorStore
+        monkeypatch.setattr(vector_store, "_default_store", None)
+        monkeypatch.setenv("DATABASE_URL", "sqlite:///./certify_intel.db")
+        monkeypatch.setenv("VECTOR_STORE_BACKEND", "auto")
+        monkeypatch.setenv("LOCAL_VECTOR_INDEX_DIR", str(tmp_path / "auto"))
+        assert isinstance(vector_store.get_vector_store(), LocalVectorStore)
+
+    def test_explicit_pgvector_backend(self, monkeypatch):
+        import vector_store
+        from local_vector_store import LocalVectorStore
+        monkeypatch.setattr(vector_store, "_default_store", None)
+        monkeypatch.setenv("VECTOR_STORE_BACKEND", "pgvector")
+        store = vector_store.get_vector_store()
+        assert not isinstance(store, LocalVectorStore)
+
+    async def test_knowledge_base_search_uses_local_store(self, store):
+        from knowledge_base import KnowledgeBase
+        await store.batch_insert_chunks("doc-a", _chunks([[1, 0], [0, 1]], {"competitor": "Epic"}))
+        store.embed_text = lambda text: _async_value(np.array([1.0, 0.05]))
+        kb = KnowledgeBase(vector_store=store)
+        results = await kb.search("epic pricing", limit=1)
+        assert [r.content for r in results] == ["chunk 0"]
+        assert results[0].metadata == {"competitor": "Epic"}
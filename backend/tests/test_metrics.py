@@ -7,7 +7,7 @@ CI-safe: No external dependencies or API keys required.
 import importlib
 import os
 import sys
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
 import pytest
 
@@ -56,6 +56,32 @@ class TestMetricsModule:
         m.db_connections_active.set(5)
         m.cache_operations.labels(operation="get", result="hit").inc()
 
+    def test_route_stats_quantiles(self):
+        """Per-route histogram estimates p50/p95 within the right bucket."""
+        m = _reload_metrics({"METRICS_ENABLED": "false"})
+        stats = m.RouteStats()
+        for _ in range(90):
+            stats.observe(200, 0.02, 100)
+        for _ in range(10):
+            stats.observe(500, 0.4, 100)
+        assert 0.01 < stats.quantile(0.5) <= 0.025
+        assert 0.25 < stats.quantile(0.95) <= 0.4
+        summary = stats.summary()
+        assert summary["count"] == 100 and summary["errors"] == 10
+        assert summary["max_ms"] == 400.0 and summary["mean_response_bytes"] == 100
+
+    def test_hot_endpoints_ranking(self):
+        """Hot endpoints are ranked by p95 and by total time."""
+        m = _reload_metrics({"METRICS_ENABLED": "false"})
+        for _ in range(50):
+            m.track_request("GET", "/api/competitors", 200, 0.05)
+        m.track_request("GET", "/api/changes/{change_id}/diff", 200, 1.5)
+        hot = m.get_hot_endpoints(limit=5, in_flight={("GET", "/api/competitors"): 2})
+        assert hot["by_p95"][0]["route"] == "/api/changes/{change_id}/diff"
+        assert hot["by_total_time"][0]["route"] == "/api/competitors"
+        assert hot["by_total_time"][0]["in_flight"] == 2
+        assert m.get_hot_endpoints(limit=1)["by_p95"][0]["count"] == 1
+
     def test_track_request(self):
         """track_request increments internal counters."""
         m = _reload_metrics({"METRICS_ENABLED": "false"})
@@ -78,6 +104,15 @@ class TestMetricsModule:
         # Should not raise
         m.track_ai_call("ollama", "llama3.1:8b", cost=0.0, duration=0.0)
 
+    def test_track_ai_first_token(self):
+        """track_ai_first_token feeds the average time to first token."""
+        m = _reload_metrics({"METRICS_ENABLED": "false"})
+        m.track_ai_first_token("google", "gemini-3-flash-preview", 0.2)
+        m.track_ai_first_token("google", "gemini-3-flash-preview", 0.4)
+        summary = m.get_metrics_summary()
+        assert summary["ai_streams_total"] == 2
+        assert summary["ai_ttft_avg_ms"] == pytest.approx(300.0)
+
     def test_track_cache_hit(self):
         """track_cache increments hit counter."""
         m = _reload_metrics({"METRICS_ENABLED": "false"})
@@ -129,35 +164,35 @@ class TestMetricsModule:
 class TestMetricsMiddleware:
     """Tests for middleware/metrics.py"""
 
-    def test_normalize_path_with_id(self):
-        """Path normalization replaces IDs with {id}."""
-        from middleware.metrics import MetricsMiddleware
-        mw = MetricsMiddleware(app=MagicMock())
-        assert mw._normalize_path("/api/competitors/42") == "/api/competitors/{id}"
-        assert mw._normalize_path("/api/chat/sessions/abc-123") == "/api/chat/sessions/{id}"
-        assert mw._normalize_path("/api/ai/tasks/task-uuid") == "/api/ai/tasks/{id}"
-
-    def test_normalize_path_with_subpath(self):
-        """Path normalization handles sub-paths after ID."""
-        from middleware.metrics import MetricsMiddleware
-        mw = MetricsMiddleware(app=MagicMock())
-        assert mw._normalize_path("/api/competitors/42/news") == "/api/competitors/{id}/news"
-        assert mw._normalize_path("/api/chat/sessions/abc/messages") == "/api/chat/sessions/{id}/messages"
-
-    def test_normalize_path_no_match(self):
-        """Paths without known prefixes are returned unchanged."""
-        from middleware.metrics import MetricsMiddleware
-        mw = MetricsMiddleware(app=MagicMock())
-        assert mw._normalize_path("/api/version") == "/api/version"
-        assert mw._normalize_path("/health") == "/health"
+    def test_route_label_uses_template(self):
+        """The matched route template is the label, whatever the IDs."""
+        from fastapi import FastAPI
+        from middleware.metrics import route_label
+
+        app = FastAPI()
+
+        @app.get("/api/sources/{competitor_id}/{field_name}")
+        def source(competitor_id: int, field_name: str):
+            return {}
+
+        @app.get("/api/files/{file_path:path}")
+        def files(file_path: str):
+            return {}
+
+        assert route_label({"route": app.routes[-2]}) == "/api/sources/{competitor_id}/{field_name}"
+        assert route_label({"route": app.routes[-1]}) == "/api/files/{file_path}"
+
+    def test_route_label_unmatched(self):
+        """Requests that matched no route share one label."""
+        from middleware.metrics import UNMATCHED_ROUTE, route_label
+        assert route_label({"path": "/api/random/123"}) == UNMATCHED_ROUTE
 
     def test_skip_paths(self):
         """Health and metrics paths are excluded from tracking."""
-        from middleware.metrics import MetricsMiddleware
-        mw = MetricsMiddleware(app=MagicMock())
-        assert "/health" in mw._SKIP_PATHS
-        assert "/readiness" in mw._SKIP_PATHS
-        assert "/metrics" in mw._SKIP_PATHS
+        from middleware.metrics import SKIP_PATHS
+        assert "/health" in SKIP_PATHS
+        assert "/readiness" in SKIP_PATHS
+        assert "/metrics" in SKIP_PATHS
 
 
 # ---------------------------------------------------------------------------
@@ -209,3 +244,39 @@ class TestMetricsEndpoint:
         response = client.get("/metrics")
         data = response.json()
         assert data["uptime_seconds"] >= 0
+
+    def test_hot_endpoints_endpoint(self):
+        """/api/metrics/hot-endpoints lists routes recorded by the middleware."""
+        m = _reload_metrics({"METRICS_ENABLED": "true"})
+
+        from fastapi.testclient import TestClient
+        from fastapi import FastAPI
+        from dependencies import get_current_user
+        from middleware.pipeline import RequestPipelineMiddleware
+        if "routers.health" in sys.modules:
+            del sys.modules["routers.health"]
+        from routers.health import router
+
+        test_app = FastAPI()
+        test_app.include_router(router)
+
+        @test_app.get("/api/products/{product_id}")
+        def product(product_id: int):
+            return {"id": product_id}
+
+        test_app.dependency_overrides[get_current_user] = lambda: {"id": 1}
+        test_app.add_middleware(RequestPipelineMiddleware, rate_limit=False, security_headers=False)
+        client = TestClient(test_app)
+        for product_id in range(5):
+            client.get(f"/api/products/{product_id}")
+        client.get("/api/does-not-exist/42")
+
+        data = client.get("/api/metrics/hot-endpoints?limit=5").json()
+        routes = {(r["method"], r["route"]): r for r in data["by_total_time"]}
+        assert routes[("GET", "/api/products/{product_id}")]["count"] == 5
+        assert routes[("GET", "/api/products/{product_id}")]["mean_response_bytes"] == len(b'{"id":0}')
+        assert ("GET", "<unmatched>") in routes
+        assert not any("/api/products/1" == r["route"] for r in data["by_p95"])
+        assert data["metrics_enabled"] is True
+        m.reset_route_stats()
+        _reload_metrics({"METRICS_ENABLED": "false"})
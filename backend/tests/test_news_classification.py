@@ -0,0 +1,102 @@
+"""
+Certify Intel - News Classification Tests
+Tests for NewsMonitor's async AI classification stage: concurrent batches
+under a semaphore, headline dedupe/caching and per-batch keyword fallback.
+"""
+import asyncio
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytestmark = pytest.mark.timeout(10)
+
+
+class _FakeRouter:
+    """Answers every headline as positive funding news; can fail chosen batches."""
+
+    def __init__(self, fail_on=None, delay=0.05):
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.fail_on = fail_on or set()
+        self.delay = delay
+
+    async def generate_json(self, prompt, task_type=None, system_prompt=None, max_tokens=None, temperature=None):
+        headlines = [line for line in prompt.split("Headlines:\n", 1)[1].splitlines() if line]
+        call_no = len(self.calls)
+        self.calls.append(headlines)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        if call_no in self.fail_on:
+            raise RuntimeError("provider timeout")
+        return {"response_json": [{"sentiment": "positive", "event_type": "funding"} for _ in headlines]}
+
+
+def _article(title, snippet=""):
+    from news_monitor import NewsArticle
+    return NewsArticle(title=title, url=f"https://news.example.com/{abs(hash(title))}", source="Google News",
+                       published_date="", snippet=snippet, sentiment="neutral",
+                       is_major_event=False, event_type=None)
+
+
+@pytest.fixture
+def monitor(monkeypatch):
+    import ai_router
+    import cache
+    from news_monitor import NewsMonitor
+    cache.reset_cache()
+    router = _FakeRouter()
+    monkeypatch.setattr(ai_router, "get_ai_router", lambda: router)
+    m = NewsMonitor(include_sec=False, include_patents=False, use_pygooglenews=False,
+                    use_ml_sentiment=False, tag_dimensions=False)
+    m.router = router
+    yield m
+    cache.reset_cache()
+
+
+class TestAIClassification:
+
+    async def test_batches_run_concurrently_under_semaphore(self, monitor):
+        articles = [_article(f"Vendor {i} raises new round") for i in range(100)]
+        await monitor._ai_classify_batch_async(articles, concurrency=2)
+        assert len(monitor.router.calls) == 4  # 100 headlines / 25 per batch
+        assert monitor.router.max_active == 2
+        assert all(a.sentiment == "positive" and a.event_type == "funding" for a in articles)
+        assert all(a.is_major_event for a in articles)
+
+    async def test_duplicate_headlines_classified_once(self, monitor):
+        articles = [_article("Acme Health Raises $50M"), _article("acme health raises  $50m!"),
+                    _article("Acme opens Boston office")]
+        await monitor._ai_classify_batch_async(articles)
+        assert monitor.router.calls and len(monitor.router.calls[0]) == 2
+        assert articles[1].event_type == "funding"
+
+    async def test_cached_headlines_skip_the_router(self, monitor):
+        await monitor._ai_classify_batch_async([_article("Acme Health Raises $50M")])
+        calls = len(monitor.router.calls)
+        again = _article("Acme Health raises $50M")
+        await monitor._ai_classify_batch_async([again])
+        assert len(monitor.router.calls) == calls
+        assert again.sentiment == "positive"
+
+    async def test_failed_batch_falls_back_to_keywords_alone(self, monitor):
+        monitor.router.fail_on = {0}
+        articles = [_article(f"Vendor {i} announces layoffs") for i in range(50)]
+        await monitor._ai_classify_batch_async(articles, concurrency=1)
+        fallback, ai = articles[:25], articles[25:]
+        assert all(a.sentiment == "negative" for a in fallback)
+        assert all(a.event_type == "funding" for a in ai)
+        # Keyword results are not cached: a retry goes back to the router
+        await monitor._ai_classify_batch_async([_article("Vendor 0 announces layoffs")])
+        assert len(monitor.router.calls) == 3
+
+    def test_sync_wrapper_runs_without_a_loop(self, monitor):
+        articles = [_article("Acme partners with Epic")]
+        monitor._analyze_sentiment_batch(articles)
+        assert articles[0].event_type == "funding"
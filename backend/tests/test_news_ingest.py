@@ -0,0 +1,144 @@
+"""
+Certify Intel - News Ingestion Tests
+Tests for URL normalization, batched ON CONFLICT upserts into
+NewsArticleCache and the url_hash backfill for existing databases.
+"""
+import pytest
+import sys
+import os
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+pytestmark = pytest.mark.timeout(30)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    from database import Base
+    engine = create_engine(f"sqlite:///{tmp_path / 'news.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _row(url, **values):
+    return {"competitor_id": 1, "competitor_name": "Acme", "title": "t", "url": url, **values}
+
+
+class TestNormalizeUrl:
+
+    def test_equivalent_links_share_a_hash(self):
+        from news_ingest import normalize_url, url_hash
+        variants = [
+            "https://www.Example.com/news/Story-1/?utm_source=rss&b=2&a=1#top",
+            "http://example.com:80/news/Story-1?a=1&b=2&fbclid=xyz",
+            "example.com/news/Story-1?b=2&a=1",
+        ]
+        assert {normalize_url(u) for u in variants} == {"https://example.com/news/Story-1?a=1&b=2"}
+        assert len({url_hash(u) for u in variants}) == 1
+        assert url_hash("https://example.com/news/story-1?a=1&b=2") != url_hash(variants[0])
+
+    def test_unusable_urls(self):
+        from news_ingest import url_hash
+        assert url_hash("") is None
+        assert url_hash(None) is None
+        assert url_hash("mailto:press@example.com") is None
+
+    def test_parse_published_date(self):
+        from news_ingest import parse_published_date
+        assert parse_published_date("Mon, 06 May 2024 14:30:00 +0200") == datetime(2024, 5, 6, 12, 30)
+        assert parse_published_date("2024-05-01T10:00:00Z") == datetime(2024, 5, 1, 10, 0)
+        assert parse_published_date("yesterday") is None
+
+
+class TestIngestArticles:
+
+    def test_inserts_once_per_normalized_url(self, db):
+        from database import NewsArticleCache
+        from news_ingest import ingest_articles
+
+        first = ingest_articles(db, [
+            _row("https://example.com/a"),
+            _row("https://www.example.com/a/?utm_medium=email"),
+            _row("https://example.com/b"),
+            _row(""),
+        ])
+        db.commit()
+        assert (first.inserted, first.updated, first.skipped) == (2, 0, 2)
+        assert first.inserted_urls == ["https://example.com/a", "https://example.com/b"]
+
+        second = ingest_articles(db, [_row("https://example.com/b"), _row("https://example.com/c")])
+        db.commit()
+        assert (second.inserted, second.skipped) == (1, 1)
+        assert db.query(NewsArticleCache).count() == 3
+        stored = db.query(NewsArticleCache).filter(NewsArticleCache.url == "https://example.com/a").one()
+        assert stored.url_hash and stored.is_archived is False and stored.fetched_at is not None
+
+    def test_update_existing_refreshes_analysis(self, db):
+        from database import NewsArticleCache
+        from news_ingest import ingest_articles
+
+        ingest_articles(db, [_row("https://example.com/a", sentiment="neutral", snippet="old", event_type="funding")])
+        db.commit()
+        result = ingest_articles(
+            db,
+            [_row("https://example.com/a", sentiment="positive", snippet=None, competitor_name="Other")],
+            update_existing=True,
+        )
+        db.commit()
+        assert (result.inserted, result.updated) == (0, 1)
+        stored = db.query(NewsArticleCache).one()
+        assert stored.sentiment == "positive"
+        assert stored.snippet == "old"          # None keeps the stored value
+        assert stored.event_type == "funding"
+        assert stored.competitor_name == "Acme"  # Identity columns are not rewritten
+
+    def test_batches_issue_constant_statements(self, db, engine):
+        from news_ingest import ingest_articles
+
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        result = ingest_articles(db, [_row(f"https://example.com/{i}") for i in range(250)], batch_size=100)
+        db.commit()
+        assert result.inserted == 250
+        # One existence check and one INSERT per batch of 100
+        assert sum(s.lstrip().upper().startswith("INSERT") for s in statements) == 3
+        assert sum(s.lstrip().upper().startswith("SELECT") for s in statements) == 3
+
+
+class TestUrlHashBackfill:
+
+    def test_backfills_and_archives_duplicates(self, tmp_path):
+        from news_ingest import create_url_hash_index
+
+        engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE news_article_cache (id INTEGER PRIMARY KEY, competitor_id INTEGER, "
+                "competitor_name VARCHAR, title VARCHAR, url VARCHAR, is_archived BOOLEAN DEFAULT 0)"
+            ))
+            conn.execute(text(
+                "INSERT INTO news_article_cache (id, title, url) VALUES "
+                "(1, 'kept', 'https://example.com/a'), (2, 'dup', 'https://example.com/a/?utm_source=x'), "
+                "(3, 'other', 'https://example.com/b'), (4, 'no url', '')"
+            ))
+        with engine.begin() as conn:
+            create_url_hash_index(conn)
+            create_url_hash_index(conn)  # Idempotent
+            rows = conn.execute(text(
+                "SELECT id, url_hash IS NOT NULL, is_archived FROM news_article_cache ORDER BY id"
+            )).all()
+        assert [tuple(r) for r in rows] == [(1, 1, 0), (2, 0, 1), (3, 1, 0), (4, 0, 0)]
+
+        engine.dispose()
@@ -0,0 +1,193 @@
+"""
+Certify Intel - Incremental News Refresh Tests
+Tests for per-source watermarks and concurrency caps in NewsMonitor's
+async fetchers, and for the resumable daily refresh in news_refresh.
+"""
+import pytest
+import sys
+import os
+import asyncio
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+pytestmark = pytest.mark.timeout(30)
+
+NOW = datetime.utcnow().replace(microsecond=0)
+
+
+def _article(url, published):
+    from news_monitor import NewsArticle
+    return NewsArticle(
+        title=f"Acme news {url}", url=url, source="Wire",
+        published_date=published.strftime("%a, %d %b %Y %H:%M:%S GMT"),
+        snippet="", sentiment="neutral", is_major_event=False, event_type=None,
+    )
+
+
+@pytest.fixture
+def monitor(monkeypatch):
+    """NewsMonitor with only Google News, served from ``monitor.feed``."""
+    import news_monitor
+    monkeypatch.setattr(news_monitor, "_circuit_breaker", {})
+    for key in ("NEWSAPI_KEY", "BING_NEWS_KEY", "GNEWS_API_KEY", "MEDIASTACK_API_KEY", "NEWSDATA_API_KEY"):
+        monkeypatch.delenv(key, raising=False)
+
+    m = news_monitor.NewsMonitor(
+        include_sec=False, include_patents=False, use_pygooglenews=False,
+        use_ml_sentiment=False, tag_dimensions=False,
+    )
+    m.feed = {}
+    m.calls = []
+    m.in_flight = 0
+    m.peak = 0
+
+    async def fake_google(client, company_name, since=None):
+        m.calls.append((company_name, since))
+        m.in_flight += 1
+        m.peak = max(m.peak, m.in_flight)
+        await asyncio.sleep(0.01)
+        m.in_flight -= 1
+        return [_article(url, published) for url, published in m.feed.get(company_name, [])]
+
+    async def no_analysis(articles):
+        return None
+
+    m._fetch_google_news_async = fake_google
+    m._analyze_sentiment_batch_async = no_analysis
+    m._filter_irrelevant_articles = lambda articles, *args, **kwargs: articles
+    return m
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    from database import Base
+    engine = create_engine(f"sqlite:///{tmp_path / 'refresh.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def _competitors(session_factory, *names):
+    from database import Competitor
+    db = session_factory()
+    comps = [Competitor(name=name) for name in names]
+    db.add_all(comps)
+    db.commit()
+    ids = [c.id for c in comps]
+    db.close()
+    return ids
+
+
+class TestAsyncFetchWatermarks:
+
+    async def test_since_drops_older_articles_and_reports_newest(self, monitor):
+        monitor.feed["Acme"] = [
+            ("https://news.example.com/old", NOW - timedelta(days=3)),
+            ("https://news.example.com/new", NOW - timedelta(hours=2)),
+        ]
+        digest = await monitor.fetch_news_async("Acme", since={"google_news": NOW - timedelta(days=1)})
+
+        assert [a.url for a in digest.articles] == ["https://news.example.com/new"]
+        assert digest.articles[0].fetched_from == "google_news"
+        assert digest.source_watermarks == {"google_news": NOW - timedelta(hours=2)}
+        assert monitor.calls == [("Acme", NOW - timedelta(days=1))]
+
+    async def test_per_source_concurrency_cap(self, monitor, monkeypatch):
+        monkeypatch.setenv("NEWS_SOURCE_CONCURRENCY", "google_news=2")
+        competitors = [{"name": f"Comp {i}"} for i in range(6)]
+
+        summary = await monitor.fetch_all_competitors_async(competitors, concurrency=6, progress_key="cap-test")
+
+        assert summary["competitors_fetched"] == 6
+        assert len(monitor.calls) == 6
+        assert monitor.peak == 2
+
+
+class TestDailyNewsRefresh:
+
+    async def test_incremental_runs_store_once_and_advance_watermarks(self, monitor, session_factory):
+        from database import NewsArticleCache, NewsSourceWatermark
+        from news_refresh import run_daily_news_refresh
+
+        _competitors(session_factory, "Acme")
+        monitor.feed["Acme"] = [("https://news.example.com/a", NOW - timedelta(hours=5))]
+
+        first = await run_daily_news_refresh(monitor=monitor, session_factory=session_factory)
+        assert (first["competitors"], first["inserted"], first["updated"]) == (1, 1, 0)
+        first_since = monitor.calls[0][1]
+        assert NOW - first_since >= timedelta(days=6)  # No watermark yet: initial lookback
+
+        monitor.feed["Acme"].append(("https://news.example.com/b", NOW - timedelta(hours=1)))
+        second = await run_daily_news_refresh(monitor=monitor, session_factory=session_factory)
+        assert monitor.calls[1][1] == NOW - timedelta(hours=5)
+        assert (second["inserted"], second["updated"]) == (1, 1)  # "a" is at the watermark, refreshed
+
+        db = session_factory()
+        try:
+            articles = db.query(NewsArticleCache).order_by(NewsArticleCache.url).all()
+            assert [(a.url, a.source_type) for a in articles] == [
+                ("https://news.example.com/a", "google_news"),
+                ("https://news.example.com/b", "google_news"),
+            ]
+            assert articles[0].published_at == NOW - timedelta(hours=5)
+            mark = db.query(NewsSourceWatermark).one()
+            assert (mark.source, mark.last_published_at) == ("google_news", NOW - timedelta(hours=1))
+        finally:
+            db.close()
+
+    async def test_resume_skips_competitors_done_before_a_crash(self, monitor, session_factory):
+        from news_refresh import _plan_run, _store_digest, load_run_state, run_daily_news_refresh
+
+        acme_id, _ = _competitors(session_factory, "Acme", "Globex")
+        assert await run_daily_news_refresh(resume=True, monitor=monitor, session_factory=session_factory) is None
+
+        # A run starts, stores Acme, then the process dies
+        plan = _plan_run(session_factory, ["google_news"], resume=False)
+        assert [c["name"] for c in plan["competitors"]] == ["Acme", "Globex"]
+        acme = plan["competitors"][0]
+        digest = await monitor.fetch_news_async("Acme", since=acme["since"])
+        _store_digest(session_factory, acme, digest)
+        monitor.calls.clear()
+
+        resumed = await run_daily_news_refresh(resume=True, monitor=monitor, session_factory=session_factory)
+        assert (resumed["competitors"], resumed["skipped"]) == (1, 1)
+        assert [name for name, _ in monitor.calls] == ["Globex"]
+
+        db = session_factory()
+        try:
+            assert load_run_state(db)["completed_at"] is not None
+        finally:
+            db.close()
+        assert await run_daily_news_refresh(resume=True, monitor=monitor, session_factory=session_factory) is None
+
+    async def test_failed_competitors_keep_the_run_open_for_resume(self, monitor, session_factory, monkeypatch):
+        import news_refresh
+        from news_refresh import load_run_state, run_daily_news_refresh
+
+        _competitors(session_factory, "Acme", "Globex")
+        record_watermarks = news_refresh.record_watermarks
+
+        def failing_for_globex(db, competitor_id, *args):
+            if competitor_id == 2:
+                raise RuntimeError("database is locked")
+            return record_watermarks(db, competitor_id, *args)
+
+        monkeypatch.setattr(news_refresh, "record_watermarks", failing_for_globex)
+        first = await run_daily_news_refresh(monitor=monitor, session_factory=session_factory)
+        assert first["failed"] == 1
+        db = session_factory()
+        try:
+            assert load_run_state(db)["completed_at"] is None
+        finally:
+            db.close()
+
+        monkeypatch.setattr(news_refresh, "record_watermarks", record_watermarks)
+        monitor.calls.clear()
+        resumed = await run_daily_news_refresh(resume=True, monitor=monitor, session_factory=session_factory)
+        assert (resumed["competitors"], resumed["skipped"], resumed["failed"]) == (1, 1, 0)
+        assert [name for name, _ in monitor.calls] == ["Globex"]
+        assert await run_daily_news_refresh(resume=True, monitor=monitor, session_factory=session_factory) is None
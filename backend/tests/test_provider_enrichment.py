@@ -0,0 +1,191 @@
+"""
+Certify Intel - Provider Enrichment Tests
+Tests for concurrent enterprise-provider enrichment: shared token buckets
+and pooled clients, the on-disk name -> provider ID cache, and the
+streaming fan-out engine.
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+pytestmark = pytest.mark.timeout(10)
+
+
+@pytest.fixture
+def id_cache(tmp_path, monkeypatch):
+    """Enable the shared ID cache on a fresh file for one test."""
+    from data_providers import id_cache as module
+    cache = module.ProviderIdCache(path=str(tmp_path / "provider_ids.db"))
+    monkeypatch.setattr(module, "is_enabled", lambda: True)
+    monkeypatch.setattr(module._shared, "instance", cache)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def pitchbook(monkeypatch):
+    from data_providers.base_provider import reset_token_buckets
+    from data_providers.pitchbook import PitchBookProvider
+    monkeypatch.setenv("PITCHBOOK_API_KEY", "test_key")
+    reset_token_buckets()
+    yield PitchBookProvider()
+    reset_token_buckets()
+
+
+class _FakeProvider:
+    """Stands in for a BaseDataProvider; records call order and in-flight peak."""
+
+    def __init__(self, name, delay=0.02, fail_for=()):
+        self.provider_name = name
+        self.delay = delay
+        self.fail_for = set(fail_for)
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = []
+
+    async def query_for_competitor(self, company_name):
+        from data_providers import ProviderResult
+        self.calls.append(company_name)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if company_name in self.fail_for:
+                raise RuntimeError("boom")
+            return ProviderResult(self.provider_name, company_name, fields={"website": company_name})
+        finally:
+            self.in_flight -= 1
+
+
+class TestTokenBucket:
+
+    def test_burst_then_paced(self):
+        from data_providers.base_provider import TokenBucket
+        bucket = TokenBucket(rate_per_minute=60, burst=3)
+        waits = [bucket.reserve() for _ in range(5)]
+        assert waits[:3] == [0.0, 0.0, 0.0]
+        # Queued callers are spaced one refill interval (1s) apart
+        assert waits[3] == pytest.approx(1.0, abs=0.05)
+        assert waits[4] == pytest.approx(2.0, abs=0.05)
+
+    def test_bucket_shared_across_instances(self, pitchbook):
+        from data_providers.base_provider import get_token_bucket
+        from data_providers.pitchbook import PitchBookProvider
+        bucket = get_token_bucket("PitchBook", PitchBookProvider.rate_limit_per_minute)
+        assert get_token_bucket("PitchBook", 1) is bucket
+        for _ in range(int(bucket.capacity)):
+            assert bucket.reserve() == 0.0
+        # A brand-new instance still sees the drained bucket
+        assert get_token_bucket(PitchBookProvider().provider_name, 100).reserve() > 0
+
+
+class TestPooledClient:
+
+    async def test_client_shared_and_closed(self, pitchbook):
+        from data_providers.base_provider import close_shared_clients
+        from data_providers.crunchbase import CrunchbaseProvider
+        from data_providers.pitchbook import PitchBookProvider
+        client = pitchbook._get_client()
+        assert PitchBookProvider()._get_client() is client
+        assert CrunchbaseProvider()._get_client() is not client
+        await close_shared_clients()
+        assert client.is_closed
+        assert pitchbook._get_client() is not client
+        await close_shared_clients()
+
+
+class TestProviderIdCache:
+
+    async def test_resolution_reused_across_runs(self, pitchbook, id_cache):
+        with patch.object(pitchbook, "search_company", new_callable=AsyncMock) as mock_search, \
+                patch.object(pitchbook, "get_company_profile", new_callable=AsyncMock) as mock_profile:
+            mock_search.return_value = {"provider_id": "pb_1", "name": "Epic Systems"}
+            mock_profile.return_value = {"employeeCount": 10000}
+            first = await pitchbook.query_for_competitor("Epic Systems")
+            second = await pitchbook.query_for_competitor("  epic   SYSTEMS ")
+        assert first.error is None and second.error is None
+        mock_search.assert_called_once_with("Epic Systems")
+        assert [c.args[0] for c in mock_profile.call_args_list] == ["pb_1", "pb_1"]
+        assert id_cache.stats()["entries"] == 1
+
+    async def test_not_found_is_not_cached(self, pitchbook, id_cache):
+        with patch.object(pitchbook, "search_company", new_callable=AsyncMock) as mock_search:
+            mock_search.return_value = None
+            await pitchbook.query_for_competitor("Nobody Inc")
+            await pitchbook.query_for_competitor("Nobody Inc")
+        assert mock_search.call_count == 2
+        assert id_cache.stats()["entries"] == 0
+
+    async def test_stale_id_is_re_resolved(self, pitchbook, id_cache):
+        id_cache.put("PitchBook", "Epic Systems", "pb_old", "Epic Systems")
+        profiles = {"pb_new": {"employeeCount": 10000}}
+        with patch.object(pitchbook, "search_company", new_callable=AsyncMock) as mock_search, \
+                patch.object(pitchbook, "get_company_profile", new_callable=AsyncMock) as mock_profile:
+            mock_search.return_value = {"provider_id": "pb_new", "name": "Epic Systems"}
+            mock_profile.side_effect = lambda pid: profiles.get(pid)
+            result = await pitchbook.query_for_competitor("Epic Systems")
+        assert result.error is None
+        assert id_cache.get("PitchBook", "Epic Systems")["provider_id"] == "pb_new"
+
+    def test_expired_entries_miss(self, tmp_path):
+        from data_providers.id_cache import ProviderIdCache
+        cache = ProviderIdCache(path=str(tmp_path / "ids.db"), ttl_days=0)
+        cache.put("PitchBook", "Epic", "pb_1", "Epic")
+        assert cache.get("PitchBook", "Epic") is None
+        cache.close()
+
+
+class TestEnrichmentEngine:
+
+    async def test_providers_run_concurrently(self):
+        from data_providers.enrichment import EnrichmentEngine
+        providers = [_FakeProvider(f"P{i}", delay=0.05) for i in range(5)]
+        engine = EnrichmentEngine(providers, concurrency_per_provider=4)
+        companies = [(i, f"Company {i}") for i in range(8)]
+
+        start = time.monotonic()
+        results = [item async for item in engine.stream(companies)]
+        elapsed = time.monotonic() - start
+
+        assert len(results) == 40
+        # 40 sequential queries would take 2s; 4-wide per provider takes ~0.1s
+        assert elapsed < 1.0
+        assert all(p.peak == 4 for p in providers)
+        assert {(key, r.provider_name) for key, r in results} == {
+            (i, f"P{j}") for i in range(8) for j in range(5)
+        }
+        assert engine.stats["P0"] == {
+            "queried": 8, "succeeded": 8, "failed": 0, "total_latency_ms": 0.0
+        }
+
+    async def test_results_stream_in_completion_order(self):
+        from data_providers.enrichment import EnrichmentEngine
+        slow, fast = _FakeProvider("Slow", delay=0.2), _FakeProvider("Fast", delay=0.01)
+        engine = EnrichmentEngine([slow, fast], concurrency_per_provider=2)
+        order = [r.provider_name async for _, r in engine.stream([(1, "A"), (2, "B")])]
+        assert order == ["Fast", "Fast", "Slow", "Slow"]
+
+    async def test_provider_exception_becomes_error_result(self):
+        from data_providers.enrichment import EnrichmentEngine
+        engine = EnrichmentEngine([_FakeProvider("P", fail_for={"Bad"})])
+        results = {key: r async for key, r in engine.stream([(1, "Good"), (2, "Bad")])}
+        assert results[1].error is None
+        assert "boom" in results[2].error
+        assert engine.stats["P"]["failed"] == 1
+
+    async def test_closing_stream_cancels_pending_queries(self):
+        from data_providers.enrichment import EnrichmentEngine
+        provider = _FakeProvider("P", delay=0.05)
+        engine = EnrichmentEngine([provider], concurrency_per_provider=1)
+        stream = engine.stream([(i, f"C{i}") for i in range(20)])
+        await stream.__anext__()
+        await stream.aclose()
+        await asyncio.sleep(0.1)
+        assert len(provider.calls) < 20
+        assert provider.in_flight == 0
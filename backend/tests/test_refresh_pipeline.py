@@ -0,0 +1,320 @@
+"""
+Certify Intel - Competitor Refresh Pipeline Tests
+Tests for the concurrent scrape -> extract -> persist refresh job:
+per-domain token buckets, browser context pooling, thread-offloaded
+extraction, per-stage progress on the RefreshSession row and page
+fingerprint change detection.
+"""
+import asyncio
+import json
+import threading
+import time
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+pytestmark = pytest.mark.timeout(20)
+
+
+class _FakeContext:
+    def __init__(self):
+        self.closed = False
+        self.cookie_clears = 0
+
+    async def clear_cookies(self):
+        self.cookie_clears += 1
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakeScraper:
+    """Stands in for CompetitorScraper; records concurrency and contexts used."""
+    instances = []
+    delay = 0.05
+    etags = {}  # website -> ETag served for its pages
+    edits = {}  # (website, page_type) -> extra page text
+
+    def __init__(self, headless=True, rate_limiter=None):
+        self.rate_limiter = rate_limiter
+        self.active = 0
+        self.max_active = 0
+        self.contexts = []
+        _FakeScraper.instances.append(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def _new_context(self):
+        context = _FakeContext()
+        self.contexts.append(context)
+        return context
+
+    async def scrape_competitor(self, name, website, pages_to_scrape=None, context=None, validators=None):
+        from scraper import ScrapeResult, ScrapedPage
+        from datetime import datetime
+        assert context is not None
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire(website)
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        if "broken" in website:
+            return ScrapeResult(competitor_name=name, website=website, pages=[], success=False,
+                                error="Site unreachable")
+        etag = self.etags.get(website)
+        pages = []
+        for page_type in pages_to_scrape:
+            url = f"{website}/{page_type}"
+            if etag and (validators or {}).get(url, {}).get("etag") == etag:
+                pages.append(ScrapedPage(url=url, title="", content="", html="", scraped_at=datetime.utcnow(),
+                                         page_type=page_type, status_code=304, not_modified=True))
+                continue
+            text = f"{name} {page_type} {self.edits.get((website, page_type), '')}"
+            pages.append(ScrapedPage(url=url, title=name, content=text, html="",
+                                     scraped_at=datetime.utcnow(), page_type=page_type, etag=etag))
+        return ScrapeResult(competitor_name=name, website=website, pages=pages, success=True)
+
+
+class _FakeExtractor:
+    def __init__(self):
+        self.threads = set()
+        self.calls = 0
+
+    def extract_from_content(self, competitor_name, content, page_type="homepage"):
+        from extractor import ExtractedData
+        self.threads.add(threading.get_ident())
+        self.calls += 1
+        time.sleep(0.01)
+        return ExtractedData(headquarters=f"{competitor_name} HQ", confidence_score=80)
+
+    def merge_extractions(self, extractions):
+        return extractions[0]
+
+
+@pytest.fixture
+def refresh_env(monkeypatch):
+    """Scheduler wired to an in-memory database and fake scraper."""
+    from database import Base, Competitor
+    import scheduler
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False},
+                           poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    monkeypatch.setattr(scheduler, "SessionLocal", Session)
+    monkeypatch.setattr(scheduler, "CompetitorScraper", _FakeScraper)
+    _FakeScraper.instances = []
+    _FakeScraper.etags = {}
+    _FakeScraper.edits = {}
+
+    db = Session()
+    db.add_all([Competitor(name=f"Vendor {i}", website=f"https://vendor{i}.example.com")
+                for i in range(8)])
+    db.add(Competitor(name="Broken Co", website="https://broken.example.com"))
+    db.commit()
+    db.close()
+    yield Session
+    engine.dispose()
+
+
+class TestDomainRateLimiter:
+
+    async def test_same_domain_is_throttled(self):
+        from scraper import DomainRateLimiter
+        limiter = DomainRateLimiter(rate_per_second=20, burst=1)
+        start = time.monotonic()
+        for _ in range(3):
+            await limiter.acquire("https://www.example.com/pricing")
+        # First token is free, the next two wait ~50ms each
+        assert time.monotonic() - start >= 0.09
+        assert limiter.total_wait_seconds > 0
+
+    async def test_different_domains_do_not_wait(self):
+        from scraper import DomainRateLimiter
+        limiter = DomainRateLimiter(rate_per_second=0.1, burst=1)
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.acquire(f"https://site{i}.example.com") for i in range(5)))
+        assert time.monotonic() - start < 0.5
+
+    def test_domain_key_ignores_www_and_path(self):
+        from scraper import DomainRateLimiter
+        assert DomainRateLimiter.domain_for("https://www.Example.com/about") == "example.com"
+        assert DomainRateLimiter.domain_for("example.com") == "example.com"
+
+
+class TestBrowserContextPool:
+
+    async def test_contexts_are_reused_and_closed(self):
+        from scraper import BrowserContextPool
+        scraper = _FakeScraper()
+        async with BrowserContextPool(scraper, size=2) as pool:
+            async def use():
+                async with pool.acquire():
+                    await asyncio.sleep(0.01)
+            await asyncio.gather(*(use() for _ in range(6)))
+            assert len(scraper.contexts) == 2
+        assert all(c.closed for c in scraper.contexts)
+        assert sum(c.cookie_clears for c in scraper.contexts) == 6
+
+    async def test_failed_context_is_discarded(self):
+        from scraper import BrowserContextPool
+        scraper = _FakeScraper()
+        async with BrowserContextPool(scraper, size=1) as pool:
+            with pytest.raises(RuntimeError):
+                async with pool.acquire():
+                    raise RuntimeError("page crashed")
+            async with pool.acquire():
+                pass
+        assert len(scraper.contexts) == 2
+        assert scraper.contexts[0].closed
+
+
+class TestCompetitorRefreshPipeline:
+
+    async def test_runs_concurrently_and_persists(self, refresh_env):
+        import scheduler
+        from database import Competitor, RefreshSession
+        job = scheduler.CompetitorRefreshJob(scrape_concurrency=4, extract_concurrency=2,
+                                             domain_rate_per_second=100)
+        job.extractor = _FakeExtractor()
+
+        results = await job.run_full_refresh()
+
+        assert len(results) == 9
+        assert [r["competitor"] for r in results][:2] == ["Vendor 0", "Vendor 1"]
+        assert sum(r["success"] for r in results) == 8
+        broken = next(r for r in results if r["competitor"] == "Broken Co")
+        assert broken["error"] == "Site unreachable"
+
+        scraper = _FakeScraper.instances[0]
+        assert 1 < scraper.max_active <= 4
+        assert len(scraper.contexts) <= 4
+        assert threading.get_ident() not in job.extractor.threads
+
+        db = refresh_env()
+        assert db.query(Competitor).filter_by(name="Vendor 3").one().headquarters == "Vendor 3 HQ"
+        session = db.query(RefreshSession).one()
+        assert session.status == "completed"
+        assert session.new_values_added == 8
+        assert session.errors_count == 1
+        stages = json.loads(session.stage_progress)
+        assert stages["scrape"]["done"] == 8 and stages["scrape"]["failed"] == 1
+        assert stages["extract"]["total"] == 8 and stages["extract"]["done"] == 8
+        assert stages["persist"]["done"] == 8
+        assert all(stages[s]["finished_at"] for s in ("scrape", "extract", "persist"))
+        db.close()
+
+    async def test_extraction_failures_are_reported_per_competitor(self, refresh_env):
+        import scheduler
+
+        class _Failing(_FakeExtractor):
+            def extract_from_content(self, competitor_name, content, page_type="homepage"):
+                if competitor_name == "Vendor 2":
+                    raise ValueError("bad json")
+                return super().extract_from_content(competitor_name, content, page_type)
+
+        job = scheduler.CompetitorRefreshJob(scrape_concurrency=3, domain_rate_per_second=100)
+        job.extractor = _Failing()
+        results = await job.run_full_refresh(competitor_ids=[1, 2, 3])
+        assert [r["success"] for r in results] == [True, True, False]
+        assert results[2]["error"] == "No data extracted"
+
+    async def test_extract_worker_survives_a_merge_error(self, refresh_env):
+        import scheduler
+
+        class _BadMerge(_FakeExtractor):
+            def merge_extractions(self, extractions):
+                if extractions[0].headquarters == "Vendor 0 HQ":
+                    raise KeyError("confidence_score")
+                return super().merge_extractions(extractions)
+
+        job = scheduler.CompetitorRefreshJob(scrape_concurrency=4, extract_concurrency=1,
+                                             domain_rate_per_second=100)
+        job.extractor = _BadMerge()
+        results = await asyncio.wait_for(job.run_full_refresh(), timeout=5)
+        assert len(results) == 9
+        assert results[0] == {"competitor": "Vendor 0", "success": False, "error": "'confidence_score'"}
+        assert sum(r["success"] for r in results) == 7
+
+    async def test_browser_start_failure_fails_every_competitor(self, refresh_env, monkeypatch):
+        import scheduler
+
+        class _NoBrowser(_FakeScraper):
+            async def __aenter__(self):
+                raise RuntimeError("Playwright is not installed")
+
+        monkeypatch.setattr(scheduler, "CompetitorScraper", _NoBrowser)
+        job = scheduler.CompetitorRefreshJob(domain_rate_per_second=100)
+        job.extractor = _FakeExtractor()
+        results = await job.run_full_refresh()
+        assert len(results) == 9
+        assert all(r["error"] == "Playwright is not installed" for r in results)
+
+
+class TestPageFingerprints:
+
+    def test_hash_ignores_whitespace_and_case(self):
+        from page_fingerprints import content_hash
+        assert content_hash("Pricing  starts\nat $99") == content_hash("pricing starts at $99 ")
+        assert content_hash("Pricing starts at $99") != content_hash("Pricing starts at $199")
+
+    async def test_unchanged_pages_skip_extraction(self, refresh_env):
+        import scheduler
+        from database import RefreshSession, PageFingerprint
+        job = scheduler.CompetitorRefreshJob(domain_rate_per_second=100)
+        job.extractor = _FakeExtractor()
+        await job.run_full_refresh(competitor_ids=[1, 2])
+        assert job.extractor.calls == 8  # 2 competitors x 4 pages
+
+        _FakeScraper.edits[("https://vendor1.example.com", "pricing")] = "now $199/month"
+        job.extractor = _FakeExtractor()
+        results = await job.run_full_refresh(competitor_ids=[1, 2])
+        assert all(r["success"] for r in results)
+        assert job.extractor.calls == 1
+
+        db = refresh_env()
+        latest = db.query(RefreshSession).order_by(RefreshSession.id.desc()).first()
+        stages = json.loads(latest.stage_progress)
+        assert stages["extract"]["pages_extracted"] == 1
+        assert stages["extract"]["pages_skipped"] == 7
+        assert db.query(PageFingerprint).count() == 8
+        db.close()
+
+    async def test_not_modified_pages_reuse_stored_extraction(self, refresh_env):
+        import scheduler
+        from database import Competitor, RefreshSession, PageFingerprint
+        _FakeScraper.etags["https://vendor0.example.com"] = '"v1"'
+        job = scheduler.CompetitorRefreshJob(domain_rate_per_second=100)
+        job.extractor = _FakeExtractor()
+        await job.run_full_refresh(competitor_ids=[1])
+
+        db = refresh_env()
+        assert {fp.etag for fp in db.query(PageFingerprint).all()} == {'"v1"'}
+        db.close()
+
+        job.extractor = _FakeExtractor()
+        results = await job.run_full_refresh(competitor_ids=[1])
+        assert results[0]["success"] and results[0]["changes_detected"] == 0
+        assert job.extractor.calls == 0
+
+        db = refresh_env()
+        latest = db.query(RefreshSession).order_by(RefreshSession.id.desc()).first()
+        stages = json.loads(latest.stage_progress)
+        assert stages["scrape"]["pages_not_modified"] == 4
+        assert stages["extract"]["pages_skipped"] == 4
+        assert db.query(Competitor).get(1).headquarters == "Vendor 0 HQ"
+        assert {fp.etag for fp in db.query(PageFingerprint).all()} == {'"v1"'}
+        db.close()
@@ -0,0 +1,184 @@
+"""
+Certify Intel - Request Pipeline Middleware Tests
+Tests for the single ASGI middleware (middleware/pipeline.py) and its GCRA
+rate limiter: limits and retry times, exempt paths, one token decode per
+request, and the response headers it adds.
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from unittest.mock import patch
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+pytestmark = pytest.mark.timeout(10)
+
+
+def _client(limiter=None, rate_limit=True):
+    """Tiny app behind the pipeline middleware."""
+    from dependencies import get_current_user
+    from middleware.pipeline import RequestPipelineMiddleware
+
+    app = FastAPI()
+
+    @app.get("/api/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.get("/api/me")
+    async def me(user: dict = Depends(get_current_user)):
+        return user
+
+    @app.get("/api/items/{item_id}")
+    async def item(item_id: int):
+        return {"id": item_id}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.get("/app/logo.png")
+    async def logo():
+        return {"png": True}
+
+    app.add_middleware(
+        RequestPipelineMiddleware, rate_limiter=limiter, rate_limit=rate_limit, security_headers=True
+    )
+    return TestClient(app)
+
+
+class TestGCRALimiter:
+
+    def test_allows_burst_then_rejects_with_retry_time(self):
+        from middleware.rate_limit import MemoryGCRAStore
+        store = MemoryGCRAStore()
+        rule = [("ip:a", 3, 60.0)]
+        results = [store.check_sync(rule, now=1000.0)[0] for _ in range(4)]
+        assert [r[0] for r in results] == [True, True, True, False]
+        # Next slot opens one emission interval (20s) later
+        assert results[3][1] == pytest.approx(20.0)
+        assert store.check_sync(rule, now=1020.0)[0][0] is True
+
+    def test_rejected_request_is_not_counted(self):
+        from middleware.rate_limit import MemoryGCRAStore
+        store = MemoryGCRAStore()
+        ip, user = ("ip:a", 10, 60.0), ("user:u", 1, 60.0)
+        assert store.check_sync([ip, user], now=0.0)[1][0] is True
+        # User limit rejects; the IP counter must not advance
+        assert store.check_sync([ip, user], now=0.0)[1][0] is False
+        assert store.check_sync([ip], now=0.0)[0][2] == pytest.approx(60.0 - 2 * 6.0)
+
+    def test_memory_is_constant_per_key(self):
+        from middleware.rate_limit import MemoryGCRAStore
+        store = MemoryGCRAStore()
+        for i in range(500):
+            store.check_sync([("ip:a", 1000, 60.0)], now=float(i) / 100)
+        assert len(store) == 1
+
+    async def test_backend_error_falls_back_to_memory(self):
+        from middleware.rate_limit import GCRARateLimiter
+
+        class _Broken:
+            async def check(self, rules):
+                raise ConnectionError("redis down")
+
+        limiter = GCRARateLimiter(ip_limit=2, user_limit=5, store=_Broken())
+        decisions = [await limiter.hit("1.2.3.4") for _ in range(3)]
+        assert [d.allowed for d in decisions] == [True, True, False]
+        assert limiter.backend_errors == 3
+
+    async def test_remaining_counts_down(self):
+        from middleware.rate_limit import GCRARateLimiter, MemoryGCRAStore
+        limiter = GCRARateLimiter(ip_limit=100, user_limit=1000, store=MemoryGCRAStore())
+        first = await limiter.hit("1.2.3.4")
+        second = await limiter.hit("1.2.3.4")
+        assert (first.remaining, second.remaining) == (99, 98)
+
+
+class TestRequestPipeline:
+
+    def test_rate_limit_headers_and_429(self):
+        from middleware.rate_limit import GCRARateLimiter, MemoryGCRAStore
+        client = _client(GCRARateLimiter(ip_limit=2, user_limit=10, store=MemoryGCRAStore()))
+        first = client.get("/api/ping")
+        assert first.headers["X-RateLimit-Limit"] == "2"
+        assert first.headers["X-RateLimit-Remaining"] == "1"
+        client.get("/api/ping")
+        blocked = client.get("/api/ping")
+        assert blocked.status_code == 429
+        assert blocked.json()["detail"] == "IP rate limit exceeded (2/min)"
+        assert blocked.headers["Retry-After"] == "30"
+        # Still carries the usual response headers
+        assert blocked.headers["X-Content-Type-Options"] == "nosniff"
+        assert "X-Correlation-ID" in blocked.headers
+
+    def test_exempt_paths_are_not_limited(self):
+        from middleware.rate_limit import GCRARateLimiter, MemoryGCRAStore
+        client = _client(GCRARateLimiter(ip_limit=1, user_limit=10, store=MemoryGCRAStore()))
+        for _ in range(3):
+            assert client.get("/health").status_code == 200
+            assert client.get("/app/logo.png").status_code == 200
+        assert client.get("/api/ping").status_code == 200
+        assert client.get("/api/ping").status_code == 429
+
+    def test_forwarded_for_is_the_client_key(self):
+        from middleware.rate_limit import GCRARateLimiter, MemoryGCRAStore
+        client = _client(GCRARateLimiter(ip_limit=1, user_limit=10, store=MemoryGCRAStore()))
+        assert client.get("/api/ping", headers={"X-Forwarded-For": "10.0.0.1"}).status_code == 200
+        assert client.get("/api/ping", headers={"X-Forwarded-For": "10.0.0.2, proxy"}).status_code == 200
+        assert client.get("/api/ping", headers={"X-Forwarded-For": "10.0.0.1"}).status_code == 429
+
+    def test_token_decoded_once_per_request(self):
+        from middleware.rate_limit import GCRARateLimiter, MemoryGCRAStore
+        client = _client(GCRARateLimiter(store=MemoryGCRAStore()))
+        with patch("extended_features.auth_manager.verify_token",
+                   return_value={"sub": "analyst@example.com", "role": "analyst"}) as verify:
+            response = client.get("/api/me", headers={"Authorization": "Bearer abc"})
+        assert response.status_code == 200
+        assert response.json()["email"] == "analyst@example.com"
+        verify.assert_called_once_with("abc")
+
+    def test_disabled_limiter_passes_everything(self):
+        client = _client(rate_limit=False)
+        for _ in range(5):
+            response = client.get("/api/ping")
+            assert response.status_code == 200
+        assert "X-RateLimit-Limit" not in response.headers
+
+    def test_limiter_off_unless_enabled(self, monkeypatch):
+        from middleware.rate_limit import is_rate_limit_enabled
+        monkeypatch.delenv("RATE_LIMIT_ENABLED", raising=False)
+        assert is_rate_limit_enabled() is False
+        monkeypatch.setenv("RATE_LIMIT_ENABLED", "true")
+        assert is_rate_limit_enabled() is True
+
+    def test_correlation_id_echoed(self):
+        client = _client(rate_limit=False)
+        assert client.get("/api/ping", headers={"X-Correlation-ID": "req-1"}).headers["X-Correlation-ID"] == "req-1"
+        assert client.get("/api/ping").headers["X-Correlation-ID"]
+
+    def test_static_caching_headers(self):
+        client = _client(rate_limit=False)
+        assert client.get("/app/logo.png").headers["Cache-Control"] == "public, max-age=604800"
+        assert client.get("/app/logo.png?v=2").headers["Vary"] == "Accept-Encoding"
+        assert "Cache-Control" not in client.get("/api/ping").headers
+
+    def test_metrics_recorded_with_route_template(self, monkeypatch):
+        import metrics
+        calls = []
+        in_flight = []
+        monkeypatch.setattr(metrics, "METRICS_ENABLED", True)
+        monkeypatch.setattr(metrics, "track_request", lambda *args: calls.append(args))
+        monkeypatch.setattr(metrics, "track_in_flight", lambda method, delta: in_flight.append(delta))
+        client = _client(rate_limit=False)
+        client.get("/api/items/42")
+        client.get("/health")
+        assert len(calls) == 1
+        method, path, status, duration, size = calls[0]
+        assert (method, path, status) == ("GET", "/api/items/{item_id}", 200)
+        assert duration >= 0 and size == len(b'{"id":42}')
+        assert in_flight == [1, -1]
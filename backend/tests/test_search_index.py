@@ -0,0 +1,130 @@
+"""
+Certify Intel - Full-Text Search Index Tests
+Tests for the FTS5 index behind /api/search and /api/search/suggestions:
+trigger sync, ranking, highlighted snippets, prefix suggestions.
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+pytestmark = pytest.mark.timeout(10)
+
+
+@pytest.fixture
+def fts_db():
+    """Fresh in-memory SQLite database with the search index in place."""
+    from database import Base
+    import search_index
+
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    search_index._index_state.pop(str(engine.url), None)
+    assert search_index.ensure_search_index(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        search_index._index_state.pop(str(engine.url), None)
+        engine.dispose()
+
+
+def _seed(db):
+    from database import Competitor, CompetitorProduct, KnowledgeBaseItem
+    athena = Competitor(name="Athenahealth", notes="Cloud EHR and revenue cycle platform",
+                        target_segments="Ambulatory", threat_level="High")
+    phreesia = Competitor(name="Phreesia", notes="Patient intake kiosks and payments",
+                          key_features="patient intake, check-in")
+    gone = Competitor(name="Intake Legacy Co", notes="patient intake", is_deleted=True)
+    db.add_all([athena, phreesia, gone])
+    db.flush()
+    db.add(CompetitorProduct(competitor_id=phreesia.id, product_name="Phreesia Intake",
+                             product_category="Patient Intake",
+                             description="Digital <b>patient</b> intake"))
+    db.add(KnowledgeBaseItem(title="Intake market report", content_text="The patient intake market grew."))
+    db.commit()
+    return athena, phreesia
+
+
+class TestSearchIndex:
+
+    def test_search_ranks_and_joins_competitor_name(self, fts_db):
+        import search_index
+        _, phreesia = _seed(fts_db)
+        results = search_index.search(fts_db, "patient intake", ["competitor", "product", "knowledge"])
+        types = {r["type"] for r in results}
+        assert types == {"competitor", "product", "knowledge"}
+        product = next(r for r in results if r["type"] == "product")
+        assert product["subtitle"].startswith("Phreesia |")
+        assert product["url"] == f"/competitors/{phreesia.id}"
+        scores = [r["score"] for r in results]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_deleted_competitors_excluded(self, fts_db):
+        import search_index
+        _seed(fts_db)
+        results = search_index.search(fts_db, "intake", ["competitor"])
+        assert [r["title"] for r in results] == ["Phreesia"]
+
+    def test_snippet_is_escaped_and_highlighted(self, fts_db):
+        import search_index
+        _seed(fts_db)
+        product = search_index.search(fts_db, "digital", ["product"])[0]
+        assert "<mark>Digital</mark>" in product["snippet"]
+        assert "&lt;b&gt;" in product["snippet"]
+
+    def test_triggers_keep_index_in_sync(self, fts_db):
+        import search_index
+        athena, _ = _seed(fts_db)
+        athena.notes = "Now focused on telehealth"
+        fts_db.commit()
+        assert [r["id"] for r in search_index.search(fts_db, "telehealth", ["competitor"])] == [athena.id]
+        assert search_index.search(fts_db, "revenue", ["competitor"]) == []
+        fts_db.delete(athena)
+        fts_db.commit()
+        assert search_index.search(fts_db, "telehealth", ["competitor"]) == []
+
+    def test_stemming_matches_word_forms(self, fts_db):
+        import search_index
+        _seed(fts_db)
+        results = search_index.search(fts_db, "payment", ["competitor"])
+        assert [r["title"] for r in results] == ["Phreesia"]
+
+    def test_query_syntax_is_not_injectable(self, fts_db):
+        import search_index
+        _seed(fts_db)
+        assert search_index.search(fts_db, 'intake" OR name:*', ["competitor"]) is not None
+        assert search_index.search(fts_db, "!!!", ["competitor"]) == []
+
+    def test_suggestions_prefix_match_names(self, fts_db):
+        import search_index
+        _seed(fts_db)
+        suggestions = search_index.suggest(fts_db, "athe")
+        assert suggestions == [{"text": "Athenahealth", "type": "competitor"}]
+        # Body text is not used for suggestions
+        assert search_index.suggest(fts_db, "kiosk") == []
+        names = {s["text"] for s in search_index.suggest(fts_db, "phre")}
+        assert names == {"Phreesia", "Phreesia Intake"}
+
+    def test_backfills_rows_created_before_index(self):
+        from database import Base, Competitor
+        import search_index
+        engine = create_engine("sqlite://", poolclass=StaticPool,
+                               connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        session.add(Competitor(name="Backfilled Health"))
+        session.commit()
+        search_index._index_state.pop(str(engine.url), None)
+        results = search_index.search(session, "backfilled", ["competitor"])
+        assert [r["title"] for r in results] == ["Backfilled Health"]
+        session.close()
+        search_index._index_state.pop(str(engine.url), None)
@@ -1,7 +1,8 @@
 """
 Certify Intel - Security Headers Middleware Tests
 
-Tests for SecurityHeadersMiddleware (middleware/security.py):
+Tests for the security headers (middleware/security.py) added by
+RequestPipelineMiddleware:
 - All required security headers present on responses
 - CSP policy allows required CDN resources
 - HSTS only added for HTTPS requests
@@ -109,8 +110,10 @@ class TestSecurityMiddlewareConfig:
 
     def test_middleware_module_importable(self):
         """Middleware can be imported from the module."""
-        from middleware.security import SecurityHeadersMiddleware
-        assert SecurityHeadersMiddleware is not None
+        from middleware.security import apply_security_headers
+        from middleware.pipeline import RequestPipelineMiddleware
+        assert apply_security_headers is not None
+        assert RequestPipelineMiddleware is not None
 
     def test_is_security_headers_enabled_default(self):
         """Default should be enabled (true)."""
@@ -0,0 +1,90 @@
+"""
+Certify Intel - SQLite Cache Base Tests
+Tests for sqlite_cache: table setup, least recently used eviction by row
+count and by byte size, and the shared instance getter.
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytestmark = pytest.mark.timeout(10)
+
+
+def _cache_class():
+    from sqlite_cache import SQLiteCache
+
+    class KeyValueCache(SQLiteCache):
+        TABLE = "items"
+        COLUMNS = "k TEXT PRIMARY KEY, v TEXT NOT NULL, size INTEGER NOT NULL, last_used_at REAL NOT NULL"
+        KEY = ("k",)
+        SIZE_COLUMN = "size"
+
+        def put(self, key, value, used_at):
+            with self._lock:
+                self._conn.execute(
+                    "INSERT INTO items (k, v, size, last_used_at) VALUES (?, ?, ?, ?)",
+                    (key, value, len(value), used_at),
+                )
+                self._stored(1, len(value))
+                self._conn.commit()
+
+        def keys(self):
+            with self._lock:
+                return [k for (k,) in self._conn.execute("SELECT k FROM items ORDER BY k")]
+
+    return KeyValueCache
+
+
+class TestEviction:
+
+    def test_row_limit_evicts_least_recently_used_to_ninety_percent(self, tmp_path):
+        cache = _cache_class()(str(tmp_path / "rows.db"), max_entries=10)
+        for i in range(11):
+            cache.put(f"k{i:02d}", "v", used_at=i)
+        assert cache.stats()["entries"] == 9
+        assert cache.keys() == [f"k{i:02d}" for i in range(2, 11)]
+        cache.close()
+
+    def test_size_limit_counts_bytes_and_survives_reopen(self, tmp_path):
+        path = str(tmp_path / "bytes.db")
+        cache = _cache_class()(path, max_bytes=100)
+        for i in range(4):
+            cache.put(f"k{i}", "x" * 30, used_at=i)
+        assert cache.keys() == ["k1", "k2", "k3"]
+        assert cache.stats()["size_bytes"] == 90
+        cache.close()
+
+        reopened = _cache_class()(path, max_bytes=100)
+        assert reopened.stats()["entries"] == 3 and reopened.stats()["size_bytes"] == 90
+        reopened.clear()
+        assert reopened.stats()["entries"] == 0
+        reopened.close()
+
+
+class TestSharedCache:
+
+    def test_opened_once_and_reset(self, tmp_path):
+        from sqlite_cache import SharedCache
+        opened = []
+
+        def factory():
+            opened.append(_cache_class()(str(tmp_path / f"shared{len(opened)}.db")))
+            return opened[-1]
+
+        shared = SharedCache(factory, "Test cache unavailable")
+        assert shared.get(enabled=False) is None
+        assert shared.get() is shared.get() is opened[0]
+        shared.reset()
+        assert shared.instance is None
+        assert shared.get() is opened[1]
+        shared.reset()
+
+    def test_unavailable_cache_returns_none(self):
+        from sqlite_cache import SharedCache
+
+        def broken():
+            raise OSError("read-only file system")
+
+        assert SharedCache(broken, "Test cache unavailable").get() is None
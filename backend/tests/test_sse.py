@@ -0,0 +1,161 @@
+"""
+Certify Intel - Server-Sent Events Tests
+Tests for sse.py framing and for the endpoints that stream AI tokens when
+the client asks for text/event-stream: /api/analytics/chat, chat session
+messages and /api/agents/query.
+"""
+import pytest
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+pytestmark = pytest.mark.timeout(30)
+
+
+async def _fake_stream(self, prompt, task_type, **kwargs):
+    for text in ("Top threat: ", "Acme"):
+        yield {"type": "token", "text": text}
+    yield {"type": "done", "response": "Top threat: Acme", "model": "mock-model",
+           "provider": "mock", "cost_usd": 0.0, "ttft_ms": 5}
+
+
+def _sse_events(response) -> list:
+    """Parse an event-stream body into (event, data) pairs."""
+    events = []
+    for frame in response.text.strip().split("\n\n"):
+        name, data = frame.split("\n", 1)
+        events.append((name[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+def _login(test_client) -> dict:
+    """Auth headers for the seeded admin user."""
+    response = test_client.post(
+        "/token",
+        data={"username": "[YOUR-ADMIN-EMAIL]", "password": "[YOUR-ADMIN-PASSWORD]"}
+    )
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+class TestEventStreamResponse:
+
+    def _app(self, events):
+        from sse import event_stream_response
+
+        app = FastAPI()
+
+        @app.get("/stream")
+        async def stream():
+            return event_stream_response(events())
+
+        return app
+
+    def test_frames_events_and_ends_with_error(self):
+        async def events():
+            yield {"type": "token", "text": "Hi"}
+            raise RuntimeError("boom")
+
+        response = TestClient(self._app(events)).get("/stream")
+        assert response.headers["content-type"].startswith("text/event-stream")
+        frames = response.text.strip().split("\n\n")
+        assert frames[0] == 'event: token\ndata: {"text": "Hi"}'
+        assert frames[1].startswith("event: error\n")
+
+    def test_gzip_leaves_event_streams_alone(self):
+        from starlette.middleware.gzip import GZipMiddleware
+
+        async def events():
+            for i in range(50):
+                yield {"type": "token", "text": f"token {i} " * 10}
+
+        app = self._app(events)
+        app.add_middleware(GZipMiddleware, minimum_size=1)
+        response = TestClient(app).get("/stream", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert len(_sse_events(response)) == 50
+
+
+class TestStreamingEndpoints:
+    """The chat endpoints stream tokens when asked for text/event-stream."""
+
+    @patch("ai_router.AIRouter.stream", _fake_stream)
+    def test_analytics_chat_streams_tokens(self, test_client):
+        response = test_client.post(
+            "/api/analytics/chat",
+            json={"message": "What are the top threats?"},
+            headers={**_login(test_client), "Accept": "text/event-stream"},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = _sse_events(response)
+        assert [d["text"] for e, d in events if e == "token"] == ["Top threat: ", "Acme"]
+        assert events[-1][0] == "done"
+        assert events[-1][1]["response"] == "Top threat: Acme"
+        assert events[-1][1]["success"] is True
+
+    @patch("ai_router.AIRouter.stream", _fake_stream)
+    def test_chat_message_streams_and_saves_reply(self, test_client):
+        headers = _login(test_client)
+        session = test_client.post(
+            "/api/chat/sessions", json={"page_context": "sse-test"}, headers=headers
+        ).json()
+        response = test_client.post(
+            f"/api/chat/sessions/{session['id']}/messages",
+            json={"role": "user", "content": "Who is the top threat?", "stream": True},
+            headers=headers,
+        )
+        assert response.status_code == 200
+        events = _sse_events(response)
+        assert events[0][0] == "message"
+        assert events[0][1]["content"] == "Who is the top threat?"
+        assert events[-1][0] == "done"
+        assert events[-1][1]["role"] == "assistant"
+
+        messages = test_client.get(
+            f"/api/chat/sessions/{session['id']}/messages", headers=headers
+        ).json()["messages"]
+        assert [(m["role"], m["content"]) for m in messages] == [
+            ("user", "Who is the top threat?"),
+            ("assistant", "Top threat: Acme"),
+        ]
+
+    @patch("ai_router.AIRouter.stream", _fake_stream)
+    def test_agent_query_streams_model_tokens(self, test_client):
+        async def fake_run_agent_query(query, **kwargs):
+            from ai_router import get_ai_router, TaskType
+            result = await get_ai_router().generate(prompt=query, task_type=TaskType.CHAT)
+            return {"response": result["response"], "target_agent": "dashboard"}
+
+        with patch("agents.run_agent_query", fake_run_agent_query):
+            response = test_client.post(
+                "/api/agents/query",
+                json={"query": "What are the top threats?"},
+                headers={"Accept": "text/event-stream"},
+            )
+        assert response.status_code == 200
+        events = _sse_events(response)
+        assert [d["text"] for e, d in events if e == "token"] == ["Top threat: ", "Acme"]
+        assert events[-1][0] == "done"
+        assert events[-1][1]["agent"] == "dashboard"
+        assert events[-1][1]["response"] == "Top threat: Acme"
+
+    def test_chat_message_without_stream_returns_json(self, test_client):
+        headers = _login(test_client)
+        session = test_client.post(
+            "/api/chat/sessions", json={"page_context": "sse-test"}, headers=headers
+        ).json()
+        response = test_client.post(
+            f"/api/chat/sessions/{session['id']}/messages",
+            json={"role": "user", "content": "hello"},
+            headers=headers,
+        )
+        assert response.status_code == 200
+        assert response.json()["content"] == "hello"
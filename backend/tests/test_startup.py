@@ -0,0 +1,102 @@
+"""
+Certify Intel - Startup State Tests
+Tests for background startup tasks, readiness gating, and the
+``-X importtime`` report parser.
+"""
+import pytest
+import sys
+import os
+import asyncio
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from startup import StartupState, parse_importtime, format_profile
+
+pytestmark = pytest.mark.timeout(10)
+
+
+class TestStartupState:
+
+    def test_ready_without_tasks_once_serving(self):
+        state = StartupState()
+        assert state.ready_at is None
+        state.mark_serving()
+        assert state.is_ready
+        assert state.ready_at is not None
+        assert state.to_dict()["status"] == "ready"
+
+    async def test_required_task_holds_readiness(self):
+        state = StartupState()
+        gate = asyncio.Event()
+
+        async def slow():
+            await gate.wait()
+
+        handle = state.start_task("seed", slow, required=True)
+        state.mark_serving()
+        await asyncio.sleep(0)
+        assert not state.is_ready
+        assert state.to_dict()["status"] == "starting"
+        assert state.tasks["seed"].status == "running"
+
+        gate.set()
+        await handle
+        assert state.is_ready
+        assert state.ready_at is not None
+        assert state.to_dict()["tasks"]["seed"]["status"] == "done"
+
+    async def test_optional_task_does_not_hold_readiness(self):
+        state = StartupState()
+        gate = asyncio.Event()
+
+        async def slow():
+            await gate.wait()
+
+        state.start_task("scheduler", slow)
+        state.mark_serving()
+        await asyncio.sleep(0)
+        assert state.is_ready
+        await state.cancel()
+        assert state.tasks["scheduler"].error == "cancelled"
+
+    async def test_sync_task_runs_in_thread_and_failure_is_recorded(self):
+        state = StartupState()
+
+        def boom():
+            raise RuntimeError("no database")
+
+        await state.start_task("seed", boom, required=True)
+        task = state.tasks["seed"]
+        assert task.status == "failed"
+        assert "no database" in task.error
+        assert task.duration_ms is not None
+        # A failed required task does not block readiness forever
+        assert state.is_ready
+
+
+class TestImportProfile:
+
+    SAMPLE = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   _io\n"
+        "import time:      2500 |       2500 |     openpyxl.styles\n"
+        "import time:      1000 |       3500 |   openpyxl\n"
+        "import time:       400 |       4020 | main\n"
+        "unrelated line\n"
+    )
+
+    def test_parse_importtime(self):
+        modules = parse_importtime(self.SAMPLE)
+        assert [m["module"] for m in modules] == ["_io", "openpyxl.styles", "openpyxl", "main"]
+        openpyxl = modules[2]
+        assert openpyxl["self_ms"] == 1.0
+        assert openpyxl["cumulative_ms"] == 3.5
+        assert openpyxl["depth"] == 1
+        assert modules[1]["depth"] == 2
+        assert modules[3]["depth"] == 0
+
+    def test_format_profile_limits_rows(self):
+        modules = sorted(parse_importtime(self.SAMPLE), key=lambda m: m["cumulative_ms"], reverse=True)
+        report = format_profile(modules, top=2).splitlines()
+        assert len(report) == 3
+        assert report[1].endswith("main")
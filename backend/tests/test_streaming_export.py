@@ -0,0 +1,183 @@
+"""
+Certify Intel - Streaming Export Tests
+Tests for streaming_export: batched server-side reads, row-streamed CSV,
+NDJSON and JSON documents, write-only Excel and optional Parquet, plus the
+export endpoints that use them.
+"""
+import pytest
+import sys
+import os
+import csv
+import io
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+pytestmark = pytest.mark.timeout(10)
+
+
+@pytest.fixture
+def history_db():
+    """In-memory database with five change-history rows."""
+    from database import Base, DataChangeHistory
+
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine)
+    db = SessionLocal()
+    for i in range(5):
+        db.add(DataChangeHistory(
+            competitor_id=1, competitor_name="Epic", field_name=f"field_{i}",
+            old_value="a", new_value=f"b{i}", changed_at=datetime(2026, 1, 1 + i),
+        ))
+    db.commit()
+    yield db
+    db.close()
+    engine.dispose()
+
+
+def _query(s):
+    from database import DataChangeHistory
+    return s.query(DataChangeHistory).order_by(DataChangeHistory.id)
+
+
+class TestReading:
+
+    def test_batches_use_their_own_session(self, history_db):
+        from streaming_export import iter_batches
+        batches = list(iter_batches(history_db, _query, batch_size=2))
+        assert [len(b) for b in batches] == [2, 2, 1]
+        # The request session never loaded the rows
+        assert len(history_db.identity_map) == 0
+
+    def test_rows_are_converted(self, history_db):
+        from streaming_export import iter_rows, model_fields
+        rows = list(iter_rows(history_db, _query, lambda c: model_fields(c, ("field_name", "missing"))))
+        assert rows[0] == {"field_name": "field_0", "missing": None}
+        assert len(rows) == 5
+
+
+class TestWriters:
+
+    def test_csv_is_written_per_batch(self):
+        from streaming_export import csv_chunks
+        chunks = list(csv_chunks(["A", "B"], ([i, f"x,{i}"] for i in range(5)), batch_size=2))
+        assert len(chunks) == 4
+        parsed = list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+        assert parsed[0] == ["A", "B"]
+        assert parsed[-1] == ["4", "x,4"]
+
+    def test_ndjson_lines(self):
+        from streaming_export import ndjson_chunks
+        rows = [{"at": datetime(2026, 1, 1)}, {"at": None}]
+        lines = b"".join(ndjson_chunks(rows)).decode("utf-8").splitlines()
+        assert [json.loads(line) for line in lines] == [{"at": "2026-01-01T00:00:00"}, {"at": None}]
+
+    def test_json_document_puts_counts_last(self):
+        from streaming_export import json_document_chunks
+        body = b"".join(json_document_chunks(
+            "items", ({"n": i} for i in range(3)), tail=lambda count: {"count": count}, batch_size=2
+        ))
+        assert json.loads(body) == {"items": [{"n": 0}, {"n": 1}, {"n": 2}], "count": 3}
+        assert json.loads(b"".join(json_document_chunks("items", []))) == {"items": []}
+
+    def test_xlsx_write_only_workbook(self):
+        from openpyxl import load_workbook
+        from streaming_export import xlsx_chunks
+        chunks = list(xlsx_chunks([
+            ("Data", ["Name", "Score"], ([f"c{i}", i] for i in range(3))),
+            ("Summary", ["Metric", "Value"], [["Total", 3]]),
+        ]))
+        wb = load_workbook(io.BytesIO(b"".join(chunks)))
+        assert wb.sheetnames == ["Data", "Summary"]
+        assert [c.value for c in wb["Data"][4]] == ["c2", 2]
+        assert wb["Summary"]["B2"].value == 3
+
+    def test_temp_file_removed_after_streaming(self, monkeypatch):
+        import streaming_export
+        created = []
+        real_mkstemp = streaming_export.tempfile.mkstemp
+
+        def mkstemp(**kwargs):
+            fd, path = real_mkstemp(**kwargs)
+            created.append(path)
+            return fd, path
+
+        monkeypatch.setattr(streaming_export.tempfile, "mkstemp", mkstemp)
+        list(streaming_export.xlsx_chunks([("Data", ["A"], [[1]])]))
+        assert created and not os.path.exists(created[0])
+
+    def test_parquet_round_trip(self, history_db):
+        pq = pytest.importorskip("pyarrow.parquet")
+        from database import DataChangeHistory
+        from streaming_export import arrow_schema, iter_rows, model_fields, parquet_chunks
+        fields = ("id", "field_name", "changed_at")
+        schema = arrow_schema(DataChangeHistory, fields)
+        rows = iter_rows(history_db, _query, lambda c: model_fields(c, fields))
+        table = pq.read_table(io.BytesIO(b"".join(parquet_chunks(schema, rows, batch_size=2))))
+        assert table.num_rows == 5
+        assert str(table.schema.field("changed_at").type) == "timestamp[us]"
+
+
+class TestFormats:
+
+    def test_check_format(self, monkeypatch):
+        import streaming_export
+        assert streaming_export.check_format("Excel", ("csv", "xlsx")) == "xlsx"
+        with pytest.raises(HTTPException) as exc:
+            streaming_export.check_format("pdf", ("csv",))
+        assert exc.value.status_code == 400
+        monkeypatch.setattr(streaming_export, "PARQUET_AVAILABLE", False)
+        with pytest.raises(HTTPException) as exc:
+            streaming_export.check_format("parquet", ("csv", "parquet"))
+        assert exc.value.status_code == 501
+
+
+class TestExportEndpoints:
+
+    def test_bulk_export_streams_csv_and_ndjson(self, test_client, api_test_competitor):
+        from database import DataChangeHistory
+        from tests.conftest import TestingSessionLocal
+        db = TestingSessionLocal()
+        db.add(DataChangeHistory(
+            competitor_id=api_test_competitor["id"], competitor_name=api_test_competitor["name"],
+            field_name="pricing_model", old_value="x" * 600, new_value="Per seat",
+        ))
+        db.commit()
+        db.close()
+
+        ids = [api_test_competitor["id"]]
+        response = test_client.post("/api/changes/bulk-export", json=ids)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.reader(io.StringIO(response.text)))
+        assert rows[0][0] == "Date" and len(rows) == 2
+        assert len(rows[1][4]) == 500
+
+        response = test_client.post("/api/changes/bulk-export?format=ndjson", json=ids)
+        records = [json.loads(line) for line in response.text.splitlines()]
+        assert records[0]["new_value"] == "Per seat"
+
+        response = test_client.post("/api/changes/bulk-export?format=json", json=ids)
+        assert response.json()["total"] == 1
+        assert test_client.post("/api/changes/bulk-export?format=pdf", json=ids).status_code == 400
+
+    def test_excel_export(self, test_client, api_test_competitor):
+        from openpyxl import load_workbook
+        response = test_client.get("/api/export/excel")
+        assert response.status_code == 200
+        wb = load_workbook(io.BytesIO(response.content))
+        names = [row[1] for row in wb["Competitors"].iter_rows(min_row=2, values_only=True)]
+        assert api_test_competitor["name"] in names
+        summary = dict(wb["Summary"].iter_rows(min_row=2, values_only=True))
+        assert summary["Total Competitors"] == len(names)
+        assert summary["High Threat"] >= 1
@@ -91,15 +91,26 @@ class TestEmbeddingGeneration:
 
             assert len(embeddings) == 3
 
-    def test_embedding_cache(self):
+    @pytest.mark.asyncio
+    async def test_embedding_cache(self, tmp_path, monkeypatch):
         """Test that embeddings are cached."""
+        import embedding_cache
+        monkeypatch.setenv("EMBEDDING_CACHE_ENABLED", "true")
+        monkeypatch.setattr(embedding_cache._shared, "instance",
+                            embedding_cache.EmbeddingCache(path=str(tmp_path / "emb.db")))
         vs = VectorStore()
 
-        # Manually add to cache
-        vs._embedding_cache["test_key"] = np.array([0.5] * 1536)
+        mock_response = Mock()
+        mock_response.data = [Mock(embedding=[0.5] * 1536)]
+
+        with patch('vector_store._openai_client') as mock_client:
+            mock_client.embeddings.create = AsyncMock(return_value=mock_response)
+            first = await vs.embed_text("cached query")
+            second = await vs.embed_text("cached query")
 
-        # Cache should be accessible
-        assert "test_key" in vs._embedding_cache
+        # Second call is served from the cache
+        assert mock_client.embeddings.create.await_count == 1
+        assert np.array_equal(first, second)
 
 
 class TestVectorInsertion:
@@ -259,6 +270,166 @@ class TestConnectionPooling:
                 pass  # May fail without asyncpg
 
 
+class _FakeConn:
+    """Records the calls the vector store makes on an asyncpg connection."""
+
+    def __init__(self, vector_schema="public"):
+        self.vector_schema = vector_schema
+        self.calls = []
+
+    async def fetchval(self, query, *args):
+        return self.vector_schema
+
+    async def set_type_codec(self, name, **kwargs):
+        self.calls.append(("codec", name, kwargs))
+
+    async def execute(self, query, *args):
+        self.calls.append(("execute", " ".join(query.split()), args))
+
+    async def executemany(self, query, records):
+        self.calls.append(("executemany", " ".join(query.split()), list(records)))
+
+    async def copy_records_to_table(self, table, records, columns):
+        self.calls.append(("copy", table, list(records), columns))
+
+    def transaction(self):
+        conn = self
+
+        class _Tx:
+            async def __aenter__(self):
+                conn.calls.append(("begin",))
+
+            async def __aexit__(self, *exc):
+                conn.calls.append(("commit" if exc[0] is None else "rollback",))
+
+        return _Tx()
+
+
+class _FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        conn = self.conn
+
+        class _Acquire:
+            async def __aenter__(self):
+                return conn
+
+            async def __aexit__(self, *exc):
+                pass
+
+        return _Acquire()
+
+
+def _store_with_conn(binary=True):
+    vs = VectorStore()
+    conn = _FakeConn()
+    vs._pool = _FakePool(conn)
+    vs._binary_vectors = binary
+    return vs, conn
+
+
+def _vec_chunks(n, start=0):
+    return [
+        DocumentChunk(chunk_index=start + i, content=f"chunk {start + i}",
+                      embedding=np.full(4, i, dtype=np.float32), metadata={"i": i}, token_count=2)
+        for i in range(n)
+    ]
+
+
+class TestBinaryVectorTransport:
+    """Test the binary pgvector codec and COPY ingestion."""
+
+    def test_codec_round_trip(self):
+        from vector_store import encode_vector, decode_vector
+        vec = np.array([0.25, -1.5, 3.0], dtype=np.float64)
+        data = encode_vector(vec)
+        # uint16 dim + uint16 unused + 3 big-endian float4
+        assert data[:4] == b"\x00\x03\x00\x00"
+        assert len(data) == 4 + 3 * 4
+        decoded = decode_vector(data)
+        assert decoded.dtype == np.float32
+        assert np.array_equal(decoded, vec.astype(np.float32))
+
+    @pytest.mark.asyncio
+    async def test_init_connection_registers_binary_codec(self):
+        vs = VectorStore()
+        conn = _FakeConn(vector_schema="extensions")
+        await vs._init_connection(conn)
+        assert vs._binary_vectors is True
+        (_, name, kwargs), = conn.calls
+        assert name == "vector"
+        assert kwargs["schema"] == "extensions"
+        assert kwargs["format"] == "binary"
+
+        # Before the extension exists, vectors stay in text format
+        await vs._init_connection(_FakeConn(vector_schema=None))
+        assert vs._binary_vectors is False
+        assert vs._vector_param([1.0, 2.0]) == "[1.0,2.0]"
+
+    @pytest.mark.asyncio
+    async def test_batch_insert_copies_through_staging_table(self):
+        vs, conn = _store_with_conn(binary=True)
+        chunks = _vec_chunks(3) + [DocumentChunk(chunk_index=1, content="newer",
+                                                 embedding=np.ones(4), metadata={})]
+        assert await vs.batch_insert_chunks("doc_1", chunks) == 4
+
+        kinds = [c[0] for c in conn.calls]
+        assert kinds == ["begin", "execute", "copy", "execute", "execute", "commit"]
+        _, table, records, columns = conn.calls[2]
+        assert table == "document_chunks_stage"
+        assert columns == list(VectorStore.CHUNK_COLUMNS)
+        # Duplicate (document, chunk_index) keeps the last row only
+        assert [(r[1], r[2]) for r in records] == [(0, "chunk 0"), (1, "newer"), (2, "chunk 2")]
+        assert isinstance(records[0][4], np.ndarray)
+        assert "ON CONFLICT (document_id, chunk_index) DO UPDATE" in conn.calls[3][1]
+
+    @pytest.mark.asyncio
+    async def test_batch_insert_text_fallback(self):
+        vs, conn = _store_with_conn(binary=False)
+        await vs.batch_insert_chunks("doc_1", _vec_chunks(2))
+        executemany = [c for c in conn.calls if c[0] == "executemany"]
+        assert len(executemany) == 1
+        assert executemany[0][2][1][4] == "[1.0,1.0,1.0,1.0]"
+        assert not [c for c in conn.calls if c[0] == "copy"]
+
+    @pytest.mark.asyncio
+    async def test_bulk_insert_batches_and_rebuilds_index_after_load(self):
+        vs, conn = _store_with_conn(binary=True)
+        order = []
+        vs.drop_vector_indexes = AsyncMock(side_effect=lambda: order.append("drop"))
+        vs.create_hnsw_index = AsyncMock(side_effect=lambda: order.append("build"))
+        original_write = vs._write_batch
+
+        async def _write(pool, records):
+            order.append(len(records))
+            return await original_write(pool, records)
+
+        vs._write_batch = _write
+        total = await vs.bulk_insert_chunks(
+            {"doc_a": _vec_chunks(3), "doc_b": _vec_chunks(2), "doc_c": []},
+            batch_rows=2, rebuild_index="hnsw"
+        )
+        assert total == 5
+        assert order == ["drop", 2, 2, 1, "build"]
+        update = [c for c in conn.calls if c[0] == "execute" and "unnest" in c[1]]
+        assert update[0][2] == (["doc_a", "doc_b"], [3, 2])
+
+    @pytest.mark.asyncio
+    async def test_bulk_insert_rebuilds_index_when_load_fails(self):
+        vs, conn = _store_with_conn(binary=True)
+        vs.drop_vector_indexes = AsyncMock()
+        vs.create_streamingdiskann_index = AsyncMock()
+        vs._write_batch = AsyncMock(side_effect=RuntimeError("copy failed"))
+        with pytest.raises(RuntimeError):
+            await vs.bulk_insert_chunks({"doc_a": _vec_chunks(1)}, rebuild_index="diskann")
+        vs.create_streamingdiskann_index.assert_awaited_once()
+
+        with pytest.raises(ValueError):
+            await vs.bulk_insert_chunks({"doc_a": _vec_chunks(1)}, rebuild_index="ivfflat")
+
+
 # PostgreSQL-specific tests
 @pytest.mark.postgresql
 class TestPostgreSQLIntegration:
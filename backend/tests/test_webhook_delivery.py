@@ -0,0 +1,222 @@
+"""
+Certify Intel - Webhook Delivery Tests
+Tests for the background webhook delivery worker: burst coalescing into
+batched payloads, signatures over the sent body, retries with backoff,
+the bounded queue, and the durable outbox.
+"""
+import pytest
+import sys
+import os
+import hashlib
+import hmac
+import json
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime, timedelta
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+pytestmark = pytest.mark.timeout(10)
+
+
+@pytest.fixture
+def outbox():
+    """Outbox on an in-memory database."""
+    from database import Base
+    from webhooks import WebhookOutbox
+
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield WebhookOutbox(sessionmaker(bind=engine))
+    engine.dispose()
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.delenv("SLACK_WEBHOOK_URL", raising=False)
+    monkeypatch.delenv("TEAMS_WEBHOOK_URL", raising=False)
+    from webhooks import WebhookManager
+    manager = WebhookManager()
+    yield manager
+    manager.close(timeout=1)
+
+
+def _worker(manager, handler, **kwargs):
+    from webhooks import WebhookDeliveryWorker
+    kwargs.setdefault("batch_window", 0.05)
+    kwargs.setdefault("retry_base", 0.01)
+    worker = WebhookDeliveryWorker(manager, transport=httpx.MockTransport(handler), **kwargs)
+    manager._delivery = worker
+    return worker
+
+
+def _recorder(statuses=None):
+    """Handler recording request bodies; answers with ``statuses`` in turn, then 200."""
+    requests = []
+    statuses = list(statuses or [])
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(statuses.pop(0) if statuses else 200)
+    return requests, handler
+
+
+class TestDelivery:
+
+    def test_burst_is_coalesced_and_signed(self, manager):
+        requests, handler = _recorder()
+        worker = _worker(manager, handler)
+        webhook = manager.register_webhook("https://hooks.example.com/in", ["price.changed"], secret="s3cret")
+        for i in range(5):
+            manager.trigger("price.changed", {"competitor": f"C{i}"})
+        assert worker.wait_idle()
+
+        assert len(requests) == 1
+        body = requests[0].content
+        payload = json.loads(body)
+        assert payload["event"] == "batch" and payload["count"] == 5
+        assert [e["data"]["competitor"] for e in payload["events"]] == [f"C{i}" for i in range(5)]
+        expected = hmac.new(b"s3cret", body, hashlib.sha256).hexdigest()
+        assert requests[0].headers["X-Certify-Signature"] == f"sha256={expected}"
+        assert worker.stats["delivered"] == 5 and worker.stats["batches"] == 1
+        assert webhook.last_triggered is not None
+
+    def test_single_event_keeps_destination_format(self, manager):
+        requests, handler = _recorder()
+        worker = _worker(manager, handler)
+        manager.register_webhook("https://hooks.slack.com/services/x", ["news.alert"])
+        manager.trigger("news.alert", {"headline": "Launch"})
+        assert worker.wait_idle()
+        assert "attachments" in json.loads(requests[0].content)
+
+    def test_endpoints_are_delivered_independently(self, manager):
+        requests, handler = _recorder()
+        worker = _worker(manager, handler)
+        manager.register_webhook("https://a.example.com", ["deal.won"])
+        manager.register_webhook("https://b.example.com", ["deal.won"])
+        manager.trigger("deal.won", {"deal_name": "Acme"})
+        assert worker.wait_idle()
+        assert sorted(r.url.host for r in requests) == ["a.example.com", "b.example.com"]
+
+    def test_server_errors_are_retried(self, manager):
+        requests, handler = _recorder([503, 502])
+        worker = _worker(manager, handler)
+        webhook = manager.register_webhook("https://hooks.example.com/in", ["price.changed"])
+        manager.trigger("price.changed", {"competitor": "Epic"})
+        assert worker.wait_idle()
+        assert len(requests) == 3
+        assert worker.stats["retries"] == 2 and worker.stats["delivered"] == 1
+        assert webhook.failure_count == 0
+
+    def test_client_errors_are_not_retried(self, manager):
+        requests, handler = _recorder([400])
+        worker = _worker(manager, handler)
+        webhook = manager.register_webhook("https://hooks.example.com/in", ["price.changed"])
+        manager.trigger("price.changed", {"competitor": "Epic"})
+        assert worker.wait_idle()
+        assert len(requests) == 1
+        assert worker.stats["failed"] == 1 and webhook.failure_count == 1
+
+    def test_queue_is_bounded(self, manager):
+        requests, handler = _recorder()
+        worker = _worker(manager, handler, max_queue=2, batch_window=0.2)
+        manager.register_webhook("https://hooks.example.com/in", ["price.changed"])
+        for i in range(3):
+            manager.trigger("price.changed", {"competitor": f"C{i}"})
+        assert worker.wait_idle()
+        assert worker.stats["dropped"] == 1
+        assert json.loads(requests[0].content)["count"] == 2
+
+
+class TestOutbox:
+
+    def test_delivered_rows_are_removed_and_failures_kept(self, manager, outbox):
+        requests, handler = _recorder([400])
+        worker = _worker(manager, handler, outbox=outbox, batch_window=0)
+        manager.register_webhook("https://hooks.example.com/in", ["price.changed"])
+        manager.trigger("price.changed", {"competitor": "Rejected"})
+        assert worker.wait_idle()
+        manager.trigger("price.changed", {"competitor": "Accepted"})
+        assert worker.wait_idle()
+        assert outbox.counts() == {"failed": 1}
+
+    def test_pending_rows_survive_a_restart(self, manager, outbox):
+        from webhooks import WebhookEvent
+        webhook = manager.register_webhook("https://hooks.example.com/in", ["news.alert"])
+        event = WebhookEvent("news.alert", {"headline": "Left over"}, datetime.utcnow().isoformat(), "certify-intel")
+        outbox.add([webhook.id], event)
+
+        requests, handler = _recorder()
+        worker = _worker(manager, handler, outbox=outbox)
+        worker.start()
+        deadline = time.monotonic() + 5
+        while not requests and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert worker.wait_idle()
+        assert json.loads(requests[0].content)["data"] == {"headline": "Left over"}
+        assert outbox.counts() == {}
+
+    def test_unknown_webhooks_stay_pending_and_removed_ones_fail(self, manager, outbox):
+        from webhooks import WebhookEvent
+        removed = manager.register_webhook("https://hooks.example.com/old", ["news.alert"])
+        manager.unregister_webhook(removed.id)
+        event = WebhookEvent("news.alert", {"headline": "Orphan"}, datetime.utcnow().isoformat(), "certify-intel")
+        outbox.add(["registered-elsewhere", removed.id], event)
+
+        requests, handler = _recorder()
+        worker = _worker(manager, handler, outbox=outbox)
+        worker.start()
+        deadline = time.monotonic() + 5
+        while worker.stats["released"] + worker.stats["failed"] < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert worker.wait_idle()
+        assert requests == []
+        assert outbox.counts() == {"pending": 1, "failed": 1}
+
+    def test_rows_are_claimed_by_one_worker(self, outbox):
+        from database import WebhookOutboxEntry
+        from webhooks import WebhookEvent
+        event = WebhookEvent("news.alert", {"headline": "Once"}, datetime.utcnow().isoformat(), "certify-intel")
+        [held] = outbox.add(["hook"], event, owner="worker-a", lease=60)
+        [loose] = outbox.add(["hook"], event)
+
+        # A live lease is left alone; the unowned row goes to the first claimant
+        assert [row[0] for row in outbox.claim("worker-b", lease=60)] == [loose]
+        assert outbox.claim("worker-c", lease=60) == []
+
+        db = outbox._session_factory()
+        db.query(WebhookOutboxEntry).filter(WebhookOutboxEntry.id == held).update(
+            {"lease_until": datetime.utcnow() - timedelta(seconds=1)}
+        )
+        db.commit()
+        db.close()
+        # worker-a stopped renewing, so its row is taken over and can't be renewed back
+        assert [row[0] for row in outbox.claim("worker-c", lease=60)] == [held]
+        outbox.renew([held], "worker-a", lease=60)
+        assert outbox.claim("worker-b", lease=60) == []
+        assert outbox.counts() == {"sending": 2}
+
+    def test_submit_writes_the_outbox_off_the_calling_thread(self, manager, outbox):
+        writers = []
+        add_many = outbox.add_many
+
+        def recording_add_many(*args):
+            writers.append(threading.current_thread())
+            return add_many(*args)
+
+        outbox.add_many = recording_add_many
+        requests, handler = _recorder()
+        worker = _worker(manager, handler, outbox=outbox, batch_window=0)
+        manager.register_webhook("https://hooks.example.com/in", ["price.changed"])
+        manager.trigger("price.changed", {"competitor": "Epic"})
+        assert worker.wait_idle()
+        assert writers and threading.current_thread() not in writers
+        assert len(requests) == 1 and outbox.counts() == {}
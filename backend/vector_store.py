@@ -3,12 +3,15 @@ Certify Intel v7.0 - Vector Store Module
 =========================================
 
 Production-grade vector search using PostgreSQL + pgvector.
+Without pgvector, get_vector_store() returns the embedded index in
+local_vector_store.py, which has the same interface.
 
 Features:
 - Semantic search with cosine similarity
 - Batch embedding with OpenAI text-embedding-3-small
 - Metadata filtering for scoped queries
 - Connection pooling for high throughput
+- Binary vector transport (asyncpg codec) and COPY-based bulk ingestion
 
 Performance Targets:
 - <500ms for 10K vectors at 99% recall
@@ -27,8 +30,9 @@ Usage:
 """
 
 import os
+import json
+import struct
 import asyncio
-import hashlib
 import logging
 from typing import List, Optional, Dict, Any
 from dataclasses import dataclass
@@ -41,6 +45,32 @@ _openai_client = None
 logger = logging.getLogger(__name__)
 
 
+def encode_vector(value) -> bytes:
+    """pgvector binary format: uint16 dim, uint16 unused, then dim big-endian float4."""
+    arr = np.asarray(value, dtype=">f4").reshape(-1)
+    return struct.pack(">HH", arr.shape[0], 0) + arr.tobytes()
+
+
+def decode_vector(data: bytes) -> np.ndarray:
+    """Inverse of encode_vector; returns a native float32 array."""
+    dim, _ = struct.unpack_from(">HH", data)
+    return np.frombuffer(data, dtype=">f4", count=dim, offset=4).astype(np.float32)
+
+
+def vector_to_text(value) -> str:
+    """pgvector text format '[x,y,z,...]' (used when the binary codec is unavailable)."""
+    if hasattr(value, 'tolist'):
+        value = value.tolist()
+    return '[' + ','.join(str(x) for x in value) + ']'
+
+
+def _embedding_cache_stats() -> Optional[Dict[str, Any]]:
+    """Stats of the shared embedding cache, or None when it is disabled."""
+    from embedding_cache import get_embedding_cache
+    cache = get_embedding_cache()
+    return cache.stats() if cache else None
+
+
 @dataclass
 class SearchResult:
     """Result from vector similarity search."""
@@ -77,6 +107,9 @@ class VectorStore:
     EMBEDDING_MODEL = "text-embedding-3-small"
     EMBEDDING_DIMENSIONS = 1536
     DEFAULT_BATCH_SIZE = 100
+    BULK_BATCH_ROWS = 5000
+
+    CHUNK_COLUMNS = ("document_id", "chunk_index", "content", "token_count", "embedding", "metadata")
 
     # Index configuration
     INDEX_TYPE_HNSW = "hnsw"
@@ -101,7 +134,8 @@ class VectorStore:
         )
         self.pool_size = pool_size
         self._pool = None
-        self._embedding_cache: Dict[str, np.ndarray] = {}
+        # Set per connection by _init_connection once the vector type is known
+        self._binary_vectors = False
 
     async def _get_pool(self):
         """Get or create async connection pool."""
@@ -121,7 +155,8 @@ class VectorStore:
                     conn_str,
                     min_size=2,
                     max_size=self.pool_size,
-                    command_timeout=30
+                    command_timeout=30,
+                    init=self._init_connection
                 )
                 logger.info(f"Created asyncpg connection pool (size={self.pool_size})")
             except ImportError:
@@ -132,6 +167,32 @@ class VectorStore:
 
         return self._pool
 
+    async def _init_connection(self, conn):
+        """
+        Register a binary codec for pgvector's ``vector`` type.
+
+        Embeddings then travel as float32 buffers instead of 1536-number
+        strings, and COPY can be used for bulk loads. Without the extension
+        (before setup_vector_store.py has run) the text format is used.
+        """
+        schema = await conn.fetchval(
+            "SELECT n.nspname FROM pg_type t JOIN pg_namespace n ON n.oid = t.typnamespace "
+            "WHERE t.typname = 'vector' LIMIT 1"
+        )
+        if schema is None:
+            self._binary_vectors = False
+            return
+        await conn.set_type_codec(
+            'vector', schema=schema, encoder=encode_vector, decoder=decode_vector, format='binary'
+        )
+        self._binary_vectors = True
+
+    def _vector_param(self, embedding):
+        """Query parameter for a vector: ndarray with the binary codec, text otherwise."""
+        if self._binary_vectors:
+            return np.asarray(embedding, dtype=np.float32)
+        return vector_to_text(embedding)
+
     async def close(self):
         """Close connection pool."""
         if self._pool:
@@ -142,58 +203,34 @@ class VectorStore:
         """
         Generate embedding for text using OpenAI.
 
+        Served from the persistent embedding cache when the same text was
+        embedded before (see embedding_cache.py).
+
         Args:
             text: Text to embed
 
         Returns:
             numpy array of embedding vector (1536 dimensions)
         """
-        # Check cache first
-        cache_key = hashlib.md5(text.encode()).hexdigest()
-        if cache_key in self._embedding_cache:
-            return self._embedding_cache[cache_key]
-
-        global _openai_client
-
-        if _openai_client is None:
-            try:
-                from openai import AsyncOpenAI
-                _openai_client = AsyncOpenAI()
-            except ImportError:
-                raise ImportError(
-                    "openai is required for embeddings. "
-                    "Install with: pip install openai"
-                )
-
-        response = await _openai_client.embeddings.create(
-            model=self.EMBEDDING_MODEL,
-            input=text
-        )
-
-        embedding = np.array(response.data[0].embedding)
-
-        # Cache for reuse
-        self._embedding_cache[cache_key] = embedding
-
-        # Limit cache size
-        if len(self._embedding_cache) > 1000:
-            # Remove oldest half
-            keys = list(self._embedding_cache.keys())[:500]
-            for k in keys:
-                del self._embedding_cache[k]
-
-        return embedding
+        return (await self.batch_embed([text]))[0]
 
     async def batch_embed(self, texts: List[str]) -> List[np.ndarray]:
         """
         Batch embed multiple texts efficiently.
 
+        Only texts missing from the embedding cache are sent to OpenAI.
+
         Args:
             texts: List of texts to embed
 
         Returns:
             List of embedding vectors
         """
+        from embedding_cache import cached_embed
+        return await cached_embed(self.EMBEDDING_MODEL, texts, self._embed_uncached)
+
+    async def _embed_uncached(self, texts: List[str]) -> List[List[float]]:
+        """Call the OpenAI embeddings API, in batches of 2048 (the API limit)."""
         global _openai_client
 
         if _openai_client is None:
@@ -201,9 +238,11 @@ class VectorStore:
                 from openai import AsyncOpenAI
                 _openai_client = AsyncOpenAI()
             except ImportError:
-                raise ImportError("openai is required for embeddings")
+                raise ImportError(
+                    "openai is required for embeddings. "
+                    "Install with: pip install openai"
+                )
 
-        # Process in batches of 2048 (OpenAI limit)
         all_embeddings = []
 
         for i in range(0, len(texts), 2048):
@@ -214,8 +253,7 @@ class VectorStore:
                 input=batch
             )
 
-            embeddings = [np.array(e.embedding) for e in response.data]
-            all_embeddings.extend(embeddings)
+            all_embeddings.extend(e.embedding for e in response.data)
 
         return all_embeddings
 
@@ -284,16 +322,11 @@ class VectorStore:
             List of SearchResult objects ordered by similarity
         """
         pool = await self._get_pool()
-
-        # Convert numpy array to pgvector string format '[x,y,z,...]'
-        if hasattr(embedding, 'tolist'):
-            embedding = embedding.tolist()
-        embedding_str = '[' + ','.join(str(x) for x in embedding) + ']'
+        embedding_param = self._vector_param(embedding)
 
         async with pool.acquire() as conn:
             # Build query with optional metadata filter
             if filter_metadata:
-                import json
                 query = """
                     SELECT
                         id as chunk_id,
@@ -309,7 +342,7 @@ class VectorStore:
                 """
                 rows = await conn.fetch(
                     query,
-                    embedding_str,
+                    embedding_param,
                     json.dumps(filter_metadata),
                     min_similarity,
                     limit
@@ -329,13 +362,11 @@ class VectorStore:
                 """
                 rows = await conn.fetch(
                     query,
-                    embedding_str,
+                    embedding_param,
                     min_similarity,
                     limit
                 )
 
-        import json as json_module
-
         def parse_metadata(meta):
             """Parse metadata from various formats."""
             if not meta:
@@ -344,7 +375,7 @@ class VectorStore:
                 return meta
             if isinstance(meta, str):
                 try:
-                    return json_module.loads(meta)
+                    return json.loads(meta)
                 except Exception:
                     return {}
             return dict(meta)
@@ -388,8 +419,6 @@ class VectorStore:
         pool = await self._get_pool()
 
         async with pool.acquire() as conn:
-            import json
-
             # First check if document with this content_hash already exists
             existing = await conn.fetchrow(
                 "SELECT id FROM knowledge_documents WHERE content_hash = $1",
@@ -425,6 +454,8 @@ class VectorStore:
         """
         Batch insert document chunks with embeddings.
 
+        Re-inserting an existing (document_id, chunk_index) replaces it.
+
         Args:
             document_id: Parent document ID
             chunks: List of DocumentChunk objects
@@ -436,57 +467,160 @@ class VectorStore:
             return 0
 
         pool = await self._get_pool()
+        records = [self._chunk_record(document_id, chunk) for chunk in chunks]
 
         async with pool.acquire() as conn:
-            import json
-
-            # Helper to convert numpy array to pgvector string format
-            def embedding_to_pgvector(emb) -> str:
-                """Convert embedding array to pgvector string format '[x,y,z,...]'"""
-                if hasattr(emb, 'tolist'):
-                    emb = emb.tolist()
-                return '[' + ','.join(str(x) for x in emb) + ']'
-
-            # Prepare data for batch insert
-            records = [
-                (
-                    document_id,
-                    chunk.chunk_index,
-                    chunk.content,
-                    chunk.token_count or 0,
-                    embedding_to_pgvector(chunk.embedding),  # Convert to pgvector format
-                    json.dumps(chunk.metadata or {})
+            async with conn.transaction():
+                await self._write_chunks(conn, records)
+
+                # Update chunk count in parent document
+                await conn.execute(
+                    """
+                    UPDATE knowledge_documents
+                    SET chunk_count = $1, updated_at = NOW()
+                    WHERE id = $2
+                    """,
+                    len(chunks),
+                    document_id
                 )
-                for chunk in chunks
-            ]
 
-            # Batch insert
+        return len(chunks)
+
+    async def bulk_insert_chunks(
+        self,
+        chunks_by_document: Dict[str, List[DocumentChunk]],
+        batch_rows: Optional[int] = None,
+        rebuild_index: Optional[str] = None
+    ) -> int:
+        """
+        Load chunks for many documents at once (archive imports).
+
+        Rows are streamed with COPY in batches of ``batch_rows``, each batch
+        in its own transaction. Maintaining an ANN index row by row is the
+        slowest part of a large load, so with ``rebuild_index`` ("hnsw" or
+        "diskann") the vector indexes are dropped first and that index is
+        built once after the load (also if the load fails part way).
+
+        Args:
+            chunks_by_document: {document_id: chunks}; documents must exist
+            batch_rows: Rows per COPY batch (default BULK_BATCH_ROWS)
+            rebuild_index: Index to build after the load, or None to keep
+                           the existing indexes in place
+
+        Returns:
+            Number of chunks inserted
+        """
+        if rebuild_index not in (None, self.INDEX_TYPE_HNSW, self.INDEX_TYPE_DISKANN):
+            raise ValueError(f"Unknown index type: {rebuild_index}")
+        batch_rows = batch_rows or self.BULK_BATCH_ROWS
+        pool = await self._get_pool()
+
+        if rebuild_index:
+            await self.drop_vector_indexes()
+
+        total = 0
+        try:
+            batch: List[tuple] = []
+            for document_id, chunks in chunks_by_document.items():
+                for chunk in chunks:
+                    batch.append(self._chunk_record(document_id, chunk))
+                    if len(batch) >= batch_rows:
+                        total += await self._write_batch(pool, batch)
+                        batch = []
+            if batch:
+                total += await self._write_batch(pool, batch)
+
+            counted = [(doc_id, len(chunks)) for doc_id, chunks in chunks_by_document.items() if chunks]
+            if counted:
+                async with pool.acquire() as conn:
+                    await conn.execute(
+                        """
+                        UPDATE knowledge_documents d
+                        SET chunk_count = c.n, updated_at = NOW()
+                        FROM unnest($1::varchar[], $2::int[]) AS c(id, n)
+                        WHERE d.id = c.id
+                        """,
+                        [doc_id for doc_id, _ in counted],
+                        [n for _, n in counted]
+                    )
+        finally:
+            if rebuild_index == self.INDEX_TYPE_HNSW:
+                await self.create_hnsw_index()
+            elif rebuild_index == self.INDEX_TYPE_DISKANN:
+                await self.create_streamingdiskann_index()
+
+        logger.info(f"Bulk loaded {total} chunks for {len(chunks_by_document)} documents")
+        return total
+
+    async def _write_batch(self, pool, records: List[tuple]) -> int:
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                await self._write_chunks(conn, records)
+        return len(records)
+
+    def _chunk_record(self, document_id: str, chunk: DocumentChunk) -> tuple:
+        """One document_chunks row, in CHUNK_COLUMNS order."""
+        return (
+            document_id,
+            chunk.chunk_index,
+            chunk.content,
+            chunk.token_count or 0,
+            self._vector_param(chunk.embedding),
+            json.dumps(chunk.metadata or {})
+        )
+
+    async def _write_chunks(self, conn, records: List[tuple]):
+        """
+        Upsert chunk rows on ``conn`` (inside the caller's transaction).
+
+        With the binary codec, rows are COPYed into a temp staging table and
+        merged with one INSERT ... SELECT ... ON CONFLICT; otherwise they
+        fall back to executemany with text-format vectors.
+        """
+        upsert = """
+            ON CONFLICT (document_id, chunk_index) DO UPDATE SET
+                content = EXCLUDED.content,
+                token_count = EXCLUDED.token_count,
+                embedding = EXCLUDED.embedding,
+                metadata = EXCLUDED.metadata
+        """
+        columns = ", ".join(self.CHUNK_COLUMNS)
+
+        if not self._binary_vectors:
             await conn.executemany(
-                """
-                INSERT INTO document_chunks
-                    (document_id, chunk_index, content, token_count, embedding, metadata)
+                f"""
+                INSERT INTO document_chunks ({columns})
                 VALUES ($1, $2, $3, $4, $5::vector, $6::jsonb)
-                ON CONFLICT (document_id, chunk_index) DO UPDATE SET
-                    content = EXCLUDED.content,
-                    token_count = EXCLUDED.token_count,
-                    embedding = EXCLUDED.embedding,
-                    metadata = EXCLUDED.metadata
+                {upsert}
                 """,
                 records
             )
-
-            # Update chunk count in parent document
-            await conn.execute(
-                """
-                UPDATE knowledge_documents
-                SET chunk_count = $1, updated_at = NOW()
-                WHERE id = $2
-                """,
-                len(chunks),
-                document_id
-            )
-
-        return len(chunks)
+            return
+
+        # ON CONFLICT can't touch the same row twice in one statement
+        latest = {(r[0], r[1]): r for r in records}
+        await conn.execute(
+            """
+            CREATE TEMP TABLE IF NOT EXISTS document_chunks_stage (
+                document_id VARCHAR(36),
+                chunk_index INTEGER,
+                content TEXT,
+                token_count INTEGER,
+                embedding vector,
+                metadata JSONB
+            ) ON COMMIT DELETE ROWS
+            """
+        )
+        await conn.copy_records_to_table(
+            "document_chunks_stage", records=list(latest.values()), columns=list(self.CHUNK_COLUMNS)
+        )
+        await conn.execute(
+            f"""
+            INSERT INTO document_chunks ({columns})
+            SELECT {columns} FROM document_chunks_stage
+            {upsert}
+            """
+        )
 
     async def delete_document(self, document_id: str) -> bool:
         """
@@ -570,7 +704,7 @@ class VectorStore:
             "avg_tokens_per_chunk": round(avg_tokens or 0, 1),
             "embedding_model": self.EMBEDDING_MODEL,
             "embedding_dimensions": self.EMBEDDING_DIMENSIONS,
-            "cache_size": len(self._embedding_cache)
+            "embedding_cache": _embedding_cache_stats()
         }
 
     # =========================================================================
@@ -785,6 +919,13 @@ class VectorStore:
         else:
             return "StreamingDiskANN required for 10M+ vectors. Run create_streamingdiskann_index() immediately."
 
+    async def drop_vector_indexes(self) -> None:
+        """Drop the HNSW and DiskANN indexes (before a bulk load)."""
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            await conn.execute("DROP INDEX IF EXISTS document_chunks_embedding_idx")
+            await conn.execute("DROP INDEX IF EXISTS document_chunks_embedding_diskann_idx")
+
     async def create_hnsw_index(
         self,
         m: int = 16,
@@ -841,12 +982,36 @@ class VectorStore:
 _default_store: Optional[VectorStore] = None
 
 
+def pgvector_available() -> bool:
+    """True when DATABASE_URL points at PostgreSQL and asyncpg is installed."""
+    url = os.getenv("DATABASE_URL", "")
+    if not url.startswith(("postgresql", "postgres://")):
+        return False
+    try:
+        import asyncpg  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
 def get_vector_store() -> VectorStore:
-    """Get or create default vector store instance."""
+    """
+    Get or create default vector store instance.
+
+    VECTOR_STORE_BACKEND selects the backend: "pgvector", "local", or
+    "auto" (default) - pgvector when PostgreSQL + asyncpg are available,
+    otherwise the embedded LocalVectorStore.
+    """
     global _default_store
 
     if _default_store is None:
-        _default_store = VectorStore()
+        backend = os.getenv("VECTOR_STORE_BACKEND", "auto").lower()
+        if backend == "local" or (backend == "auto" and not pgvector_available()):
+            from local_vector_store import LocalVectorStore
+            _default_store = LocalVectorStore()
+            logger.info(f"Using local vector index at {_default_store.index_dir}")
+        else:
+            _default_store = VectorStore()
 
     return _default_store
 
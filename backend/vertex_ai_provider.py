@@ -22,7 +22,7 @@ Documentation: https://cloud.google.com/vertex-ai/docs
 import os
 import json
 import time
-from typing import Dict, List, Optional, Any, Union
+from typing import AsyncIterator, Dict, List, Optional, Any, Union
 from dataclasses import dataclass, asdict, field
 from datetime import datetime
 from pathlib import Path
@@ -255,6 +255,33 @@ class VertexAIProvider:
         output_cost = (output_tokens / 1_000_000) * pricing["output"]
         return input_cost + output_cost
 
+    def _build_request(
+        self,
+        prompt: str,
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        system_instruction: Optional[str],
+        response_format: Optional[str] = None,
+    ):
+        """Build the contents and generation config for a request."""
+        gen_config = GenerationConfig(
+            temperature=temperature or self.config.temperature,
+            max_output_tokens=max_tokens or self.config.max_output_tokens,
+            top_p=self.config.top_p,
+            top_k=self.config.top_k,
+        )
+
+        # Add response MIME type for JSON
+        if response_format == "json":
+            gen_config.response_mime_type = "application/json"
+
+        contents = []
+        if system_instruction:
+            contents.append(Content(role="user", parts=[Part.from_text(system_instruction)]))
+            contents.append(Content(role="model", parts=[Part.from_text("I understand. I will follow these instructions.")]))
+        contents.append(Content(role="user", parts=[Part.from_text(prompt)]))
+        return contents, gen_config
+
     async def generate(
         self,
         prompt: str,
@@ -300,25 +327,10 @@ class VertexAIProvider:
         start_time = time.time()
 
         try:
-            # Build generation config
-            gen_config = GenerationConfig(
-                temperature=temperature or self.config.temperature,
-                max_output_tokens=max_tokens or self.config.max_output_tokens,
-                top_p=self.config.top_p,
-                top_k=self.config.top_k,
+            contents, gen_config = self._build_request(
+                prompt, temperature, max_tokens, system_instruction, response_format
             )
 
-            # Add response MIME type for JSON
-            if response_format == "json":
-                gen_config.response_mime_type = "application/json"
-
-            # Build content
-            contents = []
-            if system_instruction:
-                contents.append(Content(role="user", parts=[Part.from_text(system_instruction)]))
-                contents.append(Content(role="model", parts=[Part.from_text("I understand. I will follow these instructions.")]))
-            contents.append(Content(role="user", parts=[Part.from_text(prompt)]))
-
             # Generate
             response = gen_model.generate_content(
                 contents,
@@ -354,6 +366,41 @@ class VertexAIProvider:
                 latency_ms=(time.time() - start_time) * 1000
             )
 
+    async def stream(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        system_instruction: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream generated text chunks as they arrive.
+
+        Unlike generate(), errors are raised rather than returned, since
+        part of the response may already have been consumed.
+        """
+        if not self.is_available:
+            raise RuntimeError("Vertex AI not available or not initialized")
+
+        model_name = model or self.model
+        gen_model = self._get_model(model_name)
+        if not gen_model:
+            raise RuntimeError(f"Failed to load model: {model_name}")
+
+        contents, gen_config = self._build_request(
+            prompt, temperature, max_tokens, system_instruction
+        )
+        responses = await gen_model.generate_content_async(
+            contents,
+            generation_config=gen_config,
+            safety_settings=self._get_safety_settings(),
+            stream=True,
+        )
+        async for response in responses:
+            if response.text:
+                yield response.text
+
     async def generate_json(
         self,
         prompt: str,
@@ -1,17 +1,52 @@
 """
 Certify Intel - Webhook Manager
 Outbound webhook system for real-time integrations.
+
+Events are delivered by one background worker (WebhookDeliveryWorker): a
+single asyncio loop on its own thread with a pooled HTTP client. Each
+webhook endpoint gets its own flusher, so endpoints are served concurrently
+while events to one endpoint stay in order. Events that arrive within
+WEBHOOK_BATCH_WINDOW seconds of each other are coalesced into one batched
+payload. Failed deliveries are retried with exponential backoff.
+
+With WEBHOOK_OUTBOX_ENABLED (default), events are written to the
+webhook_outbox table before delivery and removed once accepted, so events
+that were not delivered are picked up again after a restart. Each row is
+leased to the worker delivering it, so several uvicorn workers sharing the
+table each deliver different rows.
 """
 import os
 import json
+import random
+import asyncio
 import hashlib
 import hmac
-from datetime import datetime
-from typing import Dict, Any, List, Optional, Callable
-from dataclasses import dataclass, asdict
-import urllib.request
-import urllib.error
+import logging
+import socket
 import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Callable, Set, Tuple
+from dataclasses import dataclass, asdict
+
+import httpx
+
+from database import SessionLocal, WebhookOutboxEntry
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Certify-Intel/1.0"
+REQUEST_TIMEOUT = 10.0
+
+# Consecutive failed deliveries before a webhook is disabled
+MAX_CONSECUTIVE_FAILURES = 5
+
+# Longest wait between retries, in seconds
+MAX_RETRY_DELAY = 60.0
+
+
+def is_outbox_enabled() -> bool:
+    return os.getenv("WEBHOOK_OUTBOX_ENABLED", "true").lower() == "true"
 
 
 @dataclass
@@ -36,6 +71,479 @@ class WebhookEvent:
     source: str
 
 
+@dataclass
+class _Delivery:
+    """One event queued for one webhook."""
+    webhook_id: str
+    event: WebhookEvent
+    outbox_id: Optional[int] = None
+
+
+# =============================================================================
+# OUTBOX
+# =============================================================================
+
+class WebhookOutbox:
+    """
+    Durable record of events not yet accepted by their webhook.
+
+    A row is ``pending`` (unowned), ``sending`` (claimed by one delivery
+    worker until ``lease_until``) or ``failed``. Workers only take pending
+    rows and rows whose lease has run out, and claim them with a single
+    conditional UPDATE, so with several uvicorn workers each row is
+    delivered by one of them.
+    """
+
+    def __init__(self, session_factory: Callable = SessionLocal):
+        self._session_factory = session_factory
+
+    def add(
+        self, webhook_ids: List[str], event: WebhookEvent,
+        owner: Optional[str] = None, lease: float = 0.0,
+    ) -> List[int]:
+        """Store one row per webhook (claimed by ``owner`` if given); returns the row ids."""
+        return self.add_many([(webhook_ids, event)], owner, lease)[0]
+
+    def add_many(
+        self, events: List[Tuple[List[str], WebhookEvent]],
+        owner: Optional[str] = None, lease: float = 0.0,
+    ) -> List[List[int]]:
+        """``add`` for several events in one transaction; row ids per event."""
+        now = datetime.utcnow()
+        claim = (
+            {"status": "sending", "claimed_by": owner, "lease_until": now + timedelta(seconds=lease)}
+            if owner else {"status": "pending"}
+        )
+        db = self._session_factory()
+        try:
+            grouped = []
+            for webhook_ids, event in events:
+                encoded = json.dumps(asdict(event), default=str)
+                grouped.append([
+                    WebhookOutboxEntry(
+                        webhook_id=webhook_id, event_type=event.event_type, event=encoded,
+                        created_at=now, **claim,
+                    )
+                    for webhook_id in webhook_ids
+                ])
+            db.add_all([entry for entries in grouped for entry in entries])
+            db.commit()
+            return [[entry.id for entry in entries] for entries in grouped]
+        finally:
+            db.close()
+
+    @staticmethod
+    def _claimable(now: datetime):
+        from sqlalchemy import and_, or_
+        return or_(
+            WebhookOutboxEntry.status == "pending",
+            and_(WebhookOutboxEntry.status == "sending", WebhookOutboxEntry.lease_until < now),
+        )
+
+    def claim(self, owner: str, lease: float, limit: int = 500) -> List[Tuple[int, str, WebhookEvent]]:
+        """Take up to ``limit`` unowned or expired rows (oldest first) for ``owner``."""
+        if limit <= 0:
+            return []
+        now = datetime.utcnow()
+        until = now + timedelta(seconds=lease)
+        db = self._session_factory()
+        try:
+            ids = [row_id for (row_id,) in db.query(WebhookOutboxEntry.id).filter(
+                self._claimable(now)
+            ).order_by(WebhookOutboxEntry.id).limit(limit)]
+            if not ids:
+                return []
+            # Rows another worker claimed since the SELECT no longer match
+            db.query(WebhookOutboxEntry).filter(
+                WebhookOutboxEntry.id.in_(ids), self._claimable(now)
+            ).update(
+                {"status": "sending", "claimed_by": owner, "lease_until": until, "updated_at": now},
+                synchronize_session=False,
+            )
+            db.commit()
+            rows = db.query(WebhookOutboxEntry).filter(
+                WebhookOutboxEntry.id.in_(ids),
+                WebhookOutboxEntry.claimed_by == owner,
+                WebhookOutboxEntry.lease_until == until,
+            ).order_by(WebhookOutboxEntry.id).all()
+            return [(row.id, row.webhook_id, WebhookEvent(**json.loads(row.event))) for row in rows]
+        finally:
+            db.close()
+
+    def renew(self, ids: List[int], owner: str, lease: float) -> None:
+        """Extend ``owner``'s lease on rows it is still delivering."""
+        if not ids:
+            return
+        db = self._session_factory()
+        try:
+            db.query(WebhookOutboxEntry).filter(
+                WebhookOutboxEntry.id.in_(ids),
+                WebhookOutboxEntry.claimed_by == owner,
+                WebhookOutboxEntry.status == "sending",
+            ).update(
+                {"lease_until": datetime.utcnow() + timedelta(seconds=lease)},
+                synchronize_session=False,
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def release(self, ids: List[int]) -> None:
+        """Hand claimed rows back as pending for any worker to take."""
+        if not ids:
+            return
+        db = self._session_factory()
+        try:
+            db.query(WebhookOutboxEntry).filter(
+                WebhookOutboxEntry.id.in_(ids), WebhookOutboxEntry.status == "sending"
+            ).update(
+                {"status": "pending", "claimed_by": None, "lease_until": None,
+                 "updated_at": datetime.utcnow()},
+                synchronize_session=False,
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def delivered(self, ids: List[int]) -> None:
+        if not ids:
+            return
+        db = self._session_factory()
+        try:
+            db.query(WebhookOutboxEntry).filter(
+                WebhookOutboxEntry.id.in_(ids)
+            ).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    def failed(self, ids: List[int], error: str, attempts: int) -> None:
+        """Keep rows that ran out of attempts for inspection; they are not retried."""
+        if not ids:
+            return
+        db = self._session_factory()
+        try:
+            db.query(WebhookOutboxEntry).filter(WebhookOutboxEntry.id.in_(ids)).update(
+                {"status": "failed", "last_error": error[:500], "attempts": attempts,
+                 "claimed_by": None, "lease_until": None, "updated_at": datetime.utcnow()},
+                synchronize_session=False,
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def counts(self) -> Dict[str, int]:
+        from sqlalchemy import func
+        db = self._session_factory()
+        try:
+            rows = db.query(
+                WebhookOutboxEntry.status, func.count(WebhookOutboxEntry.id)
+            ).group_by(WebhookOutboxEntry.status).all()
+            return {status: count for status, count in rows}
+        finally:
+            db.close()
+
+
+# =============================================================================
+# DELIVERY WORKER
+# =============================================================================
+
+class WebhookDeliveryWorker:
+    """
+    Delivers queued events from a background event loop.
+
+    ``submit`` may be called from any thread and never touches the database;
+    the loop writes submitted events to the outbox, already claimed by this
+    worker, before queueing them. At most ``max_queue`` events wait in
+    memory; past that, new events are dropped from memory (with the outbox
+    enabled they are released to pending and the periodic sweep retries
+    them). The sweep also renews this worker's leases, so another process
+    only takes over rows whose owner stopped renewing them.
+    """
+
+    def __init__(
+        self,
+        manager: "WebhookManager",
+        outbox: Optional[WebhookOutbox] = None,
+        max_queue: Optional[int] = None,
+        batch_window: Optional[float] = None,
+        batch_max: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        retry_base: Optional[float] = None,
+        sweep_interval: Optional[float] = None,
+        lease: Optional[float] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.manager = manager
+        self.outbox = outbox
+        self.max_queue = max_queue or int(os.getenv("WEBHOOK_QUEUE_SIZE", "1000"))
+        self.batch_window = (
+            batch_window if batch_window is not None
+            else float(os.getenv("WEBHOOK_BATCH_WINDOW", "2.0"))
+        )
+        self.batch_max = batch_max or int(os.getenv("WEBHOOK_BATCH_MAX", "20"))
+        self.max_attempts = max_attempts or int(os.getenv("WEBHOOK_MAX_ATTEMPTS", "5"))
+        self.retry_base = (
+            retry_base if retry_base is not None
+            else float(os.getenv("WEBHOOK_RETRY_BASE", "1.0"))
+        )
+        self.sweep_interval = sweep_interval or float(os.getenv("WEBHOOK_OUTBOX_SWEEP_SECONDS", "60"))
+        # Renewed every sweep; a row outlives its lease only if its worker died
+        self.lease = lease or float(os.getenv("WEBHOOK_OUTBOX_LEASE_SECONDS", "300"))
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._transport = transport
+
+        self.stats = {
+            "queued": 0, "delivered": 0, "batches": 0,
+            "retries": 0, "failed": 0, "dropped": 0, "released": 0,
+        }
+        # Loop-thread state
+        self._incoming: List[Tuple[List[str], WebhookEvent]] = []
+        self._receiver: Optional[asyncio.Task] = None
+        self._buffers: Dict[str, List[_Delivery]] = {}
+        self._flushers: Dict[str, asyncio.Task] = {}
+        self._inflight: Set[int] = set()
+        self._pending = 0
+        self._client: Optional[httpx.AsyncClient] = None
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+
+    # -- lifecycle ------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the delivery thread (idempotent)."""
+        with self._lock:
+            if self.running:
+                return
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._run_loop, name="webhook-delivery", daemon=True)
+            self._thread.start()
+        self._ready.wait(5)
+
+    def _run_loop(self) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        self._client = httpx.AsyncClient(
+            timeout=REQUEST_TIMEOUT,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            headers={"User-Agent": USER_AGENT},
+            transport=self._transport,
+        )
+        sweeper = loop.create_task(self._sweep()) if self.outbox else None
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            tasks = [t for t in (sweeper, self._receiver, *self._flushers.values()) if t is not None]
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.run_until_complete(self._client.aclose())
+            loop.close()
+            self._loop = None
+
+    def wait_idle(self, timeout: float = 5.0) -> bool:
+        """Block until nothing is buffered or being delivered; False on timeout."""
+        if not self.running or self._loop is None:
+            return True
+
+        async def idle():
+            while self._incoming or self._receiver or self._pending or self._flushers:
+                await asyncio.sleep(0.01)
+
+        future = asyncio.run_coroutine_threadsafe(idle(), self._loop)
+        try:
+            future.result(timeout)
+            return True
+        except Exception:
+            future.cancel()
+            return False
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Deliver what is buffered (up to ``timeout`` seconds), then stop."""
+        if not self.running:
+            return
+        if not self.wait_idle(timeout):
+            logger.warning(f"Webhook delivery stopped with {self._pending} event(s) undelivered")
+        loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+        self._thread.join(timeout=5)
+
+    # -- intake ---------------------------------------------------------------
+
+    def submit(self, webhooks: List["Webhook"], event: WebhookEvent) -> None:
+        """Queue ``event`` for each webhook (thread-safe, does no I/O)."""
+        self.start()
+        self._loop.call_soon_threadsafe(self._receive, [w.id for w in webhooks], event)
+
+    def _receive(self, webhook_ids: List[str], event: WebhookEvent) -> None:
+        """Collect a submitted event; one task persists and queues them in order (loop thread)."""
+        self._incoming.append((webhook_ids, event))
+        if self._receiver is None:
+            self._receiver = self._loop.create_task(self._accept_incoming())
+
+    async def _accept_incoming(self) -> None:
+        try:
+            while self._incoming:
+                received, self._incoming = self._incoming, []
+                outbox_ids = [[None] * len(webhook_ids) for webhook_ids, _ in received]
+                if self.outbox is not None:
+                    try:
+                        outbox_ids = await asyncio.to_thread(
+                            self.outbox.add_many, received, self.owner, self.lease
+                        )
+                    except Exception as e:
+                        logger.warning(f"Webhook outbox write failed, delivering without it: {e}")
+                self._offer([
+                    _Delivery(webhook_id, event, oid)
+                    for (webhook_ids, event), ids in zip(received, outbox_ids)
+                    for webhook_id, oid in zip(webhook_ids, ids)
+                ])
+        finally:
+            self._receiver = None
+
+    def _offer(self, items: List[_Delivery]) -> None:
+        """Add deliveries to their endpoint buffers (loop thread)."""
+        released = []
+        for item in items:
+            if item.outbox_id is not None and item.outbox_id in self._inflight:
+                continue
+            if self._pending >= self.max_queue:
+                self.stats["dropped"] += 1
+                if item.outbox_id is not None:
+                    released.append(item.outbox_id)
+                continue
+            if item.outbox_id is not None:
+                self._inflight.add(item.outbox_id)
+            self._buffers.setdefault(item.webhook_id, []).append(item)
+            self._pending += 1
+            self.stats["queued"] += 1
+            if item.webhook_id not in self._flushers:
+                self._flushers[item.webhook_id] = self._loop.create_task(
+                    self._flush_endpoint(item.webhook_id)
+                )
+        if released:
+            self._loop.create_task(self._release(released))
+        if self.stats["dropped"] and self._pending >= self.max_queue:
+            logger.warning(f"Webhook queue full ({self.max_queue}); {self.stats['dropped']} event(s) dropped so far")
+
+    async def _release(self, ids: List[int]) -> None:
+        try:
+            await asyncio.to_thread(self.outbox.release, ids)
+        except Exception as e:
+            logger.warning(f"Webhook outbox release failed (rows retry after their lease): {e}")
+
+    # -- delivery -------------------------------------------------------------
+
+    async def _flush_endpoint(self, webhook_id: str) -> None:
+        """Send one endpoint's buffer in batches until it is empty."""
+        try:
+            while self._buffers.get(webhook_id):
+                if len(self._buffers[webhook_id]) < self.batch_max and self.batch_window > 0:
+                    # Let a burst accumulate into one payload
+                    await asyncio.sleep(self.batch_window)
+                buffer = self._buffers[webhook_id]
+                batch = buffer[:self.batch_max]
+                del buffer[:self.batch_max]
+                self._pending -= len(batch)
+                await self._deliver(webhook_id, batch)
+        finally:
+            self._flushers.pop(webhook_id, None)
+            if not self._buffers.get(webhook_id):
+                self._buffers.pop(webhook_id, None)
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        if response is not None:
+            retry_after = response.headers.get("retry-after", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), MAX_RETRY_DELAY)
+        delay = self.retry_base * (2 ** attempt)
+        return min(delay + random.uniform(0, self.retry_base), MAX_RETRY_DELAY)
+
+    async def _deliver(self, webhook_id: str, batch: List[_Delivery]) -> None:
+        ids = [d.outbox_id for d in batch if d.outbox_id is not None]
+        webhook = self.manager._webhooks.get(webhook_id)
+        error = None
+        attempts = 0
+        delivered = False
+        try:
+            if webhook is None and webhook_id not in self.manager._removed:
+                # Registered in another process or before a restart: leave the
+                # rows pending for a worker that knows the endpoint
+                self.stats["released"] += len(batch)
+                if self.outbox is not None:
+                    await asyncio.to_thread(self.outbox.release, ids)
+                return
+            if webhook is None or not webhook.active:
+                error = "Webhook removed or disabled"
+            else:
+                body, headers = self.manager._encode(webhook, [d.event for d in batch])
+                delay = 0.0
+                for attempts in range(1, self.max_attempts + 1):
+                    if attempts > 1:
+                        self.stats["retries"] += 1
+                        await asyncio.sleep(delay)
+                    try:
+                        response = await self._client.post(webhook.url, content=body, headers=headers)
+                    except httpx.HTTPError as e:
+                        error = f"{type(e).__name__}: {e}"
+                        delay = self._retry_delay(attempts - 1)
+                        continue
+                    if response.is_success:
+                        delivered = True
+                        break
+                    error = f"HTTP {response.status_code}"
+                    if response.status_code != 429 and response.status_code < 500:
+                        break  # Not retryable
+                    delay = self._retry_delay(attempts - 1, response)
+
+            if delivered:
+                self.manager._record_success(webhook)
+                self.stats["delivered"] += len(batch)
+                self.stats["batches"] += 1
+                if self.outbox is not None:
+                    await asyncio.to_thread(self.outbox.delivered, ids)
+            else:
+                if webhook is not None:
+                    self.manager._record_failure(webhook, error)
+                self.stats["failed"] += len(batch)
+                if self.outbox is not None:
+                    await asyncio.to_thread(self.outbox.failed, ids, error, attempts)
+        except Exception as e:
+            logger.error(f"Webhook {webhook_id} delivery error: {e}")
+        finally:
+            self._inflight.difference_update(ids)
+
+    async def _sweep(self) -> None:
+        """Renew our leases, then claim pending rows and rows whose owner's lease ran out."""
+        while True:
+            try:
+                if self._inflight:
+                    await asyncio.to_thread(self.outbox.renew, list(self._inflight), self.owner, self.lease)
+                rows = await asyncio.to_thread(
+                    self.outbox.claim, self.owner, self.lease, self.max_queue - self._pending
+                )
+                if rows:
+                    logger.info(f"Re-queueing {len(rows)} undelivered webhook event(s)")
+                    self._offer([_Delivery(webhook_id, event, oid) for oid, webhook_id, event in rows])
+            except Exception as e:
+                logger.warning(f"Webhook outbox sweep failed: {e}")
+            await asyncio.sleep(self.sweep_interval)
+
+
+# =============================================================================
+# MANAGER
+# =============================================================================
+
 class WebhookManager:
     """Manages outbound webhooks for real-time notifications."""
     
@@ -55,7 +563,11 @@ class WebhookManager:
     
     def __init__(self):
         self._webhooks: Dict[str, Webhook] = {}
+        self._removed: Set[str] = set()  # Unregistered ids; their queued events fail
         self._event_handlers: Dict[str, List[Callable]] = {}
+        self._delivery: Optional[WebhookDeliveryWorker] = None
+        self._sync_client: Optional[httpx.Client] = None
+        self._lock = threading.Lock()
         self._load_webhooks()
     
     def _load_webhooks(self):
@@ -138,6 +650,7 @@ class WebhookManager:
         """
         if webhook_id in self._webhooks:
             del self._webhooks[webhook_id]
+            self._removed.add(webhook_id)
             return True
         return False
     
@@ -155,7 +668,7 @@ class WebhookManager:
             async_send: Whether to send asynchronously
         """
         if event_type not in self.EVENT_TYPES:
-            print(f"Unknown event type: {event_type}")
+            logger.warning(f"Unknown webhook event type: {event_type}")
             return
         
         event = WebhookEvent(
@@ -173,70 +686,95 @@ class WebhookManager:
             return
         
         if async_send:
-            # Send in background thread
-            thread = threading.Thread(target=self._send_to_all, args=(matching, event))
-            thread.daemon = True
-            thread.start()
+            # Hand off to the background delivery worker
+            self.delivery.submit(matching, event)
         else:
             self._send_to_all(matching, event)
     
+    @property
+    def delivery(self) -> WebhookDeliveryWorker:
+        """The background delivery worker (created on first use)."""
+        with self._lock:
+            if self._delivery is None:
+                outbox = WebhookOutbox() if is_outbox_enabled() else None
+                self._delivery = WebhookDeliveryWorker(self, outbox=outbox)
+            return self._delivery
+    
+    def resume_pending(self) -> int:
+        """Start delivering outbox rows left by a previous run; returns how many are pending."""
+        if not self._webhooks or not is_outbox_enabled():
+            return 0
+        counts = WebhookOutbox().counts()
+        pending = counts.get("pending", 0) + counts.get("sending", 0)
+        if pending:
+            self.delivery.start()
+        return pending
+    
+    def delivery_stats(self) -> Dict[str, Any]:
+        """Delivery counters plus outbox row counts by status."""
+        if self._delivery is None:
+            return {"running": False}
+        stats = {"running": self._delivery.running, **self._delivery.stats}
+        if self._delivery.outbox is not None:
+            try:
+                stats["outbox"] = self._delivery.outbox.counts()
+            except Exception as e:
+                logger.debug(f"Webhook outbox counts unavailable: {e}")
+        return stats
+    
+    def close(self, timeout: float = 5.0):
+        """Flush and stop the delivery worker; close pooled clients."""
+        if self._delivery is not None:
+            self._delivery.close(timeout)
+        if self._sync_client is not None:
+            self._sync_client.close()
+            self._sync_client = None
+    
+    def _record_success(self, webhook: Webhook):
+        webhook.last_triggered = datetime.utcnow().isoformat()
+        webhook.failure_count = 0
+    
+    def _record_failure(self, webhook: Webhook, error: Optional[str]):
+        logger.warning(f"Webhook {webhook.id} failed: {error}")
+        webhook.failure_count += 1
+        # Disable webhook after repeated consecutive failures
+        if webhook.failure_count >= MAX_CONSECUTIVE_FAILURES and webhook.active:
+            webhook.active = False
+            logger.warning(f"Webhook {webhook.id} disabled due to repeated failures")
+    
     def _send_to_all(self, webhooks: List[Webhook], event: WebhookEvent):
-        """Send event to all matching webhooks."""
+        """Send event to all matching webhooks (blocking)."""
         for webhook in webhooks:
             try:
                 self._send_webhook(webhook, event)
             except Exception as e:
-                print(f"Webhook {webhook.id} failed: {e}")
-                webhook.failure_count += 1
-                
-                # Disable webhook after 5 consecutive failures
-                if webhook.failure_count >= 5:
-                    webhook.active = False
-                    print(f"Webhook {webhook.id} disabled due to repeated failures")
+                self._record_failure(webhook, str(e))
     
-    def _send_webhook(self, webhook: Webhook, event: WebhookEvent):
-        """Send event to a single webhook."""
-        payload = self._format_payload(webhook, event)
+    def _encode(self, webhook: Webhook, events: List[WebhookEvent]) -> Tuple[bytes, Dict[str, str]]:
+        """Request body and headers; the body is encoded once and signed as sent."""
+        if len(events) == 1:
+            payload = self._format_payload(webhook, events[0])
+        else:
+            payload = self._format_batch_payload(webhook, events)
+        body = json.dumps(payload, default=str).encode("utf-8")
         
-        headers = {
-            "Content-Type": "application/json",
-            "User-Agent": "Certify-Intel/1.0"
-        }
+        headers = {"Content-Type": "application/json", "User-Agent": USER_AGENT}
         
         # Add HMAC signature if secret is configured
         if webhook.secret:
-            signature = hmac.new(
-                webhook.secret.encode(),
-                json.dumps(payload).encode(),
-                hashlib.sha256
-            ).hexdigest()
+            signature = hmac.new(webhook.secret.encode(), body, hashlib.sha256).hexdigest()
             headers["X-Certify-Signature"] = f"sha256={signature}"
-        
-        data = json.dumps(payload).encode("utf-8")
-        
-        req = urllib.request.Request(
-            webhook.url,
-            data=data,
-            headers=headers,
-            method="POST"
-        )
-        
-        try:
-            with urllib.request.urlopen(req, timeout=10) as response:
-                status = response.status
-                if status >= 200 and status < 300:
-                    webhook.last_triggered = datetime.utcnow().isoformat()
-                    webhook.failure_count = 0
-                else:
-                    webhook.failure_count += 1
-        except urllib.error.HTTPError as e:
-            print(f"Webhook HTTP error: {e.code}")
-            webhook.failure_count += 1
-            raise
-        except urllib.error.URLError as e:
-            print(f"Webhook URL error: {e.reason}")
-            webhook.failure_count += 1
-            raise
+        return body, headers
+    
+    def _send_webhook(self, webhook: Webhook, event: WebhookEvent):
+        """Send event to a single webhook now (raises on failure)."""
+        body, headers = self._encode(webhook, [event])
+        with self._lock:
+            if self._sync_client is None:
+                self._sync_client = httpx.Client(timeout=REQUEST_TIMEOUT)
+        response = self._sync_client.post(webhook.url, content=body, headers=headers)
+        response.raise_for_status()
+        self._record_success(webhook)
     
     def _format_payload(self, webhook: Webhook, event: WebhookEvent) -> Dict[str, Any]:
         """Format payload for webhook destination."""
@@ -248,6 +786,33 @@ class WebhookManager:
         else:
             return self._format_generic_payload(event)
     
+    def _format_batch_payload(self, webhook: Webhook, events: List[WebhookEvent]) -> Dict[str, Any]:
+        """One payload for a burst of events to the same destination."""
+        if "slack.com" in webhook.url or "hooks.slack.com" in webhook.url:
+            return {
+                "text": f"{len(events)} Certify Intel updates",
+                "attachments": [
+                    attachment
+                    for event in events
+                    for attachment in self._format_slack_payload(event)["attachments"]
+                ],
+            }
+        elif "office.com" in webhook.url or "outlook.office" in webhook.url:
+            cards = [self._format_teams_payload(event) for event in events]
+            return {
+                **cards[0],
+                "summary": f"{len(events)} Certify Intel updates",
+                "sections": [section for card in cards for section in card["sections"]],
+            }
+        else:
+            return {
+                "event": "batch",
+                "timestamp": datetime.utcnow().isoformat(),
+                "source": "certify-intel",
+                "count": len(events),
+                "events": [self._format_generic_payload(event) for event in events],
+            }
+    
     def _format_generic_payload(self, event: WebhookEvent) -> Dict[str, Any]:
         """Format generic webhook payload."""
         return {
@@ -2877,6 +2877,60 @@ async function fetchAPI(endpoint, options = {}) {
     }
 }
 
+/**
+ * POST to an endpoint that can stream Server-Sent Events (see backend/sse.py).
+ * Calls onToken(text) for each `token` event and resolves with the data of
+ * the final `done` event. Endpoints that answer with plain JSON resolve with
+ * that JSON, so any endpoint can be called this way.
+ */
+async function streamAPI(endpoint, body, onToken) {
+    const response = await fetch(`${API_BASE}${endpoint}`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'Accept': 'text/event-stream',
+            ...getAuthHeaders()
+        },
+        body: JSON.stringify(body)
+    });
+
+    // Let fetchAPI handle token refresh and retry
+    if (response.status === 401) {
+        return fetchAPI(endpoint, { method: 'POST', body: JSON.stringify(body) });
+    }
+    if (!response.ok) {
+        throw new APIError(response.status, getErrorMessage(response.status, endpoint), endpoint);
+    }
+    if (!(response.headers.get('content-type') || '').startsWith('text/event-stream')) {
+        return await response.json();
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let result = null;
+    for (;;) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        let end;
+        while ((end = buffer.indexOf('\n\n')) !== -1) {
+            const frame = buffer.slice(0, end);
+            buffer = buffer.slice(end + 2);
+            const event = (frame.match(/^event: (.*)$/m) || [])[1];
+            const data = JSON.parse((frame.match(/^data: (.*)$/m) || [])[1] || '{}');
+            if (event === 'token') {
+                onToken(data.text);
+            } else if (event === 'done') {
+                result = data;
+            } else if (event === 'error') {
+                throw new Error(data.message);
+            }
+        }
+    }
+    return result;
+}
+
 /**
  * Show persistent error banner at top of page
  */
@@ -3447,6 +3501,7 @@ function createChatWidget(containerId, config) {
         msgDiv.appendChild(bubble);
         messagesArea.appendChild(msgDiv);
         messagesArea.scrollTop = messagesArea.scrollHeight;
+        return bubble;
     }
 
     function showLoading() {
@@ -3529,9 +3584,17 @@ function createChatWidget(containerId, config) {
                 }
             }
 
-            const response = await fetchAPI(config.endpoint, {
-                method: 'POST',
-                body: JSON.stringify(payload)
+            // Show the reply as it streams in (endpoints without SSE answer with JSON)
+            let streamBubble = null;
+            let streamed = '';
+            const response = await streamAPI(config.endpoint, payload, (token) => {
+                if (!streamBubble) {
+                    hideLoading();
+                    streamBubble = appendMessage('assistant', '');
+                }
+                streamed += token;
+                streamBubble.innerHTML = escapeHtml(streamed).replace(/\n/g, '<br>');
+                messagesArea.scrollTop = messagesArea.scrollHeight;
             });
 
             hideLoading();
@@ -3547,7 +3610,11 @@ function createChatWidget(containerId, config) {
             const aiContent = response?.response || response?.content || response?.summary ||
                 (typeof response === 'string' ? response : 'No response received.');
 
-            appendMessage('assistant', aiContent);
+            if (streamBubble) {
+                streamBubble.innerHTML = escapeHtml(aiContent).replace(/\n/g, '<br>');
+            } else {
+                appendMessage('assistant', aiContent);
+            }
             conversationHistory.push({ role: 'assistant', content: aiContent });
 
             // Persist both messages to the session